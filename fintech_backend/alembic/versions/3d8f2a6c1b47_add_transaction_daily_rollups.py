@@ -0,0 +1,39 @@
+"""add transaction daily rollups
+
+Revision ID: 3d8f2a6c1b47
+Revises: 7c1e4b2f9a30
+Create Date: 2026-10-16 14:03:27.114902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d8f2a6c1b47'
+down_revision: Union[str, None] = '7c1e4b2f9a30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'transaction_daily_rollups',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('category', sa.String(length=32), nullable=False),
+        sa.Column('income_cents', sa.BigInteger(), nullable=False),
+        sa.Column('income_count', sa.Integer(), nullable=False),
+        sa.Column('expense_cents', sa.BigInteger(), nullable=False),
+        sa.Column('expense_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'day', 'category')
+    )
+
+    # Backfilled together with the monthly rollups in 9b4e7d1f0c62
+
+
+def downgrade() -> None:
+    op.drop_table('transaction_daily_rollups')
@@ -0,0 +1,122 @@
+"""partition transactions by month
+
+Revision ID: 7c1e4b2f9a30
+Revises: 58a6d0554597
+Create Date: 2026-10-16 09:12:41.508233
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.database.partitions import (
+    add_months, create_default_partition_sql, create_partition_sql, iter_months, month_start
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b2f9a30'
+down_revision: Union[str, None] = '58a6d0554597'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# PostgreSQL only; SQLite keeps the plain table.
+#
+# PostgreSQL requires every primary key and unique index on a partitioned
+# table to include the partition key, so the primary key becomes
+# (id, transaction_date) and reference numbers are unique per timestamp.
+
+MONTHS_AHEAD = 3
+
+FOREIGN_KEYS = [
+    ('transactions_account_id_fkey', 'accounts', ['account_id'], 'CASCADE'),
+    ('transactions_card_id_fkey', 'cards', ['card_id'], 'SET NULL'),
+    ('transactions_user_id_fkey', 'users', ['user_id'], 'CASCADE'),
+]
+
+INDEXES = [
+    ('idx_transaction_account_date', ['account_id', 'transaction_date']),
+    ('idx_transaction_merchant_date', ['merchant_category', 'transaction_date']),
+    ('idx_transaction_status_date', ['status', 'transaction_date']),
+    ('idx_transaction_type_date', ['transaction_type', 'transaction_date']),
+    ('idx_transaction_user_date', ['user_id', 'transaction_date']),
+    ('ix_transactions_account_id', ['account_id']),
+    ('ix_transactions_direction', ['direction']),
+    ('ix_transactions_is_disputed', ['is_disputed']),
+    ('ix_transactions_is_fraudulent', ['is_fraudulent']),
+    ('ix_transactions_merchant_category', ['merchant_category']),
+    ('ix_transactions_status', ['status']),
+    ('ix_transactions_transaction_date', ['transaction_date']),
+    ('ix_transactions_transaction_type', ['transaction_type']),
+    ('ix_transactions_user_id', ['user_id']),
+]
+
+REFERENCE_INDEX = 'ix_transactions_reference_number'
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def _detach_old_table(old_name: str) -> None:
+    """Rename ``transactions`` aside and free its index names for the new table."""
+    op.rename_table('transactions', old_name)
+    op.execute(f'ALTER TABLE {old_name} RENAME CONSTRAINT transactions_pkey TO {old_name}_pkey')
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name=old_name)
+    op.drop_index(REFERENCE_INDEX, table_name=old_name)
+
+
+def _add_keys_and_indexes(primary_key, reference_columns) -> None:
+    op.create_primary_key('transactions_pkey', 'transactions', primary_key)
+    for name, referent, columns, ondelete in FOREIGN_KEYS:
+        op.create_foreign_key(name, 'transactions', referent, columns, ['id'], ondelete=ondelete)
+    for name, columns in INDEXES:
+        op.create_index(name, 'transactions', columns, unique=False)
+    op.create_index(REFERENCE_INDEX, 'transactions', reference_columns, unique=True)
+
+
+def upgrade() -> None:
+    if not _is_postgresql():
+        return
+
+    _detach_old_table('transactions_unpartitioned')
+    op.execute(
+        'CREATE TABLE transactions '
+        '(LIKE transactions_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        'PARTITION BY RANGE (transaction_date)'
+    )
+    _add_keys_and_indexes(['id', 'transaction_date'], ['reference_number', 'transaction_date'])
+
+    # One partition per month spanning existing rows through MONTHS_AHEAD
+    oldest, newest = op.get_bind().execute(sa.text(
+        'SELECT min(transaction_date), max(transaction_date) FROM transactions_unpartitioned'
+    )).one()
+    this_month = month_start(date.today())
+    first = min(month_start(oldest), this_month) if oldest else this_month
+    last = max(month_start(newest), add_months(this_month, MONTHS_AHEAD)) if newest \
+        else add_months(this_month, MONTHS_AHEAD)
+    for month in iter_months(first, last):
+        op.execute(create_partition_sql(month))
+    op.execute(create_default_partition_sql())
+
+    op.execute('INSERT INTO transactions SELECT * FROM transactions_unpartitioned')
+    op.drop_table('transactions_unpartitioned')
+
+
+def downgrade() -> None:
+    if not _is_postgresql():
+        return
+
+    _detach_old_table('transactions_partitioned')
+    op.execute(
+        'CREATE TABLE transactions '
+        '(LIKE transactions_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    )
+    _add_keys_and_indexes(['id'], ['reference_number'])
+
+    op.execute('INSERT INTO transactions SELECT * FROM transactions_partitioned')
+    # Dropping the parent drops every partition with it
+    op.drop_table('transactions_partitioned')
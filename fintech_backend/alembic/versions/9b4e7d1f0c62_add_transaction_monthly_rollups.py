@@ -0,0 +1,43 @@
+"""add transaction monthly rollups
+
+Revision ID: 9b4e7d1f0c62
+Revises: 3d8f2a6c1b47
+Create Date: 2026-10-16 17:41:09.352816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.database.rollups import rebuild_rollups
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e7d1f0c62'
+down_revision: Union[str, None] = '3d8f2a6c1b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'transaction_monthly_rollups',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('category', sa.String(length=32), nullable=False),
+        sa.Column('income_cents', sa.BigInteger(), nullable=False),
+        sa.Column('income_count', sa.Integer(), nullable=False),
+        sa.Column('expense_cents', sa.BigInteger(), nullable=False),
+        sa.Column('expense_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'month', 'category')
+    )
+
+    # Backfill both rollup tables from existing transactions
+    rebuild_rollups(Session(bind=op.get_bind()))
+
+
+def downgrade() -> None:
+    op.drop_table('transaction_monthly_rollups')
@@ -14,6 +14,7 @@ from ...database.config import get_db
 from ...config.logging import get_logger
 from ...core.auth import get_current_user
 from ...utils.response import success_response
+from ...core.exceptions import ValidationException
 from ...services.transaction_service import TransactionService
 from ...services.database_transaction_service import DatabaseTransactionService
 from ...services.database_account_service import DatabaseAccountService
@@ -48,9 +49,9 @@ def get_transaction_service():
     return TransactionService()
 
 
-def get_database_transaction_service():
+def get_database_transaction_service(db: Session = Depends(get_db)):
     """Dependency to get database transaction service instance"""
-    return DatabaseTransactionService()
+    return DatabaseTransactionService(db)
 
 
 def get_database_account_service():
@@ -69,6 +70,7 @@ async def get_all_transactions(
     end_date: Optional[str] = Query(None),
     min_amount: Optional[float] = Query(None),
     max_amount: Optional[float] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
     transaction_service: DatabaseTransactionService = Depends(get_database_transaction_service)
@@ -77,6 +79,7 @@ async def get_all_transactions(
     Get all transactions with advanced filtering (Admin only).
 
     Returns paginated list of all transactions with comprehensive filtering options.
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the following page.
     """
     try:
         logger.info(f"Admin API: Getting transactions - page {page}, limit {limit}")
@@ -107,7 +110,8 @@ async def get_all_transactions(
             db=db,
             page=page,
             limit=limit,
-            filters=filters
+            filters=filters,
+            cursor=cursor
         )
 
         return success_response(
@@ -117,7 +121,9 @@ async def get_all_transactions(
                     "page": page,
                     "limit": limit,
                     "total": result["total"],
-                    "pages": result["pages"]
+                    "pages": result["pages"],
+                    "next_cursor": result["next_cursor"],
+                    "has_more": result["has_more"]
                 },
                 "filters": filters,
                 "summary": result.get("summary", {})
@@ -125,6 +131,10 @@ async def get_all_transactions(
             message="Transactions retrieved successfully"
         )
 
+    except HTTPException:
+        raise
+    except ValidationException as e:
+        raise HTTPException(status_code=422, detail=e.message)
     except Exception as e:
         logger.error(f"Error getting transactions: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -2,54 +2,107 @@
 Public API endpoints that don't require authentication.
 """
 
-from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Any, Dict, Optional
+import hashlib
+import json
 import os
-from sqlalchemy.orm import Session
+import time
 
+from ..core.exceptions import DatabaseUnavailableException
 from ..database.config import get_db
-from ..services.user_service_admin import UserServiceAdmin
+from ..services.user_service_admin import query_user_statistics
 from ..config.logging import get_logger
+from ..config.settings import settings
+from ..utils.cache import AsyncTTLCache
 
 router = APIRouter(tags=["Public"])
 logger = get_logger(__name__)
 
 
+# Shared across requests so a burst of landing-page hits runs one query
+_public_stats_cache = AsyncTTLCache(ttl_seconds=settings.public_stats_cache_ttl, max_entries=1)
+
+
+def _query_user_statistics() -> Dict[str, Any]:
+    # Session only on a cache miss; get_db fails fast while the circuit is open
+    with contextmanager(get_db)() as db:
+        return query_user_statistics(db)
+
+
+async def _compute_public_user_statistics() -> Dict[str, Any]:
+    stats = await run_in_threadpool(_query_user_statistics)
+
+    # Return only public-safe statistics
+    public_stats = {
+        "total_users": stats["total_users"],
+        "active_users": stats["active_users"],
+        "inactive_users": stats["inactive_users"],
+        "verified_users": stats["verified_users"],
+        "unverified_users": stats["unverified_users"],
+        "role_distribution": stats["role_distribution"],
+        "top_countries": stats["top_countries"],
+        "recent_registrations": stats["recent_registrations"],
+        "generated_at": stats["generated_at"]
+    }
+    body = json.dumps({"success": True, "statistics": public_stats}, separators=(",", ":"))
+    # Weak ETag over the statistics alone, so recomputing unchanged numbers
+    # (with a new generated_at) keeps clients' cached copies valid
+    fingerprint = json.dumps({k: v for k, v in public_stats.items() if k != "generated_at"},
+                             separators=(",", ":"), sort_keys=True, default=str)
+    etag = 'W/"' + hashlib.sha256(fingerprint.encode()).hexdigest()[:32] + '"'
+    return {"body": body, "etag": etag}
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header (a list of tags, or *) against ``etag``."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
 @router.get("/user-stats")
-async def get_public_user_statistics(db: Session = Depends(get_db)):
+async def get_public_user_statistics(request: Request):
     """
     Get public user statistics for the landing page.
 
-    Returns basic user statistics without requiring authentication.
+    Returns basic user statistics without requiring authentication. Results
+    are cached in-process for ``public_stats_cache_ttl`` seconds and served
+    with Cache-Control/ETag headers so CDNs and browsers can reuse them.
     """
     try:
         logger.info("Getting public user statistics")
 
-        user_service = UserServiceAdmin()
-        stats = await user_service.get_user_statistics_admin(db)
-
-        # Return only public-safe statistics
-        public_stats = {
-            "total_users": stats["total_users"],
-            "active_users": stats["active_users"],
-            "inactive_users": stats["inactive_users"],
-            "verified_users": stats["verified_users"],
-            "unverified_users": stats["unverified_users"],
-            "role_distribution": stats["role_distribution"],
-            "top_countries": stats["top_countries"],
-            "recent_registrations": stats["recent_registrations"],
-            "generated_at": stats["generated_at"]
+        entry = await _public_stats_cache.get_or_compute(
+            "public_user_stats", _compute_public_user_statistics
+        )
+        remaining = max(0, int(entry.expires_at - time.monotonic()))
+        headers = {
+            "Cache-Control": f"public, max-age={remaining}, stale-while-revalidate={settings.public_stats_cache_ttl}",
+            "ETag": entry.value["etag"]
         }
 
-        return JSONResponse(
+        if _etag_matches(request.headers.get("if-none-match"), entry.value["etag"]):
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            content=entry.value["body"],
             status_code=200,
-            content={
-                "success": True,
-                "statistics": public_stats
-            }
+            media_type="application/json",
+            headers=headers
         )
 
+    except DatabaseUnavailableException:
+        raise
     except Exception as e:
         logger.error(f"Error getting public user statistics: {e}")
         return JSONResponse(
@@ -1,30 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...core.auth import get_current_user
+from ...auth.dependencies import get_current_user_async
 from ...models.analytics import (
     AnalyticsRequest, BudgetRequest, SpendingAnalysisRequest, FinancialGoalRequest,
     SpendingByCategory, BudgetProfile, BudgetSummary, FinancialInsight,
     CashFlowAnalysis, FinancialHealthScore, FinancialGoalProfile, FinancialAlert,
-    AnalyticsPeriod, TransactionCategory
+    PeriodComparison, AnalyticsPeriod, TransactionCategory
 )
 from ...services.analytics_service import AnalyticsService
 from ...core.exceptions import NotFoundError, ValidationError, BusinessLogicError
 from ...config.logging import get_logger
-from ...database.config import get_db
+from ...database.config import get_async_db
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
-def get_analytics_service(db: Session = Depends(get_db)) -> AnalyticsService:
-    """Dependency to get analytics service instance with database session."""
+def get_analytics_service(db: AsyncSession = Depends(get_async_db)) -> AnalyticsService:
+    """Dependency to get analytics service instance with an async database session."""
     return AnalyticsService(db)
 
 @router.post("/spending-analysis", response_model=List[SpendingByCategory])
 async def get_spending_analysis(
     request: SpendingAnalysisRequest,
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_async),
     analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
@@ -61,7 +61,7 @@ async def get_spending_analysis(
 @router.post("/cash-flow", response_model=CashFlowAnalysis)
 async def get_cash_flow_analysis(
     request: AnalyticsRequest,
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_async),
     analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
@@ -96,10 +96,39 @@ async def get_cash_flow_analysis(
             detail=f"Failed to retrieve cash flow analysis: {str(e)}"
         )
 
+@router.get("/comparison", response_model=PeriodComparison)
+async def get_period_comparison(
+    months: int = Query(12, ge=1, le=120, description="Number of months in the month-over-month series"),
+    end_date: Optional[date] = Query(None, description="Any day in the last month compared (default today)"),
+    current_user: dict = Depends(get_current_user_async),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
+):
+    """
+    Compare spending and income across periods.
+
+    Returns, in one call:
+    - Month-over-month series for the last `months` months
+    - Quarter-over-quarter and year-over-year series over the same window
+    - Income, spending, net cash flow and category mix per period
+    - Percentage change against the previous period
+    """
+    try:
+        comparison = await analytics_service.get_period_comparison(
+            user_id=current_user["user_id"],
+            months=months,
+            end_date=end_date
+        )
+        return comparison
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compare periods: {str(e)}"
+        )
+
 @router.post("/budgets", response_model=BudgetProfile, status_code=status.HTTP_201_CREATED)
 async def create_budget(
     request: BudgetRequest,
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_async),
     analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
@@ -135,7 +164,7 @@ async def create_budget(
 
 @router.get("/budgets", response_model=List[BudgetProfile])
 async def get_user_budgets(
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_async),
     analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
@@ -160,7 +189,7 @@ async def get_user_budgets(
 
 @router.get("/budgets/summary", response_model=BudgetSummary)
 async def get_budget_summary(
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_async),
     analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
@@ -186,7 +215,7 @@ async def get_budget_summary(
 @router.post("/financial-goals", response_model=FinancialGoalProfile, status_code=status.HTTP_201_CREATED)
 async def create_financial_goal(
     request: FinancialGoalRequest,
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_async),
     analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
@@ -220,7 +249,7 @@ async def create_financial_goal(
 
 @router.get("/financial-goals", response_model=List[FinancialGoalProfile])
 async def get_user_financial_goals(
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_async),
     analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
@@ -245,7 +274,7 @@ async def get_user_financial_goals(
 
 @router.get("/financial-health", response_model=FinancialHealthScore)
 async def get_financial_health_score(
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_async),
     analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
@@ -270,7 +299,7 @@ async def get_financial_health_score(
 
 @router.get("/insights", response_model=List[FinancialInsight])
 async def get_financial_insights(
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_async),
     analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
@@ -295,7 +324,7 @@ async def get_financial_insights(
 
 @router.get("/alerts", response_model=List[FinancialAlert])
 async def get_financial_alerts(
-    current_user: dict = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user_async),
     analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
@@ -34,6 +34,7 @@ async def list_transactions(
     search_query: Optional[str] = Query(None, description="Search in transaction names"),
     limit: int = Query(50, ge=1, le=1000, description="Number of results to return"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
     sort_by: str = Query("transaction_date", description="Sort field"),
     sort_order: str = Query("desc", description="Sort order (asc/desc)")
 ):
@@ -41,7 +42,8 @@ async def list_transactions(
     List Plaid transactions with comprehensive filtering and pagination.
     
     Returns a paginated list of transactions from Plaid with summary statistics
-    and supports extensive filtering options.
+    and supports extensive filtering options. Date-sorted listings return a
+    ``next_cursor``; pass it back as ``cursor`` to fetch the following page.
     """
     try:
         logger.info(f"API: Listing Plaid transactions for user {user_id}")
@@ -72,6 +74,7 @@ async def list_transactions(
             search_query=search_query,
             limit=limit,
             offset=offset,
+            cursor=cursor,
             sort_by=sort_by,
             sort_order=sort_order
         )
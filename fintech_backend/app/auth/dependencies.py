@@ -5,10 +5,12 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..auth.jwt_handler import JWTHandler
-from ..database.config import get_db
-from ..repositories.database_repository import UserRepository
+from ..core.auth import get_current_user as get_token_user
+from ..database.config import get_db, get_async_db
+from ..repositories.database_repository import UserRepository, AsyncUserRepository
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
@@ -33,12 +35,25 @@ async def get_current_user_id(
     return JWTHandler.get_user_id_from_token(token)
 
 
+def _require_user(user):
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
 async def get_current_user(
     user_id: str = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """
     Get the current authenticated user from the database.
+
+    Uses the request's ``get_db`` session, so a route that also depends on
+    ``get_db`` shares one connection with authentication.
     
     Args:
         user_id: User ID from JWT token
@@ -51,16 +66,33 @@ async def get_current_user(
         HTTPException: If user not found
     """
     user_repo = UserRepository(db)
-    user = user_repo.get_user_by_id(user_id)
-    
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    return _require_user(user_repo.get_user_by_id(user_id))
+
+
+async def get_current_user_async(
+    token_user: dict = Depends(get_token_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> dict:
+    """
+    Check that the token's user still exists, through the request's ``AsyncSession``.
+
+    For routes that depend on ``get_async_db`` (such as the analytics API), so
+    that authentication does not check out a second pooled connection. Returns
+    the token claims of ``core.auth.get_current_user``, which those routes read.
     
-    return user
+    Args:
+        token_user: Claims from the access token
+        db: Async database session
+        
+    Returns:
+        dict: Current authenticated user's token claims
+        
+    Raises:
+        HTTPException: If user not found
+    """
+    user_repo = AsyncUserRepository(db)
+    _require_user(await user_repo.get_user_by_id(token_user["user_id"]))
+    return token_user
 
 
 async def get_optional_current_user_id(
@@ -195,7 +195,24 @@ class Settings(BaseSettings):
     cache_ttl: int = Field(default=300, description="Default cache TTL in seconds")
     exchange_rate_cache_ttl: int = Field(default=3600, description="Exchange rate cache TTL in seconds")
     market_data_cache_ttl: int = Field(default=60, description="Market data cache TTL in seconds")
+    public_stats_cache_ttl: int = Field(default=60, description="Public user statistics cache TTL in seconds")
+    financial_health_cache_ttl: int = Field(default=300, description="Per-user financial health score and insights cache TTL in seconds")
     
+    # Mock data settings
+    mock_data_seed: int = Field(default=42, description="Seed for deterministic mock/demo data")
+    mock_data_max_users: int = Field(
+        default=1000,
+        description="Demo users kept seeded in memory; least recently used users are evicted beyond this"
+    )
+    mock_persistence_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for snapshots and append logs of in-memory mock state; unset keeps state in memory only"
+    )
+    mock_persistence_snapshot_every: int = Field(
+        default=10000, description="Logged writes between automatic snapshots of mock state"
+    )
+    mock_persistence_fsync: bool = Field(default=False, description="fsync the mock state log after every write")
+
     # Business settings
     default_currency: str = Field(default="USD", description="Default currency code")
     supported_currencies: List[str] = Field(
@@ -232,7 +249,7 @@ class Settings(BaseSettings):
     )
     database_pool_pre_ping: bool = Field(
         default=True,
-        description="Enable database connection pool pre-ping"
+        description="Enable liveness pings for pooled connections idle longer than database_ping_idle_threshold"
     )
     database_echo: bool = Field(
         default=False,
@@ -246,6 +263,46 @@ class Settings(BaseSettings):
         default=10,
         description="Database connection timeout in seconds"
     )
+    database_ping_idle_threshold: int = Field(
+        default=30,
+        description="Seconds a pooled connection may sit idle before it is pinged on checkout"
+    )
+    database_circuit_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive connection failures before the database circuit breaker opens"
+    )
+    database_circuit_reset_timeout: int = Field(
+        default=15,
+        description="Seconds the database circuit breaker stays open before allowing a trial request"
+    )
+    transaction_partition_months_ahead: int = Field(
+        default=3,
+        description="Monthly transaction partitions to create ahead of the current month (PostgreSQL only)"
+    )
+    transaction_partition_check_interval: int = Field(
+        default=6 * 60 * 60,
+        description="Seconds between checks that monthly transaction partitions exist (PostgreSQL only)"
+    )
+    db_query_instrumentation: bool = Field(
+        default=True,
+        description="Record per-request SQL statement counts and timings"
+    )
+    db_slow_query_threshold_ms: float = Field(
+        default=200.0,
+        description="Statements slower than this are reported as slow queries"
+    )
+    db_explain_slow_queries: bool = Field(
+        default=False,
+        description="Capture EXPLAIN output for slow SELECT statements"
+    )
+    db_n_plus_one_threshold: int = Field(
+        default=5,
+        description="Executions of the same statement within one request that flag an N+1 candidate"
+    )
+    db_stats_header: bool = Field(
+        default=False,
+        description="Add an X-DB-Stats response header with per-request query totals"
+    )
     
     # Redis settings
     redis_url: str = Field(
@@ -60,9 +60,16 @@ async def fintech_exception_handler(request: Request, exc: FintechException) ->
         request_id=request_id
     )
     
+    # Tell clients when to retry, as the rate limiter does
+    headers = None
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after:
+        headers = {"Retry-After": str(retry_after)}
+    
     return CustomJSONResponse(
         status_code=exc.status_code,
-        content=error_response.dict()
+        content=error_response.dict(),
+        headers=headers
     )
 
 
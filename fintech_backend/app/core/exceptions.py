@@ -173,11 +173,29 @@ class ExternalServiceException(FintechException):
         )
 
 
+class DatabaseUnavailableException(FintechException):
+    """Exception raised when the database is known to be unreachable."""
+
+    def __init__(self, retry_after: Optional[int] = None):
+        self.retry_after = retry_after
+        details = {}
+        if retry_after:
+            details["retry_after_seconds"] = retry_after
+
+        super().__init__(
+            message="Database is temporarily unavailable",
+            error_code="DATABASE_UNAVAILABLE",
+            status_code=503,
+            details=details
+        )
+
+
 class RateLimitExceededException(FintechException):
     """Exception for rate limit violations."""
     
     def __init__(self, limit: int, window_seconds: int, retry_after: Optional[int] = None):
         message = f"Rate limit exceeded: {limit} requests per {window_seconds} seconds"
+        self.retry_after = retry_after
         details = {
             "limit": limit,
             "window_seconds": window_seconds
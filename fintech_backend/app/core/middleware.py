@@ -17,6 +17,9 @@ from slowapi.errors import RateLimitExceeded
 
 from ..config.logging import set_correlation_id, get_logger, log_api_request
 from ..config.settings import Settings
+from ..database.instrumentation import (
+    start_request_stats, finish_request_stats, log_request_stats, format_stats_header
+)
 from ..models.base import ErrorResponse
 from .exceptions import RateLimitExceededException
 
@@ -40,6 +43,11 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         # Store correlation ID in request state for access in handlers
         request.state.request_id = correlation_id
         
+        # Attribute SQL statements issued while handling this request
+        query_stats = None
+        if self.settings.db_query_instrumentation:
+            query_stats = start_request_stats(correlation_id)
+        
         # Log request start
         start_time = time.time()
         
@@ -65,6 +73,12 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             # Add correlation ID to response headers
             response.headers["X-Correlation-ID"] = correlation_id
             
+            db_stats = finish_request_stats(query_stats)
+            if db_stats and db_stats["query_count"]:
+                log_request_stats(db_stats, request.method, request.url.path)
+                if self.settings.db_stats_header:
+                    response.headers["X-DB-Stats"] = format_stats_header(db_stats)
+            
             # Log request completion
             log_api_request(
                 logger=logger,
@@ -81,6 +95,10 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             # Calculate duration for failed requests
             duration_ms = (time.time() - start_time) * 1000
             
+            db_stats = finish_request_stats(query_stats)
+            if db_stats and db_stats["query_count"]:
+                log_request_stats(db_stats, request.method, request.url.path)
+            
             logger.error(
                 f"Request failed: {request.method} {request.url.path}",
                 extra={
@@ -3,21 +3,36 @@ Database configuration and setup.
 """
 from .config import (
     Base, engine, SessionLocal, get_db, create_tables, drop_tables,
-    check_database_connection, get_database_info, initialize_database
+    check_database_connection, get_database_info, initialize_database,
+    get_async_engine, get_async_session_factory, get_async_db, dispose_async_engine
+)
+from .liveness import get_liveness_stats, db_circuit_breaker
+from .partitions import ensure_transaction_partitions
+from .unit_of_work import (
+    UnitOfWork, AsyncUnitOfWork, unit_of_work, async_unit_of_work,
+    get_unit_of_work, get_async_unit_of_work
 )
 from .models import (
     User, Account, Transaction, Card, Investment, P2PTransaction, Transfer,
+    TransactionDailyRollup, TransactionMonthlyRollup,
     AccountTypeEnum, AccountStatusEnum, TransactionTypeEnum, TransactionStatusEnum,
     TransactionDirectionEnum, MerchantCategoryEnum, PaymentMethodEnum,
     CardTypeEnum, CardStatusEnum
 )
+from .rollups import rebuild_rollups, record_transactions
 
 __all__ = [
     # Configuration
     "Base", "engine", "SessionLocal", "get_db", "create_tables", "drop_tables",
     "check_database_connection", "get_database_info", "initialize_database",
+    "get_async_engine", "get_async_session_factory", "get_async_db", "dispose_async_engine",
+    "get_liveness_stats", "db_circuit_breaker", "ensure_transaction_partitions",
+    "UnitOfWork", "AsyncUnitOfWork", "unit_of_work", "async_unit_of_work",
+    "get_unit_of_work", "get_async_unit_of_work",
+    "rebuild_rollups", "record_transactions",
     # Models
     "User", "Account", "Transaction", "Card", "Investment", "P2PTransaction", "Transfer",
+    "TransactionDailyRollup", "TransactionMonthlyRollup",
     # Enums
     "AccountTypeEnum", "AccountStatusEnum", "TransactionTypeEnum", "TransactionStatusEnum",
     "TransactionDirectionEnum", "MerchantCategoryEnum", "PaymentMethodEnum",
@@ -2,18 +2,29 @@
 Database configuration and session management.
 """
 from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool, QueuePool
 from ..config.settings import settings
+from ..core.exceptions import DatabaseUnavailableException
+from .partitions import ensure_transaction_partitions
+from .instrumentation import install_query_instrumentation
+from .liveness import (
+    install_liveness_listeners, db_circuit_breaker, liveness_stats,
+    before_checkout, after_checkout, get_liveness_stats
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
 def get_engine_config():
     """Get database engine configuration based on database type and environment."""
+    # SQLAlchemy's own pre_ping pings on every checkout; liveness listeners
+    # installed below ping only connections that have sat idle.
     config = {
-        "pool_pre_ping": settings.database_pool_pre_ping,
+        "pool_pre_ping": False,
         "echo": settings.database_echo or settings.debug,
         "pool_recycle": settings.database_pool_recycle,
     }
@@ -58,19 +69,112 @@ def get_engine_config():
             "pool_size": settings.database_pool_size,
             "max_overflow": settings.database_max_overflow,
             "pool_timeout": settings.database_pool_timeout,
-            "pool_pre_ping": True,  # Verify connections before use
             "pool_recycle": 3600,   # Recycle connections every hour
             "connect_args": connect_args
         })
 
     return config
 
+def get_async_database_url(database_url: str = None) -> str:
+    """
+    Translate the configured (sync) database URL into its async driver form.
+
+    postgresql:// uses asyncpg and sqlite:// uses aiosqlite. URLs that already
+    name a driver are returned unchanged.
+    """
+    url = database_url or settings.database_url
+    if url.startswith("postgresql+") or url.startswith("sqlite+"):
+        return url
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+def get_async_engine_config():
+    """Get async engine configuration based on database type and environment."""
+    config = {
+        "pool_pre_ping": False,
+        "echo": settings.database_echo or settings.debug,
+        "pool_recycle": settings.database_pool_recycle,
+    }
+
+    if settings.database_url.startswith("sqlite"):
+        config.update({
+            "poolclass": StaticPool,
+            "connect_args": {
+                "check_same_thread": False,
+                "timeout": settings.database_connect_timeout
+            }
+        })
+    elif settings.database_url.startswith("postgres"):
+        # asyncpg takes different connect arguments than psycopg2
+        connect_args = {
+            "timeout": 60,
+            "ssl": "require",
+            "server_settings": {
+                "application_name": f"{settings.app_name} v{settings.app_version}",
+            },
+            # Statement caching breaks behind pgbouncer in transaction mode (Supabase pooler)
+            "statement_cache_size": 0,
+        }
+
+        config.update({
+            "pool_size": settings.database_pool_size,
+            "max_overflow": settings.database_max_overflow,
+            "pool_timeout": settings.database_pool_timeout,
+            "pool_recycle": 3600,
+            "connect_args": connect_args
+        })
+
+    return config
+
+
 # Create database engine with optimized configuration
 engine = create_engine(settings.database_url, **get_engine_config())
+if settings.database_pool_pre_ping:
+    install_liveness_listeners(engine)
+if settings.db_query_instrumentation:
+    install_query_instrumentation(engine)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory are created on first use, so the asyncpg or
+# aiosqlite driver is only loaded when an async session is requested. The
+# ``sqlalchemy.ext.asyncio`` import above needs greenlet, which the
+# ``sqlalchemy[asyncio]`` requirement pulls in.
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_engine():
+    """Get (and lazily create) the async database engine."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(get_async_database_url(), **get_async_engine_config())
+        if settings.database_pool_pre_ping:
+            install_liveness_listeners(_async_engine.sync_engine)
+        if settings.db_query_instrumentation:
+            install_query_instrumentation(_async_engine.sync_engine)
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """Get (and lazily create) the AsyncSession factory."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return _async_session_factory
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -86,25 +190,89 @@ def create_tables():
         return False
 
 
+def _reject_if_circuit_open():
+    """Fail fast while the database circuit breaker is open."""
+    if not db_circuit_breaker.allow_request():
+        liveness_stats.increment("circuit_rejections")
+        raise DatabaseUnavailableException(retry_after=db_circuit_breaker.retry_after())
+
+
 def get_db():
     """
     Dependency to get database session.
+
+    The session checks out its pooled connection up front (no round trip;
+    idle connections are pinged by the pool listeners) so connection failures
+    surface here and feed the circuit breaker.
     """
-    db = None
+    _reject_if_circuit_open()
     try:
         db = SessionLocal()
-        # Test the connection by executing a simple query
-        db.execute(text("SELECT 1"))
-        yield db
-    except Exception as e:
-        logger.error(f"Database session creation failed: {e}")
-        if db:
-            db.close()
-        # Re-raise the exception to be handled by the endpoint
+    except BaseException:
+        db_circuit_breaker.release_trial()
         raise
+    try:
+        try:
+            wait_started = before_checkout(engine)
+            try:
+                db.connection()
+            except SQLAlchemyError as e:
+                db_circuit_breaker.record_failure()
+                logger.error(f"Database session creation failed: {e}")
+                raise
+            after_checkout(wait_started)
+        except BaseException:
+            # Cancelled or failed before a verdict; let the next request try
+            db_circuit_breaker.release_trial()
+            raise
+        yield db
     finally:
-        if db:
-            db.close()
+        db.close()
+
+
+async def get_async_db():
+    """
+    Dependency to get an async database session.
+
+    Use this from ``async def`` route handlers so database round trips do not
+    block the event loop.
+    """
+    _reject_if_circuit_open()
+    try:
+        async_engine = get_async_engine()
+        session = get_async_session_factory()()
+    except BaseException:
+        db_circuit_breaker.release_trial()
+        raise
+    async with session as db:
+        try:
+            wait_started = before_checkout(async_engine.sync_engine)
+            try:
+                await db.connection()
+            except SQLAlchemyError as e:
+                db_circuit_breaker.record_failure()
+                logger.error(f"Async database session creation failed: {e}")
+                raise
+            after_checkout(wait_started)
+        except BaseException:
+            # Cancelled (client disconnect) or failed before a verdict; let the next request try
+            db_circuit_breaker.release_trial()
+            raise
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Async database session failed: {e}")
+            await db.rollback()
+            raise
+
+
+async def dispose_async_engine():
+    """Dispose of the async engine's connection pool (used on shutdown)."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
 
 
 def drop_tables():
@@ -125,9 +293,11 @@ def check_database_connection():
             # Simple query to test connection
             result = connection.execute(text("SELECT 1"))
             result.fetchone()  # Ensure we actually get the result
+        db_circuit_breaker.record_success()
         logger.info("Database connection check successful")
         return True
     except Exception as e:
+        db_circuit_breaker.record_failure()
         # Log the error but don't make it critical
         error_msg = str(e)
         if "SSL connection has been closed unexpectedly" in error_msg:
@@ -167,6 +337,7 @@ def get_database_info():
                 "database_url": settings.database_url.split('@')[0] + '@***',  # Hide credentials
                 "database_version": version,
                 "pool_info": pool_info,
+                "liveness": get_liveness_stats(),
                 "connection_healthy": True
             }
     except Exception as e:
@@ -174,6 +345,7 @@ def get_database_info():
         return {
             "database_url": settings.database_url.split('@')[0] + '@***',
             "error": str(e),
+            "liveness": get_liveness_stats(),
             "connection_healthy": False
         }
 
@@ -185,6 +357,8 @@ def initialize_database():
     try:
         logger.info("Initializing database...")
         create_tables()
+        # No-op unless transactions is range-partitioned (PostgreSQL)
+        ensure_transaction_partitions(engine, months_ahead=settings.transaction_partition_months_ahead)
         logger.info("Database initialization completed successfully")
         return True
     except Exception as e:
@@ -0,0 +1,228 @@
+"""
+Per-request SQL instrumentation.
+
+Engine events time every statement and attribute it to the current request,
+whose stats ``RequestLoggingMiddleware`` places in a context variable. Keying
+on the context rather than the client-supplied correlation id keeps
+concurrent requests that reuse an id apart. For each request this records:
+
+* the number of statements and total time spent in the database;
+* the slowest statements;
+* N+1 candidates, i.e. the same statement text executed repeatedly with
+  different parameters, as happens when relationships lazy-load in a loop;
+* ``EXPLAIN`` output for SELECTs slower than ``db_slow_query_threshold_ms``
+  (when ``db_explain_slow_queries`` is on).
+
+Statements issued outside a tracked request are not recorded.
+"""
+import heapq
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..config.settings import settings
+from ..config.logging import get_logger
+
+logger = get_logger(__name__)
+
+_START_TIMES_KEY = "instrumentation_start_times"
+
+
+class RequestQueryStats:
+    """Statement counters and timings for one request."""
+
+    def __init__(self, correlation_id: str, slow_threshold_ms: float,
+                 max_slow_queries: int = 5):
+        self.correlation_id = correlation_id
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_slow_queries = max_slow_queries
+        self.query_count = 0
+        self.total_ms = 0.0
+        self._statements: Counter = Counter()
+        self._slowest: List[tuple] = []  # min-heap of (ms, seq, statement, explain)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.active = True
+
+    def record(self, statement: str, duration_ms: float, executemany: bool = False,
+               explain: Optional[List[str]] = None) -> None:
+        with self._lock:
+            self.query_count += 1
+            self.total_ms += duration_ms
+            if not executemany:
+                self._statements[statement] += 1
+            self._seq += 1
+            item = (duration_ms, self._seq, statement, explain)
+            if len(self._slowest) < self.max_slow_queries:
+                heapq.heappush(self._slowest, item)
+            elif duration_ms > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+
+    def n_plus_one_candidates(self, threshold: int) -> Dict[str, int]:
+        """Statements executed at least ``threshold`` times in this request."""
+        with self._lock:
+            return {sql: count for sql, count in self._statements.items() if count >= threshold}
+
+    def slow_queries(self) -> List[Dict[str, Any]]:
+        """Slowest statements at or over the slow threshold, slowest first."""
+        with self._lock:
+            items = sorted(self._slowest, reverse=True)
+        return [
+            {"statement": sql, "duration_ms": round(ms, 3), **({"explain": plan} if plan else {})}
+            for ms, _, sql, plan in items
+            if ms >= self.slow_threshold_ms
+        ]
+
+    def summary(self, n_plus_one_threshold: int) -> Dict[str, Any]:
+        return {
+            "correlation_id": self.correlation_id,
+            "query_count": self.query_count,
+            "db_time_ms": round(self.total_ms, 3),
+            "n_plus_one": self.n_plus_one_candidates(n_plus_one_threshold),
+            "slow_queries": self.slow_queries(),
+        }
+
+
+# Stats of the request being handled in this context (copied into its tasks and threadpool calls)
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def start_request_stats(correlation_id: str) -> RequestQueryStats:
+    """Begin recording statements issued from the current context."""
+    stats = RequestQueryStats(correlation_id, settings.db_slow_query_threshold_ms)
+    _current_stats.set(stats)
+    return stats
+
+
+def finish_request_stats(stats: Optional[RequestQueryStats]) -> Optional[Dict[str, Any]]:
+    """Stop recording for a request and return its summary (None if not tracked)."""
+    if stats is None or not stats.active:
+        return None
+    stats.active = False
+    if _current_stats.get() is stats:
+        _current_stats.set(None)
+    return stats.summary(settings.db_n_plus_one_threshold)
+
+
+def get_request_stats() -> Optional[RequestQueryStats]:
+    """Stats of the current request, if it is being tracked."""
+    stats = _current_stats.get()
+    return stats if stats is not None and stats.active else None
+
+
+def format_stats_header(summary: Dict[str, Any]) -> str:
+    """Compact ``X-DB-Stats`` header value."""
+    return (
+        f"queries={summary['query_count']};"
+        f"time_ms={summary['db_time_ms']:.1f};"
+        f"n_plus_one={len(summary['n_plus_one'])};"
+        f"slow={len(summary['slow_queries'])}"
+    )
+
+
+def log_request_stats(summary: Dict[str, Any], method: str, path: str) -> None:
+    """Log a request's DB totals, warning on N+1 candidates and slow statements."""
+    extra = {
+        "db_stats": True,
+        "method": method,
+        "path": path,
+        "query_count": summary["query_count"],
+        "db_time_ms": summary["db_time_ms"],
+    }
+    logger.info(
+        f"DB usage: {method} {path} ran {summary['query_count']} queries "
+        f"in {summary['db_time_ms']:.1f}ms",
+        extra=extra
+    )
+    for statement, count in summary["n_plus_one"].items():
+        logger.warning(
+            f"Possible N+1: statement executed {count} times in {method} {path}",
+            extra={**extra, "n_plus_one": True, "statement": statement, "executions": count}
+        )
+    for slow in summary["slow_queries"]:
+        logger.warning(
+            f"Slow query ({slow['duration_ms']:.1f}ms) in {method} {path}",
+            extra={**extra, "slow_query": True, **slow}
+        )
+
+
+# Savepoint wrapped around EXPLAIN outside SQLite
+_EXPLAIN_SAVEPOINT = "query_instrumentation_explain"
+
+
+def _explain(cursor, statement: str, parameters, dialect_name: str) -> Optional[List[str]]:
+    """
+    Run EXPLAIN for a SELECT on a fresh DBAPI cursor of the same connection.
+
+    The EXPLAIN shares the request's transaction. Outside SQLite it runs in a
+    savepoint: on PostgreSQL a failed statement aborts the whole transaction,
+    so a failure is rolled back to the savepoint instead.
+    """
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    sqlite = dialect_name == "sqlite"
+    prefix = "EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN "
+    explain_cursor = cursor.connection.cursor()
+    try:
+        if not sqlite:
+            explain_cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        try:
+            explain_cursor.execute(prefix + statement, parameters or ())
+            plan = [" ".join(str(col) for col in row) for row in explain_cursor.fetchall()]
+        except Exception:
+            if not sqlite:
+                explain_cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+                explain_cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            raise
+        if not sqlite:
+            explain_cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        return plan
+    except Exception as e:
+        logger.warning(f"EXPLAIN of a slow query failed: {e}", extra={"statement": statement})
+        return None
+    finally:
+        explain_cursor.close()
+
+
+def install_query_instrumentation(engine: Engine, explain_slow: Optional[bool] = None) -> None:
+    """
+    Attach statement timing listeners to a (sync) engine.
+
+    For an ``AsyncEngine`` pass ``async_engine.sync_engine``.
+    """
+    explain = settings.db_explain_slow_queries if explain_slow is None else explain_slow
+    dialect_name = engine.dialect.name
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Push for every statement (None when untracked) so each after_cursor_execute
+        # pops its own entry even if request tracking starts or ends in between
+        started = time.perf_counter() if get_request_stats() is not None else None
+        conn.info.setdefault(_START_TIMES_KEY, []).append(started)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start_times = conn.info.get(_START_TIMES_KEY)
+        if not start_times:
+            return
+        started = start_times.pop()
+        stats = get_request_stats()
+        if stats is None or started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        plan = None
+        if explain and not executemany and duration_ms >= stats.slow_threshold_ms:
+            plan = _explain(cursor, statement, parameters, dialect_name)
+        stats.record(statement, duration_ms, executemany=executemany, explain=plan)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # Drop the start time of a statement that raised
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_START_TIMES_KEY):
+            conn.info[_START_TIMES_KEY].pop()
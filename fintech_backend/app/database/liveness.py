@@ -0,0 +1,251 @@
+"""
+Connection liveness handling for the database pools.
+
+Replaces the per-request ``SELECT 1`` probe with pool-level checks:
+
+* connections are pinged on checkout only after sitting idle in the pool for
+  longer than ``database_ping_idle_threshold`` seconds;
+* a circuit breaker fails requests fast while the database is known to be down;
+* counters for pings, reconnects and pool waits are exposed through
+  ``get_liveness_stats()``.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DisconnectionError
+
+from ..config.settings import settings
+from ..config.logging import get_logger
+
+logger = get_logger(__name__)
+
+_LAST_CHECKIN_KEY = "liveness_last_checkin"
+
+
+class LivenessStats:
+    """Thread-safe counters for connection liveness events."""
+
+    _COUNTERS = (
+        "checkouts",
+        "pings",
+        "ping_failures",
+        "connects",
+        "reconnects",
+        "invalidations",
+        "pool_waits",
+        "circuit_opens",
+        "circuit_rejections",
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = {name: 0 for name in self._COUNTERS}
+            self._pool_wait_seconds = 0.0
+            self._pending_reconnects = 0
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self._counts["invalidations"] += 1
+            self._pending_reconnects += 1
+
+    def record_connect(self) -> None:
+        # A connect that follows an invalidation replaces a dead connection
+        with self._lock:
+            self._counts["connects"] += 1
+            if self._pending_reconnects:
+                self._pending_reconnects -= 1
+                self._counts["reconnects"] += 1
+
+    def record_pool_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._counts["pool_waits"] += 1
+            self._pool_wait_seconds += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            data = dict(self._counts)
+            data["pool_wait_seconds"] = round(self._pool_wait_seconds, 6)
+        return data
+
+
+class CircuitBreaker:
+    """
+    Minimal circuit breaker for database connectivity.
+
+    ``closed``: requests flow normally. After ``failure_threshold`` consecutive
+    connection failures the breaker goes ``open`` and rejects requests until
+    ``reset_timeout`` seconds have passed. It then goes ``half_open`` and lets a
+    single trial request through; success closes it, failure re-opens it. A
+    trial that ends any other way (cancelled, or failing before it reached the
+    database) must call ``release_trial`` so the next request can try.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, stats: Optional[LivenessStats] = None):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.stats = stats
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a request may try to use the database."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            # Half-open: admit one trial request at a time
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def retry_after(self) -> int:
+        """Seconds until the breaker will admit a trial request."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                # A trial is in flight and should settle within a second
+                return 1
+            if self._state != self.OPEN:
+                return 0
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+            return max(1, int(remaining + 0.999))
+
+    def release_trial(self) -> None:
+        """Give up a half-open trial without a verdict, so another request can try."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Database circuit breaker closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(
+                        f"Database circuit breaker opened after {self._failures} consecutive failures"
+                    )
+                    if self.stats:
+                        self.stats.increment("circuit_opens")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = 0.0
+            self._trial_in_flight = False
+
+
+liveness_stats = LivenessStats()
+db_circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.database_circuit_failure_threshold,
+    reset_timeout=settings.database_circuit_reset_timeout,
+    stats=liveness_stats,
+)
+
+
+def install_liveness_listeners(engine: Engine, idle_threshold: Optional[float] = None) -> None:
+    """
+    Attach lazy pre-ping and counter listeners to a (sync) engine's pool.
+
+    For an ``AsyncEngine`` pass ``async_engine.sync_engine``.
+    """
+    threshold = settings.database_ping_idle_threshold if idle_threshold is None else idle_threshold
+    dialect = engine.dialect
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info[_LAST_CHECKIN_KEY] = time.monotonic()
+        liveness_stats.record_connect()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        if connection_record is not None:
+            connection_record.info[_LAST_CHECKIN_KEY] = time.monotonic()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        liveness_stats.record_invalidation()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        liveness_stats.increment("checkouts")
+        last_checkin = connection_record.info.get(_LAST_CHECKIN_KEY)
+        if last_checkin is not None and time.monotonic() - last_checkin < threshold:
+            return
+
+        liveness_stats.increment("pings")
+        try:
+            alive = dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            if not dialect.is_disconnect(e, dbapi_connection, None):
+                raise
+            alive = False
+        if not alive:
+            liveness_stats.increment("ping_failures")
+            # The pool invalidates this connection and retries with a fresh one
+            raise DisconnectionError("Idle connection failed liveness ping")
+
+
+def _pool_saturated(pool) -> bool:
+    """True if a checkout from ``pool`` right now would have to wait."""
+    if not hasattr(pool, "checkedin") or not hasattr(pool, "overflow"):
+        return False
+    return pool.checkedin() == 0 and pool.overflow() >= getattr(pool, "_max_overflow", 0)
+
+
+def before_checkout(engine: Engine) -> Optional[float]:
+    """Start timing a checkout if the pool is saturated; pass the result to after_checkout."""
+    return time.monotonic() if _pool_saturated(engine.pool) else None
+
+
+def after_checkout(wait_started: Optional[float]) -> None:
+    """Record a successful checkout (and its wait time, if it had to wait)."""
+    if wait_started is not None:
+        liveness_stats.record_pool_wait(time.monotonic() - wait_started)
+    db_circuit_breaker.record_success()
+
+
+def get_liveness_stats() -> Dict[str, Any]:
+    """Get liveness counters together with the circuit breaker state."""
+    data = liveness_stats.snapshot()
+    data["circuit_state"] = db_circuit_breaker.state
+    data["ping_idle_threshold"] = settings.database_ping_idle_threshold
+    return data
@@ -2,7 +2,7 @@
 SQLAlchemy database models for the fintech backend.
 """
 from sqlalchemy import (
-    Column, String, DateTime, Boolean, Integer, Text, ForeignKey,
+    Column, String, Date, DateTime, Boolean, Integer, BigInteger, Text, ForeignKey,
     Enum as SQLEnum, JSON, CheckConstraint, UniqueConstraint, Index
 )
 from sqlalchemy.types import DECIMAL
@@ -26,6 +26,10 @@ class TimestampMixin:
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Fetch server-generated timestamps in the INSERT/UPDATE itself (RETURNING)
+    # so flushed rows need no refresh round trip
+    __mapper_args__ = {"eager_defaults": True}
+
 
 # Enums
 class AccountTypeEnum(enum.Enum):
@@ -325,7 +329,13 @@ class Account(Base, TimestampMixin):
 
 
 class Transaction(Base, TimestampMixin):
-    """Transaction model with enhanced validation and constraints."""
+    """
+    Transaction model with enhanced validation and constraints.
+
+    On PostgreSQL the table is range-partitioned by month on
+    ``transaction_date`` (see ``app/database/partitions.py``), so the database
+    primary key and reference-number unique index include that column.
+    """
     __tablename__ = "transactions"
 
     id = Column(String, primary_key=True, default=generate_uuid)
@@ -435,6 +445,42 @@ class Transaction(Base, TimestampMixin):
         return self.amount + self.fee_amount
 
 
+class TransactionDailyRollup(Base):
+    """
+    Per-user daily income and expense totals by analytics category.
+
+    Amounts are integer cents. Rows are kept in step with ``transactions`` in
+    the same database transaction (see ``app/database/rollups.py``).
+    """
+    __tablename__ = "transaction_daily_rollups"
+
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    category = Column(String(32), primary_key=True)  # TransactionCategory value
+
+    income_cents = Column(BigInteger, nullable=False, default=0)
+    income_count = Column(Integer, nullable=False, default=0)
+    expense_cents = Column(BigInteger, nullable=False, default=0)
+    expense_count = Column(Integer, nullable=False, default=0)
+
+
+class TransactionMonthlyRollup(Base):
+    """
+    Per-user monthly totals by analytics category, the daily rollups summed
+    by calendar month. ``month`` is the first day of the month.
+    """
+    __tablename__ = "transaction_monthly_rollups"
+
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    category = Column(String(32), primary_key=True)  # TransactionCategory value
+
+    income_cents = Column(BigInteger, nullable=False, default=0)
+    income_count = Column(Integer, nullable=False, default=0)
+    expense_cents = Column(BigInteger, nullable=False, default=0)
+    expense_count = Column(Integer, nullable=False, default=0)
+
+
 class Card(Base, TimestampMixin):
     """Card model with enhanced validation and constraints."""
     __tablename__ = "cards"
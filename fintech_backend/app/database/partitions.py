@@ -0,0 +1,168 @@
+"""
+Monthly range partitions for the ``transactions`` table.
+
+On PostgreSQL the table is partitioned by ``transaction_date`` (see the
+``partition_transactions_by_month`` migration), one child table per calendar
+month plus a DEFAULT partition for stragglers. Partitions must exist before
+rows for their month arrive, so ``ensure_transaction_partitions`` creates the
+coming months ahead of time. It runs at startup and then periodically through
+``maintain_transaction_partitions``, and is safe to repeat.
+
+PostgreSQL refuses to create a partition for a range the DEFAULT partition
+already holds rows for. If rows for a month landed there first,
+``ensure_transaction_partitions`` detaches the default, creates the month,
+moves those rows into it and reattaches the default, all in one transaction.
+
+Other databases (SQLite in development and tests) keep the plain table and
+every helper here is a no-op for them.
+"""
+import asyncio
+from datetime import date, datetime
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+import logging
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "transactions"
+DEFAULT_PARTITION = "transactions_default"
+
+
+def month_start(value) -> date:
+    """First day of the month containing ``value``."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Shift a first-of-month date by ``months`` (may be negative)."""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Child table name for a month, e.g. ``transactions_y2024m03``."""
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_bounds(month: date) -> Tuple[date, date]:
+    """Half-open ``[from, to)`` range covered by a month's partition."""
+    start = month_start(month)
+    return start, add_months(start, 1)
+
+
+def iter_months(first: date, last: date) -> Iterator[date]:
+    """Yield the first day of every month from ``first`` through ``last``."""
+    current, last = month_start(first), month_start(last)
+    while current <= last:
+        yield current
+        current = add_months(current, 1)
+
+
+def create_partition_sql(month: date) -> str:
+    """DDL creating one month's partition if it does not exist yet."""
+    start, end = partition_bounds(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def create_default_partition_sql() -> str:
+    """DDL for the catch-all partition holding rows outside every monthly range."""
+    return f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"
+
+
+def move_default_rows_sql(month: date) -> List[str]:
+    """
+    Statements creating a month's partition when the DEFAULT partition holds rows for it.
+
+    Expects ``:start`` and ``:end`` bound to the month's ``partition_bounds``.
+    """
+    return [
+        f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}",
+        create_partition_sql(month),
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE transaction_date >= :start AND transaction_date < :end RETURNING *) "
+        f"INSERT INTO {partition_name(month)} SELECT * FROM moved",
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT",
+    ]
+
+
+def is_transactions_partitioned(connection) -> bool:
+    """Whether ``transactions`` is a partitioned table on this connection's database."""
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(connection.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :name AND pg_table_is_visible(c.oid))"
+    ), {"name": PARENT_TABLE}).scalar())
+
+
+def ensure_transaction_partitions(bind, months_ahead: int = 3,
+                                  today: Optional[date] = None) -> List[str]:
+    """
+    Create monthly partitions from the current month through ``months_ahead``.
+
+    ``bind`` may be an Engine or a Connection. Returns the names of the
+    partitions checked; an empty list when the table is not partitioned.
+    """
+    today = today or datetime.utcnow().date()
+    months = list(iter_months(today, add_months(month_start(today), months_ahead)))
+
+    def _ensure(connection) -> List[str]:
+        if not is_transactions_partitioned(connection):
+            return []
+        for month in months:
+            _create_partition(connection, month)
+        return [partition_name(month) for month in months]
+
+    if isinstance(bind, Engine):
+        with bind.begin() as connection:
+            names = _ensure(connection)
+    else:
+        names = _ensure(bind)
+
+    if names:
+        logger.info(f"Transaction partitions ready through {names[-1]}")
+    return names
+
+
+def _table_exists(connection, name: str) -> bool:
+    return bool(connection.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar())
+
+
+def _create_partition(connection, month: date) -> None:
+    """Create a month's partition, first moving any of its rows out of the DEFAULT partition."""
+    if _table_exists(connection, partition_name(month)):
+        return
+    start, end = partition_bounds(month)
+    bounds = {"start": start, "end": end}
+    stranded = _table_exists(connection, DEFAULT_PARTITION) and connection.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+        f"WHERE transaction_date >= :start AND transaction_date < :end)"
+    ), bounds).scalar()
+    if not stranded:
+        connection.execute(text(create_partition_sql(month)))
+        return
+    for statement in move_default_rows_sql(month):
+        connection.execute(text(statement), bounds)
+    logger.warning(f"Moved {month:%Y-%m} transactions from {DEFAULT_PARTITION} into {partition_name(month)}")
+
+
+async def maintain_transaction_partitions(bind, months_ahead: int, interval_seconds: float) -> None:
+    """
+    Re-run ``ensure_transaction_partitions`` every ``interval_seconds`` until cancelled.
+
+    Keeps partitions ahead of the calendar in a process that outlives
+    ``months_ahead`` months. Failures are logged and retried next interval.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(ensure_transaction_partitions, bind, months_ahead)
+        except Exception as e:
+            logger.error(f"Transaction partition maintenance failed: {e}")
@@ -0,0 +1,287 @@
+"""
+Per-user daily and monthly analytics rollups.
+
+``transaction_daily_rollups`` holds, for each user, day and analytics
+category, the income and expense totals (integer cents) and counts that
+``AnalyticsService`` reports, so analytics read O(days x categories) rows
+instead of converting every transaction. ``transaction_monthly_rollups``
+holds the same totals per calendar month for multi-period comparisons.
+
+Rollups change in the same database transaction as the transactions they
+summarise:
+
+* ORM inserts, updates and deletes of ``Transaction`` are picked up by a
+  session ``after_flush`` hook.
+* Core bulk inserts (``TransactionRepository.insert_transactions`` and
+  ``bulk_create_transactions``) call ``record_transactions`` themselves.
+
+Transactions removed by a database-level cascade, or written with raw SQL,
+are not seen; ``rebuild_rollups`` (``scripts/backfill_analytics_rollups.py``)
+recomputes both tables from history.
+
+Users whose rollups changed are collected in ``session.info[CHANGED_USERS]``
+until the session commits, so caches derived from their data can be dropped.
+
+A rollup day is the calendar date of ``transaction_date``. Aware timestamps
+are taken in UTC, the session time zone the analytics date filters assume.
+"""
+from collections.abc import Mapping
+from datetime import date, datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from functools import partial
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Date, delete, event, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy import inspect as inspect_instance
+from sqlalchemy.orm import Session
+
+from .models import Transaction, TransactionDailyRollup, TransactionMonthlyRollup
+from ..models.analytics import TransactionCategory
+from ..models.transaction import MerchantCategory, TransactionType, TransactionDirection
+
+# Map merchant categories to transaction categories, keyed by enum value
+CATEGORY_MAPPING = {
+    merchant.value: category for merchant, category in {
+        MerchantCategory.GROCERIES: TransactionCategory.GROCERIES,
+        MerchantCategory.RESTAURANTS: TransactionCategory.FOOD_DINING,
+        MerchantCategory.GAS_STATIONS: TransactionCategory.FUEL,
+        MerchantCategory.RETAIL: TransactionCategory.SHOPPING,
+        MerchantCategory.ENTERTAINMENT: TransactionCategory.ENTERTAINMENT,
+        MerchantCategory.TRAVEL: TransactionCategory.TRAVEL,
+        MerchantCategory.HEALTHCARE: TransactionCategory.HEALTHCARE,
+        MerchantCategory.UTILITIES: TransactionCategory.BILLS_UTILITIES,
+        MerchantCategory.EDUCATION: TransactionCategory.EDUCATION,
+        MerchantCategory.AUTOMOTIVE: TransactionCategory.TRANSPORTATION,
+        MerchantCategory.ONLINE_SERVICES: TransactionCategory.OTHER,
+        MerchantCategory.SUBSCRIPTION: TransactionCategory.OTHER,
+        MerchantCategory.TRANSFER: TransactionCategory.TRANSFERS,
+        MerchantCategory.INVESTMENT_TRADE: TransactionCategory.INVESTMENTS,
+    }.items()
+}
+
+INCOME_TYPES = frozenset(t.value for t in (
+    TransactionType.SALARY, TransactionType.DEPOSIT, TransactionType.INTEREST,
+    TransactionType.DIVIDEND, TransactionType.REFUND
+))
+
+# Transaction attributes a rollup depends on
+ROLLUP_FIELDS = ("user_id", "transaction_date", "merchant_category", "transaction_type", "direction", "amount")
+
+# session.info key holding the ids of users whose rollups changed
+CHANGED_USERS = "rollup_changed_users"
+
+_TOTALS = ("income_cents", "income_count", "expense_cents", "expense_count")
+_CENT = Decimal("0.01")
+
+Deltas = Dict[Tuple[str, date, str], List[int]]
+
+
+class RollupTotals(NamedTuple):
+    """Income and expense totals of one category over a period."""
+    income: Decimal
+    income_count: int
+    expense: Decimal
+    expense_count: int
+
+
+def enum_value(value: Any) -> Any:
+    """Value of an enum member; database enum names as plain strings are lowercased to match."""
+    value = getattr(value, "value", value)
+    return value.lower() if isinstance(value, str) else value
+
+
+def analytics_category(merchant_category: Optional[str]) -> TransactionCategory:
+    return CATEGORY_MAPPING.get(merchant_category, TransactionCategory.OTHER)
+
+
+def is_income(transaction_type: str, direction: str, negative: bool) -> bool:
+    """Income by type or direction; stored amounts are positive, so a negative outbound amount is income too."""
+    if transaction_type in INCOME_TYPES or direction == TransactionDirection.INBOUND.value:
+        return True
+    return bool(negative)
+
+
+def to_cents(amount: Any) -> int:
+    return int(Decimal(str(amount)).quantize(_CENT, rounding=ROUND_HALF_UP) * 100)
+
+
+def from_cents(cents: Optional[int]) -> Decimal:
+    return Decimal(cents or 0).scaleb(-2)
+
+
+def rollup_day(value: Any) -> date:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.date()
+    return value
+
+
+def add_deltas(deltas: Deltas, rows: Iterable[Any], sign: int = 1) -> Deltas:
+    """Add the rollup changes of ``rows`` (mappings or objects with ``ROLLUP_FIELDS``) to ``deltas``."""
+    for row in rows:
+        get = row.get if isinstance(row, Mapping) else partial(getattr, row)
+        cents = to_cents(get("amount"))
+        income = is_income(enum_value(get("transaction_type")), enum_value(get("direction")), cents < 0)
+        _add(
+            deltas,
+            (get("user_id"), rollup_day(get("transaction_date")),
+             analytics_category(enum_value(get("merchant_category"))).value),
+            sign * abs(cents), sign, income
+        )
+    return deltas
+
+
+def _add(deltas: Deltas, key: Tuple[str, date, str], cents: int, count: int, income: bool) -> None:
+    totals = deltas.get(key)
+    if totals is None:
+        totals = deltas[key] = [0, 0, 0, 0]
+    offset = 0 if income else 2
+    totals[offset] += cents
+    totals[offset + 1] += count
+
+
+def apply_deltas(executor: Any, deltas: Deltas, chunk_size: int = 5000) -> None:
+    """
+    Add ``deltas`` onto the stored daily and monthly rollups.
+
+    ``executor`` is a Session or Connection; nothing is committed.
+    """
+    months: Deltas = {}
+    for (user_id, day, category), totals in deltas.items():
+        month = months.setdefault((user_id, day.replace(day=1), category), [0, 0, 0, 0])
+        for index, value in enumerate(totals):
+            month[index] += value
+    dialect = executor.get_bind().dialect.name if isinstance(executor, Session) else executor.dialect.name
+    _upsert(executor, dialect, TransactionDailyRollup.__table__, "day", deltas, chunk_size)
+    _upsert(executor, dialect, TransactionMonthlyRollup.__table__, "month", months, chunk_size)
+
+
+def _upsert(executor: Any, dialect: str, table: Any, period: str, deltas: Deltas, chunk_size: int) -> None:
+    rows = [
+        {"user_id": user_id, period: start, "category": category, **dict(zip(_TOTALS, totals))}
+        for (user_id, start, category), totals in deltas.items()
+        if any(totals)
+    ]
+    if not rows:
+        return
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = dialect_insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c[period], table.c.category],
+            set_={name: table.c[name] + statement.excluded[name] for name in _TOTALS}
+        )
+        for start in range(0, len(rows), chunk_size):
+            executor.execute(statement, rows[start:start + chunk_size])
+        return
+
+    # No portable upsert; update in place and insert what was missing
+    for row in rows:
+        result = executor.execute(
+            update(table)
+            .where(table.c.user_id == row["user_id"], table.c[period] == row[period],
+                   table.c.category == row["category"])
+            .values({name: table.c[name] + row[name] for name in _TOTALS})
+        )
+        if result.rowcount == 0:
+            executor.execute(table.insert().values(row))
+
+
+def record_transactions(session: Session, rows: Iterable[Any]) -> None:
+    """Roll up newly inserted transaction rows within ``session``'s transaction."""
+    deltas = add_deltas({}, rows)
+    apply_deltas(session, deltas)
+    _mark_changed(session, deltas)
+
+
+def _mark_changed(session: Session, deltas: Deltas) -> None:
+    if deltas:
+        session.info.setdefault(CHANGED_USERS, set()).update(user_id for user_id, _, _ in deltas)
+
+
+def rollup_day_criteria(start_date=None, end_date=None) -> list:
+    """WHERE clauses bounding ``TransactionDailyRollup.day`` to whole days, as ``transaction_date_criteria`` does."""
+    criteria = []
+    if start_date:
+        criteria.append(TransactionDailyRollup.day >= rollup_day(start_date))
+    if end_date:
+        criteria.append(TransactionDailyRollup.day <= rollup_day(end_date))
+    return criteria
+
+
+def rebuild_rollups(session: Session, user_id: Optional[str] = None, batch_size: int = 10000) -> int:
+    """
+    Recompute rollups from ``transactions``, for one user or everyone.
+
+    Transactions are grouped in SQL by user, day and the columns that decide
+    the category and income flag. The groups are read through a server-side
+    cursor, ``batch_size`` at a time, and added onto the rollups whenever that
+    many keys have built up. Peak memory is therefore bounded however long
+    the history. Returns the number of transactions rolled up. Does not commit.
+    """
+    tables = (TransactionDailyRollup.__table__, TransactionMonthlyRollup.__table__)
+    groups = (
+        Transaction.user_id,
+        func.date(Transaction.transaction_date, type_=Date),
+        Transaction.merchant_category,
+        Transaction.transaction_type,
+        Transaction.direction,
+        Transaction.amount < 0,
+    )
+    query = select(*groups, func.sum(Transaction.amount), func.count()).group_by(*groups)
+    if user_id is not None:
+        query = query.where(Transaction.user_id == user_id)
+    for table in tables:
+        purge = delete(table)
+        if user_id is not None:
+            purge = purge.where(table.c.user_id == user_id)
+        session.execute(purge)
+
+    deltas: Deltas = {}
+    transactions = 0
+    for owner, day, merchant_category, transaction_type, direction, negative, amount, count in \
+            session.execute(query.execution_options(yield_per=batch_size)):
+        income = is_income(enum_value(transaction_type), enum_value(direction), negative)
+        category = analytics_category(enum_value(merchant_category)).value
+        _add(deltas, (owner, day, category), abs(to_cents(amount)), count, income)
+        transactions += count
+        if len(deltas) >= batch_size:
+            # The upserts add onto what earlier batches wrote
+            apply_deltas(session, deltas)
+            _mark_changed(session, deltas)
+            deltas = {}
+    apply_deltas(session, deltas)
+    _mark_changed(session, deltas)
+    return transactions
+
+
+def _previous_values(instance: Transaction) -> Dict[str, Any]:
+    """Rollup fields of ``instance`` as they were before the current flush."""
+    state = inspect_instance(instance)
+    values = {}
+    for name in ROLLUP_FIELDS:
+        history = state.attrs[name].history
+        values[name] = history.deleted[0] if history.deleted else getattr(instance, name)
+    return values
+
+
+def _changed(instance: Transaction) -> bool:
+    state = inspect_instance(instance)
+    return any(state.attrs[name].history.has_changes() for name in ROLLUP_FIELDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _roll_up_flushed_transactions(session: Session, flush_context) -> None:
+    # new/dirty/deleted and attribute history still show the pre-flush state here
+    deltas: Deltas = {}
+    add_deltas(deltas, (obj for obj in session.new if isinstance(obj, Transaction)))
+    add_deltas(deltas, (_previous_values(obj) for obj in session.deleted if isinstance(obj, Transaction)), -1)
+    changed = [obj for obj in session.dirty if isinstance(obj, Transaction) and _changed(obj)]
+    if changed:
+        add_deltas(deltas, [_previous_values(obj) for obj in changed], -1)
+        add_deltas(deltas, changed)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+        _mark_changed(session, deltas)
@@ -0,0 +1,122 @@
+"""
+Unit-of-work transaction scope.
+
+A unit of work holds one session for a whole service operation. Repositories
+only add and flush; the outermost scope commits once when the operation
+succeeds and rolls back if it raises. Nested scopes on the same session join
+the outer one, so a service method that opens a scope can be called on its
+own or from inside a request-wide scope.
+
+    with unit_of_work(db):
+        account = account_repo.create_account(...)
+        transaction_repo.create_transaction(...)
+
+    async with async_unit_of_work(db):
+        ...
+
+As FastAPI dependencies, ``get_unit_of_work`` and ``get_async_unit_of_work``
+open a scope around the whole request.
+"""
+from typing import AsyncIterator, Iterator
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .config import get_db, get_async_db
+
+_SESSION_KEY = "unit_of_work"
+
+
+class UnitOfWork:
+    """Transaction scope around a sync ``Session``."""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._depth = 0
+
+    @property
+    def active(self) -> bool:
+        return self._depth > 0
+
+    def __enter__(self) -> "UnitOfWork":
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._depth -= 1
+        if self._depth == 0:
+            if exc_type is None:
+                try:
+                    self.session.commit()
+                except Exception:
+                    self.session.rollback()
+                    raise
+            else:
+                self.session.rollback()
+        return False
+
+    def flush(self, objects=None) -> None:
+        """Send pending changes now, e.g. to read generated ids mid-operation."""
+        self.session.flush(objects)
+
+
+class AsyncUnitOfWork:
+    """Transaction scope around an ``AsyncSession``."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._depth = 0
+
+    @property
+    def active(self) -> bool:
+        return self._depth > 0
+
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self._depth -= 1
+        if self._depth == 0:
+            if exc_type is None:
+                try:
+                    await self.session.commit()
+                except Exception:
+                    await self.session.rollback()
+                    raise
+            else:
+                await self.session.rollback()
+        return False
+
+    async def flush(self, objects=None) -> None:
+        """Send pending changes now, e.g. to read generated ids mid-operation."""
+        await self.session.flush(objects)
+
+
+def unit_of_work(session: Session) -> UnitOfWork:
+    """The unit of work bound to ``session``, created on first use."""
+    uow = session.info.get(_SESSION_KEY)
+    if uow is None:
+        uow = session.info[_SESSION_KEY] = UnitOfWork(session)
+    return uow
+
+
+def async_unit_of_work(session: AsyncSession) -> AsyncUnitOfWork:
+    """The async unit of work bound to ``session``, created on first use."""
+    uow = session.info.get(_SESSION_KEY)
+    if uow is None:
+        uow = session.info[_SESSION_KEY] = AsyncUnitOfWork(session)
+    return uow
+
+
+def get_unit_of_work(db: Session = Depends(get_db)) -> Iterator[UnitOfWork]:
+    """Dependency wrapping the request in one unit of work on a ``get_db`` session."""
+    with unit_of_work(db) as uow:
+        yield uow
+
+
+async def get_async_unit_of_work(db: AsyncSession = Depends(get_async_db)) -> AsyncIterator[AsyncUnitOfWork]:
+    """Dependency wrapping the request in one unit of work on a ``get_async_db`` session."""
+    async with async_unit_of_work(db) as uow:
+        yield uow
@@ -8,14 +8,19 @@ import uvicorn
 from datetime import datetime
 import os
 import json
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from .config.settings import get_settings
 from .config.logging import setup_logging, get_logger
 from .core.middleware import setup_middleware
 from .core.exception_handlers import register_exception_handlers
 from .utils.json_encoder import CustomJSONEncoder
-from .database.config import check_database_connection, create_tables, initialize_database
+from .repositories.persistence import get_journal
+from .database.config import (
+    engine, check_database_connection, create_tables, initialize_database, dispose_async_engine
+)
+from .database.partitions import maintain_transaction_partitions
 from .api.health import router as health_router
 from .api.v1.dashboard import router as dashboard_router
 from .api.v1.auth import router as auth_router
@@ -67,6 +72,7 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("🚀 Starting HoardRun Backend API...")
+    partition_task = None
 
     try:
         # Check database connection (non-blocking)
@@ -82,6 +88,14 @@ async def lifespan(app: FastAPI):
                 logger.info("✅ Database initialization successful!")
             else:
                 logger.warning("⚠️ Database initialization failed, but continuing startup...")
+
+            # Keep monthly transaction partitions ahead of the calendar while running
+            if engine.dialect.name == "postgresql":
+                partition_task = asyncio.create_task(maintain_transaction_partitions(
+                    engine,
+                    settings.transaction_partition_months_ahead,
+                    settings.transaction_partition_check_interval
+                ))
         else:
             logger.warning("⚠️ Database connection failed during startup, but continuing...")
             logger.info("💡 Database connection will be retried on first request")
@@ -96,6 +110,13 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("🛑 Shutting down HoardRun Backend API...")
+    if partition_task is not None:
+        partition_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await partition_task
+    await dispose_async_engine()
+    # Snapshot in-memory mock state so the next start replays no log
+    get_journal().close()
     logger.info("👋 Application shutdown completed!")
 
 
@@ -172,6 +172,27 @@ class CashFlowAnalysis(BaseModel):
     cash_flow_trend: TrendDirection
     previous_period_comparison: Optional[Dict[str, Any]] = None
 
+class PeriodSummary(BaseModel):
+    period: str  # 2024-03, 2024-Q1 or 2024
+    start_date: date
+    end_date: date  # last day of the period, or of the last month compared if sooner
+    is_partial: bool = False  # True if the period runs past the last month compared
+    total_income: Decimal
+    total_spending: Decimal
+    net_cash_flow: Decimal
+    transaction_count: int
+    category_spending: Dict[str, Decimal]
+    category_mix: Dict[str, float]  # share of spending per category, percent
+    income_change_percent: Optional[float] = None  # versus the previous period
+    spending_change_percent: Optional[float] = None
+
+class PeriodComparison(BaseModel):
+    months: int
+    month_over_month: List[PeriodSummary]
+    quarter_over_quarter: List[PeriodSummary]
+    year_over_year: List[PeriodSummary]
+    generated_at: datetime
+
 class FinancialHealthScore(BaseModel):
     overall_score: int = Field(..., ge=0, le=100)
     spending_score: int = Field(..., ge=0, le=100)
@@ -212,6 +212,7 @@ class TransactionListRequest(BaseModel):
     tags: Optional[List[str]] = Field(None, description="Filter by tags")
     limit: int = Field(default=50, ge=1, le=1000, description="Number of results to return")
     offset: int = Field(default=0, ge=0, description="Number of results to skip")
+    cursor: Optional[str] = Field(None, description="Opaque cursor from a previous page; takes precedence over offset")
     sort_by: str = Field(default="transaction_date", description="Sort field")
     sort_order: str = Field(default="desc", description="Sort order (asc, desc)")
     
@@ -275,6 +276,7 @@ class TransactionListResponse(BaseResponse):
     total_count: int = Field(..., description="Total number of matching transactions")
     summary: TransactionSummary = Field(..., description="Summary statistics")
     has_more: bool = Field(..., description="Whether more results are available")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
 
 
 class TransactionResponse(BaseResponse):
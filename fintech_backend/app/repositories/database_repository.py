@@ -1,16 +1,37 @@
 """
 Database repository implementations for data access.
+
+Repositories never commit. Mutations are added to the caller's session and
+``create_*`` methods flush so ids and server defaults are populated; the
+caller's unit of work (``app.database.unit_of_work``) commits once for the
+whole operation.
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Iterable, Iterator
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
-from datetime import datetime, date
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, desc, asc, select, update, insert, func, text
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from itertools import islice
+import enum
+import io
+import json
 
 from ..database.models import (
+    generate_uuid,
     User, Account, Transaction, Card, Investment, P2PTransaction, Transfer,
     AccountTypeEnum, AccountStatusEnum, TransactionTypeEnum, TransactionStatusEnum,
     CardTypeEnum, CardStatusEnum
 )
+from ..database.partitions import is_transactions_partitioned
+from ..database.rollups import record_transactions
+from ..config.logging import get_logger
+from ..core.exceptions import ValidationException
+from ..utils.pagination import decode_cursor, next_cursor_for
+
+logger = get_logger(__name__)
+
 class UserRepository:
     """Repository for User operations."""
     
@@ -27,8 +48,7 @@ class UserRepository:
             phone_number=phone_number
         )
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self.db.flush()
         return user
     
     def get_user_by_id(self, user_id: str) -> Optional[User]:
@@ -46,8 +66,6 @@ class UserRepository:
             for key, value in kwargs.items():
                 if hasattr(user, key):
                     setattr(user, key, value)
-            self.db.commit()
-            self.db.refresh(user)
         return user
     
     def delete_user(self, user_id: str) -> bool:
@@ -55,7 +73,6 @@ class UserRepository:
         user = self.get_user_by_id(user_id)
         if user:
             self.db.delete(user)
-            self.db.commit()
             return True
         return False
 
@@ -77,8 +94,7 @@ class AccountRepository:
             currency=currency
         )
         self.db.add(account)
-        self.db.commit()
-        self.db.refresh(account)
+        self.db.flush()
         return account
     
     def get_account_by_id(self, account_id: str) -> Optional[Account]:
@@ -100,8 +116,6 @@ class AccountRepository:
         if account:
             account.current_balance = current_balance
             account.available_balance = available_balance
-            self.db.commit()
-            self.db.refresh(account)
         return account
     
     def set_primary_account(self, user_id: str, account_id: str) -> bool:
@@ -115,9 +129,49 @@ class AccountRepository:
         account = self.get_account_by_id(account_id)
         if account and account.user_id == user_id:
             account.is_primary = True
-            self.db.commit()
             return True
         return False
+    
+    def lock_accounts_for_update(self, account_ids: List[str]) -> Dict[str, Account]:
+        """
+        Lock the given accounts with SELECT ... FOR UPDATE.
+
+        Rows are locked in ascending id order so concurrent callers locking
+        overlapping sets always acquire them in the same order. Does not commit;
+        the locks are held until the caller's transaction ends.
+        """
+        accounts = self.db.execute(
+            select(Account)
+            .where(Account.id.in_(sorted(set(account_ids))))
+            .order_by(Account.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).scalars().all()
+        return {account.id: account for account in accounts}
+    
+    def apply_balance_delta(self, account_id: str, delta: Decimal,
+                            enforce_minimum_balance: bool = False) -> bool:
+        """
+        Adjust current and available balance by ``delta`` in SQL.
+
+        With ``enforce_minimum_balance`` the update only applies if the
+        available balance stays at or above the account's minimum balance.
+        Returns False if no row was updated. Does not commit.
+        """
+        stmt = (
+            update(Account)
+            .where(Account.id == account_id)
+            .values(
+                current_balance=Account.current_balance + delta,
+                available_balance=Account.available_balance + delta
+            )
+        )
+        if enforce_minimum_balance:
+            stmt = stmt.where(
+                Account.available_balance + delta >= func.coalesce(Account.minimum_balance, 0)
+            )
+        result = self.db.execute(stmt.execution_options(synchronize_session=False))
+        return result.rowcount == 1
 
 
 class TransactionRepository:
@@ -142,45 +196,247 @@ class TransactionRepository:
             **kwargs
         )
         self.db.add(transaction)
-        self.db.commit()
-        self.db.refresh(transaction)
+        self.db.flush()
         return transaction
     
-    def get_transaction_by_id(self, transaction_id: str) -> Optional[Transaction]:
-        """Get transaction by ID."""
-        return self.db.query(Transaction).filter(Transaction.id == transaction_id).first()
+    def insert_transactions(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """
+        Insert several transaction rows in one batched INSERT.
+
+        Ids are assigned up front so no refresh is needed. ``transaction_date``
+        defaults to now. Analytics rollups are updated in the same
+        transaction. Does not commit.
+        """
+        if not rows:
+            return []
+        now = datetime.utcnow()
+        values = []
+        for row in rows:
+            row = dict(row)
+            row.setdefault("id", generate_uuid())
+            row.setdefault("transaction_date", now)
+            values.append(row)
+        self.db.execute(insert(Transaction), values)
+        record_transactions(self.db, values)
+        return [row["id"] for row in values]
+    
+    def bulk_create_transactions(self, rows: Iterable[Dict[str, Any]],
+                                 chunk_size: int = 5000,
+                                 skipped: Optional[List[str]] = None) -> List[str]:
+        """
+        Insert many transactions, streaming ``rows`` in chunks of ``chunk_size``.
+
+        A row is skipped if its ``reference_number`` already exists in the
+        table or appears earlier in the input. Each chunk's reference numbers
+        are checked against the table in one query before inserting, because
+        on the partitioned table the only unique key is
+        ``(reference_number, transaction_date)``. Skipped reference numbers
+        are appended to ``skipped`` when given, and logged.
+
+        PostgreSQL loads each chunk with ``COPY ... FROM STDIN`` into a
+        temporary staging table, then moves it across with
+        ``INSERT ... SELECT``. Other databases use a single executemany INSERT.
+        Both name the reference number unique key as the ``ON CONFLICT``
+        target. That catches a row inserted concurrently since the check, and
+        an ``id`` collision still raises ``IntegrityError``.
+
+        Ids are assigned up front, so nothing is refreshed. Analytics rollups
+        are updated for the inserted rows. Returns the ids of the rows actually
+        inserted, in input order. Does not commit.
+        """
+        if chunk_size < 1:
+            raise ValidationException("chunk_size must be positive", field="chunk_size", value=chunk_size)
+        skipped = [] if skipped is None else skipped
+        already_skipped = len(skipped)
+        conflict_target = ["reference_number"]
+        if is_transactions_partitioned(self.db.connection()):
+            conflict_target.append("transaction_date")
+        use_copy = self._supports_copy()
+        if use_copy:
+            self.db.execute(text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {_COPY_STAGING_TABLE} "
+                f"(LIKE {Transaction.__tablename__} INCLUDING DEFAULTS) ON COMMIT DROP"
+            ))
+
+        inserted_ids: List[str] = []
+        seen_references: set = set()
+        for chunk in _chunked(rows, chunk_size):
+            now = datetime.utcnow()
+            values = self._new_references([_bulk_transaction_values(row, now) for row in chunk],
+                                          seen_references, skipped)
+            if not values:
+                continue
+            if use_copy:
+                inserted = self._copy_chunk(values, conflict_target)
+            else:
+                inserted = self._executemany_chunk(values, conflict_target)
+            skipped.extend(row["reference_number"] for row in values if row["id"] not in inserted)
+            values = [row for row in values if row["id"] in inserted]
+            record_transactions(self.db, values)
+            inserted_ids.extend(row["id"] for row in values)
+        if len(skipped) > already_skipped:
+            sample = ", ".join(skipped[already_skipped:already_skipped + 5])
+            logger.warning(f"Bulk insert skipped {len(skipped) - already_skipped} transactions "
+                           f"with existing reference numbers (e.g. {sample})")
+        return inserted_ids
+    
+    def _new_references(self, values: List[Dict[str, Any]], seen: set,
+                        skipped: List[str]) -> List[Dict[str, Any]]:
+        """Drop rows whose reference number is already stored or was seen earlier in the load."""
+        references = {row["reference_number"] for row in values} - {None}
+        existing = set()
+        if references:
+            existing = set(self.db.scalars(
+                select(Transaction.reference_number).where(Transaction.reference_number.in_(references))
+            ))
+        kept = []
+        for row in values:
+            reference = row["reference_number"]
+            if reference is not None:
+                if reference in existing or reference in seen:
+                    skipped.append(reference)
+                    continue
+                seen.add(reference)
+            kept.append(row)
+        return kept
+    
+    def _supports_copy(self) -> bool:
+        # COPY is driven through psycopg2's cursor.copy_expert
+        dialect = self.db.get_bind().dialect
+        return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+    
+    def _copy_chunk(self, values: List[Dict[str, Any]], conflict_target: List[str]) -> set:
+        columns = ", ".join(column.name for column in _BULK_COLUMNS)
+        buffer = io.StringIO()
+        for row in values:
+            buffer.write("\t".join(_copy_text(row[column.name]) for column in _BULK_COLUMNS))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        self.db.execute(text(f"TRUNCATE {_COPY_STAGING_TABLE}"))
+        cursor = self.db.connection().connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {_COPY_STAGING_TABLE} ({columns}) FROM STDIN", buffer)
+        finally:
+            cursor.close()
+
+        result = self.db.execute(text(
+            f"INSERT INTO {Transaction.__tablename__} ({columns}) "
+            f"SELECT {columns} FROM {_COPY_STAGING_TABLE} "
+            f"ON CONFLICT ({', '.join(conflict_target)}) DO NOTHING RETURNING id"
+        ))
+        return set(result.scalars())
+    
+    def _executemany_chunk(self, values: List[Dict[str, Any]], conflict_target: List[str]) -> set:
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            statement = postgresql.insert(Transaction).on_conflict_do_nothing(index_elements=conflict_target)
+        elif dialect == "sqlite":
+            statement = sqlite.insert(Transaction).on_conflict_do_nothing(index_elements=conflict_target)
+        else:
+            # No portable conflict clause; duplicates raise IntegrityError
+            self.db.execute(insert(Transaction), values)
+            return {row["id"] for row in values}
+        result = self.db.execute(statement.returning(Transaction.id), values)
+        return set(result.scalars())
+    
+    def get_transaction_by_id(self, transaction_id: str,
+                              transaction_date: Optional[datetime] = None) -> Optional[Transaction]:
+        """
+        Get transaction by ID.
+
+        Passing the known ``transaction_date`` lets a partitioned table probe
+        a single partition instead of every month's primary key index.
+        """
+        query = self.db.query(Transaction).filter(Transaction.id == transaction_id)
+        if transaction_date is not None:
+            query = query.filter(Transaction.transaction_date == transaction_date)
+        return query.first()
     
     def get_transactions_by_account(self, account_id: str, limit: int = 50, 
-                                   offset: int = 0) -> List[Transaction]:
-        """Get transactions for an account."""
-        return (self.db.query(Transaction)
-                .filter(Transaction.account_id == account_id)
-                .order_by(desc(Transaction.transaction_date))
-                .limit(limit)
-                .offset(offset)
-                .all())
+                                   offset: int = 0, cursor: Optional[str] = None,
+                                   since: Optional[datetime] = None) -> List[Transaction]:
+        """
+        Get transactions for an account (newest first). ``cursor`` takes precedence over ``offset``.
+
+        ``since`` bounds how far back to look, limiting which partitions are read.
+        """
+        query = self._since(self.db.query(Transaction).filter(Transaction.account_id == account_id), since)
+        return self._paginate(query, limit, offset, cursor).all()
     
     def get_transactions_by_user(self, user_id: str, limit: int = 50, 
-                                offset: int = 0) -> List[Transaction]:
-        """Get transactions for a user."""
-        return (self.db.query(Transaction)
-                .filter(Transaction.user_id == user_id)
-                .order_by(desc(Transaction.transaction_date))
-                .limit(limit)
-                .offset(offset)
-                .all())
+                                offset: int = 0, cursor: Optional[str] = None,
+                                since: Optional[datetime] = None) -> List[Transaction]:
+        """
+        Get transactions for a user (newest first). ``cursor`` takes precedence over ``offset``.
+
+        ``since`` bounds how far back to look, limiting which partitions are read.
+        """
+        query = self._since(self.db.query(Transaction).filter(Transaction.user_id == user_id), since)
+        return self._paginate(query, limit, offset, cursor).all()
+    
+    def get_transaction_page_by_account(self, account_id: str, limit: int = 50,
+                                        cursor: Optional[str] = None,
+                                        since: Optional[datetime] = None) -> Tuple[List[Transaction], Optional[str]]:
+        """Get one keyset page of an account's transactions and the cursor for the next page."""
+        query = self._since(self.db.query(Transaction).filter(Transaction.account_id == account_id), since)
+        return self.keyset_page(query, limit, cursor)
+    
+    def get_transaction_page_by_user(self, user_id: str, limit: int = 50,
+                                     cursor: Optional[str] = None,
+                                     since: Optional[datetime] = None) -> Tuple[List[Transaction], Optional[str]]:
+        """Get one keyset page of a user's transactions and the cursor for the next page."""
+        query = self._since(self.db.query(Transaction).filter(Transaction.user_id == user_id), since)
+        return self.keyset_page(query, limit, cursor)
+    
+    @staticmethod
+    def _since(query, since: Optional[datetime]):
+        return query.filter(Transaction.transaction_date >= since) if since is not None else query
+    
+    @staticmethod
+    def apply_keyset(query, cursor: Optional[str] = None):
+        """
+        Order a Transaction query by ``(transaction_date, id)`` descending and,
+        given a cursor, restrict it to rows strictly after the cursor's key.
+
+        The redundant ``transaction_date <= :date`` bound keeps the predicate
+        sargable for the ``(user_id|account_id, transaction_date)`` indexes and
+        lets a partitioned table skip months newer than the cursor. Ordering by
+        the partition key with a LIMIT means older months are only read once
+        the newer ones run out of rows.
+        """
+        if cursor:
+            cursor_date, cursor_id = decode_cursor(cursor)
+            query = query.filter(
+                Transaction.transaction_date <= cursor_date,
+                or_(
+                    Transaction.transaction_date < cursor_date,
+                    and_(Transaction.transaction_date == cursor_date, Transaction.id < cursor_id)
+                )
+            )
+        return query.order_by(desc(Transaction.transaction_date), desc(Transaction.id))
+    
+    def keyset_page(self, query, limit: int,
+                    cursor: Optional[str] = None) -> Tuple[List[Transaction], Optional[str]]:
+        """Fetch ``limit + 1`` rows past ``cursor`` and split off the next cursor."""
+        rows = self.apply_keyset(query, cursor).limit(limit + 1).all()
+        return next_cursor_for(rows, limit)
+    
+    def _paginate(self, query, limit: int, offset: int, cursor: Optional[str]):
+        query = self.apply_keyset(query, cursor).limit(limit)
+        return query if cursor else query.offset(offset)
     
     def get_transactions_by_date_range(self, account_id: str, start_date: date, 
                                       end_date: date) -> List[Transaction]:
-        """Get transactions within a date range."""
+        """
+        Get transactions within a date range.
+
+        Plain dates cover whole days, as in ``TransactionQueryBuilder.in_date_range``;
+        the datetime bounds let a partitioned table read only the months in range.
+        """
         return (self.db.query(Transaction)
-                .filter(
-                    and_(
-                        Transaction.account_id == account_id,
-                        Transaction.transaction_date >= start_date,
-                        Transaction.transaction_date <= end_date
-                    )
-                )
+                .filter(Transaction.account_id == account_id,
+                        *transaction_date_criteria(start_date, end_date))
                 .order_by(desc(Transaction.transaction_date))
                 .all())
     
@@ -192,11 +448,205 @@ class TransactionRepository:
             transaction.status = status
             if status == TransactionStatusEnum.COMPLETED:
                 transaction.posted_date = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(transaction)
         return transaction
 
 
+# Every column the bulk loader writes; created_at/updated_at use server defaults
+_BULK_COLUMNS = [column for column in Transaction.__table__.columns if column.server_default is None]
+_BULK_COLUMN_NAMES = {column.name for column in _BULK_COLUMNS}
+_COPY_STAGING_TABLE = "transactions_import_staging"
+
+
+def _chunked(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _bulk_transaction_values(row: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """Complete one input row to the full, uniform column set the bulk loader writes."""
+    unknown = set(row) - _BULK_COLUMN_NAMES
+    if unknown:
+        field = sorted(unknown)[0]
+        raise ValidationException(f"Unknown transaction field: {field}", field=field)
+    values = {}
+    for column in _BULK_COLUMNS:
+        if column.name in row:
+            values[column.name] = row[column.name]
+        elif column.name == "id":
+            values["id"] = generate_uuid()
+        elif column.name == "transaction_date":
+            values["transaction_date"] = now
+        elif column.default is not None and column.default.is_scalar:
+            values[column.name] = column.default.arg
+        else:
+            values[column.name] = None
+    return values
+
+
+def _copy_text(value: Any) -> str:
+    """Render a value in PostgreSQL COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, enum.Enum):
+        # SQLEnum columns store member names
+        value = value.name
+    elif isinstance(value, bool):
+        value = "t" if value else "f"
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return (str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r"))
+
+
+class TransactionQueryBuilder:
+    """
+    Composable builder that turns transaction filters into SQL predicates.
+
+    Each ``with_*``/``for_*`` call adds a WHERE clause and returns the builder,
+    so callers can chain only the filters they have. User, account, status,
+    type and date predicates line up with the ``idx_transaction_*`` indexes.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self._criteria = []
+        self._columns = None
+    
+    def for_user(self, user_id: Optional[str]) -> "TransactionQueryBuilder":
+        if user_id:
+            self._criteria.append(Transaction.user_id == user_id)
+        return self
+    
+    def for_account(self, account_id: Optional[str]) -> "TransactionQueryBuilder":
+        if account_id:
+            self._criteria.append(Transaction.account_id == account_id)
+        return self
+    
+    def with_type(self, transaction_type) -> "TransactionQueryBuilder":
+        if transaction_type:
+            self._criteria.append(
+                Transaction.transaction_type == self._to_enum(TransactionTypeEnum, transaction_type, "transaction_type")
+            )
+        return self
+    
+    def with_status(self, status) -> "TransactionQueryBuilder":
+        if status:
+            self._criteria.append(
+                Transaction.status == self._to_enum(TransactionStatusEnum, status, "status")
+            )
+        return self
+    
+    def in_date_range(self, start_date: Optional[date] = None,
+                      end_date: Optional[date] = None) -> "TransactionQueryBuilder":
+        """
+        Restrict to transaction dates within [start_date, end_date].
+
+        Plain dates cover whole days; datetimes are used as exact bounds.
+        """
+        self._criteria.extend(transaction_date_criteria(start_date, end_date))
+        return self
+    
+    def with_amount_range(self, min_amount=None, max_amount=None) -> "TransactionQueryBuilder":
+        if min_amount is not None:
+            self._criteria.append(Transaction.amount >= Decimal(str(min_amount)))
+        if max_amount is not None:
+            self._criteria.append(Transaction.amount <= Decimal(str(max_amount)))
+        return self
+    
+    def apply_filters(self, filters) -> "TransactionQueryBuilder":
+        """Apply every field of a ``TransactionFilters`` model."""
+        return (self
+                .for_account(filters.account_id)
+                .with_type(filters.transaction_type)
+                .with_status(filters.status)
+                .in_date_range(filters.start_date, filters.end_date)
+                .with_amount_range(filters.min_amount, filters.max_amount))
+    
+    def select_columns(self, *columns) -> "TransactionQueryBuilder":
+        """Project only these columns instead of loading full Transaction entities."""
+        self._columns = columns
+        return self
+    
+    def query(self):
+        """Build the (unordered) query."""
+        query = self.db.query(*self._columns) if self._columns else self.db.query(Transaction)
+        return query.filter(*self._criteria)
+    
+    def fetch_page(self, limit: int, offset: int = 0) -> Tuple[list, int]:
+        """
+        Fetch one newest-first page together with the exact matching total.
+
+        The total comes from ``COUNT(*) OVER ()`` on the same scan; a separate
+        COUNT is only issued when the offset is past the last row.
+        """
+        total_column = func.count().over().label("_total_count")
+        rows = (TransactionRepository.apply_keyset(self.query().add_columns(total_column))
+                .limit(limit)
+                .offset(offset)
+                .all())
+        if rows:
+            return rows, rows[0]._total_count
+        total = self.query().order_by(None).count() if offset else 0
+        return [], total
+    
+    def summarize(self) -> list:
+        """
+        Aggregate the matching transactions in one ``GROUP BY status, transaction_type``.
+
+        Returns rows of ``(status, transaction_type, count, total_amount)``.
+        """
+        return (self.select_columns(
+                    Transaction.status,
+                    Transaction.transaction_type,
+                    func.count().label("count"),
+                    func.sum(Transaction.amount).label("total_amount"))
+                .query()
+                .group_by(Transaction.status, Transaction.transaction_type)
+                .all())
+    
+    @staticmethod
+    def _to_enum(enum_cls, value, field: str):
+        if isinstance(value, enum_cls):
+            return value
+        try:
+            return enum_cls(getattr(value, "value", value))
+        except ValueError:
+            raise ValidationException(f"Invalid {field}: {value}", field=field, value=value)
+
+
+def _day_start(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, datetime.min.time())
+
+
+def transaction_date_criteria(start_date=None, end_date=None) -> list:
+    """
+    WHERE clauses bounding ``Transaction.transaction_date``.
+
+    Plain dates cover whole days; datetimes are used as exact bounds. Bounds
+    are always datetimes so PostgreSQL can prune monthly partitions at plan time.
+    """
+    criteria = []
+    if start_date:
+        criteria.append(Transaction.transaction_date >= _day_start(start_date))
+    if end_date:
+        if isinstance(end_date, datetime):
+            criteria.append(Transaction.transaction_date <= end_date)
+        else:
+            criteria.append(Transaction.transaction_date < _day_start(end_date) + timedelta(days=1))
+    return criteria
+
+
 class CardRepository:
     """Repository for Card operations."""
     
@@ -217,8 +667,7 @@ class CardRepository:
             expiry_year=expiry_year
         )
         self.db.add(card)
-        self.db.commit()
-        self.db.refresh(card)
+        self.db.flush()
         return card
     
     def get_card_by_id(self, card_id: str) -> Optional[Card]:
@@ -238,8 +687,6 @@ class CardRepository:
         card = self.get_card_by_id(card_id)
         if card:
             card.status = status
-            self.db.commit()
-            self.db.refresh(card)
         return card
     
     def update_card_limits(self, card_id: str, daily_limit: Optional[float] = None,
@@ -251,8 +698,6 @@ class CardRepository:
                 card.daily_limit = daily_limit
             if monthly_limit is not None:
                 card.monthly_limit = monthly_limit
-            self.db.commit()
-            self.db.refresh(card)
         return card
 
 
@@ -277,8 +722,7 @@ class InvestmentRepository:
             purchase_date=datetime.utcnow()
         )
         self.db.add(investment)
-        self.db.commit()
-        self.db.refresh(investment)
+        self.db.flush()
         return investment
     
     def get_investment_by_id(self, investment_id: str) -> Optional[Investment]:
@@ -298,8 +742,6 @@ class InvestmentRepository:
         investment = self.get_investment_by_id(investment_id)
         if investment:
             investment.current_price = current_price
-            self.db.commit()
-            self.db.refresh(investment)
         return investment
 
 
@@ -323,8 +765,7 @@ class TransferRepository:
             status="pending"
         )
         self.db.add(transfer)
-        self.db.commit()
-        self.db.refresh(transfer)
+        self.db.flush()
         return transfer
     
     def get_transfer_by_id(self, transfer_id: str) -> Optional[Transfer]:
@@ -347,6 +788,248 @@ class TransferRepository:
                 transfer.completed_date = datetime.utcnow()
             elif status == "processing":
                 transfer.processed_date = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(transfer)
         return transfer
+
+
+# Async repositories
+#
+# Mirror the sync repositories above for use with an AsyncSession from
+# ``get_async_db``. Method names and return values match so services can be
+# migrated one call site at a time.
+
+class AsyncUserRepository:
+    """Async repository for User operations."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create_user(self, email: str, first_name: str, last_name: str,
+                          phone_number: Optional[str] = None) -> User:
+        """Create a new user."""
+        user = User(
+            email=email,
+            first_name=first_name,
+            last_name=last_name,
+            phone_number=phone_number
+        )
+        self.db.add(user)
+        await self.db.flush()
+        return user
+    
+    async def get_user_by_id(self, user_id: str) -> Optional[User]:
+        """Get user by ID."""
+        return await self.db.get(User, user_id)
+    
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        """Get user by email."""
+        result = await self.db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+    
+    async def update_user(self, user_id: str, **kwargs) -> Optional[User]:
+        """Update user information."""
+        user = await self.get_user_by_id(user_id)
+        if user:
+            for key, value in kwargs.items():
+                if hasattr(user, key):
+                    setattr(user, key, value)
+        return user
+    
+    async def delete_user(self, user_id: str) -> bool:
+        """Delete user."""
+        user = await self.get_user_by_id(user_id)
+        if user:
+            await self.db.delete(user)
+            return True
+        return False
+
+
+class AsyncAccountRepository:
+    """Async repository for Account operations."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create_account(self, user_id: str, account_name: str, account_type: AccountTypeEnum,
+                             account_number: str, currency: str = "USD") -> Account:
+        """Create a new account."""
+        account = Account(
+            user_id=user_id,
+            account_name=account_name,
+            account_type=account_type,
+            account_number=account_number,
+            currency=currency
+        )
+        self.db.add(account)
+        await self.db.flush()
+        return account
+    
+    async def get_account_by_id(self, account_id: str) -> Optional[Account]:
+        """Get account by ID."""
+        return await self.db.get(Account, account_id)
+    
+    async def get_accounts_by_user_id(self, user_id: str) -> List[Account]:
+        """Get all accounts for a user."""
+        result = await self.db.execute(select(Account).where(Account.user_id == user_id))
+        return list(result.scalars().all())
+    
+    async def get_account_by_number(self, account_number: str) -> Optional[Account]:
+        """Get account by account number."""
+        result = await self.db.execute(
+            select(Account).where(Account.account_number == account_number)
+        )
+        return result.scalars().first()
+    
+    async def update_balance(self, account_id: str, current_balance: float,
+                             available_balance: float) -> Optional[Account]:
+        """Update account balance."""
+        account = await self.get_account_by_id(account_id)
+        if account:
+            account.current_balance = current_balance
+            account.available_balance = available_balance
+        return account
+    
+    async def set_primary_account(self, user_id: str, account_id: str) -> bool:
+        """Set an account as primary for a user."""
+        await self.db.execute(
+            update(Account).where(Account.user_id == user_id).values(is_primary=False)
+        )
+        
+        account = await self.get_account_by_id(account_id)
+        if account and account.user_id == user_id:
+            account.is_primary = True
+            return True
+        return False
+
+
+class AsyncTransactionRepository:
+    """Async repository for Transaction operations."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create_transaction(self, user_id: str, account_id: str,
+                                 transaction_type: TransactionTypeEnum,
+                                 amount: float, currency: str, description: str,
+                                 **kwargs) -> Transaction:
+        """Create a new transaction."""
+        transaction = Transaction(
+            user_id=user_id,
+            account_id=account_id,
+            transaction_type=transaction_type,
+            amount=amount,
+            currency=currency,
+            description=description,
+            transaction_date=datetime.utcnow(),
+            **kwargs
+        )
+        self.db.add(transaction)
+        await self.db.flush()
+        return transaction
+    
+    async def get_transaction_by_id(self, transaction_id: str) -> Optional[Transaction]:
+        """Get transaction by ID."""
+        return await self.db.get(Transaction, transaction_id)
+    
+    async def get_transactions_by_account(self, account_id: str, limit: int = 50,
+                                          offset: int = 0, cursor: Optional[str] = None) -> List[Transaction]:
+        """Get transactions for an account (newest first). ``cursor`` takes precedence over ``offset``."""
+        stmt = TransactionRepository.apply_keyset(
+            select(Transaction).where(Transaction.account_id == account_id), cursor
+        ).limit(limit)
+        result = await self.db.execute(stmt if cursor else stmt.offset(offset))
+        return list(result.scalars().all())
+    
+    async def get_transactions_by_user(self, user_id: str, limit: int = 50,
+                                       offset: int = 0, cursor: Optional[str] = None) -> List[Transaction]:
+        """Get transactions for a user (newest first). ``cursor`` takes precedence over ``offset``."""
+        stmt = TransactionRepository.apply_keyset(
+            select(Transaction).where(Transaction.user_id == user_id), cursor
+        ).limit(limit)
+        result = await self.db.execute(stmt if cursor else stmt.offset(offset))
+        return list(result.scalars().all())
+    
+    async def get_transaction_page_by_user(self, user_id: str, limit: int = 50,
+                                           cursor: Optional[str] = None) -> Tuple[List[Transaction], Optional[str]]:
+        """Get one keyset page of a user's transactions and the cursor for the next page."""
+        stmt = TransactionRepository.apply_keyset(
+            select(Transaction).where(Transaction.user_id == user_id), cursor
+        ).limit(limit + 1)
+        result = await self.db.execute(stmt)
+        return next_cursor_for(list(result.scalars().all()), limit)
+    
+    async def get_transactions_by_date_range(self, account_id: str, start_date: date,
+                                             end_date: date) -> List[Transaction]:
+        """Get transactions within a date range (whole days for plain dates)."""
+        result = await self.db.execute(
+            select(Transaction)
+            .where(Transaction.account_id == account_id,
+                   *transaction_date_criteria(start_date, end_date))
+            .order_by(desc(Transaction.transaction_date))
+        )
+        return list(result.scalars().all())
+    
+    async def update_transaction_status(self, transaction_id: str,
+                                        status: TransactionStatusEnum) -> Optional[Transaction]:
+        """Update transaction status."""
+        transaction = await self.get_transaction_by_id(transaction_id)
+        if transaction:
+            transaction.status = status
+            if status == TransactionStatusEnum.COMPLETED:
+                transaction.posted_date = datetime.utcnow()
+        return transaction
+
+
+class AsyncCardRepository:
+    """Async repository for Card operations."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create_card(self, user_id: str, account_id: str, card_type: CardTypeEnum,
+                          cardholder_name: str, card_number_masked: str,
+                          expiry_month: int, expiry_year: int) -> Card:
+        """Create a new card."""
+        card = Card(
+            user_id=user_id,
+            account_id=account_id,
+            card_type=card_type,
+            cardholder_name=cardholder_name,
+            card_number_masked=card_number_masked,
+            expiry_month=expiry_month,
+            expiry_year=expiry_year
+        )
+        self.db.add(card)
+        await self.db.flush()
+        return card
+    
+    async def get_card_by_id(self, card_id: str) -> Optional[Card]:
+        """Get card by ID."""
+        return await self.db.get(Card, card_id)
+    
+    async def get_cards_by_user_id(self, user_id: str) -> List[Card]:
+        """Get all cards for a user."""
+        result = await self.db.execute(select(Card).where(Card.user_id == user_id))
+        return list(result.scalars().all())
+    
+    async def get_cards_by_account_id(self, account_id: str) -> List[Card]:
+        """Get all cards for an account."""
+        result = await self.db.execute(select(Card).where(Card.account_id == account_id))
+        return list(result.scalars().all())
+    
+    async def update_card_status(self, card_id: str, status: CardStatusEnum) -> Optional[Card]:
+        """Update card status."""
+        card = await self.get_card_by_id(card_id)
+        if card:
+            card.status = status
+        return card
+    
+    async def update_card_limits(self, card_id: str, daily_limit: Optional[float] = None,
+                                 monthly_limit: Optional[float] = None) -> Optional[Card]:
+        """Update card limits."""
+        card = await self.get_card_by_id(card_id)
+        if card:
+            if daily_limit is not None:
+                card.daily_limit = daily_limit
+            if monthly_limit is not None:
+                card.monthly_limit = monthly_limit
+        return card
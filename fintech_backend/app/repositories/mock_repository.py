@@ -1,22 +1,349 @@
 """
 Mock repository implementation with in-memory storage and realistic financial data.
 """
+import asyncio
+import bisect
 import random
+import re
 import uuid
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, UTC
 from decimal import Decimal
-from typing import Dict, List, Optional, Any
+from itertools import islice
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Any, Sequence, Tuple
 from enum import Enum
 
 from .base import BaseRepository, UserFilterableRepository, TransactionRepository
+from .columnar import ColumnarTransactionStore
+from .persistence import JournaledDict, StateJournal, get_journal
+from .seeding import seeded_random
+from ..config.settings import settings
+from ..utils.search import TextSearchIndex
+from ..utils.transaction_columns import TransactionColumns
+
+
+_MISSING = object()
+
+# Evaluation order of compiled checks: cheap, usually selective tests first
+_EQUALITY, _MEMBERSHIP, _RANGE, _PRESENCE, _REGEX = range(5)
+
+
+def _compile_condition(key: str, value: Any) -> List[Tuple[int, Callable[[Dict[str, Any]], bool]]]:
+    """Checks for one criteria entry, each tagged with its evaluation rank."""
+    if not isinstance(value, dict):
+        def equals(record, key=key, value=value):
+            found = record.get(key, _MISSING)
+            return found is not _MISSING and found == value
+        return [(_EQUALITY, equals)]
+    
+    checks = []
+    if "$in" in value:
+        options = value["$in"]
+        def member(record, key=key, options=options):
+            found = record.get(key, _MISSING)
+            return found is not _MISSING and found in options
+        checks.append((_MEMBERSHIP, member))
+    if "$gte" in value:
+        def gte(record, key=key, bound=value["$gte"]):
+            found = record.get(key, _MISSING)
+            return found is not _MISSING and not found < bound
+        checks.append((_RANGE, gte))
+    if "$lte" in value:
+        def lte(record, key=key, bound=value["$lte"]):
+            found = record.get(key, _MISSING)
+            return found is not _MISSING and not found > bound
+        checks.append((_RANGE, lte))
+    if "$gt" in value:
+        def gt(record, key=key, bound=value["$gt"]):
+            found = record.get(key, _MISSING)
+            return found is not _MISSING and not found <= bound
+        checks.append((_RANGE, gt))
+    if "$lt" in value:
+        def lt(record, key=key, bound=value["$lt"]):
+            found = record.get(key, _MISSING)
+            return found is not _MISSING and not found >= bound
+        checks.append((_RANGE, lt))
+    if "$regex" in value:
+        def regex(record, key=key, search=re.compile(value["$regex"], re.IGNORECASE).search):
+            found = record.get(key, _MISSING)
+            return found is not _MISSING and search(str(found)) is not None
+        checks.append((_REGEX, regex))
+    if not checks:
+        # Unknown operators only require the field to be present
+        checks.append((_PRESENCE, lambda record, key=key: key in record))
+    return checks
+
+
+def compile_criteria(criteria: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Compile query criteria into a single record predicate.
+
+    Supports plain equality and the ``$gte``, ``$lte``, ``$gt``, ``$lt``,
+    ``$in`` and ``$regex`` (case-insensitive) operators; a record missing a
+    criteria field never matches. Regexes are compiled once and checks run
+    equality first, regexes last.
+    """
+    checks = []
+    for key, value in criteria.items():
+        checks.extend(_compile_condition(key, value))
+    checks.sort(key=lambda check: check[0])
+    predicates = tuple(check for _, check in checks)
+    
+    if not predicates:
+        return lambda record: True
+    if len(predicates) == 1:
+        return predicates[0]
+    
+    def predicate(record: Dict[str, Any]) -> bool:
+        for check in predicates:
+            if not check(record):
+                return False
+        return True
+    
+    return predicate
+
+
+class _Index(ABC):
+    """Secondary index over one record field, tracking ids with their insertion sequence."""
+    
+    def __init__(self, field: str):
+        self.field = field
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every indexed record."""
+        pass
+    
+    @abstractmethod
+    def add(self, record: Dict[str, Any], seq: int) -> bool:
+        """Index ``record``; return False if its value cannot be indexed."""
+        pass
+    
+    @abstractmethod
+    def remove(self, record: Dict[str, Any], seq: int) -> None:
+        """Unindex ``record``, added earlier with ``seq``."""
+        pass
+    
+    @abstractmethod
+    def plan(self, condition: Any) -> Optional[Tuple[int, Callable[[], List[str]]]]:
+        """Estimated row count and candidate fetcher for ``condition``, or None if unusable."""
+        pass
+
+
+class HashIndex(_Index):
+    """Equality / ``$in`` index: field value -> {record id: seq}."""
+    
+    def __init__(self, field: str):
+        super().__init__(field)
+        self.clear()
+    
+    def clear(self) -> None:
+        self._buckets: Dict[Any, Dict[str, int]] = {}
+    
+    def add(self, record: Dict[str, Any], seq: int) -> bool:
+        if self.field not in record:
+            return True
+        try:
+            self._buckets.setdefault(record[self.field], {})[record["id"]] = seq
+        except TypeError:
+            return False
+        return True
+    
+    def remove(self, record: Dict[str, Any], seq: int) -> None:
+        if self.field not in record:
+            return
+        bucket = self._buckets.get(record[self.field])
+        if bucket is not None:
+            bucket.pop(record["id"], None)
+            if not bucket:
+                del self._buckets[record[self.field]]
+    
+    def plan(self, condition: Any) -> Optional[Tuple[int, Callable[[], List[str]]]]:
+        if isinstance(condition, dict):
+            if set(condition) != {"$in"}:
+                return None
+            values = list(condition["$in"])
+        else:
+            values = [condition]
+        try:
+            buckets = [self._buckets.get(value, {}) for value in values]
+        except TypeError:
+            return None
+        estimate = sum(len(bucket) for bucket in buckets)
+        
+        def fetch() -> List[str]:
+            if len(buckets) == 1:
+                ids = buckets[0]
+                # Updates re-add records at the end of a bucket; restore insertion order
+                if any(a > b for a, b in zip(ids.values(), islice(ids.values(), 1, None))):
+                    return sorted(ids, key=ids.__getitem__)
+                return list(ids)
+            merged = {}
+            for bucket in buckets:
+                merged.update(bucket)
+            return sorted(merged, key=merged.__getitem__)
+        
+        return estimate, fetch
+
+
+class SortedIndex(_Index):
+    """
+    Range index: sorted lists of ``(value, seq, id)`` for ``$gte``/``$gt``/``$lte``/``$lt``.
+
+    With ``partition_by`` the index keeps one sorted list per value of that
+    field (e.g. one date-ordered list per ``user_id``); such indexes are read
+    directly through ``partition`` and ``bounds`` rather than by the planner.
+    """
+    
+    _RANGE_OPS = {"$gte", "$gt", "$lte", "$lt"}
+    
+    def __init__(self, field: str, partition_by: Optional[str] = None):
+        super().__init__(field)
+        self.partition_by = partition_by
+        self.clear()
+    
+    def clear(self) -> None:
+        self._partitions: Dict[Any, List[Tuple[Any, int, str]]] = {}
+    
+    def partition(self, key: Any = None) -> List[Tuple[Any, int, str]]:
+        """Sorted entries of one partition (the whole index when unpartitioned)."""
+        return self._partitions.get(key, [])
+    
+    def _key(self, record: Dict[str, Any]) -> Any:
+        return record.get(self.partition_by) if self.partition_by else None
+    
+    def add(self, record: Dict[str, Any], seq: int) -> bool:
+        value = record.get(self.field)
+        if value is None or (self.partition_by and self.partition_by not in record):
+            return True
+        try:
+            entries = self._partitions.setdefault(self._key(record), [])
+            bisect.insort(entries, (value, seq, record["id"]))
+        except TypeError:
+            return False
+        return True
+    
+    def remove(self, record: Dict[str, Any], seq: int) -> None:
+        value = record.get(self.field)
+        if value is None:
+            return
+        entry = (value, seq, record["id"])
+        try:
+            entries = self._partitions.get(self._key(record))
+            if not entries:
+                return
+            position = bisect.bisect_left(entries, entry)
+        except TypeError:
+            return
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+            if not entries:
+                del self._partitions[self._key(record)]
+    
+    def plan(self, condition: Any) -> Optional[Tuple[int, Callable[[], List[str]]]]:
+        if self.partition_by or not isinstance(condition, dict) or not condition \
+                or not set(condition) <= self._RANGE_OPS:
+            return None
+        entries = self.partition()
+        try:
+            lo, hi = self.bounds(entries, condition)
+        except TypeError:
+            return None
+        
+        def fetch() -> List[str]:
+            matched = entries[lo:hi]
+            matched.sort(key=lambda entry: entry[1])
+            return [entry[2] for entry in matched]
+        
+        return hi - lo, fetch
+    
+    @staticmethod
+    def bounds(entries: List[Tuple[Any, int, str]], condition: Dict[str, Any]) -> Tuple[int, int]:
+        """Slice ``[lo, hi)`` of sorted entries satisfying a range condition."""
+        lo, hi = 0, len(entries)
+        # (value,) sorts before every (value, seq, id); (value, inf) after
+        if "$gte" in condition:
+            lo = max(lo, bisect.bisect_left(entries, (condition["$gte"],)))
+        if "$gt" in condition:
+            lo = max(lo, bisect.bisect_right(entries, (condition["$gt"], float("inf"))))
+        if "$lte" in condition:
+            hi = min(hi, bisect.bisect_right(entries, (condition["$lte"], float("inf"))))
+        if "$lt" in condition:
+            hi = min(hi, bisect.bisect_left(entries, (condition["$lt"],)))
+        return lo, max(lo, hi)
+
+
+class TextIndex(_Index):
+    """
+    Text search index over several fields, one ``TextSearchIndex`` per
+    ``partition_by`` value (e.g. per user). Ties rank newest ``sort_field``
+    first. Read directly through ``partition``; never used by the planner.
+    """
+    
+    def __init__(self, fields: Sequence[str], partition_by: str, sort_field: str):
+        super().__init__(sort_field)
+        self.fields = tuple(fields)
+        self.partition_by = partition_by
+        self.clear()
+    
+    def clear(self) -> None:
+        self._partitions: Dict[Any, TextSearchIndex] = {}
+    
+    def partition(self, key: Any) -> TextSearchIndex:
+        index = self._partitions.get(key)
+        return index if index is not None else TextSearchIndex()
+    
+    def add(self, record: Dict[str, Any], seq: int) -> bool:
+        if self.partition_by not in record:
+            return True
+        try:
+            index = self._partitions.setdefault(record[self.partition_by], TextSearchIndex())
+        except TypeError:
+            return False
+        sort_value = record.get(self.field)
+        timestamp = sort_value.timestamp() if isinstance(sort_value, datetime) else float("-inf")
+        index.add(record["id"], [record.get(field) for field in self.fields], (timestamp, seq))
+        return True
+    
+    def remove(self, record: Dict[str, Any], seq: int) -> None:
+        try:
+            index = self._partitions.get(record.get(self.partition_by))
+        except TypeError:
+            return
+        if index is not None:
+            index.remove(record["id"])
+            if not len(index):
+                del self._partitions[record.get(self.partition_by)]
+    
+    def plan(self, condition: Any) -> None:
+        return None
 
 
 class MockRepository(BaseRepository[Dict]):
-    """Base mock repository with in-memory storage."""
+    """
+    Base mock repository with in-memory storage.
+
+    Secondary indexes can be declared per instance: hash indexes for equality
+    and ``$in`` lookups (e.g. ``user_id``, ``status``, ``is_read``) and sorted
+    indexes for range lookups on ordered fields such as dates. ``create``,
+    ``update`` and ``delete`` maintain them. Records changed in place must go
+    back through ``update`` (or ``reindex``) to stay findable.
+    """
     
-    def __init__(self):
+    # Mapping type of ``data`` once attached to a journal
+    _journaled_store = JournaledDict
+    
+    def __init__(self, hash_indexes: Iterable[str] = (), sorted_indexes: Iterable[str] = ()):
         self.data: Dict[str, Dict[str, Any]] = {}
         self.next_id = 1
+        # Insertion sequence per record id; query results keep this order
+        self._seq: Dict[str, int] = {}
+        self._hash_indexes: Dict[str, HashIndex] = {field: HashIndex(field) for field in hash_indexes}
+        self._sorted_indexes: Dict[str, SortedIndex] = {field: SortedIndex(field) for field in sorted_indexes}
+        # (partition field, sort field) -> per-partition sorted index
+        self._partitioned_indexes: Dict[Tuple[str, str], SortedIndex] = {}
+        self._text_indexes: Dict[str, TextIndex] = {}
     
     def _generate_id(self) -> str:
         """Generate a unique ID for new records."""
@@ -28,7 +355,7 @@ class MockRepository(BaseRepository[Dict]):
     
     async def get_all(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """Retrieve all records with pagination."""
-        items = list(self.data.values())[offset:offset + limit]
+        items = list(islice(self.data.values(), offset, offset + limit))
         return items
     
     async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -40,7 +367,12 @@ class MockRepository(BaseRepository[Dict]):
         data["created_at"] = now
         data["updated_at"] = now
         
+        if data["id"] in self.data:
+            self._unindex(self.data[data["id"]])
+        else:
+            self._seq[data["id"]] = self.next_id
         self.data[data["id"]] = data
+        self._index(data)
         self.next_id += 1
         return data
     
@@ -53,75 +385,160 @@ class MockRepository(BaseRepository[Dict]):
         updated_data = {**self.data[id], **data}
         updated_data["updated_at"] = datetime.now(UTC)
         
+        self._unindex(self.data[id])
         self.data[id] = updated_data
+        self._seq.setdefault(id, self.next_id)
+        self._index(updated_data)
         return updated_data
     
     async def delete(self, id: str) -> bool:
         """Delete a record by ID."""
         if id in self.data:
+            self._unindex(self.data[id])
             del self.data[id]
+            self._seq.pop(id, None)
             return True
         return False
     
     async def find_by_criteria(self, criteria: Dict[str, Any], limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """Find records matching specific criteria."""
+        if limit <= 0:
+            return []
         matches = []
-        for record in self.data.values():
-            if self._matches_criteria(record, criteria):
+        wanted = offset + limit
+        predicate = self._compile_criteria(criteria)
+        for record in self._candidates(criteria):
+            if predicate(record):
                 matches.append(record)
+                if len(matches) == wanted:
+                    break
         
-        return matches[offset:offset + limit]
+        return matches[offset:]
     
     async def count(self, criteria: Optional[Dict[str, Any]] = None) -> int:
         """Count records matching criteria."""
         if not criteria:
             return len(self.data)
         
-        count = 0
+        predicate = self._compile_criteria(criteria)
+        return sum(1 for record in self._candidates(criteria) if predicate(record))
+    
+    # Secondary indexes
+    
+    def add_hash_index(self, field: str) -> None:
+        """Declare a hash index on ``field`` and build it from existing records."""
+        self._hash_indexes[field] = HashIndex(field)
+        self.reindex()
+    
+    def add_sorted_index(self, field: str) -> None:
+        """Declare a sorted (range) index on ``field`` and build it from existing records."""
+        self._sorted_indexes[field] = SortedIndex(field)
+        self.reindex()
+    
+    def add_partitioned_index(self, partition_by: str, field: str) -> SortedIndex:
+        """Declare a sorted index on ``field`` kept separately per ``partition_by`` value."""
+        index = self._partitioned_indexes[(partition_by, field)] = SortedIndex(field, partition_by)
+        self.reindex()
+        return index
+    
+    def add_text_index(self, name: str, fields: Sequence[str], partition_by: str, sort_field: str) -> TextIndex:
+        """Declare a text search index over ``fields``, kept per ``partition_by`` value."""
+        index = self._text_indexes[name] = TextIndex(fields, partition_by, sort_field)
+        self.reindex()
+        return index
+    
+    def attach_store(self, journal: StateJournal, name: str) -> None:
+        """
+        Keep this repository's records in the journaled store ``name``.
+
+        Records persisted by an earlier run are restored and indexed, and
+        later writes to ``self.data`` are journaled. Call before adding records.
+        """
+        self.data = journal.attach(name, self._journaled_store)
+        self._seq = {record_id: seq for seq, record_id in enumerate(self.data, 1)}
+        self.next_id = len(self._seq) + 1
+        self.reindex()
+    
+    def reindex(self) -> None:
+        """Rebuild every index from ``self.data``."""
+        for index in self._all_indexes():
+            index.clear()
         for record in self.data.values():
-            if self._matches_criteria(record, criteria):
-                count += 1
-        
-        return count
+            self._index(record)
+    
+    def _all_indexes(self) -> List["_Index"]:
+        return [
+            *self._hash_indexes.values(),
+            *self._sorted_indexes.values(),
+            *self._partitioned_indexes.values(),
+            *self._text_indexes.values()
+        ]
+    
+    def _index(self, record: Dict[str, Any]) -> None:
+        seq = self._seq.get(record.get("id"))
+        if seq is None:
+            return
+        for index in self._all_indexes():
+            if not index.add(record, seq):
+                # Values that cannot be hashed or ordered make the index unusable
+                self._drop_index(index)
+    
+    def _unindex(self, record: Dict[str, Any]) -> None:
+        seq = self._seq.get(record.get("id"))
+        if seq is None:
+            return
+        for index in self._all_indexes():
+            index.remove(record, seq)
+    
+    def _drop_index(self, index: "_Index") -> None:
+        for indexes in (self._hash_indexes, self._sorted_indexes, self._partitioned_indexes, self._text_indexes):
+            for key in [key for key, value in indexes.items() if value is index]:
+                del indexes[key]
+    
+    def _plan(self, criteria: Dict[str, Any]) -> Optional[Tuple[int, Callable[[], List[str]]]]:
+        """
+        Pick the most selective usable index for ``criteria``.
+
+        Returns ``(estimated_rows, fetch)`` where ``fetch()`` yields candidate
+        ids in insertion order, or None when no index applies (full scan).
+        """
+        best = None
+        for field, condition in criteria.items():
+            for index in (self._hash_indexes.get(field), self._sorted_indexes.get(field)):
+                if index is None:
+                    continue
+                plan = index.plan(condition)
+                if plan is not None and (best is None or plan[0] < best[0]):
+                    best = plan
+        return best
+    
+    def _candidates(self, criteria: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Records that may match ``criteria``, in insertion order."""
+        plan = self._plan(criteria)
+        if plan is None:
+            return self.data.values()
+        data = self.data
+        return [data[record_id] for record_id in plan[1]()]
     
     async def exists(self, id: str) -> bool:
         """Check if a record exists by ID."""
         return id in self.data
     
+    def _compile_criteria(self, criteria: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+        """Compile criteria once per query into a record predicate."""
+        return compile_criteria(criteria)
+    
     def _matches_criteria(self, record: Dict[str, Any], criteria: Dict[str, Any]) -> bool:
         """Check if a record matches the given criteria."""
-        for key, value in criteria.items():
-            if key not in record:
-                return False
-            
-            record_value = record[key]
-            
-            # Handle different comparison types
-            if isinstance(value, dict):
-                if "$gte" in value and record_value < value["$gte"]:
-                    return False
-                if "$lte" in value and record_value > value["$lte"]:
-                    return False
-                if "$gt" in value and record_value <= value["$gt"]:
-                    return False
-                if "$lt" in value and record_value >= value["$lt"]:
-                    return False
-                if "$in" in value and record_value not in value["$in"]:
-                    return False
-                if "$regex" in value:
-                    import re
-                    if not re.search(value["$regex"], str(record_value), re.IGNORECASE):
-                        return False
-            else:
-                if record_value != value:
-                    return False
-        
-        return True
+        return self._compile_criteria(criteria)(record)
 
 
 class UserMockRepository(MockRepository, UserFilterableRepository[Dict]):
     """Mock repository for user-specific entities."""
     
+    def __init__(self, hash_indexes: Iterable[str] = (), sorted_indexes: Iterable[str] = ()):
+        super().__init__(("user_id", *hash_indexes), sorted_indexes)
+    
     async def get_by_user_id(self, user_id: str, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """Retrieve all records for a specific user."""
         return await self.find_by_criteria({"user_id": user_id}, limit, offset)
@@ -139,10 +556,34 @@ class UserMockRepository(MockRepository, UserFilterableRepository[Dict]):
         if criteria:
             user_criteria.update(criteria)
         return await self.count(user_criteria)
+    
+    async def delete_by_user(self, user_id: str) -> int:
+        """Delete every record of a user; returns how many were removed."""
+        ids = [record["id"] for record in self._candidates({"user_id": user_id}) if record.get("user_id") == user_id]
+        for record_id in ids:
+            await self.delete(record_id)
+        return len(ids)
 
 
 class TransactionMockRepository(UserMockRepository, TransactionRepository[Dict]):
-    """Mock repository for transaction entities with advanced querying."""
+    """
+    Mock repository for transaction entities with advanced querying.
+
+    Records are kept column-wise in a ``ColumnarTransactionStore``. Queries
+    match against lazy row views, and only the records returned are built
+    as dicts. ``get_amount_totals`` aggregates straight over the columns.
+    """
+    
+    _journaled_store = ColumnarTransactionStore
+    
+    def __init__(self):
+        super().__init__(
+            hash_indexes=("status", "category", "account_id"),
+            sorted_indexes=("transaction_date",)
+        )
+        self.data = ColumnarTransactionStore()
+        self.add_partitioned_index("user_id", "transaction_date")
+        self.add_text_index("search", ("description", "merchant"), "user_id", "transaction_date")
     
     async def get_by_date_range(
         self, 
@@ -152,15 +593,22 @@ class TransactionMockRepository(UserMockRepository, TransactionRepository[Dict])
         limit: int = 100,
         offset: int = 0
     ) -> List[Dict[str, Any]]:
-        """Retrieve transactions within a date range."""
-        criteria = {
-            "user_id": user_id,
-            "transaction_date": {
-                "$gte": start_date,
-                "$lte": end_date
-            }
-        }
-        return await self.find_by_criteria(criteria, limit, offset)
+        """Retrieve transactions within a date range, newest first."""
+        condition = {"$gte": start_date, "$lte": end_date}
+        index = self._partitioned_indexes.get(("user_id", "transaction_date"))
+        if index is None:
+            matches = await self.find_by_criteria(
+                {"user_id": user_id, "transaction_date": condition}, limit=len(self.data)
+            )
+            matches.sort(key=lambda x: x["transaction_date"], reverse=True)
+            return matches[offset:offset + limit]
+        
+        entries = index.partition(user_id)
+        lo, hi = index.bounds(entries, condition)
+        # Page backwards from the newest match
+        stop = hi - offset
+        start = max(lo, stop - limit)
+        return [self.data[entry[2]] for entry in reversed(entries[start:stop])] if start < stop else []
     
     async def get_by_category(
         self, 
@@ -183,32 +631,130 @@ class TransactionMockRepository(UserMockRepository, TransactionRepository[Dict])
         limit: int = 100,
         offset: int = 0
     ) -> List[Dict[str, Any]]:
-        """Search transactions by description or merchant."""
-        matches = []
-        search_term_lower = search_term.lower()
+        """
+        Search transactions by description or merchant.
+
+        Whole-word matches rank above word-prefix and infix matches; ties are
+        most recent first.
+        """
+        index = self._text_indexes.get("search")
+        if index is None:
+            matches = await self.find_by_criteria({"user_id": user_id}, limit=len(self.data))
+            search_term_lower = search_term.lower()
+            matches = [
+                record for record in matches
+                if search_term_lower in str(record.get("description", "")).lower()
+                or search_term_lower in str(record.get("merchant", "")).lower()
+            ]
+            matches.sort(key=lambda x: x.get("transaction_date", datetime.min), reverse=True)
+            return matches[offset:offset + limit]
         
-        for record in self.data.values():
-            if record.get("user_id") != user_id:
-                continue
-            
-            # Search in description and merchant fields
-            description = str(record.get("description", "")).lower()
-            merchant = str(record.get("merchant", "")).lower()
-            
-            if search_term_lower in description or search_term_lower in merchant:
-                matches.append(record)
+        ids = index.partition(user_id).search(search_term, limit=offset + limit)
+        return [self.data[record_id] for record_id in ids[offset:]]
+    
+    async def find_by_criteria(self, criteria: Dict[str, Any], limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """Find records matching specific criteria."""
+        rows = await super().find_by_criteria(criteria, limit, offset)
+        return [row.materialize() for row in rows]
+    
+    async def get_amount_totals(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        group_by: Optional[str] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[Any, Tuple[Decimal, int]]:
+        """
+        Summed amounts and counts of a user's transactions in a date range.
+
+        Grouping and filters are as in ``ColumnarTransactionStore.sum_amounts``,
+        e.g. ``group_by="category"`` or ``"transaction_date:month"`` with
+        ``where={"transaction_type": "debit"}``.
+        """
+        ids = self._ids_in_date_range(user_id, start_date, end_date)
+        return self.data.sum_amounts(ids, group_by, where)
+    
+    async def get_transaction_columns(
+        self,
+        user_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        where: Optional[Dict[str, Any]] = None
+    ) -> TransactionColumns:
+        """
+        A user's transactions in a date range as a ``TransactionColumns`` batch.
+
+        The batch is read from the store's columns, oldest first; ``where``
+        takes any criteria, e.g. ``{"status": {"$in": ["completed"]}}``.
+        """
+        ids = self._ids_in_date_range(user_id, start_date, end_date)
+        if where:
+            predicate, view = self._compile_criteria(where), self.data.view
+            ids = [record_id for record_id in ids if predicate(view(record_id))]
+        return self.data.transaction_columns(ids)
+    
+    def _ids_in_date_range(self, user_id: str, start_date: datetime, end_date: datetime) -> List[str]:
+        """Ids of a user's transactions dated within ``[start_date, end_date]``."""
+        condition = {"$gte": start_date, "$lte": end_date}
+        index = self._partitioned_indexes.get(("user_id", "transaction_date"))
+        if index is None:
+            predicate = self._compile_criteria({"user_id": user_id, "transaction_date": condition})
+            return [row["id"] for row in self.data.views() if predicate(row)]
+        entries = index.partition(user_id)
+        lo, hi = index.bounds(entries, condition)
+        return [entry[2] for entry in entries[lo:hi]]
+    
+    def _compile_criteria(self, criteria: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+        """Predicate over row views; encodable conditions compare columns directly."""
+        checks, rest = self.data.column_checks(criteria)
+        predicate = super()._compile_criteria(rest)
+        if not checks:
+            return predicate
         
-        # Sort by date (most recent first)
-        matches.sort(key=lambda x: x.get("transaction_date", datetime.min), reverse=True)
+        def matches(view) -> bool:
+            row = view.row
+            for check in checks:
+                if not check(row):
+                    return False
+            return predicate(view)
         
-        return matches[offset:offset + limit]
+        return matches
+    
+    def _matches_criteria(self, record: Dict[str, Any], criteria: Dict[str, Any]) -> bool:
+        """Check a plain record dict (not a row view) against ``criteria``."""
+        return compile_criteria(criteria)(record)
+    
+    def _candidates(self, criteria: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Row views that may match ``criteria``, in insertion order."""
+        plan = self._plan(criteria)
+        if plan is None:
+            return self.data.views()
+        view = self.data.view
+        return [view(record_id) for record_id in plan[1]()]
+
+
+# Users seeded when no user is given
+DEMO_USER_IDS = ("user_001", "user_002", "user_003")
 
 
 # Repository instances
 class RepositoryManager:
-    """Central repository manager for all data access."""
+    """
+    Central repository manager for all data access.
+
+    Demo data is seeded per user on first access, deterministically from
+    ``settings.mock_data_seed`` and the user id. Seeded users are kept in an
+    LRU of ``settings.mock_data_max_users``; evicting a user removes their
+    records, and they are re-seeded identically on next access.
+
+    Repository contents and the set of seeded users are kept in ``journal``
+    (the process-wide ``StateJournal`` by default), so with persistence
+    enabled they survive restarts and users are not re-seeded.
+    """
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None, max_seeded_users: Optional[int] = None,
+                 journal: Optional[StateJournal] = None):
         self.accounts = UserMockRepository()
         self.cards = UserMockRepository()
         self.transactions = TransactionMockRepository()
@@ -217,7 +763,7 @@ class RepositoryManager:
         self.savings_goals = UserMockRepository()
         self.savings_accounts = UserMockRepository()
         self.beneficiaries = UserMockRepository()
-        self.notifications = UserMockRepository()
+        self.notifications = UserMockRepository(hash_indexes=("is_read",))
         self.settings = UserMockRepository()
         self.watchlist = UserMockRepository()
         self.plaid_connections = UserMockRepository()
@@ -225,41 +771,90 @@ class RepositoryManager:
         self.plaid_transactions = UserMockRepository()
         self.plaid_link_tokens = UserMockRepository()
         
-        # Flag to track if mock data has been initialized
-        self._mock_data_initialized = False
+        self.seed = settings.mock_data_seed if seed is None else seed
+        self.max_seeded_users = settings.mock_data_max_users if max_seeded_users is None else max_seeded_users
+        self.journal = get_journal() if journal is None else journal
+        for name, repository in vars(self).items():
+            if isinstance(repository, MockRepository):
+                repository.attach_store(self.journal, f"repositories.{name}")
+        self._seeded_store = self.journal.attach("repositories.seeded_users")
+        # Seeded user ids, least recently used first
+        self._seeded_users: "OrderedDict[str, None]" = OrderedDict.fromkeys(self._seeded_store)
+        # Per-user locks serializing concurrent first accesses
+        self._seeding_locks: Dict[str, asyncio.Lock] = {}
     
-    async def ensure_mock_data_initialized(self):
-        """Ensure mock data is initialized (lazy initialization)."""
-        if not self._mock_data_initialized:
-            await self._setup_mock_data()
-            self._mock_data_initialized = True
+    async def ensure_mock_data_initialized(self, user_id: Optional[str] = None):
+        """Ensure mock data exists for ``user_id`` (default: the demo users), seeding on first access."""
+        for seeded_user_id in ((user_id,) if user_id else DEMO_USER_IDS):
+            await self.ensure_user_seeded(seeded_user_id)
     
-    async def _setup_mock_data(self):
-        """Setup realistic mock data for all entities."""
-        
-        # Sample user IDs for testing
-        user_ids = ["user_001", "user_002", "user_003"]
+    async def ensure_user_seeded(self, user_id: str) -> bool:
+        """Seed a user's demo data unless already present; returns True if it seeded."""
+        if user_id in self._seeded_users:
+            self._seeded_users.move_to_end(user_id)
+            return False
         
-        for user_id in user_ids:
-            await self._create_user_accounts(user_id)
-            await self._create_user_cards(user_id)
-            await self._create_user_transactions(user_id)
-            await self._create_user_investments(user_id)
-            await self._create_user_savings(user_id)
-            await self._create_user_settings(user_id)
-    
-    async def _create_user_accounts(self, user_id: str):
+        lock = self._seeding_locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            # Another caller may have finished seeding while we waited
+            if user_id in self._seeded_users:
+                self._seeded_users.move_to_end(user_id)
+                return False
+            try:
+                await self._setup_user_mock_data(user_id)
+            except BaseException:
+                # Drop the records written so far; the next access seeds afresh
+                await self.evict_user(user_id)
+                raise
+            self._seeded_users[user_id] = None
+            self._seeded_store[user_id] = None
+        while len(self._seeded_users) > self.max_seeded_users:
+            least_recent = next(iter(self._seeded_users))
+            await self.evict_user(least_recent)
+        return True
+    
+    async def evict_user(self, user_id: str) -> int:
+        """Drop all in-memory records of a user; returns how many were removed."""
+        self._seeded_users.pop(user_id, None)
+        self._seeded_store.pop(user_id, None)
+        lock = self._seeding_locks.get(user_id)
+        if lock is not None and not lock.locked():
+            del self._seeding_locks[user_id]
+        removed = 0
+        for repository in self._user_repositories():
+            removed += await repository.delete_by_user(user_id)
+        return removed
+    
+    @property
+    def seeded_user_ids(self) -> List[str]:
+        """Seeded users, least recently used first."""
+        return list(self._seeded_users)
+    
+    def _user_repositories(self) -> List[UserMockRepository]:
+        return [repo for repo in vars(self).values() if isinstance(repo, UserMockRepository)]
+    
+    async def _setup_user_mock_data(self, user_id: str):
+        """Setup realistic mock data for one user."""
+        rng = seeded_random(user_id, seed=self.seed)
+        await self._create_user_accounts(user_id, rng)
+        await self._create_user_cards(user_id, rng)
+        await self._create_user_transactions(user_id, rng)
+        await self._create_user_investments(user_id, rng)
+        await self._create_user_savings(user_id, rng)
+        await self._create_user_settings(user_id, rng)
+    
+    async def _create_user_accounts(self, user_id: str, rng: random.Random):
         """Create mock accounts for a user."""
         accounts = [
             {
                 "user_id": user_id,
                 "account_type": "checking",
-                "account_number": f"CHK{random.randint(100000, 999999)}",
-                "balance": Decimal(str(random.uniform(1000, 50000))),
-                "available_balance": Decimal(str(random.uniform(800, 48000))),
+                "account_number": f"CHK{rng.randint(100000, 999999)}",
+                "balance": Decimal(str(rng.uniform(1000, 50000))),
+                "available_balance": Decimal(str(rng.uniform(800, 48000))),
                 "currency": "USD",
                 "status": "active",
-                "bank_name": random.choice(["Chase Bank", "Bank of America", "Wells Fargo", "Citi Bank"]),
+                "bank_name": rng.choice(["Chase Bank", "Bank of America", "Wells Fargo", "Citi Bank"]),
                 "account_name": "Primary Checking",
                 "interest_rate": Decimal("0.01"),
                 "monthly_fee": Decimal("0.00"),
@@ -267,22 +862,22 @@ class RepositoryManager:
             {
                 "user_id": user_id,
                 "account_type": "savings",
-                "account_number": f"SAV{random.randint(100000, 999999)}",
-                "balance": Decimal(str(random.uniform(5000, 100000))),
-                "available_balance": Decimal(str(random.uniform(5000, 100000))),
+                "account_number": f"SAV{rng.randint(100000, 999999)}",
+                "balance": Decimal(str(rng.uniform(5000, 100000))),
+                "available_balance": Decimal(str(rng.uniform(5000, 100000))),
                 "currency": "USD",
                 "status": "active",
-                "bank_name": random.choice(["Chase Bank", "Bank of America", "Wells Fargo", "Citi Bank"]),
+                "bank_name": rng.choice(["Chase Bank", "Bank of America", "Wells Fargo", "Citi Bank"]),
                 "account_name": "High Yield Savings",
                 "interest_rate": Decimal("4.5"),
                 "monthly_fee": Decimal("0.00"),
             }
         ]
         
-        for account in accounts:
-            await self.accounts.create(account)
+        for number, account in enumerate(accounts, 1):
+            await self.accounts.create({"id": f"acc_{user_id}_{number}", **account})
     
-    async def _create_user_cards(self, user_id: str):
+    async def _create_user_cards(self, user_id: str, rng: random.Random):
         """Create mock cards for a user."""
         user_accounts = await self.accounts.get_by_user_id(user_id)
         
@@ -298,8 +893,8 @@ class RepositoryManager:
                 "expiry_date": (datetime.now() + timedelta(days=365*2)).strftime("%m/%y"),
                 "daily_limit": Decimal("5000.00"),
                 "monthly_limit": Decimal("50000.00"),
-                "current_daily_spent": Decimal(str(random.uniform(0, 1000))),
-                "current_monthly_spent": Decimal(str(random.uniform(0, 10000))),
+                "current_daily_spent": Decimal(str(rng.uniform(0, 1000))),
+                "current_monthly_spent": Decimal(str(rng.uniform(0, 10000))),
                 "is_frozen": False,
                 "card_name": "Primary Debit Card",
             },
@@ -314,19 +909,19 @@ class RepositoryManager:
                 "expiry_date": (datetime.now() + timedelta(days=365*3)).strftime("%m/%y"),
                 "daily_limit": Decimal("10000.00"),
                 "monthly_limit": Decimal("100000.00"),
-                "current_daily_spent": Decimal(str(random.uniform(0, 2000))),
-                "current_monthly_spent": Decimal(str(random.uniform(0, 20000))),
+                "current_daily_spent": Decimal(str(rng.uniform(0, 2000))),
+                "current_monthly_spent": Decimal(str(rng.uniform(0, 20000))),
                 "credit_limit": Decimal("25000.00"),
-                "available_credit": Decimal(str(random.uniform(15000, 25000))),
+                "available_credit": Decimal(str(rng.uniform(15000, 25000))),
                 "is_frozen": False,
                 "card_name": "Rewards Credit Card",
             }
         ]
         
-        for card in cards:
-            await self.cards.create(card)
+        for number, card in enumerate(cards, 1):
+            await self.cards.create({"id": f"card_{user_id}_{number}", **card})
     
-    async def _create_user_transactions(self, user_id: str):
+    async def _create_user_transactions(self, user_id: str, rng: random.Random):
         """Create mock transactions for a user."""
         user_accounts = await self.accounts.get_by_user_id(user_id)
         user_cards = await self.cards.get_by_user_id(user_id)
@@ -339,28 +934,29 @@ class RepositoryManager:
         
         # Generate transactions for the last 90 days
         for i in range(50):
-            transaction_date = datetime.now(UTC) - timedelta(days=random.randint(0, 90))
+            transaction_date = datetime.now(UTC) - timedelta(days=rng.randint(0, 90))
             
             transaction = {
+                "id": f"txn_{user_id}_{i + 1:03d}",
                 "user_id": user_id,
-                "account_id": random.choice(user_accounts)["id"] if user_accounts else None,
-                "card_id": random.choice(user_cards)["id"] if user_cards and random.random() > 0.3 else None,
-                "amount": Decimal(str(random.uniform(5.99, 500.00))),
+                "account_id": rng.choice(user_accounts)["id"] if user_accounts else None,
+                "card_id": rng.choice(user_cards)["id"] if user_cards and rng.random() > 0.3 else None,
+                "amount": Decimal(f"{rng.uniform(5.99, 500.00):.2f}"),
                 "currency": "USD",
-                "transaction_type": random.choice(["debit", "credit"]),
-                "category": random.choice(categories),
-                "merchant": random.choice(merchants),
-                "description": f"Payment to {random.choice(merchants)}",
+                "transaction_type": rng.choice(["debit", "credit"]),
+                "category": rng.choice(categories),
+                "merchant": rng.choice(merchants),
+                "description": f"Payment to {rng.choice(merchants)}",
                 "transaction_date": transaction_date,
-                "status": random.choice(["completed", "pending"]) if random.random() > 0.9 else "completed",
-                "reference_number": f"TXN{random.randint(100000000, 999999999)}",
-                "location": random.choice(["New York, NY", "Los Angeles, CA", "Chicago, IL", "Houston, TX"]),
-                "is_recurring": random.random() > 0.85,
+                "status": rng.choice(["completed", "pending"]) if rng.random() > 0.9 else "completed",
+                "reference_number": f"TXN{rng.randint(100000000, 999999999)}",
+                "location": rng.choice(["New York, NY", "Los Angeles, CA", "Chicago, IL", "Houston, TX"]),
+                "is_recurring": rng.random() > 0.85,
             }
             
             await self.transactions.create(transaction)
     
-    async def _create_user_investments(self, user_id: str):
+    async def _create_user_investments(self, user_id: str, rng: random.Random):
         """Create mock investment data for a user."""
         stocks = [
             {"symbol": "AAPL", "name": "Apple Inc.", "price": 182.50, "change": 2.3},
@@ -371,40 +967,42 @@ class RepositoryManager:
         ]
         
         # Create portfolio holdings
-        for stock in stocks[:3]:  # User holds first 3 stocks
+        for number, stock in enumerate(stocks[:3], 1):  # User holds first 3 stocks
             holding = {
+                "id": f"inv_{user_id}_{number}",
                 "user_id": user_id,
                 "symbol": stock["symbol"],
                 "company_name": stock["name"],
-                "shares": Decimal(str(random.randint(5, 100))),
-                "avg_purchase_price": Decimal(str(stock["price"] * random.uniform(0.8, 1.2))),
+                "shares": Decimal(str(rng.randint(5, 100))),
+                "avg_purchase_price": Decimal(str(stock["price"] * rng.uniform(0.8, 1.2))),
                 "current_price": Decimal(str(stock["price"])),
-                "market_value": Decimal(str(stock["price"] * random.randint(5, 100))),
-                "unrealized_gain_loss": Decimal(str(random.uniform(-1000, 2000))),
-                "purchase_date": datetime.now(UTC) - timedelta(days=random.randint(30, 365)),
+                "market_value": Decimal(str(stock["price"] * rng.randint(5, 100))),
+                "unrealized_gain_loss": Decimal(str(rng.uniform(-1000, 2000))),
+                "purchase_date": datetime.now(UTC) - timedelta(days=rng.randint(30, 365)),
             }
             await self.investments.create(holding)
         
         # Create watchlist
-        for stock in stocks[3:]:  # Remaining stocks in watchlist
+        for number, stock in enumerate(stocks[3:], 1):  # Remaining stocks in watchlist
             watchlist_item = {
+                "id": f"watch_{user_id}_{number}",
                 "user_id": user_id,
                 "symbol": stock["symbol"],
                 "company_name": stock["name"],
                 "current_price": Decimal(str(stock["price"])),
-                "target_price": Decimal(str(stock["price"] * random.uniform(1.1, 1.3))),
+                "target_price": Decimal(str(stock["price"] * rng.uniform(1.1, 1.3))),
                 "alert_enabled": True,
             }
             await self.watchlist.create(watchlist_item)
     
-    async def _create_user_savings(self, user_id: str):
+    async def _create_user_savings(self, user_id: str, rng: random.Random):
         """Create mock savings data for a user."""
         savings_goals = [
             {
                 "user_id": user_id,
                 "goal_name": "Emergency Fund",
                 "target_amount": Decimal("10000.00"),
-                "current_amount": Decimal(str(random.uniform(2000, 8000))),
+                "current_amount": Decimal(str(rng.uniform(2000, 8000))),
                 "target_date": datetime.now(UTC) + timedelta(days=365),
                 "monthly_contribution": Decimal("500.00"),
                 "auto_save_enabled": True,
@@ -415,7 +1013,7 @@ class RepositoryManager:
                 "user_id": user_id,
                 "goal_name": "Vacation Fund",
                 "target_amount": Decimal("5000.00"),
-                "current_amount": Decimal(str(random.uniform(500, 3000))),
+                "current_amount": Decimal(str(rng.uniform(500, 3000))),
                 "target_date": datetime.now(UTC) + timedelta(days=180),
                 "monthly_contribution": Decimal("300.00"),
                 "auto_save_enabled": False,
@@ -424,14 +1022,15 @@ class RepositoryManager:
             }
         ]
         
-        for goal in savings_goals:
-            await self.savings_goals.create(goal)
+        for number, goal in enumerate(savings_goals, 1):
+            await self.savings_goals.create({"id": f"goal_{user_id}_{number}", **goal})
         
         # Create savings accounts
         savings_account = {
+            "id": f"sav_{user_id}_1",
             "user_id": user_id,
             "account_name": "High Yield Savings",
-            "balance": Decimal(str(random.uniform(10000, 50000))),
+            "balance": Decimal(str(rng.uniform(10000, 50000))),
             "interest_rate": Decimal("4.50"),
             "compound_frequency": "monthly",
             "minimum_balance": Decimal("1000.00"),
@@ -440,15 +1039,16 @@ class RepositoryManager:
         }
         await self.savings_accounts.create(savings_account)
     
-    async def _create_user_settings(self, user_id: str):
+    async def _create_user_settings(self, user_id: str, rng: random.Random):
         """Create mock user settings."""
         user_settings = {
+            "id": f"settings_{user_id}",
             "user_id": user_id,
             "profile": {
                 "first_name": f"User{user_id[-3:]}",
                 "last_name": "Demo",
                 "email": f"user{user_id[-3:]}@example.com",
-                "phone": f"+1{random.randint(1000000000, 9999999999)}",
+                "phone": f"+1{rng.randint(1000000000, 9999999999)}",
                 "date_of_birth": "1990-01-01",
                 "address": {
                     "street": "123 Main St",
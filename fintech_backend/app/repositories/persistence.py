@@ -0,0 +1,340 @@
+"""
+Snapshot and append-log persistence for in-memory state.
+
+Mock repositories and service-level dicts keep all their state in memory. A
+``StateJournal`` lets that state survive restarts. Each store is a named
+``JournaledDict``, and every write to it is passed to a pluggable
+``PersistenceBackend``.
+
+``AppendLogBackend`` keeps two kinds of file under a directory:
+
+* ``<name>.snapshot`` holds a magic number, the log generation and the
+  pickled ``{store: {key: value}}`` state.
+* ``<name>.<generation>.log`` holds one frame per write:
+  ``<length><crc32><pickled (store, op, key, value)>``.
+
+Every ``snapshot_every`` writes the full state goes into a new snapshot and
+the log starts a new generation. A warm start memory-maps the snapshot and
+replays only the log of its generation. A torn or corrupt frame at the end
+of the log, for example from a crash mid-write, ends the replay and is
+truncated. The files are pickles, so only point a backend at a directory
+this application writes.
+
+Persistence is off unless ``settings.mock_persistence_dir`` is set. While
+it is off, stores behave as plain dicts.
+"""
+import mmap
+import os
+import pickle
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, MutableMapping, Optional, Set, Tuple, Union
+
+from ..config.logging import get_logger
+from ..config.settings import settings
+
+logger = get_logger(__name__)
+
+State = Dict[str, Dict[Hashable, Any]]
+
+# Log operations
+SET, DELETE, CLEAR = range(3)
+
+_MISSING = object()
+
+
+def apply_operation(state: State, store: str, op: int, key: Any = None, value: Any = None) -> None:
+    """Replay one logged write onto ``state``."""
+    records = state.setdefault(store, {})
+    if op == SET:
+        records[key] = value
+    elif op == DELETE:
+        records.pop(key, None)
+    elif op == CLEAR:
+        records.clear()
+
+
+class PersistenceBackend(ABC):
+    """Durable storage for journaled writes and state snapshots."""
+
+    @abstractmethod
+    def load(self) -> State:
+        """Return the persisted state: the last snapshot plus the writes logged after it."""
+        pass
+
+    @abstractmethod
+    def append(self, store: str, op: int, key: Any = None, value: Any = None) -> None:
+        """Durably record one write."""
+        pass
+
+    @abstractmethod
+    def snapshot(self, state: State) -> None:
+        """Persist the full state; writes logged before it are no longer needed."""
+        pass
+
+    def close(self) -> None:
+        """Release files or connections."""
+        pass
+
+
+class AppendLogBackend(PersistenceBackend):
+    """Binary append-only log with periodic, memory-mapped snapshots."""
+
+    MAGIC = b"HRSNAP01"
+    _HEADER = struct.Struct("<8sQ")  # magic, log generation
+    _FRAME = struct.Struct("<II")  # payload length, crc32
+
+    def __init__(self, directory: Union[str, Path], name: str = "state", fsync: bool = False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.fsync = fsync
+        self.generation = 0
+        self._log = None
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.directory / f"{self.name}.snapshot"
+
+    def log_path(self, generation: Optional[int] = None) -> Path:
+        generation = self.generation if generation is None else generation
+        return self.directory / f"{self.name}.{generation}.log"
+
+    def load(self) -> State:
+        state, self.generation = self._read_snapshot()
+        replayed = self._replay_log(state)
+        self._remove_stale_logs()
+        self._open_log()
+        if state:
+            logger.info(
+                f"Restored {len(state)} stores from {self.directory} "
+                f"(snapshot generation {self.generation}, {replayed} log records replayed)"
+            )
+        return state
+
+    def append(self, store: str, op: int, key: Any = None, value: Any = None) -> None:
+        if self._log is None:
+            self._open_log()
+        payload = pickle.dumps((store, op, key, value), protocol=pickle.HIGHEST_PROTOCOL)
+        self._log.write(self._FRAME.pack(len(payload), zlib.crc32(payload)) + payload)
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+
+    def snapshot(self, state: State) -> None:
+        generation = self.generation + 1
+        temporary = self.snapshot_path.with_suffix(".tmp")
+        with open(temporary, "wb") as f:
+            f.write(self._HEADER.pack(self.MAGIC, generation))
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        # The new snapshot is only visible once complete; the old log stays
+        # valid for the old snapshot until then
+        os.replace(temporary, self.snapshot_path)
+
+        previous = self.log_path()
+        self.close()
+        self.generation = generation
+        self._open_log()
+        previous.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _open_log(self) -> None:
+        self._log = open(self.log_path(), "ab")
+
+    def _read_snapshot(self) -> Tuple[State, int]:
+        path = self.snapshot_path
+        if not path.exists() or path.stat().st_size < self._HEADER.size:
+            return {}, 0
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            magic, generation = self._HEADER.unpack_from(mapped)
+            if magic != self.MAGIC:
+                raise ValueError(f"{path} is not a state snapshot")
+            with memoryview(mapped) as view:
+                state = pickle.loads(view[self._HEADER.size:])
+        return state, generation
+
+    def _replay_log(self, state: State) -> int:
+        """Apply the current generation's log to ``state``; returns the number of records replayed."""
+        path = self.log_path()
+        size = path.stat().st_size if path.exists() else 0
+        if not size:
+            return 0
+
+        replayed = end = 0
+        frame = self._FRAME
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            while end + frame.size <= size:
+                length, checksum = frame.unpack_from(mapped, end)
+                start = end + frame.size
+                payload = mapped[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    break
+                apply_operation(state, *pickle.loads(payload))
+                replayed += 1
+                end = start + length
+
+        if end < size:
+            logger.warning(f"Truncating {size - end} bytes of incomplete log records from {path}")
+            with open(path, "r+b") as f:
+                f.truncate(end)
+        return replayed
+
+    def _remove_stale_logs(self) -> None:
+        current = self.log_path()
+        for path in self.directory.glob(f"{self.name}.*.log"):
+            if path != current:
+                path.unlink(missing_ok=True)
+
+
+class JournaledDict(dict):
+    """
+    Dict whose writes are recorded in a ``StateJournal`` under a store name.
+
+    Item assignment, deletion, ``pop``, ``setdefault``, ``update`` and
+    ``clear`` are journaled. A value changed in place (a model attribute or
+    a list inside it) must be re-recorded with ``touch``.
+    """
+
+    __slots__ = ("_journal", "_name")
+
+    def __init__(self, journal: "StateJournal", name: str, contents: Iterable = ()):
+        super().__init__(contents)
+        self._journal = journal
+        self._name = name
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._journal.record(self._name, SET, key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._journal.record(self._name, DELETE, key)
+
+    def pop(self, key, default=_MISSING):
+        if key in self:
+            value = super().pop(key)
+            self._journal.record(self._name, DELETE, key)
+            return value
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._journal.record(self._name, DELETE, key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        super().clear()
+        self._journal.record(self._name, CLEAR)
+
+    def touch(self, key) -> None:
+        """Record the current value of ``key`` after changing it in place."""
+        if key in self:
+            self._journal.record(self._name, SET, key, self[key])
+
+
+class StateJournal:
+    """
+    Named, journaled stores restored from a ``PersistenceBackend``.
+
+    Without a backend the journal is disabled: stores start empty and
+    writes are not recorded.
+    """
+
+    def __init__(self, backend: Optional[PersistenceBackend] = None, snapshot_every: int = 10000):
+        self.backend = backend
+        self.snapshot_every = snapshot_every
+        # Persisted stores not attached yet; kept so snapshots do not lose them
+        self._restored: State = backend.load() if backend else {}
+        self._restored_names: Set[str] = set(self._restored)
+        self._stores: Dict[str, MutableMapping] = {}
+        self._pending = 0
+        self._seeded = self.attach("journal.seeded")
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def attach(self, name: str, factory: Callable[..., MutableMapping] = JournaledDict) -> MutableMapping:
+        """
+        Journaled store ``name``, pre-filled with its persisted contents.
+
+        ``factory(journal, name, contents)`` builds the store, a
+        ``JournaledDict`` by default. Attaching a name twice returns the same
+        store.
+        """
+        if name in self._stores:
+            return self._stores[name]
+        store = factory(self, name, self._restored.pop(name, ()))
+        if self.enabled:
+            self._stores[name] = store
+        return store
+
+    def restored(self, name: str) -> bool:
+        """Whether store ``name`` had persisted contents at startup."""
+        return name in self._restored_names
+
+    def is_seeded(self, scope: str) -> bool:
+        """Whether mock data for ``scope`` was seeded and persisted in an earlier run."""
+        return self.enabled and scope in self._seeded
+
+    def mark_seeded(self, scope: str) -> None:
+        if self.enabled:
+            self._seeded[scope] = True
+
+    def record(self, name: str, op: int, key: Any = None, value: Any = None) -> None:
+        if self.backend is None:
+            return
+        self.backend.append(name, op, key, value)
+        self._pending += 1
+        if self.snapshot_every and self._pending >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self) -> None:
+        """Write every store to a snapshot so that the log restarts empty."""
+        if self.backend is None:
+            return
+        state: State = dict(self._restored)
+        state.update((name, dict(store)) for name, store in self._stores.items())
+        self.backend.snapshot(state)
+        self._pending = 0
+
+    def close(self) -> None:
+        """Snapshot outstanding writes and release the backend."""
+        if self.backend is None:
+            return
+        if self._pending:
+            self.snapshot()
+        self.backend.close()
+
+
+_journal: Optional[StateJournal] = None
+
+
+def get_journal() -> StateJournal:
+    """The process-wide journal, configured from settings on first use."""
+    global _journal
+    if _journal is None:
+        backend = None
+        if settings.mock_persistence_dir:
+            backend = AppendLogBackend(settings.mock_persistence_dir, fsync=settings.mock_persistence_fsync)
+        _journal = StateJournal(backend, snapshot_every=settings.mock_persistence_snapshot_every)
+    return _journal
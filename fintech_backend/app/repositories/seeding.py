@@ -0,0 +1,109 @@
+"""
+Deterministic, lazy mock data seeding.
+
+Mock data is generated on first use rather than at import time, from a
+``random.Random`` seeded with ``settings.mock_data_seed`` and a scope (a
+service name or user id), so every process produces the same demo data.
+
+Services that keep mock data in instance attributes inherit
+``LazyMockData`` and list those attributes in ``_lazy_attributes``; the
+first read of any of them runs ``_initialize_mock_data`` once:
+
+    class AuditService(LazyMockData):
+        _lazy_attributes = ("audit_logs", "compliance_checks")
+
+        def __init__(self):
+            self.audit_logs = {}          # cheap, no seeding yet
+            self.compliance_checks = {}
+
+        def _initialize_mock_data(self):
+            ...                           # use self.rng for randomness
+
+A service can also call ``_persist_attributes`` in ``__init__`` to keep
+those attributes in the process-wide ``StateJournal``. Its data then
+survives restarts, and it is only seeded once.
+"""
+import random
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Tuple
+
+from ..config.settings import settings
+from .persistence import get_journal
+
+
+def seeded_random(*scope: Any, seed: Optional[int] = None) -> random.Random:
+    """Random generator seeded from ``seed`` (default ``settings.mock_data_seed``) and ``scope``."""
+    seed = settings.mock_data_seed if seed is None else seed
+    return random.Random(":".join(str(part) for part in (seed, *scope)))
+
+
+def seeded_uuid(rng: random.Random) -> uuid.UUID:
+    """Version 4 UUID drawn from ``rng``."""
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _lazy_attribute(name: str) -> property:
+    storage = f"_lazy_{name}"
+
+    def get(self):
+        self.ensure_mock_data()
+        return self.__dict__[storage]
+
+    def set(self, value):
+        self.__dict__[storage] = value
+
+    return property(get, set, doc=f"``{name}``, seeded with mock data on first read.")
+
+
+class LazyMockData(ABC):
+    """Mixin running ``_initialize_mock_data`` on the first read of a lazy attribute."""
+
+    _lazy_attributes: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in cls.__dict__.get("_lazy_attributes", ()):
+            setattr(cls, name, _lazy_attribute(name))
+
+    @property
+    def mock_data_ready(self) -> bool:
+        return self.__dict__.get("_mock_data_ready", False)
+
+    def ensure_mock_data(self) -> None:
+        """Seed this service's mock data if it has not been seeded yet."""
+        if self.mock_data_ready:
+            return
+        # Flag first: seeding itself reads the lazy attributes
+        self.__dict__["_mock_data_ready"] = True
+        self.rng = seeded_random(type(self).__name__)
+        try:
+            self._initialize_mock_data()
+        except BaseException:
+            # Let the next read try again rather than serve half-seeded data as ready
+            self.__dict__["_mock_data_ready"] = False
+            raise
+        if self.__dict__.get("_persistent"):
+            get_journal().mark_seeded(type(self).__name__)
+    
+    def _persist_attributes(self, *attributes: str) -> bool:
+        """
+        Back dict ``attributes`` with journaled stores named after this class.
+
+        Returns True if data persisted by an earlier run was restored. In that
+        case the service is not seeded again.
+        """
+        journal = get_journal()
+        scope = type(self).__name__
+        for attribute in attributes:
+            setattr(self, attribute, journal.attach(f"{scope}.{attribute}"))
+        self.__dict__["_persistent"] = True
+        if journal.is_seeded(scope):
+            self.__dict__["_mock_data_ready"] = True
+            return True
+        return False
+
+    @abstractmethod
+    def _initialize_mock_data(self) -> None:
+        """Fill the lazy attributes with mock data, drawing randomness from ``self.rng``."""
+        pass
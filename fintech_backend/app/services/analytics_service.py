@@ -1,116 +1,54 @@
 from datetime import datetime, date, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import uuid
 import random
 from decimal import Decimal
-from sqlalchemy.orm import Session
-from sqlalchemy import select, and_, func, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func, or_, case, literal, event
+from sqlalchemy.orm import Session, selectinload
 
 from ..models.analytics import (
     AnalyticsRequest, BudgetRequest, SpendingAnalysisRequest, FinancialGoalRequest,
     SpendingByCategory, MonthlySpending, SpendingTrend, BudgetProfile, BudgetSummary,
     FinancialInsight, CashFlowAnalysis, FinancialHealthScore, ExpenseReport,
-    FinancialGoalProfile, FinancialAlert,
-    BudgetDB, FinancialGoalDB, FinancialAlertDB, TransactionAnalyticsDB,
+    FinancialGoalProfile, FinancialAlert, PeriodSummary, PeriodComparison,
+    BudgetDB, FinancialGoalDB, FinancialAlertDB,
     AnalyticsPeriod, TransactionCategory, BudgetStatus, TrendDirection, AlertType
 )
-from ..models.transaction import Transaction, TransactionType, TransactionStatus, MerchantCategory
+from ..database.models import Transaction, TransactionDailyRollup, TransactionMonthlyRollup
+from ..database.partitions import add_months, month_start
+from ..database.rollups import (
+    CHANGED_USERS, RollupTotals, enum_value, from_cents, is_income, rollup_day_criteria
+)
+from ..repositories.database_repository import transaction_date_criteria
 from ..core.exceptions import NotFoundError, ValidationError, BusinessLogicError
+from ..config.settings import settings
+from ..utils.cache import AsyncTTLCache
+
+# Health scores and insights per user, shared across requests; a user's
+# entries are dropped when their transactions, budgets or goals change
+_user_analytics_cache = AsyncTTLCache(ttl_seconds=settings.financial_health_cache_ttl, max_entries=4096)
+
+
+def invalidate_user_analytics(user_id: str) -> None:
+    """Drop a user's cached health score and insights"""
+    _user_analytics_cache.invalidate(("health_score", user_id))
+    _user_analytics_cache.invalidate(("insights", user_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    # Users whose transactions were rolled up in the committed transaction.
+    # A rollback leaves them in place, which only costs an extra invalidation.
+    for user_id in session.info.pop(CHANGED_USERS, ()):
+        invalidate_user_analytics(user_id)
+
 
 class AnalyticsService:
-    def __init__(self, db_session: Session):
-        """Initialize analytics service with database session"""
+    def __init__(self, db_session: AsyncSession):
+        """Initialize analytics service with an async database session"""
         self.db = db_session
     
-    async def _sync_transaction_to_analytics(self, transaction: Transaction) -> TransactionAnalyticsDB:
-        """Convert a regular transaction to analytics format"""
-        
-        # Map merchant categories to transaction categories
-        category_mapping = {
-            MerchantCategory.GROCERIES: TransactionCategory.GROCERIES,
-            MerchantCategory.RESTAURANTS: TransactionCategory.FOOD_DINING,
-            MerchantCategory.GAS_STATIONS: TransactionCategory.FUEL,
-            MerchantCategory.RETAIL: TransactionCategory.SHOPPING,
-            MerchantCategory.ENTERTAINMENT: TransactionCategory.ENTERTAINMENT,
-            MerchantCategory.TRAVEL: TransactionCategory.TRAVEL,
-            MerchantCategory.HEALTHCARE: TransactionCategory.HEALTHCARE,
-            MerchantCategory.UTILITIES: TransactionCategory.BILLS_UTILITIES,
-            MerchantCategory.EDUCATION: TransactionCategory.EDUCATION,
-            MerchantCategory.AUTOMOTIVE: TransactionCategory.TRANSPORTATION,
-            MerchantCategory.ONLINE_SERVICES: TransactionCategory.OTHER,
-            MerchantCategory.SUBSCRIPTION: TransactionCategory.OTHER,
-            MerchantCategory.TRANSFER: TransactionCategory.TRANSFERS,
-            MerchantCategory.INVESTMENT_TRADE: TransactionCategory.INVESTMENTS,
-        }
-        
-        analytics_category = category_mapping.get(
-            MerchantCategory(transaction.merchant_category) if isinstance(transaction.merchant_category, str) else transaction.merchant_category,
-            TransactionCategory.OTHER
-        )
-        
-        # Determine if it's income based on transaction type and direction
-        income_types = [TransactionType.SALARY, TransactionType.DEPOSIT, 
-                       TransactionType.INTEREST, TransactionType.DIVIDEND, 
-                       TransactionType.REFUND]
-        is_income = (transaction.transaction_type in income_types or 
-                    transaction.direction == "inbound" or 
-                    transaction.amount > 0)
-        
-        # Get transaction date as date object
-        trans_date = transaction.transaction_date
-        if isinstance(trans_date, datetime):
-            trans_date = trans_date.date()
-        
-        return TransactionAnalyticsDB(
-            id=f"analytics_{transaction.transaction_id}",
-            user_id=transaction.user_id,
-            transaction_id=transaction.transaction_id,
-            amount=abs(transaction.amount),
-            category=analytics_category,
-            merchant=transaction.merchant_name,
-            description=transaction.description,
-            transaction_date=trans_date,
-            currency=transaction.currency,
-            is_income=is_income,
-            created_at=transaction.created_at if hasattr(transaction, 'created_at') else datetime.utcnow()
-        )
-    
-    async def _get_user_transactions(
-        self, 
-        user_id: str, 
-        start_date: Optional[date] = None,
-        end_date: Optional[date] = None,
-        include_income: bool = True
-    ) -> List[TransactionAnalyticsDB]:
-        """Get user transactions from database and convert to analytics format"""
-        
-        # Query transactions from database
-        query = select(Transaction).where(Transaction.user_id == user_id)
-        
-        # Apply date filters
-        if start_date:
-            query = query.where(Transaction.transaction_date >= start_date)
-        if end_date:
-            query = query.where(Transaction.transaction_date <= end_date)
-        
-        result = await self.db.execute(query)
-        transactions = result.scalars().all()
-        
-        # Convert to analytics format
-        analytics_transactions = []
-        for transaction in transactions:
-            try:
-                analytics_trans = await self._sync_transaction_to_analytics(transaction)
-                if include_income or not analytics_trans.is_income:
-                    analytics_transactions.append(analytics_trans)
-            except Exception as e:
-                # Log error but continue processing other transactions
-                print(f"Error converting transaction {transaction.transaction_id}: {e}")
-                continue
-        
-        return analytics_transactions
-    
     async def get_spending_analysis(
         self, 
         user_id: str, 
@@ -118,47 +56,28 @@ class AnalyticsService:
     ) -> List[SpendingByCategory]:
         """Get spending analysis by category from actual database data"""
         
-        # Get user transactions (expenses only)
-        user_transactions = await self._get_user_transactions(
-            user_id,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            include_income=False
+        # Current and previous period spending per category, in one grouped query
+        current, previous = await self._get_category_spending(
+            user_id, request.start_date, request.end_date
         )
         
-        if not user_transactions:
+        if not current:
             return []
         
-        # Group by category
-        category_spending = {}
-        for transaction in user_transactions:
-            category = transaction.category
-            if category not in category_spending:
-                category_spending[category] = {
-                    'amount': Decimal('0'),
-                    'count': 0,
-                    'transactions': []
-                }
-            
-            category_spending[category]['amount'] += abs(transaction.amount)
-            category_spending[category]['count'] += 1
-            category_spending[category]['transactions'].append(transaction)
-        
         # Calculate totals
-        total_spending = sum(data['amount'] for data in category_spending.values())
+        total_spending = sum(amount for amount, _ in current.values())
         
         # Build response
         spending_by_category = []
-        for category, data in category_spending.items():
-            amount = data['amount']
-            count = data['count']
+        for category, (amount, count) in current.items():
             percentage = float(amount / total_spending * 100) if total_spending > 0 else 0
             average_transaction = amount / count if count > 0 else Decimal('0')
             
             # Determine trend (comparing to previous period)
-            trend = await self._calculate_category_trend(
-                user_id, category, request.start_date, request.end_date
-            )
+            if previous is None:
+                trend = TrendDirection.STABLE
+            else:
+                trend = self._calculate_category_trend(amount, previous.get(category, (Decimal('0'), 0))[0])
             
             spending_by_category.append(SpendingByCategory(
                 category=category,
@@ -174,40 +93,78 @@ class AnalyticsService:
         
         return spending_by_category
     
-    async def _calculate_category_trend(
-        self, 
-        user_id: str, 
-        category: TransactionCategory,
+    async def _get_category_spending(
+        self,
+        user_id: str,
         start_date: Optional[date],
         end_date: Optional[date]
-    ) -> TrendDirection:
-        """Calculate spending trend for a category"""
-        
-        if not start_date or not end_date:
-            return TrendDirection.STABLE
-        
-        # Calculate period length
-        period_days = (end_date - start_date).days
+    ) -> Tuple[Dict[TransactionCategory, Tuple[Decimal, int]], Optional[Dict[TransactionCategory, Tuple[Decimal, int]]]]:
+        """
+        Expense totals and counts per category for the period and the one before it.
+        
+        Both periods are read from the daily rollups in one grouped query. The
+        previous period has the same length and ends the day before
+        ``start_date``; it is ``None`` unless both dates are given.
+        """
+        
+        with_previous = bool(start_date and end_date)
+        lower_bound = start_date
+        if with_previous:
+            lower_bound = start_date - timedelta(days=(end_date - start_date).days)
+            is_current = case((and_(*rollup_day_criteria(start_date)), True), else_=False)
+        else:
+            is_current = literal(True)
+        
+        query = (
+            select(
+                is_current.label("is_current"),
+                TransactionDailyRollup.category,
+                func.sum(TransactionDailyRollup.expense_cents),
+                func.sum(TransactionDailyRollup.expense_count),
+            )
+            .where(TransactionDailyRollup.user_id == user_id)
+            .where(*rollup_day_criteria(lower_bound, end_date))
+            .group_by(is_current, TransactionDailyRollup.category)
+            .having(func.sum(TransactionDailyRollup.expense_count) > 0)
+        )
         
-        # Get previous period data
-        previous_start = start_date - timedelta(days=period_days)
-        previous_end = start_date - timedelta(days=1)
+        periods = {True: {}, False: {}}
+        for in_current, category, cents, count in await self.db.execute(query):
+            periods[bool(in_current)][TransactionCategory(category)] = (from_cents(cents), count)
         
-        # Get current period spending
-        current_transactions = await self._get_user_transactions(
-            user_id, start_date, end_date, include_income=False
-        )
-        current_spending = sum(
-            abs(t.amount) for t in current_transactions if t.category == category
+        return periods[True], periods[False] if with_previous else None
+    
+    async def _get_category_totals(
+        self,
+        user_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[TransactionCategory, RollupTotals]:
+        """Income and expense totals per category over whole days, from the daily rollups"""
+        
+        query = (
+            select(
+                TransactionDailyRollup.category,
+                func.sum(TransactionDailyRollup.income_cents),
+                func.sum(TransactionDailyRollup.income_count),
+                func.sum(TransactionDailyRollup.expense_cents),
+                func.sum(TransactionDailyRollup.expense_count),
+            )
+            .where(TransactionDailyRollup.user_id == user_id)
+            .where(*rollup_day_criteria(start_date, end_date))
+            .group_by(TransactionDailyRollup.category)
         )
         
-        # Get previous period spending
-        previous_transactions = await self._get_user_transactions(
-            user_id, previous_start, previous_end, include_income=False
-        )
-        previous_spending = sum(
-            abs(t.amount) for t in previous_transactions if t.category == category
-        )
+        return {
+            TransactionCategory(category): RollupTotals(
+                from_cents(income), income_count or 0, from_cents(expense), expense_count or 0
+            )
+            for category, income, income_count, expense, expense_count in await self.db.execute(query)
+        }
+    
+    @staticmethod
+    def _calculate_category_trend(current_spending: Decimal, previous_spending: Decimal) -> TrendDirection:
+        """Calculate spending trend for a category"""
         
         # Determine trend
         if previous_spending == 0:
@@ -229,34 +186,23 @@ class AnalyticsService:
     ) -> CashFlowAnalysis:
         """Get cash flow analysis for a period from actual database data"""
         
-        # Get all user transactions (income and expenses)
-        user_transactions = await self._get_user_transactions(
-            user_id,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            include_income=True
-        )
-        
-        # Separate income and expenses
-        income_transactions = [t for t in user_transactions if t.is_income]
-        expense_transactions = [t for t in user_transactions if not t.is_income]
+        # Per-category income and expense totals from the daily rollups
+        category_totals = await self._get_category_totals(user_id, request.start_date, request.end_date)
         
         # Calculate totals
-        total_income = sum(t.amount for t in income_transactions)
-        total_expenses = sum(abs(t.amount) for t in expense_transactions)
+        total_income = sum((totals.income for totals in category_totals.values()), Decimal('0'))
+        total_expenses = sum((totals.expense for totals in category_totals.values()), Decimal('0'))
         net_cash_flow = total_income - total_expenses
         
-        # Group income sources
-        income_sources = {}
-        for transaction in income_transactions:
-            source = transaction.merchant or "Other Income"
-            income_sources[source] = income_sources.get(source, Decimal('0')) + transaction.amount
+        # Group income sources (rollups have no merchant, so these are grouped in SQL)
+        income_sources = await self._get_income_sources(user_id, request.start_date, request.end_date)
         
         # Group expense categories
-        expense_categories = {}
-        for transaction in expense_transactions:
-            category = transaction.category.value
-            expense_categories[category] = expense_categories.get(category, Decimal('0')) + abs(transaction.amount)
+        expense_categories = {
+            category.value: totals.expense
+            for category, totals in category_totals.items()
+            if totals.expense_count
+        }
         
         # Determine cash flow trend
         if total_income == 0:
@@ -280,6 +226,164 @@ class AnalyticsService:
             cash_flow_trend=cash_flow_trend
         )
     
+    async def _get_income_sources(
+        self,
+        user_id: str,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> Dict[str, Decimal]:
+        """Income per merchant, grouped in SQL by merchant and the columns that decide income"""
+        
+        negative = Transaction.amount < 0
+        query = (
+            select(
+                Transaction.merchant_name,
+                Transaction.transaction_type,
+                Transaction.direction,
+                negative.label("negative"),
+                func.sum(func.abs(Transaction.amount, type_=Transaction.amount.type)),
+            )
+            .where(Transaction.user_id == user_id)
+            .where(*transaction_date_criteria(start_date, end_date))
+            .group_by(Transaction.merchant_name, Transaction.transaction_type, Transaction.direction, negative)
+        )
+        
+        income_sources = {}
+        for merchant, transaction_type, direction, is_negative, amount in await self.db.execute(query):
+            if is_income(enum_value(transaction_type), enum_value(direction), is_negative):
+                source = merchant or "Other Income"
+                income_sources[source] = income_sources.get(source, Decimal('0')) + Decimal(amount or 0)
+        return income_sources
+    
+    async def get_period_comparison(
+        self,
+        user_id: str,
+        months: int = 12,
+        end_date: Optional[date] = None
+    ) -> PeriodComparison:
+        """
+        Month-over-month, quarter-over-quarter and year-over-year series.
+        
+        The monthly series covers the ``months`` calendar months ending with
+        the month of ``end_date`` (default today); the quarterly and yearly
+        series cover the quarters and years overlapping them. A period still
+        running at ``end_date`` ends with that month and is flagged
+        ``is_partial``. Each period's change is against the period before it,
+        limited to the same number of months for a partial period. Everything comes
+        from the monthly rollups in one query, so the cost grows with months
+        x categories rather than with transactions.
+        """
+        
+        end_month = month_start(end_date or date.today())
+        first_month = add_months(end_month, 1 - months)
+        # Reaching back to January of the previous year covers the period
+        # before the first month, quarter and year
+        query = (
+            select(
+                TransactionMonthlyRollup.month,
+                TransactionMonthlyRollup.category,
+                TransactionMonthlyRollup.income_cents,
+                TransactionMonthlyRollup.income_count,
+                TransactionMonthlyRollup.expense_cents,
+                TransactionMonthlyRollup.expense_count,
+            )
+            .where(TransactionMonthlyRollup.user_id == user_id)
+            .where(TransactionMonthlyRollup.month >= date(first_month.year - 1, 1, 1))
+            .where(TransactionMonthlyRollup.month <= end_month)
+        )
+        
+        monthly: Dict[date, Dict[str, List[int]]] = {}
+        for month, category, *totals in await self.db.execute(query):
+            monthly.setdefault(month, {})[category] = totals
+        
+        return PeriodComparison(
+            months=months,
+            month_over_month=self._period_series(monthly, first_month, end_month, 1),
+            quarter_over_quarter=self._period_series(monthly, first_month, end_month, 3),
+            year_over_year=self._period_series(monthly, first_month, end_month, 12),
+            generated_at=datetime.utcnow()
+        )
+    
+    @classmethod
+    def _period_series(
+        cls,
+        monthly: Dict[date, Dict[str, List[int]]],
+        first_month: date,
+        end_month: date,
+        period_months: int
+    ) -> List[PeriodSummary]:
+        """Summaries of consecutive ``period_months``-long periods overlapping ``first_month``..``end_month``"""
+        
+        # Periods start in January, April, July and October for quarters, January for years
+        start = add_months(first_month, -((first_month.month - 1) % period_months))
+        previous = cls._summarize_period(monthly, add_months(start, -period_months), period_months)
+        
+        series = []
+        while start <= end_month:
+            covered = min(period_months, (end_month.year - start.year) * 12 + end_month.month - start.month + 1)
+            summary = cls._summarize_period(monthly, start, period_months, covered)
+            if summary.is_partial:
+                # Compare a period still running with the same months of the one before
+                previous = cls._summarize_period(monthly, add_months(start, -period_months), period_months, covered)
+            summary.income_change_percent = cls._change_percent(summary.total_income, previous.total_income)
+            summary.spending_change_percent = cls._change_percent(summary.total_spending, previous.total_spending)
+            series.append(summary)
+            previous, start = summary, add_months(start, period_months)
+        
+        return series
+    
+    @staticmethod
+    def _summarize_period(
+        monthly: Dict[date, Dict[str, List[int]]],
+        start: date,
+        period_months: int,
+        covered_months: Optional[int] = None
+    ) -> PeriodSummary:
+        """Totals and category mix of the first ``covered_months`` (default all) of the period starting at ``start``"""
+        
+        covered_months = covered_months or period_months
+        totals = [0, 0, 0, 0]
+        category_cents: Dict[str, int] = {}
+        for offset in range(covered_months):
+            for category, (income, income_count, expense, expense_count) in \
+                    monthly.get(add_months(start, offset), {}).items():
+                totals[0] += income
+                totals[1] += income_count
+                totals[2] += expense
+                totals[3] += expense_count
+                if expense_count:
+                    category_cents[category] = category_cents.get(category, 0) + expense
+        
+        if period_months == 1:
+            label = start.strftime("%Y-%m")
+        elif period_months == 3:
+            label = f"{start.year}-Q{(start.month - 1) // 3 + 1}"
+        else:
+            label = str(start.year)
+        
+        total_income, total_spending = from_cents(totals[0]), from_cents(totals[2])
+        return PeriodSummary(
+            period=label,
+            start_date=start,
+            end_date=add_months(start, covered_months) - timedelta(days=1),
+            is_partial=covered_months < period_months,
+            total_income=total_income,
+            total_spending=total_spending,
+            net_cash_flow=total_income - total_spending,
+            transaction_count=totals[1] + totals[3],
+            category_spending={category: from_cents(cents) for category, cents in category_cents.items()},
+            category_mix={
+                category: round(cents / totals[2] * 100, 2) if totals[2] else 0.0
+                for category, cents in category_cents.items()
+            }
+        )
+    
+    @staticmethod
+    def _change_percent(current: Decimal, previous: Decimal) -> Optional[float]:
+        if previous == 0:
+            return None
+        return round(float((current - previous) / previous * 100), 2)
+    
     async def create_budget(self, user_id: str, request: BudgetRequest) -> BudgetProfile:
         """Create a new budget in database"""
         budget_id = str(uuid.uuid4())
@@ -304,6 +408,8 @@ class AnalyticsService:
         # self.db.add(budget)
         # await self.db.commit()
         
+        invalidate_user_analytics(user_id)
+        
         # Calculate current spending for this budget
         spent_amount = await self._calculate_budget_spending(user_id, budget)
         
@@ -313,21 +419,23 @@ class AnalyticsService:
         """Get all budgets for a user from database"""
         
         # Query budgets from database
+        user_budgets = await self._load_user_budgets(user_id)
+        
+        # Spending for every budget in one query
+        spent_amounts = await self._calculate_budgets_spending(user_id, user_budgets)
+        
+        return [self._build_budget_profile(budget, spent_amounts[budget.id]) for budget in user_budgets]
+    
+    async def _load_user_budgets(self, user_id: str) -> List[BudgetDB]:
+        """Load a user's budgets from database"""
+        
         # query = select(Budget).where(Budget.user_id == user_id)
         # result = await self.db.execute(query)
-        # user_budgets = result.scalars().all()
+        # return result.scalars().all()
         
         # For now, return empty list since we need the Budget ORM model
         # You'll need to implement this once you have the Budget table
-        user_budgets = []
-        
-        budget_profiles = []
-        for budget in user_budgets:
-            spent_amount = await self._calculate_budget_spending(user_id, budget)
-            profile = self._build_budget_profile(budget, spent_amount)
-            budget_profiles.append(profile)
-        
-        return budget_profiles
+        return []
     
     async def get_budget_summary(self, user_id: str) -> BudgetSummary:
         """Get budget summary for user from database"""
@@ -408,6 +516,7 @@ class AnalyticsService:
         # Save to database (assuming you have a FinancialGoal ORM model)
         # self.db.add(goal)
         # await self.db.commit()
+        invalidate_user_analytics(user_id)
         
         return self._build_financial_goal_profile(goal)
     
@@ -425,20 +534,28 @@ class AnalyticsService:
         return [self._build_financial_goal_profile(goal) for goal in user_goals]
     
     async def get_financial_health_score(self, user_id: str) -> FinancialHealthScore:
+        """
+        Financial health score, cached per user.
+        
+        Concurrent requests share one computation; ``last_calculated`` is when
+        the cached score was computed.
+        """
+        entry = await _user_analytics_cache.get_or_compute(
+            ("health_score", user_id), lambda: self._compute_financial_health_score(user_id)
+        )
+        return entry.value.model_copy(update={"last_calculated": entry.computed_at})
+    
+    async def _compute_financial_health_score(self, user_id: str) -> FinancialHealthScore:
         """Calculate financial health score from actual user data"""
         
         # Get user data from database
-        user_transactions = await self._get_user_transactions(
-            user_id,
-            start_date=date.today() - timedelta(days=90),
-            include_income=True
-        )
+        category_totals = await self._get_category_totals(user_id, start_date=date.today() - timedelta(days=90))
         user_budgets = await self.get_user_budgets(user_id)
         user_goals = await self.get_user_financial_goals(user_id)
         
         # Calculate component scores
-        spending_score = await self._calculate_spending_score(user_transactions, user_budgets)
-        savings_score = await self._calculate_savings_score(user_goals, user_transactions)
+        spending_score = await self._calculate_spending_score(category_totals, user_budgets)
+        savings_score = await self._calculate_savings_score(user_goals, category_totals)
         budget_adherence_score = await self._calculate_budget_adherence_score(user_id, user_budgets)
         debt_management_score = 75  # Default score (implement based on debt data)
         emergency_fund_score = await self._calculate_emergency_fund_score(user_goals)
@@ -487,41 +604,42 @@ class AnalyticsService:
         )
     
     async def get_financial_insights(self, user_id: str) -> List[FinancialInsight]:
+        """Financial insights, cached per user like the health score"""
+        entry = await _user_analytics_cache.get_or_compute(
+            ("insights", user_id), lambda: self._compute_financial_insights(user_id)
+        )
+        return list(entry.value)
+    
+    async def _compute_financial_insights(self, user_id: str) -> List[FinancialInsight]:
         """Generate financial insights for user from actual data"""
         insights = []
         
-        # Get recent transactions (last 30 days)
+        # Recent spending per category (last 30 days)
         recent_date = date.today() - timedelta(days=30)
-        recent_transactions = await self._get_user_transactions(
-            user_id,
-            start_date=recent_date,
-            include_income=False
-        )
+        category_totals = await self._get_category_totals(user_id, start_date=recent_date)
+        category_spending = {
+            category: totals.expense
+            for category, totals in category_totals.items()
+            if totals.expense_count
+        }
         
-        if recent_transactions:
-            # High spending category insight
-            category_spending = {}
-            for transaction in recent_transactions:
-                category = transaction.category
-                category_spending[category] = category_spending.get(category, Decimal('0')) + abs(transaction.amount)
+        if category_spending:
+            top_category = max(category_spending.items(), key=lambda x: x[1])
+            total_spending = sum(category_spending.values())
+            percentage = float(top_category[1] / total_spending * 100)
             
-            if category_spending:
-                top_category = max(category_spending.items(), key=lambda x: x[1])
-                total_spending = sum(category_spending.values())
-                percentage = float(top_category[1] / total_spending * 100)
-                
-                insights.append(FinancialInsight(
-                    id=str(uuid.uuid4()),
-                    title="Top Spending Category",
-                    description=f"Your highest spending category this month is {top_category[0].value.replace('_', ' ').title()}, accounting for {percentage:.1f}% of your expenses.",
-                    insight_type="spending_pattern",
-                    category=top_category[0],
-                    amount=top_category[1],
-                    percentage=percentage,
-                    action_recommended="Consider setting a budget for this category to better control spending",
-                    priority="medium",
-                    created_at=datetime.utcnow()
-                ))
+            insights.append(FinancialInsight(
+                id=str(uuid.uuid4()),
+                title="Top Spending Category",
+                description=f"Your highest spending category this month is {top_category[0].value.replace('_', ' ').title()}, accounting for {percentage:.1f}% of your expenses.",
+                insight_type="spending_pattern",
+                category=top_category[0],
+                amount=top_category[1],
+                percentage=percentage,
+                action_recommended="Consider setting a budget for this category to better control spending",
+                priority="medium",
+                created_at=datetime.utcnow()
+            ))
         
         return insights
     
@@ -536,7 +654,10 @@ class AnalyticsService:
         # For now, return empty list
         user_alerts = []
         
-        return [
+        # Budget alerts from the batched budget spending
+        budget_alerts = self._build_budget_alerts(await self.get_user_budgets(user_id))
+        
+        return budget_alerts + [
             FinancialAlert(
                 id=alert.id,
                 alert_type=alert.alert_type,
@@ -556,22 +677,63 @@ class AnalyticsService:
     # Helper methods
     async def _calculate_budget_spending(self, user_id: str, budget: BudgetDB) -> Decimal:
         """Calculate current spending for a budget from actual transactions"""
+        return (await self._calculate_budgets_spending(user_id, [budget]))[budget.id]
+    
+    async def _calculate_budgets_spending(self, user_id: str, budgets: List[BudgetDB]) -> Dict[str, Decimal]:
+        """
+        Spending of several budgets at once, keyed by budget id.
+        
+        One query over the daily rollups covering every budget's category and
+        period; each budget gets its own conditional sum, so budgets with
+        different windows over the same category do not interfere.
+        """
+        if not budgets:
+            return {}
+        
+        sums = [
+            func.sum(case(
+                (and_(TransactionDailyRollup.category == budget.category.value,
+                      *rollup_day_criteria(budget.start_date, budget.end_date)),
+                 TransactionDailyRollup.expense_cents),
+                else_=0
+            ))
+            for budget in budgets
+        ]
         
-        # Get transactions for the budget period and category
-        user_transactions = await self._get_user_transactions(
-            user_id,
-            start_date=budget.start_date,
-            end_date=budget.end_date,
-            include_income=False
+        # Only read the rows some budget can use
+        end_dates = [budget.end_date for budget in budgets]
+        query = (
+            select(*sums)
+            .where(TransactionDailyRollup.user_id == user_id)
+            .where(TransactionDailyRollup.category.in_({budget.category.value for budget in budgets}))
+            .where(*rollup_day_criteria(
+                min(budget.start_date for budget in budgets),
+                None if None in end_dates else max(end_dates)
+            ))
         )
         
-        # Filter by category
-        category_transactions = [
-            t for t in user_transactions 
-            if t.category == budget.category
-        ]
-        
-        return sum(abs(t.amount) for t in category_transactions)
+        totals = (await self.db.execute(query)).one()
+        return {budget.id: from_cents(cents) for budget, cents in zip(budgets, totals)}
+    
+    def _build_budget_alerts(self, budgets: List[BudgetProfile]) -> List[FinancialAlert]:
+        """Alerts for active budgets that have been exceeded"""
+        now = datetime.utcnow()
+        alerts = []
+        for budget in budgets:
+            if not budget.is_active or budget.percentage_used <= 100:
+                continue
+            alerts.append(FinancialAlert(
+                id=f"budget_exceeded_{budget.id}",
+                alert_type=AlertType.BUDGET_EXCEEDED,
+                title=f"{budget.name} budget exceeded",
+                message=f"You have spent {budget.percentage_used:.1f}% of your {budget.name} budget.",
+                severity="critical" if budget.percentage_used > 120 else "warning",
+                category=budget.category,
+                amount=budget.spent_amount,
+                threshold=budget.budgeted_amount,
+                created_at=now
+            ))
+        return alerts
     
     def _build_budget_profile(self, budget: BudgetDB, spent_amount: Decimal) -> BudgetProfile:
         """Build budget profile from budget DB and spending data"""
@@ -654,23 +816,19 @@ class AnalyticsService:
     
     async def _calculate_spending_score(
         self, 
-        transactions: List[TransactionAnalyticsDB], 
+        category_totals: Dict[TransactionCategory, RollupTotals], 
         budgets: List[BudgetProfile]
     ) -> int:
         """Calculate spending efficiency score"""
-        if not transactions:
+        expense_count = sum(totals.expense_count for totals in category_totals.values())
+        if not expense_count and not any(totals.income_count for totals in category_totals.values()):
             return 50
         
-        recent_transactions = [
-            t for t in transactions 
-            if not t.is_income
-        ]
-        
-        if not recent_transactions:
+        if not expense_count:
             return 70
         
-        total_spending = sum(abs(t.amount) for t in recent_transactions)
-        avg_transaction = total_spending / len(recent_transactions)
+        total_spending = sum(totals.expense for totals in category_totals.values())
+        avg_transaction = total_spending / expense_count
         
         # Higher scores for lower average transactions
         if avg_transaction < Decimal('50000'):
@@ -693,7 +851,7 @@ class AnalyticsService:
     async def _calculate_savings_score(
         self, 
         goals: List[FinancialGoalProfile], 
-        transactions: List[TransactionAnalyticsDB]
+        category_totals: Dict[TransactionCategory, RollupTotals]
     ) -> int:
         """Calculate savings rate score"""
         if not goals:
@@ -704,12 +862,12 @@ class AnalyticsService:
         avg_progress = total_progress / len(goals)
         
         # Calculate savings rate from transactions
-        income_transactions = [t for t in transactions if t.is_income]
-        savings_transactions = [t for t in transactions if t.category == TransactionCategory.SAVINGS]
+        income_count = sum(totals.income_count for totals in category_totals.values())
         
-        if income_transactions:
-            total_income = sum(t.amount for t in income_transactions)
-            total_savings = sum(abs(t.amount) for t in savings_transactions)
+        if income_count:
+            total_income = sum(totals.income for totals in category_totals.values())
+            savings = category_totals.get(TransactionCategory.SAVINGS)
+            total_savings = savings.income + savings.expense if savings else Decimal('0')
             savings_rate = float(total_savings / total_income * 100) if total_income > 0 else 0
             
             score = int((avg_progress * 0.6) + (min(savings_rate, 30) * 2))
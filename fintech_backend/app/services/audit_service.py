@@ -26,16 +26,18 @@ from ..models.audit import (
 )
 from ..models.base import PaginatedResponse
 from ..core.exceptions import NotFoundError, ValidationError
+from ..repositories.seeding import LazyMockData, seeded_uuid
 
-class AuditService:
+class AuditService(LazyMockData):
     """Service for handling audit and compliance operations"""
+
+    _lazy_attributes = ("audit_logs", "compliance_checks", "compliance_reports")
     
     def __init__(self):
         """Initialize the audit service with mock data"""
         self.audit_logs: Dict[str, AuditLogDB] = {}
         self.compliance_checks: Dict[str, ComplianceCheckDB] = {}
         self.compliance_reports: Dict[str, ComplianceReportDB] = {}
-        self._initialize_mock_data()
     
     def _initialize_mock_data(self):
         """Initialize mock audit and compliance data"""
@@ -84,7 +86,7 @@ class AuditService:
         
         for i, log_data in enumerate(sample_logs):
             log_id = f"audit_{str(i+1).zfill(3)}"
-            timestamp = datetime.utcnow() - timedelta(days=random.randint(0, 30))
+            timestamp = datetime.utcnow() - timedelta(days=self.rng.randint(0, 30))
             
             self.audit_logs[log_id] = AuditLogDB(
                 id=log_id,
@@ -97,7 +99,7 @@ class AuditService:
                 resource_id=log_data.get("resource_id"),
                 resource_type=log_data.get("resource_type"),
                 metadata=log_data.get("metadata"),
-                session_id=f"session_{uuid.uuid4().hex[:8]}",
+                session_id=f"session_{seeded_uuid(self.rng).hex[:8]}",
                 created_at=timestamp,
                 updated_at=timestamp
             )
@@ -144,7 +146,7 @@ class AuditService:
         
         for i, check_data in enumerate(sample_checks):
             check_id = f"compliance_{str(i+1).zfill(3)}"
-            checked_at = datetime.utcnow() - timedelta(days=random.randint(0, 15))
+            checked_at = datetime.utcnow() - timedelta(days=self.rng.randint(0, 15))
             expires_at = checked_at + timedelta(days=90)  # 90-day validity
             
             self.compliance_checks[check_id] = ComplianceCheckDB(
@@ -156,7 +158,7 @@ class AuditService:
                 score=check_data["score"],
                 findings=check_data["findings"],
                 recommendations=check_data["recommendations"],
-                reference_id=f"ref_{uuid.uuid4().hex[:8]}",
+                reference_id=f"ref_{seeded_uuid(self.rng).hex[:8]}",
                 checked_at=checked_at,
                 expires_at=expires_at,
                 metadata={"automated": True, "version": "1.0"},
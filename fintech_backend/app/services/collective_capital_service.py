@@ -25,19 +25,21 @@ from ..core.exceptions import (
     AccountNotFoundException, FintechException
 )
 from ..config.logging import get_logger
+from ..repositories.seeding import LazyMockData
 
 logger = get_logger(__name__)
 
 
-class CollectiveCapitalService:
+class CollectiveCapitalService(LazyMockData):
     """Service for managing collective capital circles and investments"""
 
+    _lazy_attributes = ("_circles", "_join_requests", "_user_circles")
+
     def __init__(self):
         # Mock data storage - in production, this would use a database
         self._circles: Dict[str, CollectiveCircle] = {}
         self._join_requests: Dict[str, JoinRequest] = {}
         self._user_circles: Dict[str, List[str]] = {}  # user_id -> circle_ids
-        self._initialize_mock_data()
 
     def _initialize_mock_data(self):
         """Initialize mock data for development"""
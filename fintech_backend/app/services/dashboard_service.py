@@ -15,7 +15,9 @@ from ..repositories.mock_repository import (
     get_cards_repository,
     get_repository_manager
 )
+from ..models.transaction import TransactionStatus
 from ..utils.calculations import AnalyticsCalculator, RiskCalculator
+from ..utils.transaction_columns import TransactionColumns
 from ..utils.formatters import (
     DashboardFormatter, 
     FinancialFormatter, 
@@ -48,7 +50,7 @@ class DashboardService:
         try:
             # Ensure mock data is initialized
             repo_manager = get_repository_manager()
-            await repo_manager.ensure_mock_data_initialized()
+            await repo_manager.ensure_mock_data_initialized(user_id)
             
             # Log business event
             log_business_event(
@@ -117,9 +119,14 @@ class DashboardService:
             
             # Calculate quick stats
             monthly_spending = await self._calculate_monthly_spending(user_id)
-            spending_velocity = RiskCalculator.calculate_spending_velocity(
-                recent_transactions_data, days=7
+            now = datetime.now(UTC)
+            settled = None if include_pending else {
+                "status": {"$in": [status.value for status in TransactionStatus if status != TransactionStatus.PENDING]}
+            }
+            week_columns = await self.transactions_repo.get_transaction_columns(
+                user_id, now - timedelta(days=7), now, where=settled
             )
+            spending_velocity = RiskCalculator.calculate_spending_velocity(week_columns, days=7, now=now)
             
             dashboard_data = {
                 "financial_summary": financial_summary,
@@ -187,40 +194,37 @@ class DashboardService:
                 user_id=user_id
             )
             
-            # Get transactions for the period
-            cutoff_date = datetime.now(UTC) - timedelta(days=period_days)
-            transactions = await self.transactions_repo.get_by_date_range(
-                user_id=user_id,
-                start_date=cutoff_date,
-                end_date=datetime.now(UTC),
-                limit=1000  # Large limit for analytics
-            )
+            # Analysis period
+            now = datetime.now(UTC)
+            cutoff_date = now - timedelta(days=period_days)
             
             # Filter by category if specified
+            scope: Dict[str, Any] = {}
             if category_filter:
-                transactions = [
-                    tx for tx in transactions 
-                    if tx.get("category") in category_filter
-                ]
+                scope["category"] = {"$in": category_filter}
+            debits = {**scope, "transaction_type": "debit"}
             
-            # Calculate spending by category
-            category_breakdown = AnalyticsCalculator.calculate_spending_by_category(
-                transactions, days=period_days
+            # Transactions for the insights, read straight from the transaction columns
+            columns = await self.transactions_repo.get_transaction_columns(
+                user_id, cutoff_date, now, where=scope
             )
             
+            # Spending by category and month, aggregated over the transaction columns
+            category_totals = await self.transactions_repo.get_amount_totals(
+                user_id, cutoff_date, now, group_by="category", where=debits
+            )
+            category_breakdown = AnalyticsCalculator.summarize_category_totals(category_totals)
+            
             # Calculate monthly trends
             monthly_trends = []
             if include_trends:
-                monthly_trends = AnalyticsCalculator.calculate_monthly_trends(
-                    transactions, months=6
+                monthly_totals = await self.transactions_repo.get_amount_totals(
+                    user_id, cutoff_date, now, group_by="transaction_date:month", where=debits
                 )
+                monthly_trends = AnalyticsCalculator.summarize_monthly_totals(monthly_totals, months=6)
             
             # Calculate total spending for the period
-            total_spending = sum(
-                Decimal(str(tx.get("amount", 0))) 
-                for tx in transactions 
-                if tx.get("transaction_type") == "debit"
-            )
+            total_spending = sum((amount for amount, _ in category_totals.values()), Decimal("0"))
             
             # Format analytics data
             analytics_data = DashboardFormatter.format_spending_analytics(
@@ -231,7 +235,7 @@ class DashboardService:
             
             # Add insights
             insights = await self._generate_spending_insights(
-                transactions, category_breakdown, total_spending
+                columns, category_breakdown, total_spending, now
             )
             analytics_data["insights"] = insights
             
@@ -240,7 +244,7 @@ class DashboardService:
                 extra={
                     "user_id": user_id,
                     "period_days": period_days,
-                    "transactions_analyzed": len(transactions),
+                    "transactions_analyzed": columns.size,
                     "categories_count": len(category_breakdown)
                 }
             )
@@ -389,20 +393,11 @@ class DashboardService:
         now = datetime.now(UTC)
         month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         
-        # Get transactions for current month
-        transactions = await self.transactions_repo.get_by_date_range(
-            user_id=user_id,
-            start_date=month_start,
-            end_date=now,
-            limit=1000
-        )
-        
-        # Sum debit transactions
-        monthly_spending = sum(
-            Decimal(str(tx.get("amount", 0)))
-            for tx in transactions
-            if tx.get("transaction_type") == "debit"
+        # Sum debit transactions for current month
+        totals = await self.transactions_repo.get_amount_totals(
+            user_id, month_start, now, where={"transaction_type": "debit"}
         )
+        monthly_spending, _ = totals.get(None, (Decimal("0"), 0))
         
         return monthly_spending
     
@@ -436,9 +431,10 @@ class DashboardService:
     
     async def _generate_spending_insights(
         self,
-        transactions: List[Dict],
+        columns: TransactionColumns,
         category_breakdown: List[Dict],
-        total_spending: Decimal
+        total_spending: Decimal,
+        now: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """Generate spending insights and recommendations."""
         insights = []
@@ -455,7 +451,7 @@ class DashboardService:
                 })
         
         # Spending velocity insight
-        velocity = RiskCalculator.calculate_spending_velocity(transactions, days=7)
+        velocity = RiskCalculator.calculate_spending_velocity(columns, days=7, now=now)
         if velocity["avg_daily_spending"] > total_spending / 30 * Decimal("1.5"):
             insights.append({
                 "type": "high_spending_velocity",
@@ -474,14 +470,10 @@ class DashboardService:
             })
         
         # Weekend spending pattern
-        weekend_spending = sum(
-            Decimal(str(tx.get("amount", 0)))
-            for tx in transactions
-            if (tx.get("transaction_date") and 
-                isinstance(tx.get("transaction_date"), datetime) and
-                tx.get("transaction_date").weekday() >= 5 and  # Saturday = 5, Sunday = 6
-                tx.get("transaction_type") == "debit")
-        )
+        weekend_spending = columns.to_decimal(sum(
+            columns.amounts[i] for i in columns.debit_rows()
+            if columns.weekday(i) >= 5  # Saturday = 5, Sunday = 6
+        ))
         
         if weekend_spending > total_spending * Decimal("0.4"):  # More than 40% on weekends
             insights.append({
@@ -4,12 +4,15 @@ Database-integrated account management service for the fintech backend.
 from typing import List, Optional, Dict, Any
 from decimal import Decimal
 from datetime import datetime, date
+import uuid
 from sqlalchemy.orm import Session
 
 from ..database import get_db
+from ..database.unit_of_work import unit_of_work
 from ..database.models import (
     User, Account, Transaction, AccountTypeEnum, AccountStatusEnum,
-    TransactionTypeEnum, TransactionStatusEnum, TransactionDirectionEnum
+    TransactionTypeEnum, TransactionStatusEnum, TransactionDirectionEnum,
+    PaymentMethodEnum, MerchantCategoryEnum
 )
 from ..repositories.database_repository import (
     UserRepository, AccountRepository, TransactionRepository
@@ -34,6 +37,7 @@ class DatabaseAccountService:
         self.user_repo = UserRepository(db)
         self.account_repo = AccountRepository(db)
         self.transaction_repo = TransactionRepository(db)
+        self.uow = unit_of_work(db)
     
     def list_user_accounts(self, user_id: str) -> Dict[str, Any]:
         """List all accounts for a user."""
@@ -76,7 +80,12 @@ class DatabaseAccountService:
         return account
     
     def create_account(self, user_id: str, request: AccountCreateRequest) -> Dict[str, Any]:
-        """Create a new financial account."""
+        """
+        Create a new financial account.
+
+        The account, its opening balance and any deposit/bonus journal rows
+        are written in one unit of work and committed together.
+        """
         logger.info(f"Creating new account for user {user_id}")
         
         # Validate user exists
@@ -95,28 +104,34 @@ class DatabaseAccountService:
         # Determine if this should be primary account
         is_primary = len(existing_accounts) == 0  # First account is primary
         
-        # Create account
-        account = self.account_repo.create_account(
-            user_id=user_id,
-            account_name=request.account_name,
-            account_type=AccountTypeEnum(request.account_type.value),
-            account_number=account_number,
-            currency=request.currency.value if hasattr(request.currency, 'value') else str(request.currency)
-        )
-        
-        # Set as primary if needed
-        if is_primary:
-            self.account_repo.set_primary_account(user_id, account.id)
+        initial_deposit = Decimal(str(getattr(request, 'initial_deposit', None) or 0))
         
-        # Process initial deposit if provided
-        if hasattr(request, 'initial_deposit') and request.initial_deposit and request.initial_deposit > 0:
-            self._process_initial_deposit(account, request.initial_deposit)
-        
-        # Calculate welcome bonus
-        welcome_bonus = self._calculate_welcome_bonus(request.account_type, 
-                                                    getattr(request, 'initial_deposit', Decimal('0')))
-        if welcome_bonus > 0:
-            self._apply_welcome_bonus(account, welcome_bonus)
+        with self.uow:
+            # Create account (flushed so its id is available)
+            account = self.account_repo.create_account(
+                user_id=user_id,
+                account_name=request.account_name,
+                account_type=AccountTypeEnum(request.account_type.value),
+                account_number=account_number,
+                currency=request.currency.value if hasattr(request.currency, 'value') else str(request.currency)
+            )
+            
+            # The first account has no siblings to demote
+            if is_primary:
+                account.is_primary = True
+            
+            journal_rows = []
+            
+            # Process initial deposit if provided
+            if initial_deposit > 0:
+                journal_rows.append(self._process_initial_deposit(account, initial_deposit))
+            
+            # Calculate welcome bonus
+            welcome_bonus = self._calculate_welcome_bonus(request.account_type, initial_deposit)
+            if welcome_bonus > 0:
+                journal_rows.append(self._apply_welcome_bonus(account, welcome_bonus))
+            
+            self.transaction_repo.insert_transactions(journal_rows)
         
         next_steps = self._generate_next_steps(request.account_type)
         
@@ -155,15 +170,13 @@ class DatabaseAccountService:
                 raise BusinessRuleViolationException("MINIMUM_BALANCE", "Cannot set minimum balance above current balance")
             update_data['minimum_balance'] = request.minimum_balance
         
-        if request.is_primary is not None and request.is_primary:
-            self.account_repo.set_primary_account(user_id, account_id)
-        
-        # Apply updates
-        if update_data:
+        with self.uow:
+            if request.is_primary is not None and request.is_primary:
+                self.account_repo.set_primary_account(user_id, account_id)
+            
+            # Apply updates
             for key, value in update_data.items():
                 setattr(account, key, value)
-            self.db.commit()
-            self.db.refresh(account)
         
         logger.info(f"Account {account_id} settings updated successfully")
         return account
@@ -185,82 +198,97 @@ class DatabaseAccountService:
     
     def transfer_between_accounts(self, user_id: str, 
                                 request: AccountTransferRequest) -> Dict[str, Any]:
-        """Transfer money between user's accounts."""
+        """
+        Transfer money between user's accounts.
+
+        Runs as a single unit of work: both accounts are locked in id order,
+        balances are adjusted in SQL and both journal rows are inserted in one
+        batch before the single commit.
+        """
         logger.info(f"Processing transfer from {request.from_account_id} to {request.to_account_id}")
         
-        # Get and validate both accounts
-        from_account = self.get_account_details(request.from_account_id, user_id)
-        to_account = self.get_account_details(request.to_account_id, user_id)
-        
-        # Validate accounts are active
-        if from_account.status != AccountStatusEnum.ACTIVE:
-            raise BusinessRuleViolationException("ACCOUNT_STATUS", "Source account is not active")
-        if to_account.status != AccountStatusEnum.ACTIVE:
-            raise BusinessRuleViolationException("ACCOUNT_STATUS", "Destination account is not active")
+        if request.from_account_id == request.to_account_id:
+            raise ValidationException("Cannot transfer to the same account", "to_account_id")
         
-        # Check sufficient funds
-        if from_account.available_balance < request.amount:
-            raise InsufficientFundsException(from_account.available_balance, request.amount)
+        amount = Decimal(str(request.amount))
         
-        # Check minimum balance requirement
-        remaining_balance = from_account.available_balance - request.amount
-        if remaining_balance < from_account.minimum_balance:
-            raise InsufficientFundsException(from_account.available_balance, request.amount)
-        
-        # Process transfer
         try:
-            # Update balances
-            self.account_repo.update_balance(
-                from_account.id,
-                float(from_account.current_balance - request.amount),
-                float(from_account.available_balance - request.amount)
-            )
-            
-            self.account_repo.update_balance(
-                to_account.id,
-                float(to_account.current_balance + request.amount),
-                float(to_account.available_balance + request.amount)
-            )
-            
-            # Create transaction records
-            # Debit transaction for source account
-            self.transaction_repo.create_transaction(
-                user_id=user_id,
-                account_id=from_account.id,
-                transaction_type=TransactionTypeEnum.TRANSFER_OUT,
-                amount=float(-request.amount),  # Negative for debit
-                currency=request.currency.value if hasattr(request.currency, 'value') else str(request.currency),
-                description=f"Transfer to account {to_account.account_number}",
-                status=TransactionStatusEnum.COMPLETED,
-                direction=TransactionDirectionEnum.OUTBOUND
-            )
-            
-            # Credit transaction for destination account
-            self.transaction_repo.create_transaction(
-                user_id=user_id,
-                account_id=to_account.id,
-                transaction_type=TransactionTypeEnum.TRANSFER_IN,
-                amount=float(request.amount),  # Positive for credit
-                currency=request.currency.value if hasattr(request.currency, 'value') else str(request.currency),
-                description=f"Transfer from account {from_account.account_number}",
-                status=TransactionStatusEnum.COMPLETED,
-                direction=TransactionDirectionEnum.INBOUND
-            )
-            
-            logger.info(f"Transfer completed successfully between accounts")
-            return {
-                "from_account": request.from_account_id,
-                "to_account": request.to_account_id,
-                "amount": request.amount,
-                "currency": request.currency,
-                "status": "completed",
-                "completed_at": datetime.utcnow(),
-                "fee": Decimal("0.00")  # No fee for internal transfers
-            }
+            with self.uow:
+                # Lock both accounts; validation below sees the locked rows
+                accounts = self.account_repo.lock_accounts_for_update(
+                    [request.from_account_id, request.to_account_id]
+                )
+                from_account = self._get_locked_account(accounts, request.from_account_id, user_id)
+                to_account = self._get_locked_account(accounts, request.to_account_id, user_id)
+                
+                # Validate accounts are active
+                if from_account.status != AccountStatusEnum.ACTIVE:
+                    raise BusinessRuleViolationException("ACCOUNT_STATUS", "Source account is not active")
+                if to_account.status != AccountStatusEnum.ACTIVE:
+                    raise BusinessRuleViolationException("ACCOUNT_STATUS", "Destination account is not active")
+                
+                # Check sufficient funds and minimum balance requirement
+                available = Decimal(str(from_account.available_balance))
+                minimum_balance = Decimal(str(from_account.minimum_balance or 0))
+                if available - amount < minimum_balance:
+                    raise InsufficientFundsException(available, amount)
+                
+                # Guarded SQL debit also covers backends without row locks (SQLite)
+                if not self.account_repo.apply_balance_delta(from_account.id, -amount,
+                                                             enforce_minimum_balance=True):
+                    raise InsufficientFundsException(available, amount)
+                self.account_repo.apply_balance_delta(to_account.id, amount)
+                
+                # Journal rows for both legs, linked by a shared reference
+                reference = f"TRF-{uuid.uuid4().hex[:16].upper()}"
+                currency = from_account.currency
+                common = {
+                    "user_id": user_id,
+                    "amount": amount,
+                    "currency": currency,
+                    "status": TransactionStatusEnum.COMPLETED,
+                    "payment_method": PaymentMethodEnum.BANK_TRANSFER,
+                    "merchant_category": MerchantCategoryEnum.TRANSFER,
+                    "notes": request.description,
+                }
+                self.transaction_repo.insert_transactions([
+                    {
+                        **common,
+                        "account_id": from_account.id,
+                        "transaction_type": TransactionTypeEnum.TRANSFER_OUT,
+                        "direction": TransactionDirectionEnum.OUTBOUND,
+                        "description": f"Transfer to account {to_account.account_number}",
+                        "reference_number": f"{reference}-DR",
+                        "balance_after": Decimal(str(from_account.current_balance)) - amount,
+                    },
+                    {
+                        **common,
+                        "account_id": to_account.id,
+                        "transaction_type": TransactionTypeEnum.TRANSFER_IN,
+                        "direction": TransactionDirectionEnum.INBOUND,
+                        "description": f"Transfer from account {from_account.account_number}",
+                        "reference_number": f"{reference}-CR",
+                        "balance_after": Decimal(str(to_account.current_balance)) + amount,
+                    },
+                ])
             
+        except FintechException:
+            raise
         except Exception as e:
             logger.error(f"Transfer failed: {e}")
             raise BusinessRuleViolationException("TRANSFER_FAILED", f"Transfer failed: {str(e)}")
+        
+        logger.info(f"Transfer completed successfully between accounts")
+        return {
+            "from_account": request.from_account_id,
+            "to_account": request.to_account_id,
+            "amount": amount,
+            "currency": currency,
+            "reference_number": reference,
+            "status": "completed",
+            "completed_at": datetime.utcnow(),
+            "fee": Decimal("0.00")  # No fee for internal transfers
+        }
     
     def get_account_transactions(self, account_id: str, user_id: str, 
                                limit: int = 50, offset: int = 0) -> List[Transaction]:
@@ -313,33 +341,31 @@ class DatabaseAccountService:
         }
     
     # Private helper methods
+    def _get_locked_account(self, accounts: Dict[str, Account], account_id: str,
+                            user_id: str) -> Account:
+        """Pick an account out of a locked set, checking existence and ownership."""
+        account = accounts.get(account_id)
+        if not account:
+            raise AccountNotFoundException(f"Account {account_id} not found")
+        if account.user_id != user_id:
+            raise FintechException("You don't have access to this account", "UNAUTHORIZED", 403)
+        return account
+    
     def _generate_account_number(self) -> str:
         """Generate a unique account number."""
         import random
         return f"ACC{random.randint(100000, 999999)}"
     
-    def _process_initial_deposit(self, account: Account, amount: Decimal) -> None:
-        """Process initial deposit for new account."""
-        # Update account balance
-        self.account_repo.update_balance(
-            account.id,
-            float(amount),
-            float(amount)
-        )
-        
-        # Create deposit transaction
-        self.transaction_repo.create_transaction(
-            user_id=account.user_id,
-            account_id=account.id,
-            transaction_type=TransactionTypeEnum.DEPOSIT,
-            amount=float(amount),
-            currency=account.currency,
-            description="Initial deposit",
-            status=TransactionStatusEnum.COMPLETED,
-            direction=TransactionDirectionEnum.INBOUND
-        )
-        
+    def _process_initial_deposit(self, account: Account, amount: Decimal) -> Dict[str, Any]:
+        """
+        Credit the initial deposit to a new account.
+
+        Updates the balance on the pending entity and returns the journal row
+        for the caller to insert with the rest of the unit of work.
+        """
+        row = self._credit_account(account, amount, "Initial deposit", PaymentMethodEnum.BANK_TRANSFER)
         logger.info(f"Processed initial deposit of {amount} for account {account.id}")
+        return row
     
     def _calculate_welcome_bonus(self, account_type, initial_deposit: Decimal) -> Decimal:
         """Calculate welcome bonus based on account type and deposit."""
@@ -354,27 +380,29 @@ class DatabaseAccountService:
             return Decimal("25.00")  # $25 bonus for checking with $500+ deposit
         return Decimal("0.00")
     
-    def _apply_welcome_bonus(self, account: Account, bonus_amount: Decimal) -> None:
-        """Apply welcome bonus to account."""
-        # Update account balance
-        new_current = float(account.current_balance + bonus_amount)
-        new_available = float(account.available_balance + bonus_amount)
-        
-        self.account_repo.update_balance(account.id, new_current, new_available)
-        
-        # Create bonus transaction
-        self.transaction_repo.create_transaction(
-            user_id=account.user_id,
-            account_id=account.id,
-            transaction_type=TransactionTypeEnum.DEPOSIT,
-            amount=float(bonus_amount),
-            currency=account.currency,
-            description="Welcome bonus",
-            status=TransactionStatusEnum.COMPLETED,
-            direction=TransactionDirectionEnum.INBOUND
-        )
-        
+    def _apply_welcome_bonus(self, account: Account, bonus_amount: Decimal) -> Dict[str, Any]:
+        """Credit the welcome bonus to an account and return its journal row."""
+        row = self._credit_account(account, bonus_amount, "Welcome bonus", PaymentMethodEnum.OTHER)
         logger.info(f"Applied welcome bonus of {bonus_amount} to account {account.id}")
+        return row
+    
+    def _credit_account(self, account: Account, amount: Decimal, description: str,
+                        payment_method: PaymentMethodEnum) -> Dict[str, Any]:
+        """Add ``amount`` to the account's balances in memory and build the deposit row."""
+        account.current_balance = Decimal(str(account.current_balance or 0)) + amount
+        account.available_balance = Decimal(str(account.available_balance or 0)) + amount
+        return {
+            "user_id": account.user_id,
+            "account_id": account.id,
+            "transaction_type": TransactionTypeEnum.DEPOSIT,
+            "status": TransactionStatusEnum.COMPLETED,
+            "direction": TransactionDirectionEnum.INBOUND,
+            "payment_method": payment_method,
+            "amount": amount,
+            "currency": account.currency,
+            "description": description,
+            "balance_after": account.current_balance,
+        }
     
     def _generate_next_steps(self, account_type) -> List[str]:
         """Generate recommended next steps for new account."""
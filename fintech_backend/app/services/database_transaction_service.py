@@ -2,59 +2,67 @@ from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc
 from ..database.config import get_db
-from ..repositories.database_repository import TransactionRepository, AccountRepository
-from ..models.transaction import TransactionResponse, TransactionCreateRequest, TransactionFilters
-from ..database.models import Transaction as DBTransaction
+from ..repositories.database_repository import (
+    TransactionRepository, AccountRepository, TransactionQueryBuilder
+)
+from ..models.transaction import TransactionCreateRequest, TransactionFilters
+from ..database.models import Transaction as DBTransaction, TransactionTypeEnum
 from ..models.transaction import TransactionType, TransactionStatus
 from ..core.exceptions import AccountNotFoundException, ValidationException
+from ..utils.pagination import next_cursor_for
 import uuid
-from datetime import datetime
+from datetime import datetime, date
 from decimal import Decimal
 
+# Transaction types that add to / take from a balance in summaries
+CREDIT_TRANSACTION_TYPES = frozenset({
+    TransactionTypeEnum.DEPOSIT, TransactionTypeEnum.TRANSFER_IN, TransactionTypeEnum.REFUND,
+    TransactionTypeEnum.INTEREST, TransactionTypeEnum.DIVIDEND, TransactionTypeEnum.SALE,
+    TransactionTypeEnum.SALARY
+})
+DEBIT_TRANSACTION_TYPES = frozenset({
+    TransactionTypeEnum.WITHDRAWAL, TransactionTypeEnum.TRANSFER_OUT, TransactionTypeEnum.PAYMENT,
+    TransactionTypeEnum.FEE, TransactionTypeEnum.PURCHASE, TransactionTypeEnum.ATM_WITHDRAWAL,
+    TransactionTypeEnum.CARD_PAYMENT, TransactionTypeEnum.MOBILE_PAYMENT,
+    TransactionTypeEnum.BILL_PAYMENT, TransactionTypeEnum.LOAN_PAYMENT, TransactionTypeEnum.INVESTMENT
+})
+
+# Columns read by _convert_to_response; list queries project only these
+RESPONSE_COLUMNS = (
+    DBTransaction.id, DBTransaction.user_id, DBTransaction.account_id,
+    DBTransaction.transaction_type, DBTransaction.status, DBTransaction.direction,
+    DBTransaction.amount, DBTransaction.currency, DBTransaction.description,
+    DBTransaction.merchant_name, DBTransaction.merchant_category,
+    DBTransaction.reference_number, DBTransaction.transaction_date,
+    DBTransaction.created_at, DBTransaction.updated_at
+)
+
 class DatabaseTransactionService:
     def __init__(self, db: Session):
         self.db = db
         self.transaction_repository = TransactionRepository(db)
         self.account_repository = AccountRepository(db)
     
-    def get_user_transactions(self, user_id: str, filters: TransactionFilters, db: Session) -> List[TransactionResponse]:
-        """Get transactions for a user with optional filters"""
-        transactions = self.transaction_repository.get_transactions_by_user(
-            user_id, filters.limit, filters.offset
-        )
-        
-        # Apply additional filters
-        filtered_transactions = []
-        for transaction in transactions:
-            # Filter by account if specified
-            if filters.account_id and transaction.account_id != filters.account_id:
-                continue
-            
-            # Filter by type if specified
-            if filters.transaction_type and transaction.transaction_type.value != filters.transaction_type:
-                continue
-            
-            # Filter by status if specified
-            if filters.status and transaction.status.value != filters.status:
-                continue
-            
-            # Filter by date range if specified
-            if filters.start_date and transaction.created_at.date() < filters.start_date:
-                continue
-            if filters.end_date and transaction.created_at.date() > filters.end_date:
-                continue
-            
-            # Filter by amount range if specified
-            if filters.min_amount and transaction.amount < Decimal(str(filters.min_amount)):
-                continue
-            if filters.max_amount and transaction.amount > Decimal(str(filters.max_amount)):
-                continue
-            
-            filtered_transactions.append(transaction)
-        
-        return [self._convert_to_response(transaction) for transaction in filtered_transactions]
+    def get_user_transactions(self, user_id: str, filters: TransactionFilters, db: Session = None) -> Dict[str, Any]:
+        """
+        Get a page of a user's transactions with filters applied in SQL.
+
+        Returns the page, the exact number of matching transactions and
+        whether more pages follow.
+        """
+        rows, total_count = (TransactionQueryBuilder(self.db)
+                             .for_user(user_id)
+                             .apply_filters(filters)
+                             .select_columns(*RESPONSE_COLUMNS)
+                             .fetch_page(filters.limit, filters.offset))
+        
+        return {
+            "transactions": [self._convert_to_response(row) for row in rows],
+            "total_count": total_count,
+            "has_more": filters.offset + len(rows) < total_count
+        }
     
-    def get_transaction_by_id(self, transaction_id: str, user_id: str, db: Session) -> TransactionResponse:
+    def get_transaction_by_id(self, transaction_id: str, user_id: str, db: Session) -> Dict[str, Any]:
         """Get a specific transaction by ID"""
         transaction = self.transaction_repository.get_transaction_by_id(transaction_id)
         if not transaction:
@@ -67,7 +75,7 @@ class DatabaseTransactionService:
         
         return self._convert_to_response(transaction)
     
-    def create_transaction(self, user_id: str, transaction_data: TransactionCreateRequest, db: Session) -> TransactionResponse:
+    def create_transaction(self, user_id: str, transaction_data: TransactionCreateRequest, db: Session) -> Dict[str, Any]:
         """Create a new transaction"""
         # Verify the account exists and belongs to the user
         account = self.account_repository.get_account_by_id(transaction_data.account_id)
@@ -107,7 +115,7 @@ class DatabaseTransactionService:
         
         return self._convert_to_response(updated_transaction)
     
-    def get_account_transactions(self, account_id: str, user_id: str, limit: int = 50, offset: int = 0, db: Session = None) -> List[TransactionResponse]:
+    def get_account_transactions(self, account_id: str, user_id: str, limit: int = 50, offset: int = 0, db: Session = None) -> List[Dict[str, Any]]:
         """Get transactions for a specific account"""
         # Verify account belongs to user
         account = self.account_repository.get_account_by_id(account_id)
@@ -117,33 +125,49 @@ class DatabaseTransactionService:
         transactions = self.transaction_repository.get_transactions_by_account(account_id, limit, offset)
         return [self._convert_to_response(transaction) for transaction in transactions]
     
-    def get_transaction_summary(self, user_id: str, account_id: Optional[str] = None, db: Session = None) -> Dict[str, Any]:
-        """Get transaction summary for user or specific account"""
+    def get_transaction_summary(self, user_id: str, account_id: Optional[str] = None, db: Session = None,
+                                start_date: Optional[date] = None,
+                                end_date: Optional[date] = None) -> Dict[str, Any]:
+        """Get transaction summary for user or specific account, optionally within a date window"""
         if account_id:
             # Verify account belongs to user
             account = self.account_repository.get_account_by_id(account_id)
             if not account or account.user_id != user_id:
                 raise AccountNotFoundException(f"Account with ID {account_id} not found")
-            transactions = self.transaction_repository.get_transactions_by_account(account_id)
-        else:
-            transactions = self.transaction_repository.get_transactions_by_user(user_id)
-        
-        # Calculate summary
-        total_transactions = len(transactions)
-        total_credits = sum(t.amount for t in transactions if t.transaction_type in [TransactionType.CREDIT, TransactionType.DEPOSIT])
-        total_debits = sum(t.amount for t in transactions if t.transaction_type in [TransactionType.DEBIT, TransactionType.WITHDRAWAL])
         
-        # Group by status
-        status_counts = {}
-        for transaction in transactions:
-            status = transaction.status.value
-            status_counts[status] = status_counts.get(status, 0) + 1
+        rows = (TransactionQueryBuilder(self.db)
+                .for_user(user_id)
+                .for_account(account_id)
+                .in_date_range(start_date, end_date)
+                .summarize())
+        return self._build_summary(rows)
+    
+    async def get_transaction_summary_admin(self, db: Session = None,
+                                            start_date: Optional[datetime] = None,
+                                            end_date: Optional[datetime] = None) -> Dict[str, Any]:
+        """Get the system-wide transaction summary, optionally within a date window"""
+        rows = (TransactionQueryBuilder(self.db)
+                .in_date_range(start_date, end_date)
+                .summarize())
+        return self._build_summary(rows)
+    
+    def _build_summary(self, rows) -> Dict[str, Any]:
+        """Fold ``(status, transaction_type, count, total_amount)`` groups into a summary"""
+        total_transactions = 0
+        total_credits = Decimal("0")
+        total_debits = Decimal("0")
+        status_counts: Dict[str, int] = {}
+        type_counts: Dict[str, int] = {}
         
-        # Group by type
-        type_counts = {}
-        for transaction in transactions:
-            tx_type = transaction.transaction_type.value
-            type_counts[tx_type] = type_counts.get(tx_type, 0) + 1
+        for row in rows:
+            amount = Decimal(str(row.total_amount or 0))
+            total_transactions += row.count
+            if row.transaction_type in CREDIT_TRANSACTION_TYPES:
+                total_credits += amount
+            elif row.transaction_type in DEBIT_TRANSACTION_TYPES:
+                total_debits += amount
+            status_counts[row.status.value] = status_counts.get(row.status.value, 0) + row.count
+            type_counts[row.transaction_type.value] = type_counts.get(row.transaction_type.value, 0) + row.count
         
         return {
             "total_transactions": total_transactions,
@@ -154,6 +178,63 @@ class DatabaseTransactionService:
             "type_breakdown": type_counts
         }
     
+    async def get_transactions_admin(self, db: Session, page: int = 1, limit: int = 20,
+                                     filters: Optional[Dict[str, Any]] = None,
+                                     cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        List transactions across all users for the admin console, newest first.
+
+        Pages with keyset cursors over ``(transaction_date, id)``; ``page`` is
+        only honoured (as an offset) when no cursor is given. The exact total
+        is counted on the first request of a listing and omitted on follow-up
+        cursor pages.
+        """
+        filters = filters or {}
+        query = (self._admin_query_builder(filters)
+                 .select_columns(*RESPONSE_COLUMNS)
+                 .query())
+        
+        if cursor or page == 1:
+            transactions, next_cursor = self.transaction_repository.keyset_page(query, limit, cursor)
+        else:
+            rows = (TransactionRepository.apply_keyset(query)
+                    .offset((page - 1) * limit)
+                    .limit(limit + 1)
+                    .all())
+            transactions, next_cursor = next_cursor_for(rows, limit)
+        
+        total = None if cursor else query.order_by(None).count()
+        return {
+            "transactions": [self._convert_to_response(t) for t in transactions],
+            "total": total,
+            "pages": (total + limit - 1) // limit if total is not None else None,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None
+        }
+    
+    def _admin_query_builder(self, filters: Dict[str, Any]) -> TransactionQueryBuilder:
+        """Translate the admin filter dict into a query builder."""
+        try:
+            start_date = self._parse_admin_date(filters.get("start_date"))
+            end_date = self._parse_admin_date(filters.get("end_date"))
+        except ValueError as e:
+            raise ValidationException(f"Invalid transaction filter: {e}")
+        return (TransactionQueryBuilder(self.db)
+                .for_user(filters.get("user_id"))
+                .with_status(filters.get("status"))
+                .with_type(filters.get("type"))
+                .in_date_range(start_date, end_date)
+                .with_amount_range(filters.get("min_amount"), filters.get("max_amount")))
+    
+    @staticmethod
+    def _parse_admin_date(value: Optional[str]):
+        """Parse YYYY-MM-DD as a whole day, anything longer as an exact timestamp."""
+        if not value:
+            return None
+        if len(value) == 10:
+            return date.fromisoformat(value)
+        return datetime.fromisoformat(value)
+    
     def _update_account_balance(self, account, transaction: DBTransaction, db: Session):
         """Update account balance based on transaction type"""
         amount = transaction.amount
@@ -172,18 +253,22 @@ class DatabaseTransactionService:
             "updated_at": datetime.utcnow()
         })
     
-    def _convert_to_response(self, transaction: DBTransaction) -> TransactionResponse:
-        """Convert database transaction to response model"""
-        return TransactionResponse(
-            id=transaction.id,
-            account_id=transaction.account_id,
-            transaction_type=transaction.transaction_type.value,
-            amount=float(transaction.amount),
-            currency=transaction.currency,
-            description=transaction.description,
-            reference=transaction.reference,
-            status=transaction.status.value,
-            metadata=transaction.metadata,
-            created_at=transaction.created_at,
-            updated_at=transaction.updated_at
-        )
+    def _convert_to_response(self, transaction) -> Dict[str, Any]:
+        """Convert a database transaction (entity or RESPONSE_COLUMNS row) to a response dict"""
+        return {
+            "id": transaction.id,
+            "user_id": transaction.user_id,
+            "account_id": transaction.account_id,
+            "transaction_type": transaction.transaction_type.value,
+            "status": transaction.status.value,
+            "direction": transaction.direction.value,
+            "amount": float(transaction.amount),
+            "currency": transaction.currency,
+            "description": transaction.description,
+            "merchant_name": transaction.merchant_name,
+            "merchant_category": transaction.merchant_category.value if transaction.merchant_category else None,
+            "reference_number": transaction.reference_number,
+            "transaction_date": transaction.transaction_date,
+            "created_at": transaction.created_at,
+            "updated_at": transaction.updated_at
+        }
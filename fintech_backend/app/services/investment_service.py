@@ -18,10 +18,13 @@ from ..models.investment import (
 )
 from ..models.base import PaginationRequest
 from ..core.exceptions import NotFoundError, ValidationError, BusinessLogicError
+from ..repositories.seeding import LazyMockData
 
 
-class InvestmentService:
+class InvestmentService(LazyMockData):
     """Service for handling investment management operations."""
+
+    _lazy_attributes = ("portfolios", "holdings", "orders", "watchlists", "market_data", "dividend_payments")
     
     def __init__(self):
         # Mock data storage - replace with actual database
@@ -31,9 +34,6 @@ class InvestmentService:
         self.watchlists: Dict[str, List[Watchlist]] = {}  # user_id -> watchlists
         self.market_data: Dict[str, MarketData] = {}
         self.dividend_payments: Dict[str, List[DividendPayment]] = {}  # portfolio_id -> dividends
-        
-        # Initialize with mock data
-        self._initialize_mock_data()
     
     def _initialize_mock_data(self):
         """Initialize with mock investment data."""
@@ -58,13 +58,13 @@ class InvestmentService:
                 previous_close=previous,
                 day_change=day_change,
                 day_change_percent=day_change_percent,
-                volume=random.randint(1000000, 50000000),
-                market_cap=Decimal(str(random.uniform(50, 3000))) * Decimal("1000000000") if asset_type == AssetType.STOCK else None,
-                pe_ratio=Decimal(str(random.uniform(15, 35))) if asset_type == AssetType.STOCK else None,
-                dividend_yield=Decimal(str(random.uniform(0.5, 4.0))),
+                volume=self.rng.randint(1000000, 50000000),
+                market_cap=Decimal(str(self.rng.uniform(50, 3000))) * Decimal("1000000000") if asset_type == AssetType.STOCK else None,
+                pe_ratio=Decimal(str(self.rng.uniform(15, 35))) if asset_type == AssetType.STOCK else None,
+                dividend_yield=Decimal(str(self.rng.uniform(0.5, 4.0))),
                 week_52_high=current * Decimal("1.15"),
                 week_52_low=current * Decimal("0.85"),
-                beta=Decimal(str(random.uniform(0.8, 1.5)))
+                beta=Decimal(str(self.rng.uniform(0.8, 1.5)))
             )
         
         # Mock portfolio for user_123
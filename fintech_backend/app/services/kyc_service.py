@@ -30,17 +30,17 @@ from ..models.kyc import (
 )
 from ..core.exceptions import ValidationError, NotFoundError, ConflictError
 from ..repositories.mock_repository import MockRepository
+from ..repositories.seeding import LazyMockData
+
+class KYCService(LazyMockData):
+    _lazy_attributes = ("repository",)
 
-class KYCService:
     def __init__(self):
         self.repository = MockRepository()
         # In production, this would be a proper file storage service
         self.file_storage_path = "/tmp/kyc_documents"
-        
-        # Initialize mock data
-        self._init_mock_data()
     
-    def _init_mock_data(self):
+    def _initialize_mock_data(self):
         """Initialize mock KYC data"""
         mock_kyc_profiles = [
             {
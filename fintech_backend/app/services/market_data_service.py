@@ -11,20 +11,22 @@ from ..models.market_data import (
     MarketDataType, MarketStatus, TimeInterval, TrendDirection
 )
 from ..core.exceptions import NotFoundError, ValidationError, BusinessLogicError
+from ..repositories.seeding import LazyMockData, seeded_uuid
+
+class MarketDataService(LazyMockData):
+    _lazy_attributes = ("watchlists", "alerts", "cache")
 
-class MarketDataService:
     def __init__(self):
         # Mock data storage
         self.watchlists: Dict[str, WatchlistDB] = {}
         self.alerts: Dict[str, MarketAlertDB] = {}
         self.cache: Dict[str, MarketDataCacheDB] = {}
-        self._initialize_mock_data()
     
     def _initialize_mock_data(self):
         """Initialize with sample market data"""
         # Sample watchlist
         user_id = "user_123"
-        watchlist_id = str(uuid.uuid4())
+        watchlist_id = str(seeded_uuid(self.rng))
         self.watchlists[watchlist_id] = WatchlistDB(
             id=watchlist_id,
             user_id=user_id,
@@ -55,7 +57,7 @@ class MarketDataService:
         ]
         
         for alert_info in alert_data:
-            alert_id = str(uuid.uuid4())
+            alert_id = str(seeded_uuid(self.rng))
             self.alerts[alert_id] = MarketAlertDB(
                 id=alert_id,
                 user_id=user_id,
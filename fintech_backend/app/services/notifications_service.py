@@ -11,20 +11,23 @@ from ..models.notifications import (
 )
 from ..core.exceptions import NotFoundError, ValidationError, BusinessLogicError
 from ..core.websocket import broadcast_notification
+from ..repositories.seeding import LazyMockData, seeded_uuid
+
+class NotificationsService(LazyMockData):
+    _lazy_attributes = ("notifications", "preferences", "deliveries")
 
-class NotificationsService:
     def __init__(self):
         # Mock data storage
         self.notifications: Dict[str, NotificationDB] = {}
         self.preferences: Dict[str, NotificationPreferencesDB] = {}
         self.deliveries: Dict[str, NotificationDeliveryDB] = {}
-        self._initialize_mock_data()
+        self._persist_attributes("notifications", "preferences", "deliveries")
     
     def _initialize_mock_data(self):
         """Initialize with sample notifications and preferences"""
         # Sample user preferences
         user_id = "user_123"
-        prefs_id = str(uuid.uuid4())
+        prefs_id = str(seeded_uuid(self.rng))
         self.preferences[user_id] = NotificationPreferencesDB(
             id=prefs_id,
             user_id=user_id,
@@ -100,7 +103,7 @@ class NotificationsService:
         ]
         
         for i, notif_data in enumerate(notifications_data):
-            notif_id = str(uuid.uuid4())
+            notif_id = str(seeded_uuid(self.rng))
             self.notifications[notif_id] = NotificationDB(
                 id=notif_id,
                 user_id=user_id,
@@ -338,6 +341,7 @@ class NotificationsService:
             notification.read_at = datetime.utcnow()
         
         notification.updated_at = datetime.utcnow()
+        self.notifications.touch(notification_id)
         
         return NotificationProfile(
             id=notification.id,
@@ -378,6 +382,7 @@ class NotificationsService:
                 if request.status == NotificationStatus.READ and not notification.read_at:
                     notification.read_at = datetime.utcnow()
                 notification.updated_at = datetime.utcnow()
+                self.notifications.touch(notification_id)
                 
                 results[notification_id] = "updated"
             except Exception:
@@ -460,6 +465,7 @@ class NotificationsService:
             prefs.quiet_hours_end = request.quiet_hours_end
             prefs.timezone = request.timezone
             prefs.updated_at = now
+            self.preferences.touch(user_id)
         else:
             prefs_id = str(uuid.uuid4())
             prefs = NotificationPreferencesDB(
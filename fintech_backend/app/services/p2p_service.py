@@ -19,10 +19,13 @@ from ..models.p2p import (
 )
 from ..models.base import PaginationRequest
 from ..core.exceptions import NotFoundError, ValidationError, BusinessLogicError
+from ..repositories.seeding import LazyMockData
 
 
-class P2PService:
+class P2PService(LazyMockData):
     """Service for handling peer-to-peer money operations."""
+
+    _lazy_attributes = ("p2p_transactions", "money_requests", "split_bills", "payment_links", "contacts")
     
     def __init__(self):
         # Mock data storage - replace with actual database
@@ -31,9 +34,9 @@ class P2PService:
         self.split_bills: Dict[str, SplitBill] = {}
         self.payment_links: Dict[str, PaymentLink] = {}
         self.contacts: Dict[str, List[P2PContact]] = {}  # user_id -> contacts
-        
-        # Initialize with some mock data
-        self._initialize_mock_data()
+        self._persist_attributes(
+            "p2p_transactions", "money_requests", "split_bills", "payment_links", "contacts"
+        )
     
     def _initialize_mock_data(self):
         """Initialize with mock P2P data."""
@@ -126,6 +129,7 @@ class P2PService:
         if user_id not in self.contacts:
             self.contacts[user_id] = []
         self.contacts[user_id].append(contact)
+        self.contacts.touch(user_id)
         
         return contact
     
@@ -137,6 +141,7 @@ class P2PService:
         for contact in contacts:
             if contact.contact_id == contact_id:
                 contact.is_favorite = is_favorite
+                self.contacts.touch(user_id)
                 return contact
         
         raise NotFoundError("Contact not found")
@@ -256,6 +261,7 @@ class P2PService:
                 requests_created.append(money_request.request_id)
         
         split_bill.requests_created = requests_created
+        self.split_bills.touch(split_bill.split_bill_id)
         
         return split_bill
     
@@ -384,6 +390,7 @@ class P2PService:
         
         transaction.status = P2PStatus.CANCELLED
         transaction.completed_at = datetime.utcnow()
+        self.p2p_transactions.touch(transaction.transaction_id)
         
         return transaction
     
@@ -487,6 +494,7 @@ class P2PService:
         else:
             raise ValidationError("Invalid action. Use 'accept' or 'decline'")
         
+        self.money_requests.touch(money_request.request_id)
         return money_request
     
     async def cancel_money_request(self, user_id: str, request_id: str) -> MoneyRequest:
@@ -504,6 +512,7 @@ class P2PService:
         
         money_request.status = P2PRequestStatus.CANCELLED
         money_request.completed_at = datetime.utcnow()
+        self.money_requests.touch(money_request.request_id)
         
         return money_request
     
@@ -678,6 +687,7 @@ class P2PService:
         payment_link.current_uses += 1
         payment_link.payments_received.append(transaction.transaction_id)
         payment_link.total_received += request.amount
+        self.payment_links.touch(payment_link.link_id)
         
         # Simulate async processing
         asyncio.create_task(self._process_p2p_transaction(transaction.transaction_id))
@@ -696,6 +706,7 @@ class P2PService:
             raise NotFoundError("Payment link not found")
         
         payment_link.is_active = False
+        self.payment_links.touch(link_id)
         
         return payment_link
     
@@ -837,6 +848,7 @@ class P2PService:
             else:
                 transaction.status = P2PStatus.FAILED
                 transaction.completed_at = datetime.utcnow()
+            self.p2p_transactions.touch(transaction_id)
     
     async def _send_money_request_notification(self, money_request: MoneyRequest):
         """Simulate sending money request notification."""
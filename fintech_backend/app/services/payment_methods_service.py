@@ -22,18 +22,18 @@ from ..models.payment_methods import (
 )
 from ..core.exceptions import ValidationError, NotFoundError, ConflictError
 from ..repositories.mock_repository import MockRepository
+from ..repositories.seeding import LazyMockData
+
+class PaymentMethodsService(LazyMockData):
+    _lazy_attributes = ("repository",)
 
-class PaymentMethodsService:
     def __init__(self):
         self.repository = MockRepository()
         # In production, this would be loaded from environment variables
         self.encryption_key = Fernet.generate_key()
         self.cipher_suite = Fernet(self.encryption_key)
-        
-        # Initialize mock data
-        self._init_mock_data()
     
-    def _init_mock_data(self):
+    def _initialize_mock_data(self):
         """Initialize mock payment methods data"""
         mock_payment_methods = [
             {
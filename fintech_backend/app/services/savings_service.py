@@ -26,15 +26,15 @@ from ..models.savings import (
 )
 from ..core.exceptions import ValidationError, NotFoundError, ConflictError
 from ..repositories.mock_repository import MockRepository
+from ..repositories.seeding import LazyMockData
+
+class SavingsService(LazyMockData):
+    _lazy_attributes = ("repository",)
 
-class SavingsService:
     def __init__(self):
         self.repository = MockRepository()
-        
-        # Initialize mock data
-        self._init_mock_data()
     
-    def _init_mock_data(self):
+    def _initialize_mock_data(self):
         """Initialize mock savings data"""
         mock_goals = [
             {
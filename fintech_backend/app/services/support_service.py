@@ -1,7 +1,6 @@
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 import uuid
-import random
 from ..models.support import (
     SupportTicketRequest, TicketMessageRequest, TicketUpdateRequest, 
     FAQSearchRequest, FeedbackRequest,
@@ -11,8 +10,11 @@ from ..models.support import (
     TicketStatus, TicketPriority, TicketCategory, FAQCategory, SupportChannelType
 )
 from ..core.exceptions import NotFoundError, ValidationError, BusinessLogicError
+from ..repositories.seeding import LazyMockData, seeded_uuid
+
+class SupportService(LazyMockData):
+    _lazy_attributes = ("tickets", "messages", "faqs", "feedback", "help_articles", "_ticket_counter")
 
-class SupportService:
     def __init__(self):
         # Mock data storage
         self.tickets: Dict[str, SupportTicketDB] = {}
@@ -21,7 +23,9 @@ class SupportService:
         self.feedback: Dict[str, FeedbackDB] = {}
         self.help_articles: Dict[str, HelpArticleDB] = {}
         self._ticket_counter = 1000
-        self._initialize_mock_data()
+        if self._persist_attributes("tickets", "messages", "faqs", "feedback", "help_articles"):
+            # Ticket numbers are sequential from 1000
+            self._ticket_counter += len(self.tickets)
     
     def _initialize_mock_data(self):
         """Initialize with sample support data"""
@@ -61,16 +65,16 @@ class SupportService:
         ]
         
         for i, ticket_info in enumerate(ticket_data):
-            ticket_id = str(uuid.uuid4())
+            ticket_id = str(seeded_uuid(self.rng))
             ticket_number = f"TKT-{self._ticket_counter + i}"
             
             self.tickets[ticket_id] = SupportTicketDB(
                 id=ticket_id,
                 ticket_number=ticket_number,
                 user_id=user_id,
-                created_at=datetime.utcnow() - timedelta(days=random.randint(1, 7)),
-                updated_at=datetime.utcnow() - timedelta(hours=random.randint(1, 24)),
-                last_activity_at=datetime.utcnow() - timedelta(hours=random.randint(1, 12)),
+                created_at=datetime.utcnow() - timedelta(days=self.rng.randint(1, 7)),
+                updated_at=datetime.utcnow() - timedelta(hours=self.rng.randint(1, 24)),
+                last_activity_at=datetime.utcnow() - timedelta(hours=self.rng.randint(1, 12)),
                 **ticket_info
             )
             
@@ -128,13 +132,13 @@ class SupportService:
         ]
         
         for faq_info in faq_data:
-            faq_id = str(uuid.uuid4())
+            faq_id = str(seeded_uuid(self.rng))
             self.faqs[faq_id] = FAQDB(
                 id=faq_id,
-                created_at=datetime.utcnow() - timedelta(days=random.randint(30, 90)),
-                updated_at=datetime.utcnow() - timedelta(days=random.randint(1, 30)),
+                created_at=datetime.utcnow() - timedelta(days=self.rng.randint(30, 90)),
+                updated_at=datetime.utcnow() - timedelta(days=self.rng.randint(1, 30)),
                 is_published=True,
-                not_helpful_count=random.randint(2, 15),
+                not_helpful_count=self.rng.randint(2, 15),
                 **faq_info
             )
         
@@ -163,13 +167,13 @@ class SupportService:
         ]
         
         for article_info in article_data:
-            article_id = str(uuid.uuid4())
+            article_id = str(seeded_uuid(self.rng))
             self.help_articles[article_id] = HelpArticleDB(
                 id=article_id,
-                created_at=datetime.utcnow() - timedelta(days=random.randint(60, 120)),
-                updated_at=datetime.utcnow() - timedelta(days=random.randint(1, 30)),
+                created_at=datetime.utcnow() - timedelta(days=self.rng.randint(60, 120)),
+                updated_at=datetime.utcnow() - timedelta(days=self.rng.randint(1, 30)),
                 is_published=True,
-                not_helpful_count=random.randint(5, 25),
+                not_helpful_count=self.rng.randint(5, 25),
                 **article_info
             )
     
@@ -200,7 +204,7 @@ class SupportService:
         ]
         
         for msg_data in messages_data:
-            msg_id = str(uuid.uuid4())
+            msg_id = str(seeded_uuid(self.rng))
             self.messages[msg_id] = TicketMessageDB(
                 id=msg_id,
                 ticket_id=ticket_id,
@@ -347,6 +351,7 @@ class SupportService:
         
         ticket.last_activity_at = datetime.utcnow()
         ticket.updated_at = datetime.utcnow()
+        self.tickets.touch(ticket_id)
         
         message = await self._add_ticket_message(
             ticket_id=ticket_id,
@@ -402,6 +407,7 @@ class SupportService:
         result_items = []
         for faq, _ in limited_faqs:
             faq.view_count += 1  # Increment view count
+            self.faqs.touch(faq.id)
             result_items.append(FAQItem(
                 id=faq.id,
                 question=faq.question,
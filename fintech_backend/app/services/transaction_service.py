@@ -5,9 +5,11 @@ Now uses Plaid as the primary source for transaction data.
 
 import uuid
 import time
+from collections import OrderedDict
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from bisect import bisect_left, bisect_right
 from difflib import SequenceMatcher
 
 from ..models.transaction import (
@@ -23,11 +25,53 @@ from ..core.exceptions import (
 )
 from ..data.repository import get_repository_manager
 from ..utils.validators import validate_user_exists
+from ..utils.pagination import encode_cursor, decode_cursor
+from ..utils.search import TextSearchIndex
 from ..config.logging import get_logger
 from .plaid_service import get_plaid_service
 
 logger = get_logger(__name__)
 
+# Per-user text search indexes over Plaid transactions, least recently used first
+MAX_SEARCH_INDEXES = 256
+_search_indexes: "OrderedDict[str, _UserSearchIndex]" = OrderedDict()
+
+
+class _UserSearchIndex:
+    """
+    A user's search index and the transactions it holds.
+
+    ``high_water`` is the newest ``updated_at`` indexed. A sync only indexes
+    transactions updated after it and ids not seen yet, so a renamed
+    transaction is re-indexed and unchanged ones are left alone. A complete
+    sync (every transaction the user has in the window) also drops ids that
+    are gone.
+    """
+
+    def __init__(self):
+        self.index = TextSearchIndex()
+        self.transactions: Dict[str, Any] = {}
+        self.high_water: Optional[datetime] = None
+
+    def sync(self, transactions: List[Any], complete: bool = False) -> None:
+        known, high_water = self.transactions, self.high_water
+        for transaction in transactions:
+            updated_at = transaction.updated_at
+            if high_water is not None and updated_at <= high_water and transaction.transaction_id in known:
+                continue
+            known[transaction.transaction_id] = transaction
+            self.index.add(
+                transaction.transaction_id,
+                (transaction.name, transaction.merchant_name),
+                sort_key=(str(transaction.date), transaction.transaction_id)
+            )
+            if self.high_water is None or updated_at > self.high_water:
+                self.high_water = updated_at
+        if complete and len(known) > len(transactions):
+            for transaction_id in known.keys() - {t.transaction_id for t in transactions}:
+                del known[transaction_id]
+                self.index.remove(transaction_id)
+
 
 class TransactionService:
     """Service for managing financial transactions via Plaid."""
@@ -80,13 +124,14 @@ class TransactionService:
             account_transactions = [t for t in plaid_transactions if t.account_id == account.account_id]
             all_transactions.extend(account_transactions)
         
+        # Apply search query if provided; an unfiltered default window is the user's whole index
+        if request.search_query:
+            complete = not (request.account_id or request.start_date or request.end_date)
+            all_transactions = self._apply_search(all_transactions, request.search_query, user_id, complete)
+        
         # Apply additional filters
         filtered_transactions = await self._apply_filters(all_transactions, request)
         
-        # Apply search query if provided
-        if request.search_query:
-            filtered_transactions = self._apply_search(filtered_transactions, request.search_query)
-        
         # Sort transactions
         sorted_transactions = self._sort_transactions(
             filtered_transactions, request.sort_by, request.sort_order
@@ -94,21 +139,34 @@ class TransactionService:
         
         # Apply pagination
         total_count = len(sorted_transactions)
-        paginated_transactions = sorted_transactions[request.offset:request.offset + request.limit]
+        next_cursor = None
+        if request.cursor:
+            if request.sort_by not in ("transaction_date", "date"):
+                raise ValidationError("Cursor pagination requires sort_by=transaction_date", "cursor")
+            paginated_transactions, next_cursor = self._keyset_slice(
+                sorted_transactions, request.cursor, request.limit,
+                descending=request.sort_order.lower() == "desc"
+            )
+            has_more = next_cursor is not None
+        else:
+            paginated_transactions = sorted_transactions[request.offset:request.offset + request.limit]
+            has_more = (request.offset + request.limit) < total_count
+            if has_more and paginated_transactions and request.sort_by in ("transaction_date", "date"):
+                last = paginated_transactions[-1]
+                next_cursor = encode_cursor(date.fromisoformat(last.date), last.transaction_id)
         
         # Generate summary
         summary = self._calculate_transaction_summary(
             filtered_transactions, request.start_date, request.end_date
         )
         
-        has_more = (request.offset + request.limit) < total_count
-        
         logger.info(f"Found {total_count} Plaid transactions, returning {len(paginated_transactions)}")
         return {
             "transactions": paginated_transactions,
             "total_count": total_count,
             "summary": summary,
-            "has_more": has_more
+            "has_more": has_more,
+            "next_cursor": next_cursor
         }
     
     async def get_transaction_details(self, transaction_id: str, user_id: str) -> Dict[str, Any]:
@@ -186,7 +244,9 @@ class TransactionService:
                 matching_transactions.append(transaction)
         
         # Generate search suggestions
-        suggestions = self._generate_search_suggestions(request.query, all_transactions)
+        suggestions = self._generate_search_suggestions(
+            request.query, all_transactions, user_id, complete=not request.filters
+        )
         
         search_time = (time.time() - start_time) * 1000  # Convert to milliseconds
         
@@ -360,23 +420,41 @@ class TransactionService:
         
         return filtered
     
-    def _apply_search(self, transactions: List[Any], query: str) -> List[Any]:
-        """Apply text search to Plaid transactions."""
-        query_lower = query.lower()
-        matching = []
-        
-        for transaction in transactions:
-            # Search in transaction name
-            if query_lower in transaction.name.lower():
-                matching.append(transaction)
-                continue
-            
-            # Search in merchant name
-            if transaction.merchant_name and query_lower in transaction.merchant_name.lower():
-                matching.append(transaction)
-                continue
-        
-        return matching
+    def _apply_search(
+        self,
+        transactions: List[Any],
+        query: str,
+        user_id: Optional[str] = None,
+        complete: bool = False
+    ) -> List[Any]:
+        """
+        Apply text search (name or merchant name) to Plaid transactions, best matches first.
+
+        ``complete`` says ``transactions`` is everything the user has in the
+        window, so no per-request restriction of the index is needed.
+        """
+        entry = self._search_index(transactions, user_id, complete)
+        allowed = None if complete else {transaction.transaction_id for transaction in transactions}
+        return [entry.transactions[transaction_id] for transaction_id in entry.index.search(query, allowed=allowed)]
+    
+    def _search_index(
+        self,
+        transactions: List[Any],
+        user_id: Optional[str] = None,
+        complete: bool = False
+    ) -> _UserSearchIndex:
+        """The user's search index, brought up to date with ``transactions``."""
+        entry = _search_indexes.get(user_id) if user_id else None
+        if entry is None:
+            entry = _UserSearchIndex()
+            if user_id:
+                _search_indexes[user_id] = entry
+                while len(_search_indexes) > MAX_SEARCH_INDEXES:
+                    _search_indexes.popitem(last=False)
+        else:
+            _search_indexes.move_to_end(user_id)
+        entry.sync(transactions, complete)
+        return entry
     
     def _sort_transactions(
         self, 
@@ -392,12 +470,45 @@ class TransactionService:
                 return sorted(transactions, key=lambda x: abs(x.amount), reverse=reverse)
             elif sort_by == "merchant_name":
                 return sorted(transactions, key=lambda x: x.merchant_name or "", reverse=reverse)
-            else:  # Default to date
-                return sorted(transactions, key=lambda x: x.date, reverse=reverse)
+            else:  # Default to date, id breaks ties so cursor pages are stable
+                return sorted(transactions, key=lambda x: (x.date, x.transaction_id), reverse=reverse)
         except Exception as e:
             logger.warning(f"Failed to sort by {sort_by}, using default sort: {e}")
             return sorted(transactions, key=lambda x: x.date, reverse=True)
     
+    def _keyset_slice(
+        self,
+        transactions: List[Any],
+        cursor: str,
+        limit: int,
+        descending: bool = True
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Take the page following ``cursor`` from transactions sorted by (date, id).
+
+        Binary-searches the sorted list for the cursor key instead of counting
+        an offset, so the page stays aligned even if transactions were added
+        since the last page. Keys are read only at the O(log N) probed
+        positions; no key list is built.
+        """
+        cursor_date, cursor_id = decode_cursor(cursor)
+        cursor_key = (cursor_date.isoformat(), cursor_id)
+        key = lambda t: (t.date, t.transaction_id)
+        
+        if descending:
+            # First position whose key falls below the cursor
+            start = bisect_left(range(len(transactions)), True, key=lambda i: key(transactions[i]) < cursor_key)
+        else:
+            start = bisect_right(transactions, cursor_key, key=key)
+        page = transactions[start:start + limit]
+        remaining = len(transactions) - start - len(page)
+        
+        next_cursor = None
+        if remaining > 0 and page:
+            last = page[-1]
+            next_cursor = encode_cursor(date.fromisoformat(last.date), last.transaction_id)
+        return page, next_cursor
+    
     def _calculate_transaction_summary(
         self, 
         transactions: List[Any],
@@ -523,27 +634,14 @@ class TransactionService:
     def _generate_search_suggestions(
         self, 
         query: str, 
-        transactions: List[Any]
+        transactions: List[Any],
+        user_id: Optional[str] = None,
+        complete: bool = False
     ) -> List[str]:
         """Generate search suggestions based on Plaid transaction data."""
-        suggestions = set()
-        query_lower = query.lower()
-        
-        for transaction in transactions[:100]:  # Limit for performance
-            # From transaction name
-            words = transaction.name.lower().split()
-            for word in words:
-                if len(word) > 3 and query_lower in word:
-                    suggestions.add(word)
-            
-            # From merchant name
-            if transaction.merchant_name:
-                merchant_words = transaction.merchant_name.lower().split()
-                for word in merchant_words:
-                    if len(word) > 3 and query_lower in word:
-                        suggestions.add(word)
-        
-        return sorted(list(suggestions))[:5]
+        entry = self._search_index(transactions, user_id, complete)
+        allowed = None if complete else {transaction.transaction_id for transaction in transactions}
+        return entry.index.suggest(query, limit=5, allowed=allowed)
 
 
 # Dependency provider
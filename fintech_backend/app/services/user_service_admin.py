@@ -6,7 +6,7 @@ import secrets
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case
 
 from ..core.exceptions import ValidationException, UserNotFoundException
 from ..config.logging import get_logger
@@ -15,6 +15,73 @@ from .user_service import pwd_context
 logger = get_logger(__name__)
 
 
+def _conditional_counter(db: Session):
+    """
+    Return a builder for ``COUNT(*) FILTER (WHERE cond)`` on this connection.
+
+    Postgres and SQLite >= 3.30 get the FILTER clause; older SQLite falls
+    back to the equivalent ``SUM(CASE WHEN cond THEN 1 ELSE 0 END)``.
+    """
+    dialect = db.get_bind().dialect
+    supports_filter = dialect.name == "postgresql" or (
+        dialect.name == "sqlite" and (dialect.server_version_info or (0,)) >= (3, 30)
+    )
+    if supports_filter:
+        return lambda condition: func.count().filter(condition)
+    return lambda condition: func.sum(case((condition, 1), else_=0))
+
+
+def query_user_statistics(db: Session) -> Dict[str, Any]:
+    """
+    User counts by status, role and country, from one scan per grouping.
+
+    Synchronous, so async callers can run it in a worker thread.
+    """
+    from ..database.models import User
+
+    # Registration trends window (last 30 days)
+    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+    thirty_days_ago = thirty_days_ago.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # One scan: conditional counts per role, summed across roles below
+    count_where = _conditional_counter(db)
+    role_rows = db.query(
+        User.role,
+        func.count(User.id).label("total"),
+        count_where(User.is_active == True).label("active"),
+        count_where(User.is_active == False).label("inactive"),
+        count_where(User.email_verified == True).label("verified"),
+        count_where(User.email_verified == False).label("unverified"),
+        count_where(User.created_at >= thirty_days_ago).label("recent")
+    ).group_by(User.role).all()
+
+    roles = {row.role: row.total for row in role_rows}
+    total_users = sum(row.total for row in role_rows)
+    active_users = sum(row.active or 0 for row in role_rows)
+    inactive_users = sum(row.inactive or 0 for row in role_rows)
+    verified_users = sum(row.verified or 0 for row in role_rows)
+    unverified_users = sum(row.unverified or 0 for row in role_rows)
+    recent_registrations = sum(row.recent or 0 for row in role_rows)
+
+    # Get country distribution (top 10)
+    country_counts = db.query(User.country, func.count(User.id)).filter(
+        User.country.isnot(None)
+    ).group_by(User.country).order_by(func.count(User.id).desc()).limit(10).all()
+    countries = {country: count for country, count in country_counts}
+
+    return {
+        "total_users": total_users,
+        "active_users": active_users,
+        "inactive_users": inactive_users,
+        "verified_users": verified_users,
+        "unverified_users": unverified_users,
+        "role_distribution": roles,
+        "top_countries": countries,
+        "recent_registrations": recent_registrations,
+        "generated_at": datetime.utcnow().isoformat()
+    }
+
+
 class UserServiceAdmin:
     """Admin-specific user service methods."""
 
@@ -529,45 +596,7 @@ class UserServiceAdmin:
         """
         try:
             logger.info("Getting user statistics (admin)")
-
-            from ..database.models import User
-
-            # Get basic counts
-            total_users = db.query(func.count(User.id)).scalar()
-            active_users = db.query(func.count(User.id)).filter(User.is_active == True).scalar()
-            inactive_users = db.query(func.count(User.id)).filter(User.is_active == False).scalar()
-            verified_users = db.query(func.count(User.id)).filter(User.email_verified == True).scalar()
-            unverified_users = db.query(func.count(User.id)).filter(User.email_verified == False).scalar()
-
-            # Get role distribution
-            role_counts = db.query(User.role, func.count(User.id)).group_by(User.role).all()
-            roles = {role: count for role, count in role_counts}
-
-            # Get country distribution (top 10)
-            country_counts = db.query(User.country, func.count(User.id)).filter(
-                User.country.isnot(None)
-            ).group_by(User.country).order_by(func.count(User.id).desc()).limit(10).all()
-            countries = {country: count for country, count in country_counts}
-
-            # Get registration trends (last 30 days) - FIXED
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            thirty_days_ago = thirty_days_ago.replace(hour=0, minute=0, second=0, microsecond=0)
-
-            recent_registrations = db.query(func.count(User.id)).filter(
-                User.created_at >= thirty_days_ago
-            ).scalar()
-
-            return {
-                "total_users": total_users,
-                "active_users": active_users,
-                "inactive_users": inactive_users,
-                "verified_users": verified_users,
-                "unverified_users": unverified_users,
-                "role_distribution": roles,
-                "top_countries": countries,
-                "recent_registrations": recent_registrations,
-                "generated_at": datetime.utcnow().isoformat()
-            }
+            return query_user_statistics(db)
 
         except Exception as e:
             logger.error(f"Error getting user statistics: {e}")
@@ -0,0 +1,134 @@
+"""
+In-process async TTL cache with single-flight refresh.
+
+Concurrent callers asking for the same missing or expired key share one
+computation instead of each running it. Entries remember when they were
+computed so responses can report freshness.
+
+``invalidate`` and ``clear`` may be called from any thread, for example from
+a SQLAlchemy ``after_commit`` listener on a sync session running in the
+threadpool. A lock guards the entry and in-flight maps; it is never held
+across an ``await``.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+@dataclass
+class CacheEntry:
+    """A cached value and its freshness information."""
+    value: Any
+    computed_at: datetime
+    expires_at: float  # time.monotonic() deadline
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class AsyncTTLCache:
+    """Bounded LRU of TTL entries with per-key single-flight computation."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Return the fresh entry for ``key``, if any."""
+        with self._lock:
+            return self._get(key)
+
+    async def get_or_compute(self, key: Hashable,
+                             compute: Callable[[], Awaitable[Any]]) -> CacheEntry:
+        """
+        Return the cached entry for ``key``, computing it if missing or expired.
+
+        Only one ``compute`` runs per key at a time; other callers await its
+        result. If it raises, every waiter sees the exception and nothing is
+        cached. If the computing caller is cancelled (say its client went
+        away), the next waiter takes over with its own ``compute``.
+        """
+        while True:
+            with self._lock:
+                entry = self._get(key)
+                in_flight = self._in_flight.get(key) if entry is None else None
+                if entry is None and in_flight is None:
+                    future = asyncio.get_running_loop().create_future()
+                    self._in_flight[key] = future
+            if entry is not None:
+                self.hits += 1
+                return entry
+            if in_flight is None:
+                break
+            try:
+                entry = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # Only retry when the leader was cancelled, not this caller
+                if not in_flight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                continue
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        try:
+            value = await compute()
+            entry = CacheEntry(
+                value=value,
+                computed_at=datetime.utcnow(),
+                expires_at=time.monotonic() + self.ttl_seconds
+            )
+            # Skip storing if the key was invalidated while computing
+            with self._lock:
+                if self._in_flight.get(key) is future:
+                    self._store(key, entry)
+            future.set_result(entry)
+            return entry
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop ``key``; a computation already in flight will not be cached."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._in_flight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._in_flight.clear()
+
+    # Callers hold self._lock
+
+    def _get(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None or not entry.is_fresh:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: Hashable, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
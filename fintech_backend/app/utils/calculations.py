@@ -3,10 +3,12 @@ Financial calculation utilities for fees, interest, portfolio metrics, and more.
 """
 import math
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+from datetime import datetime
 from enum import Enum
 
+from .transaction_columns import MISSING_CATEGORY, TransactionColumns, cutoffs
+
 
 class TransferType(str, Enum):
     """Types of money transfers."""
@@ -274,34 +276,25 @@ class RiskCalculator:
     """Calculator for financial risk metrics."""
     
     @staticmethod
-    def calculate_spending_velocity(transactions: List[Dict], days: int = 30) -> Dict[str, Decimal]:
+    def calculate_spending_velocity(
+        transactions: Union[List[Dict], TransactionColumns],
+        days: int = 30,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Decimal]:
         """Calculate spending velocity and trends."""
-        cutoff_date = datetime.now() - timedelta(days=days)
+        columns = TransactionColumns.of(transactions)
+        rows = columns.debit_rows(since=cutoffs(days, now))
         
-        recent_spending = Decimal("0.00")
-        transaction_count = 0
-        daily_amounts = {}
-        
-        for transaction in transactions:
-            tx_date = transaction.get("transaction_date")
-            if isinstance(tx_date, str):
-                tx_date = datetime.fromisoformat(tx_date.replace('Z', '+00:00'))
-            
-            if tx_date and tx_date >= cutoff_date:
-                if transaction.get("transaction_type") == "debit":
-                    amount = Decimal(str(transaction.get("amount", 0)))
-                    recent_spending += amount
-                    transaction_count += 1
-                    
-                    date_key = tx_date.date()
-                    daily_amounts[date_key] = daily_amounts.get(date_key, Decimal("0.00")) + amount
+        amounts = columns.amounts
+        recent_spending = columns.to_decimal(sum(amounts[i] for i in rows))
+        transaction_count = len(rows)
+        daily_values = [columns.to_decimal(units) for units, _ in columns.day_totals(rows).values()]
         
         # Calculate metrics
         avg_daily_spending = recent_spending / days if days > 0 else Decimal("0.00")
         avg_transaction_amount = recent_spending / transaction_count if transaction_count > 0 else Decimal("0.00")
         
         # Calculate spending variance (simplified)
-        daily_values = list(daily_amounts.values())
         if len(daily_values) > 1:
             mean = sum(daily_values) / len(daily_values)
             variance = sum((x - mean) ** 2 for x in daily_values) / len(daily_values)
@@ -386,29 +379,81 @@ class AnalyticsCalculator:
     """Calculator for financial analytics and insights."""
     
     @staticmethod
-    def calculate_spending_by_category(transactions: List[Dict], days: int = 30) -> List[Dict]:
+    def calculate_spending_by_category(
+        transactions: Union[List[Dict], TransactionColumns],
+        days: int = 30,
+        now: Optional[datetime] = None
+    ) -> List[Dict]:
         """Calculate spending breakdown by category."""
-        cutoff_date = datetime.now() - timedelta(days=days)
+        columns = TransactionColumns.of(transactions)
+        totals = columns.category_totals(columns.debit_rows(since=cutoffs(days, now)))
+        
+        # Rows without a category are summed as "Other" but, like any other
+        # category, counted by their own value over all debits
         category_totals = {}
+        for code, (units, _) in totals.items():
+            category = columns.categories[code] if code != MISSING_CATEGORY else "Other"
+            category_totals[category] = category_totals.get(category, 0) + units
+        
+        debit_counts = columns.debit_counts_by_category()
+        category_codes = {category: code for code, category in enumerate(columns.categories)}
+        counts = {}
+        for category in category_totals:
+            counts[category] = debit_counts.get(category_codes.get(category), 0)
+            if category is None:
+                counts[category] += debit_counts.get(MISSING_CATEGORY, 0)
+        
+        return AnalyticsCalculator._format_category_breakdown(
+            {category: columns.to_decimal(units) for category, units in category_totals.items()}, counts
+        )
+    
+    @staticmethod
+    def calculate_monthly_trends(
+        transactions: Union[List[Dict], TransactionColumns],
+        months: int = 6
+    ) -> List[Dict]:
+        """Calculate monthly spending trends."""
+        columns = TransactionColumns.of(transactions)
+        totals = columns.month_totals(columns.debit_rows())
         
-        for transaction in transactions:
-            tx_date = transaction.get("transaction_date")
-            if isinstance(tx_date, str):
-                tx_date = datetime.fromisoformat(tx_date.replace('Z', '+00:00'))
-            
-            if (tx_date and tx_date >= cutoff_date and 
-                transaction.get("transaction_type") == "debit"):
-                
-                category = transaction.get("category", "Other")
-                amount = Decimal(str(transaction.get("amount", 0)))
-                category_totals[category] = category_totals.get(category, Decimal("0.00")) + amount
+        return AnalyticsCalculator.summarize_monthly_totals(
+            {month: (columns.to_decimal(units), count) for month, (units, count) in totals.items()}, months
+        )
+    
+    @staticmethod
+    def summarize_category_totals(totals: Dict[Optional[str], Tuple[Decimal, int]]) -> List[Dict]:
+        """Category breakdown, as ``calculate_spending_by_category``, from per-category sums and counts."""
+        amounts, counts = {}, {}
+        for category, (amount, count) in totals.items():
+            category = category if category is not None else "Other"
+            amounts[category] = amounts.get(category, Decimal("0.00")) + amount
+            counts[category] = counts.get(category, 0) + count
+        
+        return AnalyticsCalculator._format_category_breakdown(amounts, counts)
+    
+    @staticmethod
+    def summarize_monthly_totals(totals: Dict[str, Tuple[Decimal, int]], months: int = 6) -> List[Dict]:
+        """Monthly trends, as ``calculate_monthly_trends``, from per-month (``YYYY-MM``) sums and counts."""
+        trends = []
+        for month, (amount, count) in sorted((item for item in totals.items() if item[0]), key=lambda x: x[0]):
+            trends.append({
+                "month": month,
+                "total_spending": amount.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
+                "transaction_count": count,
+                "avg_transaction_amount": (
+                    amount / count
+                ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) if count > 0 else Decimal("0.00")
+            })
         
-        # Calculate total for percentages
-        total_spending = sum(category_totals.values())
+        return trends[-months:] if months else trends
+    
+    @staticmethod
+    def _format_category_breakdown(amounts: Dict, counts: Dict) -> List[Dict]:
+        """Category rows with share of the total, largest first."""
+        total_spending = sum(amounts.values())
         
-        # Format results
         results = []
-        for category, amount in category_totals.items():
+        for category, amount in amounts.items():
             percentage = Decimal("0.00")
             if total_spending > 0:
                 percentage = (amount / total_spending * 100).quantize(Decimal("0.1"), rounding=ROUND_HALF_UP)
@@ -417,50 +462,10 @@ class AnalyticsCalculator:
                 "category": category,
                 "amount": amount.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
                 "percentage": percentage,
-                "transaction_count": len([t for t in transactions 
-                                       if t.get("category") == category and 
-                                       t.get("transaction_type") == "debit"])
+                "transaction_count": counts[category]
             })
         
         return sorted(results, key=lambda x: x["amount"], reverse=True)
-    
-    @staticmethod
-    def calculate_monthly_trends(transactions: List[Dict], months: int = 6) -> List[Dict]:
-        """Calculate monthly spending trends."""
-        monthly_data = {}
-        
-        for transaction in transactions:
-            tx_date = transaction.get("transaction_date")
-            if isinstance(tx_date, str):
-                tx_date = datetime.fromisoformat(tx_date.replace('Z', '+00:00'))
-            
-            if tx_date and transaction.get("transaction_type") == "debit":
-                month_key = tx_date.strftime("%Y-%m")
-                amount = Decimal(str(transaction.get("amount", 0)))
-                
-                if month_key not in monthly_data:
-                    monthly_data[month_key] = {
-                        "month": month_key,
-                        "total_spending": Decimal("0.00"),
-                        "transaction_count": 0
-                    }
-                
-                monthly_data[month_key]["total_spending"] += amount
-                monthly_data[month_key]["transaction_count"] += 1
-        
-        # Sort by month and format
-        trends = []
-        for month_data in sorted(monthly_data.values(), key=lambda x: x["month"]):
-            trends.append({
-                "month": month_data["month"],
-                "total_spending": month_data["total_spending"].quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
-                "transaction_count": month_data["transaction_count"],
-                "avg_transaction_amount": (
-                    month_data["total_spending"] / month_data["transaction_count"]
-                ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) if month_data["transaction_count"] > 0 else Decimal("0.00")
-            })
-        
-        return trends[-months:] if months else trends
 
 
 class LimitCalculator:
@@ -489,36 +494,21 @@ class LimitCalculator:
     
     @staticmethod
     def suggest_optimal_limits(
-        historical_transactions: List[Dict],
-        days_to_analyze: int = 90
+        historical_transactions: Union[List[Dict], TransactionColumns],
+        days_to_analyze: int = 90,
+        now: Optional[datetime] = None
     ) -> Dict[str, Decimal]:
         """Suggest optimal spending limits based on historical data."""
-        cutoff_date = datetime.now() - timedelta(days=days_to_analyze)
+        columns = TransactionColumns.of(historical_transactions)
+        rows = columns.debit_rows(since=cutoffs(days_to_analyze, now))
         
-        daily_spending = {}
-        monthly_spending = {}
-        
-        for transaction in historical_transactions:
-            tx_date = transaction.get("transaction_date")
-            if isinstance(tx_date, str):
-                tx_date = datetime.fromisoformat(tx_date.replace('Z', '+00:00'))
-            
-            if (tx_date and tx_date >= cutoff_date and 
-                transaction.get("transaction_type") == "debit"):
-                
-                amount = Decimal(str(transaction.get("amount", 0)))
-                
-                # Daily aggregation
-                date_key = tx_date.date()
-                daily_spending[date_key] = daily_spending.get(date_key, Decimal("0.00")) + amount
-                
-                # Monthly aggregation  
-                month_key = tx_date.strftime("%Y-%m")
-                monthly_spending[month_key] = monthly_spending.get(month_key, Decimal("0.00")) + amount
+        # Daily and monthly aggregation
+        daily_spending = columns.day_totals(rows)
+        monthly_spending = columns.month_totals(rows)
         
         # Calculate suggested limits (add 20% buffer to 90th percentile)
-        daily_amounts = list(daily_spending.values())
-        monthly_amounts = list(monthly_spending.values())
+        daily_amounts = [columns.to_decimal(units) for units, _ in daily_spending.values()]
+        monthly_amounts = [columns.to_decimal(units) for units, _ in monthly_spending.values()]
         
         if daily_amounts:
             daily_amounts.sort()
@@ -0,0 +1,58 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe tokens wrapping the sort key of the last row on
+a page, ``(transaction_date, id)``. The next page starts strictly after that
+key, so page cost does not grow with depth and rows inserted meanwhile never
+shift page boundaries.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Optional, Tuple
+
+from ..core.exceptions import ValidationException
+
+
+def encode_cursor(sort_value: Any, row_id: str) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    if isinstance(sort_value, datetime):
+        payload = {"t": "dt", "v": sort_value.isoformat()}
+    elif isinstance(sort_value, date):
+        payload = {"t": "d", "v": sort_value.isoformat()}
+    else:
+        raise ValueError(f"Unsupported cursor value type: {type(sort_value).__name__}")
+    payload["id"] = str(row_id)
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """Decode a cursor back into ``(sort_value, id)``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["t"] == "dt":
+            sort_value = datetime.fromisoformat(payload["v"])
+        elif payload["t"] == "d":
+            sort_value = date.fromisoformat(payload["v"])
+        else:
+            raise ValueError(payload["t"])
+        return sort_value, str(payload["id"])
+    except Exception:
+        raise ValidationException("Invalid pagination cursor", field="cursor", value=cursor)
+
+
+def next_cursor_for(rows: list, limit: int, sort_attr: str = "transaction_date",
+                    id_attr: str = "id") -> Tuple[list, Optional[str]]:
+    """
+    Trim a ``limit + 1`` fetch to ``limit`` rows and build the next cursor.
+
+    Returns the page and the cursor for the following page, or None when the
+    extra row was not present (no further pages).
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(getattr(last, sort_attr), getattr(last, id_attr))
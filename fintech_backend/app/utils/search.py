@@ -0,0 +1,265 @@
+"""
+In-memory inverted index for transaction text search.
+
+Each document is a few text fields (e.g. description and merchant) under an
+id. The index maps character trigrams of the lowercased fields to document
+ids, and word tokens to document ids. A single-word query is answered from
+the token postings alone; other queries only verify documents containing
+all of their trigrams. The token vocabulary also serves autocomplete.
+Documents are added and removed incrementally.
+
+Matching keeps the plain substring semantics (``query.lower() in field``).
+Results are ranked whole-word match, then word-prefix match, then infix
+match, with ties broken by the caller's sort key (newest first for
+transactions). Only the requested top N are selected.
+"""
+import bisect
+import heapq
+import re
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+_SEPARATOR = "\x00"
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercased text, the form fields are indexed and matched in."""
+    return str(text).lower() if text else ""
+
+
+def tokenize(text: str) -> List[str]:
+    """Word tokens of already normalized text."""
+    return _TOKEN_RE.findall(text)
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _rank_matchers(query: str) -> Tuple[Callable, Callable]:
+    """
+    Searches for ``query`` as a whole word and at the start of a word.
+
+    Boundaries are only required next to word characters, so a query that
+    starts or ends with punctuation or a space is not penalised for it.
+    """
+    start = r"(?<!\w)" if _TOKEN_RE.match(query[0]) else ""
+    end = r"(?!\w)" if _TOKEN_RE.match(query[-1]) else ""
+    escaped = re.escape(query)
+    return re.compile(start + escaped + end).search, re.compile(start + escaped).search
+
+
+class TextSearchIndex:
+    """Token and trigram index over the text fields of a set of documents."""
+
+    def __init__(self, min_suggestion_length: int = 4):
+        self.min_suggestion_length = min_suggestion_length
+        # Normalized fields joined by a separator no query contains
+        self._docs: Dict[Hashable, str] = {}
+        self._sort_keys: Dict[Hashable, Any] = {}
+        self._ordered: List[Tuple[Any, Hashable]] = []  # (sort_key, id), ascending
+        self._tokens: Dict[str, Set[Hashable]] = {}
+        self._grams: Dict[str, Set[Hashable]] = {}
+        self._sorted_tokens: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._docs
+
+    def add(self, doc_id: Hashable, fields: Iterable[Optional[str]], sort_key: Any = 0) -> None:
+        """Index (or re-index) a document."""
+        if doc_id in self._docs:
+            self.remove(doc_id)
+        normalized = tuple(normalize(field) for field in fields)
+        self._docs[doc_id] = _SEPARATOR.join(normalized)
+        self._sort_keys[doc_id] = sort_key
+        bisect.insort(self._ordered, (sort_key, doc_id))
+        for token in _field_tokens(normalized):
+            ids = self._tokens.get(token)
+            if ids is None:
+                ids = self._tokens[token] = set()
+                self._sorted_tokens = None
+            ids.add(doc_id)
+        for gram in _field_trigrams(normalized):
+            self._grams.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: Hashable) -> None:
+        text = self._docs.pop(doc_id, None)
+        if text is None:
+            return
+        entry = (self._sort_keys.pop(doc_id), doc_id)
+        position = bisect.bisect_left(self._ordered, entry)
+        if position < len(self._ordered) and self._ordered[position] == entry:
+            del self._ordered[position]
+        normalized = text.split(_SEPARATOR)
+        for postings, keys in ((self._tokens, _field_tokens(normalized)),
+                               (self._grams, _field_trigrams(normalized))):
+            for key in keys:
+                ids = postings.get(key)
+                if ids is not None:
+                    ids.discard(doc_id)
+                    if not ids:
+                        del postings[key]
+                        if postings is self._tokens:
+                            self._sorted_tokens = None
+
+    def search(self, query: str, limit: Optional[int] = None,
+               allowed: Optional[Set[Hashable]] = None) -> List[Hashable]:
+        """
+        Ids of documents with ``query`` in any field, best ranked first.
+
+        ``limit`` selects only the top N; ``allowed`` restricts results to a
+        subset of ids.
+        """
+        query = normalize(query)
+        if not query:
+            tiers = [self._docs.keys()]
+        elif _TOKEN_RE.fullmatch(query):
+            tiers = self._token_tiers(query)
+        else:
+            return self._search_verified(query, limit, allowed)
+
+        sort_key = self._sort_keys.__getitem__
+        results: List[Hashable] = []
+        for tier in tiers:
+            if allowed is not None:
+                tier = tier & allowed if len(tier) < len(allowed) else allowed & tier
+            if limit is None:
+                results.extend(sorted(tier, key=sort_key, reverse=True))
+                continue
+            wanted = limit - len(results)
+            if len(tier) * 4 >= len(self._docs):
+                # Dense tier: walking newest first finds the top N quickly
+                results.extend(islice((doc_id for _, doc_id in reversed(self._ordered) if doc_id in tier), wanted))
+            else:
+                results.extend(heapq.nlargest(wanted, tier, key=sort_key))
+            if len(results) >= limit:
+                break
+        return results
+
+    def suggest(self, query: str, limit: int = 5,
+                allowed: Optional[Set[Hashable]] = None) -> List[str]:
+        """
+        Autocomplete terms containing ``query``.
+
+        Terms starting with the query come first, then terms containing it,
+        each by how many documents use them. ``allowed`` counts only those
+        documents, dropping terms none of them use.
+        """
+        query = normalize(query).strip()
+        minimum = self.min_suggestion_length
+        uses: Dict[str, int] = {}
+        prefixed, infixed = [], []
+        for term in self._prefixed_tokens(query):
+            if len(term) >= minimum:
+                prefixed.append(term)
+        for term in self._tokens:
+            if len(term) >= minimum and query in term and not term.startswith(query):
+                infixed.append(term)
+        for term in chain(prefixed, infixed):
+            ids = self._tokens[term]
+            if allowed is not None:
+                ids = ids & allowed if len(ids) < len(allowed) else allowed & ids
+            uses[term] = len(ids)
+
+        by_use = lambda term: (-uses[term], term)
+        return [
+            term for term in sorted(prefixed, key=by_use) + sorted(infixed, key=by_use)
+            if uses[term]
+        ][:limit]
+
+    def _prefixed_tokens(self, prefix: str) -> Iterable[str]:
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._tokens)
+        tokens = self._sorted_tokens
+        for term in islice(tokens, bisect.bisect_left(tokens, prefix), None):
+            if not term.startswith(prefix):
+                break
+            yield term
+
+    def _token_tiers(self, query: str) -> Iterator[Set[Hashable]]:
+        """
+        Whole-word, prefix and infix matches of a single-token query.
+
+        A query of word characters only can occur only inside a token, so the
+        token postings give exact substring matches without verification.
+        """
+        tokens = self._tokens
+        word = tokens.get(query, set())
+        yield word
+        prefix: Set[Hashable] = set()
+        for term in self._prefixed_tokens(query):
+            if term != query:
+                prefix |= tokens[term]
+        prefix -= word
+        yield prefix
+        infix: Set[Hashable] = set()
+        for term, ids in tokens.items():
+            if query in term and not term.startswith(query):
+                infix |= ids
+        infix -= word
+        infix -= prefix
+        yield infix
+
+    def _search_verified(self, query: str, limit: Optional[int],
+                         allowed: Optional[Set[Hashable]]) -> List[Hashable]:
+        """
+        Search for queries spanning several words or punctuation.
+
+        Trigram candidates are verified by substring match, then ranked
+        newest first; ranking stops once ``limit`` matches of the best
+        achievable rank are found.
+        """
+        docs = self._docs
+        if len(query) < 3:
+            candidates: Iterable[Hashable] = docs
+        else:
+            sets = []
+            for gram in trigrams(query):
+                ids = self._grams.get(gram)
+                if not ids:
+                    return []
+                sets.append(ids)
+            sets.sort(key=len)
+            candidates = sets[0].intersection(*sets[1:])
+        if len(candidates) * 4 >= len(docs):
+            # Dense candidates: walk newest first and stop early
+            newest_first: Iterable[Hashable] = (
+                doc_id for _, doc_id in reversed(self._ordered) if doc_id in candidates
+            )
+        else:
+            newest_first = sorted(candidates, key=self._sort_keys.__getitem__, reverse=True)
+
+        # A whole-word match needs the query's edge words to be complete tokens
+        tokens = tokenize(query)
+        words_possible = (not _TOKEN_RE.match(query[0]) or tokens[0] in self._tokens) and \
+            (not _TOKEN_RE.match(query[-1]) or tokens[-1] in self._tokens)
+
+        word_match, prefix_match = _rank_matchers(query)
+        word, prefix, infix = [], [], []
+        best = word if words_possible else prefix
+        for doc_id in newest_first:
+            text = docs[doc_id]
+            if query not in text or (allowed is not None and doc_id not in allowed):
+                continue
+            if words_possible and word_match(text):
+                word.append(doc_id)
+            elif prefix_match(text):
+                prefix.append(doc_id)
+            else:
+                infix.append(doc_id)
+            if limit is not None and len(best) >= limit:
+                break
+        results = word + prefix + infix
+        return results if limit is None else results[:limit]
+
+
+def _field_tokens(fields: Sequence[str]) -> Set[str]:
+    return {token for field in fields for token in tokenize(field)}
+
+
+def _field_trigrams(fields: Sequence[str]) -> Set[str]:
+    return set().union(*(trigrams(field) for field in fields))
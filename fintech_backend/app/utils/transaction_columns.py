@@ -0,0 +1,269 @@
+"""
+Columnar transaction batches for the analytics calculators.
+
+``TransactionColumns`` converts a list of transaction dicts once into
+parallel arrays: integer amounts in minor units, epoch-microsecond
+timestamps, wall-clock day numbers, category codes and debit flags. The
+grouping kernels then work on integers, so they neither re-parse ISO
+strings nor build ``Decimal(str(...))`` per row, and sums stay exact.
+Building the columns costs about one row-by-row pass; callers running
+several calculations over the same transactions should build them once and
+pass the ``TransactionColumns`` to each calculator.
+
+All amounts in a batch share one scale, by default cents. A batch with
+finer amounts (``Decimal("1.005")`` or a float such as ``0.1 + 0.2``) uses
+as many decimal places as its finest amount, so no value is ever rounded.
+
+Naive timestamps are compared with naive cutoffs and aware timestamps with
+aware cutoffs, so a batch can mix both. Day and month keys use each
+timestamp's own wall clock, as ``tx_date.date()`` and ``strftime`` do.
+
+The epoch, microsecond and cent encodings here are shared with
+``repositories.columnar.ColumnarTransactionStore``. The store builds a batch
+straight from its columns with ``TransactionColumns.from_columns``, without
+going through dicts.
+"""
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from decimal import Context, Decimal, MAX_EMAX, MAX_PREC, MIN_EMIN
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+US_PER_DAY = 86_400_000_000
+EPOCH = datetime(1970, 1, 1)
+EPOCH_UTC = EPOCH.replace(tzinfo=timezone.utc)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+_EPOCH_WEEKDAY = EPOCH.weekday()
+MICROSECOND = timedelta(microseconds=1)
+
+# Date kinds
+_NO_DATE, _AWARE, _NAIVE = range(3)
+
+# Category code for rows without a "category" key
+MISSING_CATEGORY = 0
+
+_MISSING = object()
+
+# Rescaling between Decimal and minor units never rounds
+_EXACT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+def _parse_date(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    raise TypeError(f"Unsupported transaction_date {value!r}")
+
+
+def epoch_microseconds(value: datetime) -> int:
+    """Microseconds since the epoch: UTC for aware values, wall clock for naive ones."""
+    if value.utcoffset() is None:
+        return (value - EPOCH) // MICROSECOND
+    return (value - EPOCH_UTC) // MICROSECOND
+
+
+def exact_cents(amount: Decimal) -> Optional[int]:
+    """A finite ``Decimal`` as integer cents, or None if that would round it."""
+    numerator, denominator = amount.as_integer_ratio()
+    if 100 % denominator:
+        return None
+    return numerator * (100 // denominator)
+
+
+def _integer_array(values: List[int]) -> Sequence[int]:
+    try:
+        return array("q", values)
+    except OverflowError:
+        return values
+
+
+def cutoffs(days: int, now: Optional[datetime] = None) -> Tuple[int, int]:
+    """
+    ``(aware, naive)`` cutoffs ``days`` before ``now``, as row instants.
+
+    ``now`` defaults to the current time; a naive ``now`` is local time.
+    """
+    now = now or datetime.now()
+    if now.tzinfo is None:
+        naive_now, aware_now = now, now.astimezone()
+    else:
+        aware_now, naive_now = now, now.astimezone().replace(tzinfo=None)
+    delta = timedelta(days=days)
+    return epoch_microseconds(aware_now - delta), epoch_microseconds(naive_now - delta)
+
+
+class TransactionColumns:
+    """
+    A batch of transactions as parallel columns.
+
+    Row ``i`` of every column describes ``transactions[i]``. ``date_kinds``
+    tells rows without a date from aware and naive ones; rows without a date
+    hold zeros in the other time columns.
+    """
+
+    __slots__ = (
+        "size", "scale", "amounts", "instants", "days", "date_kinds", "debit",
+        "category_codes", "categories", "_month_keys",
+    )
+
+    def __init__(self, transactions: Iterable[Dict]):
+        category_index: Dict[Any, int] = {_MISSING: MISSING_CATEGORY}
+        categories: List[Any] = [_MISSING]
+        whole_cents = True
+        rows = []
+
+        for transaction in transactions:
+            amount = transaction.get("amount", 0)
+            if type(amount) is not Decimal:
+                amount = Decimal(str(amount))
+            if not amount.is_finite():
+                raise ValueError(f"Transaction amount {amount} is not a finite number")
+            units = exact_cents(amount)
+            if units is None:
+                whole_cents = False
+                units = 0
+
+            tx_date = transaction.get("transaction_date")
+            if type(tx_date) is not datetime:
+                tx_date = _parse_date(tx_date)
+            if tx_date is None:
+                kind = instant = day = _NO_DATE
+            else:
+                offset = tx_date.utcoffset()
+                instant = wall = epoch_microseconds(tx_date)
+                if offset is None:
+                    kind = _NAIVE
+                else:
+                    kind = _AWARE
+                    if offset:
+                        wall += offset // MICROSECOND
+                day = wall // US_PER_DAY
+
+            category = transaction.get("category", _MISSING)
+            code = category_index.get(category)
+            if code is None:
+                code = category_index[category] = len(categories)
+                categories.append(category)
+
+            rows.append((units, amount, instant, day, kind, transaction.get("transaction_type") == "debit", code))
+
+        units, amounts, instants, days, kinds, debit, codes = zip(*rows) if rows else ((),) * 7
+        self.size = len(rows)
+        self.scale = 2
+        if not whole_cents:
+            # Rescale the whole batch to its finest amount
+            self.scale = max(-amount.as_tuple().exponent for amount in amounts)
+            units = [int(amount.scaleb(self.scale, _EXACT)) for amount in amounts]
+        self.amounts = _integer_array(units)
+        self.instants = _integer_array(instants)
+        self.days = array("l", days)
+        self.date_kinds = bytes(kinds)
+        self.debit = bytes(debit)
+        self.category_codes = array("l", codes)
+        self.categories = categories
+        self._month_keys: Dict[int, str] = {}
+
+    @classmethod
+    def from_columns(
+        cls,
+        cents: Sequence[int],
+        utc_instants: Sequence[Optional[int]],
+        debit: Sequence[bool],
+        category_codes: Sequence[int],
+        categories: List[Any]
+    ) -> "TransactionColumns":
+        """
+        A batch from columns already encoded this module's way.
+
+        ``cents`` are whole-cent amounts and ``utc_instants`` are UTC epoch
+        microseconds, None for rows without a date. A category code is
+        ``MISSING_CATEGORY`` for rows without a category, otherwise one more
+        than the index of its value in ``categories``.
+        """
+        columns = cls.__new__(cls)
+        columns.size = len(cents)
+        columns.scale = 2
+        columns.amounts = _integer_array(list(cents))
+        columns.instants = _integer_array([instant or 0 for instant in utc_instants])
+        columns.days = array("l", [(instant or 0) // US_PER_DAY for instant in utc_instants])
+        columns.date_kinds = bytes(_NO_DATE if instant is None else _AWARE for instant in utc_instants)
+        columns.debit = bytes(debit)
+        columns.category_codes = array("l", category_codes)
+        columns.categories = [_MISSING] + list(categories)
+        columns._month_keys = {}
+        return columns
+
+    @classmethod
+    def of(cls, transactions: Any) -> "TransactionColumns":
+        """``transactions`` as columns, converting only if it is not columns already."""
+        return transactions if isinstance(transactions, cls) else cls(transactions)
+
+    def to_decimal(self, units: int) -> Decimal:
+        """An amount in this batch's minor units as a ``Decimal``."""
+        return Decimal(units).scaleb(-self.scale, _EXACT)
+
+    def month_key(self, day: int) -> str:
+        """``YYYY-MM`` of a day number, cached per day."""
+        key = self._month_keys.get(day)
+        if key is None:
+            key = self._month_keys[day] = date.fromordinal(_EPOCH_ORDINAL + day).strftime("%Y-%m")
+        return key
+
+    def weekday(self, row: int) -> int:
+        """Wall-clock weekday of a dated row, Monday being 0."""
+        return (self.days[row] + _EPOCH_WEEKDAY) % 7
+
+    def debit_rows(self, since: Optional[Tuple[int, int]] = None) -> List[int]:
+        """
+        Indices of dated debit rows, in order.
+
+        ``since`` is an ``(aware, naive)`` pair from ``cutoffs``; rows before
+        their cutoff are left out.
+        """
+        if since is None:
+            return [i for i, (kind, is_debit) in enumerate(zip(self.date_kinds, self.debit)) if kind and is_debit]
+        bounds = (None, *since)
+        return [
+            i for i, (kind, is_debit, instant) in enumerate(zip(self.date_kinds, self.debit, self.instants))
+            if kind and is_debit and instant >= bounds[kind]
+        ]
+
+    def group_sums(self, keys: Sequence[Any], rows: Iterable[int]) -> Dict[Any, List[int]]:
+        """``{key: [amount units, row count]}`` over ``rows``, keys in first-seen order."""
+        amounts = self.amounts
+        groups: Dict[Any, List[int]] = {}
+        for i in rows:
+            group = groups.get(keys[i])
+            if group is None:
+                groups[keys[i]] = [amounts[i], 1]
+            else:
+                group[0] += amounts[i]
+                group[1] += 1
+        return groups
+
+    def category_totals(self, rows: Iterable[int]) -> Dict[int, List[int]]:
+        return self.group_sums(self.category_codes, rows)
+
+    def day_totals(self, rows: Iterable[int]) -> Dict[int, List[int]]:
+        return self.group_sums(self.days, rows)
+
+    def month_totals(self, rows: Iterable[int]) -> Dict[str, List[int]]:
+        """Totals per ``YYYY-MM``, merged from per-day totals."""
+        months: Dict[str, List[int]] = {}
+        for day, (units, count) in sorted(self.day_totals(rows).items()):
+            month = months.setdefault(self.month_key(day), [0, 0])
+            month[0] += units
+            month[1] += count
+        return months
+
+    def debit_counts_by_category(self) -> Dict[int, int]:
+        """Debit rows per category code over the whole batch, dated or not."""
+        counts: Dict[int, int] = {}
+        for code, is_debit in zip(self.category_codes, self.debit):
+            if is_debit:
+                counts[code] = counts.get(code, 0) + 1
+        return counts
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Rebuild the per-user daily and monthly analytics rollups from transaction history.
+
+Rollups are kept up to date on write; run this after loading transactions
+with raw SQL, after cascade deletes, or to repair drift.
+
+Usage:
+    python scripts/backfill_analytics_rollups.py [--user-id ID]
+"""
+
+import sys
+import argparse
+import logging
+import time
+from pathlib import Path
+
+# Add the parent directory to the path so we can import our app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal, rebuild_rollups
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--user-id", help="Only rebuild this user's rollups")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as session:
+        try:
+            count = rebuild_rollups(session, user_id=args.user_id)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"✗ Rollup backfill failed: {e}")
+            return 1
+
+    scope = f"user {args.user_id}" if args.user_id else "all users"
+    logger.info(f"✓ Rolled up {count} transactions for {scope} in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for MockRepository criteria matching.
+
+Compares the previous per-record matcher (criteria dict re-read for every
+record, ``$regex`` recompiled on every comparison, every match collected
+before slicing) with the compiled predicates and early stop used by
+``find_by_criteria``. Records live in an unindexed repository so that only the
+matching cost is measured.
+
+Usage:
+    python scripts/benchmark_mock_queries.py [--records N] [--repeat N]
+"""
+
+import sys
+import argparse
+import asyncio
+import random
+import re
+import time
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+
+# Add the parent directory to the path so we can import our app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.repositories.mock_repository import MockRepository
+
+
+def legacy_matches_criteria(record, criteria):
+    """The matcher ``MockRepository`` used before criteria were compiled."""
+    for key, value in criteria.items():
+        if key not in record:
+            return False
+        record_value = record[key]
+        if isinstance(value, dict):
+            if "$gte" in value and record_value < value["$gte"]:
+                return False
+            if "$lte" in value and record_value > value["$lte"]:
+                return False
+            if "$gt" in value and record_value <= value["$gt"]:
+                return False
+            if "$lt" in value and record_value >= value["$lt"]:
+                return False
+            if "$in" in value and record_value not in value["$in"]:
+                return False
+            if "$regex" in value:
+                if not re.search(value["$regex"], str(record_value), re.IGNORECASE):
+                    return False
+        elif record_value != value:
+            return False
+    return True
+
+
+def legacy_find(repo, criteria, limit, offset):
+    matches = [record for record in repo.data.values() if legacy_matches_criteria(record, criteria)]
+    return matches[offset:offset + limit]
+
+
+async def seed(count):
+    repo = MockRepository()
+    rng = random.Random(42)
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    merchants = ["Amazon", "Starbucks", "Shell", "Netflix", "Whole Foods", "Uber"]
+    for i in range(count):
+        merchant = rng.choice(merchants)
+        await repo.create({
+            "user_id": f"user_{i % 500:03d}",
+            "status": rng.choice(["completed", "completed", "completed", "pending", "failed"]),
+            "category": rng.choice(["food", "transport", "shopping", "entertainment"]),
+            "amount": round(rng.uniform(1, 500), 2),
+            "merchant": merchant,
+            "description": f"Purchase at {merchant}",
+            "transaction_date": base + timedelta(minutes=i),
+        })
+    return repo
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def timed_async(make_coro, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await make_coro()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark mock repository criteria matching")
+    parser.add_argument("--records", type=int, default=100_000, help="Number of records to seed")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    repo = await seed(args.records)
+
+    cases = {
+        "equality + range": {"status": "completed", "amount": {"$gte": 100, "$lt": 200}},
+        "regex": {"description": {"$regex": "star.*ks"}, "category": "food"},
+        "in + range": {"category": {"$in": ["food", "shopping"]}, "amount": {"$gt": 450}},
+    }
+
+    print(f"{args.records} records, best of {args.repeat} runs")
+    print(f"{'case':<20}{'op':<22}{'legacy ms':>12}{'compiled ms':>14}{'speedup':>10}")
+    for name, criteria in cases.items():
+        legacy_all = timed(lambda: legacy_find(repo, criteria, args.records, 0), args.repeat)
+        compiled_all = await timed_async(lambda: repo.find_by_criteria(criteria, args.records, 0), args.repeat)
+        legacy_page = timed(lambda: legacy_find(repo, criteria, 20, 0), args.repeat)
+        compiled_page = await timed_async(lambda: repo.find_by_criteria(criteria, 20, 0), args.repeat)
+        for op, legacy, compiled in (
+            ("find (all matches)", legacy_all, compiled_all),
+            ("find (first 20)", legacy_page, compiled_page),
+        ):
+            print(f"{name:<20}{op:<22}{legacy:>12.2f}{compiled:>14.2f}{legacy / compiled:>9.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -15,6 +15,7 @@ Options:
     --check-only    Only check database connection, don't run migrations
     --force-reset   Drop all tables and recreate (DANGEROUS - use with caution)
     --create-sample-data    Create sample data for development
+    --sample-transactions N Number of sample transactions to bulk-load (default 500)
     --verbose       Enable verbose logging
 """
 
@@ -99,7 +100,55 @@ def run_migrations():
         return False
 
 
-def create_sample_data():
+def create_sample_transactions(db, account, count):
+    """
+    Bulk-load ``count`` sample transactions for ``account``.
+
+    Reference numbers and dates derive from the row index and the account's
+    creation time, so re-running skips rows that already exist.
+    """
+    from ..database.models import (
+        TransactionTypeEnum, TransactionStatusEnum, TransactionDirectionEnum,
+        MerchantCategoryEnum, PaymentMethodEnum
+    )
+    from ..repositories.database_repository import TransactionRepository
+    from decimal import Decimal
+    from datetime import timedelta
+    import random
+
+    rng = random.Random(account.id)
+    categories = [
+        MerchantCategoryEnum.GROCERIES, MerchantCategoryEnum.RESTAURANTS,
+        MerchantCategoryEnum.GAS_STATIONS, MerchantCategoryEnum.UTILITIES,
+        MerchantCategoryEnum.ENTERTAINMENT, MerchantCategoryEnum.ONLINE_SERVICES
+    ]
+    anchor = account.created_at.replace(microsecond=0)
+
+    def rows():
+        for i in range(count):
+            is_salary = i % 30 == 0
+            yield {
+                "user_id": account.user_id,
+                "account_id": account.id,
+                "transaction_type": TransactionTypeEnum.SALARY if is_salary else TransactionTypeEnum.PURCHASE,
+                "status": TransactionStatusEnum.COMPLETED,
+                "direction": TransactionDirectionEnum.INBOUND if is_salary else TransactionDirectionEnum.OUTBOUND,
+                "payment_method": PaymentMethodEnum.BANK_TRANSFER if is_salary else PaymentMethodEnum.CARD,
+                "merchant_category": MerchantCategoryEnum.OTHER if is_salary else rng.choice(categories),
+                "amount": Decimal("3500.00") if is_salary else Decimal(rng.randint(100, 25000)) / 100,
+                "currency": account.currency,
+                "description": "Monthly salary" if is_salary else f"Sample purchase {i}",
+                "reference_number": f"SEED-{account.account_number}-{i:06d}",
+                "transaction_date": anchor - timedelta(hours=6 * i),
+            }
+
+    skipped = []
+    inserted = TransactionRepository(db).bulk_create_transactions(rows(), skipped=skipped)
+    db.commit()
+    logger.info(f"  - Sample transactions: {len(inserted)} inserted, {len(skipped)} already present")
+
+
+def create_sample_data(transaction_count=500):
     """Create sample data for development."""
     logger.info("Creating sample data...")
     
@@ -117,6 +166,11 @@ def create_sample_data():
             existing_user = db.query(User).filter(User.email == "admin@hoardrun.com").first()
             if existing_user:
                 logger.info("Sample data already exists, skipping creation")
+                existing_account = db.query(Account).filter(
+                    Account.user_id == existing_user.id, Account.is_primary == True
+                ).first()
+                if existing_account and transaction_count:
+                    create_sample_transactions(db, existing_account, transaction_count)
                 return True
             
             # Create sample user
@@ -162,6 +216,9 @@ def create_sample_data():
             db.add(sample_account)
             db.commit()
             
+            if transaction_count:
+                create_sample_transactions(db, sample_account, transaction_count)
+            
             logger.info("✓ Sample data created successfully")
             logger.info(f"  - Sample user: {sample_user.email}")
             logger.info(f"  - Sample account: {sample_account.account_number}")
@@ -204,6 +261,8 @@ def main():
                        help="Drop all tables and recreate (DANGEROUS)")
     parser.add_argument("--create-sample-data", action="store_true",
                        help="Create sample data for development")
+    parser.add_argument("--sample-transactions", type=int, default=500,
+                       help="Number of sample transactions to bulk-load with --create-sample-data")
     parser.add_argument("--verbose", action="store_true",
                        help="Enable verbose logging")
     
@@ -243,7 +302,7 @@ def main():
     
     # Create sample data if requested
     if args.create_sample_data:
-        if not create_sample_data():
+        if not create_sample_data(args.sample_transactions):
             logger.warning("Sample data creation failed, but continuing...")
     
     logger.info("Database initialization completed successfully!")
@@ -3,15 +3,17 @@ Test configuration and fixtures.
 """
 
 import pytest
+import pytest_asyncio
 import os
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from ..app.main import app
 from ..app.database.config import Base, get_db
-from ..app.database.models import User, Account, Transaction, Card
+from ..app.database.models import User, Account, Transaction, Card, generate_uuid
 from ..app.config.settings import get_settings
 
 
@@ -54,6 +56,42 @@ def test_db(test_engine, test_session_factory):
         Base.metadata.drop_all(bind=test_engine)
 
 
+@pytest.fixture
+def memory_engine():
+    """In-memory SQLite engine with all tables, private to one test."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(memory_engine):
+    """Session on the per-test in-memory database."""
+    session = sessionmaker(bind=memory_engine)()
+    yield session
+    session.close()
+
+
+@pytest_asyncio.fixture
+async def async_memory_engine():
+    """In-memory aiosqlite engine with all tables, private to one test."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def async_db(async_memory_engine):
+    """Async session on the per-test in-memory database."""
+    async with AsyncSession(async_memory_engine, expire_on_commit=False) as session:
+        yield session
+
+
 @pytest.fixture
 def client(test_db):
     """Create a test client with database dependency override."""
@@ -110,6 +148,18 @@ def sample_account_data():
     }
 
 
+@pytest.fixture
+def user_account(sample_user_data, sample_account_data):
+    """Unsaved user and checking account built from the sample data.
+
+    Ids are assigned up front so either a sync or an async session can add
+    the pair and reference it before flushing.
+    """
+    user = User(id=generate_uuid(), **sample_user_data)
+    account = Account(id=generate_uuid(), user_id=user.id, **sample_account_data)
+    return user, account
+
+
 @pytest.fixture
 def sample_transaction_data():
     """Sample transaction data for testing."""
@@ -122,4 +172,4 @@ def sample_transaction_data():
         "description": "Test transaction",
         "payment_method": "BANK_TRANSFER",
         "merchant_category": "OTHER"
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,157 @@
+"""
+Integration tests for atomic transfers between accounts.
+"""
+import threading
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from fintech_backend.app.core.exceptions import InsufficientFundsException
+from fintech_backend.app.database.config import Base
+from fintech_backend.app.database.models import (
+    User, Account, Transaction, AccountTypeEnum, TransactionTypeEnum
+)
+from fintech_backend.app.models.flat_account import AccountTransferRequest
+from fintech_backend.app.services.database_account_service import DatabaseAccountService
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """File-backed SQLite database shared by several threads."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/transfers.db",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+
+    # pysqlite defers BEGIN; take the write lock up front so concurrent
+    # transactions queue on the busy timeout instead of deadlocking.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def accounts(session_factory):
+    """A user with two funded accounts."""
+    db = session_factory()
+    user = User(email="transfer@example.com", first_name="T", last_name="User", password_hash="x")
+    db.add(user)
+    db.flush()
+    checking = Account(
+        user_id=user.id, account_number="CHK0000000001", account_name="Checking",
+        account_type=AccountTypeEnum.CHECKING, current_balance=Decimal("500.00"),
+        available_balance=Decimal("500.00"), is_primary=True,
+    )
+    savings = Account(
+        user_id=user.id, account_number="SAV0000000001", account_name="Savings",
+        account_type=AccountTypeEnum.SAVINGS, current_balance=Decimal("500.00"),
+        available_balance=Decimal("500.00"), is_primary=False,
+    )
+    db.add_all([checking, savings])
+    db.commit()
+    ids = (user.id, checking.id, savings.id)
+    db.close()
+    return ids
+
+
+def _balances(session_factory, *account_ids):
+    db = session_factory()
+    try:
+        return [Decimal(str(db.get(Account, account_id).current_balance)) for account_id in account_ids]
+    finally:
+        db.close()
+
+
+class TestTransferBetweenAccounts:
+    """Test cases for DatabaseAccountService.transfer_between_accounts."""
+
+    def test_transfer_moves_funds_and_writes_both_legs(self, session_factory, accounts):
+        user_id, checking_id, savings_id = accounts
+        db = session_factory()
+        service = DatabaseAccountService(db)
+
+        result = service.transfer_between_accounts(user_id, AccountTransferRequest(
+            from_account_id=checking_id, to_account_id=savings_id, amount=Decimal("125.50")
+        ))
+        db.close()
+
+        assert result["status"] == "completed"
+        assert _balances(session_factory, checking_id, savings_id) == [Decimal("374.50"), Decimal("625.50")]
+
+        db = session_factory()
+        legs = db.execute(select(Transaction).order_by(Transaction.reference_number)).scalars().all()
+        assert [leg.transaction_type for leg in legs] == [
+            TransactionTypeEnum.TRANSFER_IN, TransactionTypeEnum.TRANSFER_OUT
+        ]
+        assert all(leg.amount == Decimal("125.50") for leg in legs)
+        db.close()
+
+    def test_insufficient_funds_leaves_balances_untouched(self, session_factory, accounts):
+        user_id, checking_id, savings_id = accounts
+        db = session_factory()
+        service = DatabaseAccountService(db)
+
+        with pytest.raises(InsufficientFundsException):
+            service.transfer_between_accounts(user_id, AccountTransferRequest(
+                from_account_id=checking_id, to_account_id=savings_id, amount=Decimal("500.01")
+            ))
+        db.close()
+
+        assert _balances(session_factory, checking_id, savings_id) == [Decimal("500.00"), Decimal("500.00")]
+
+    def test_concurrent_transfers_conserve_balance(self, session_factory, accounts):
+        user_id, checking_id, savings_id = accounts
+        workers, transfers_per_worker = 8, 15
+        completed = []
+        errors = []
+        lock = threading.Lock()
+
+        def worker(index):
+            # Alternate directions so lock order matters
+            source, target = (checking_id, savings_id) if index % 2 else (savings_id, checking_id)
+            for _ in range(transfers_per_worker):
+                db = session_factory()
+                try:
+                    DatabaseAccountService(db).transfer_between_accounts(user_id, AccountTransferRequest(
+                        from_account_id=source, to_account_id=target, amount=Decimal("7.25")
+                    ))
+                    with lock:
+                        completed.append((source, target))
+                except InsufficientFundsException:
+                    pass
+                except Exception as e:  # pragma: no cover - surfaced by the assertion below
+                    with lock:
+                        errors.append(e)
+                finally:
+                    db.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        checking, savings = _balances(session_factory, checking_id, savings_id)
+        assert checking + savings == Decimal("1000.00")
+        assert checking >= 0 and savings >= 0
+
+        net_out_of_checking = sum(
+            Decimal("7.25") if source == checking_id else Decimal("-7.25") for source, _ in completed
+        )
+        assert checking == Decimal("500.00") - net_out_of_checking
+
+        db = session_factory()
+        journal_rows = db.execute(select(func.count(Transaction.id))).scalar()
+        db.close()
+        assert journal_rows == 2 * len(completed)
@@ -0,0 +1,84 @@
+"""
+Row-by-row analytics conversion, the reference for aggregated analytics.
+
+This copies the per-row conversion the analytics service used before
+transactions were grouped in SQL and rolled up on write
+(``AnalyticsService._sync_transaction_to_analytics``). It shares no code
+with the service or ``database.rollups``, so a wrong category mapping or
+income rule there does not carry over into the expected numbers.
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+from fintech_backend.app.database.models import Transaction
+from fintech_backend.app.models.analytics import TransactionCategory
+from fintech_backend.app.models.transaction import MerchantCategory, TransactionDirection, TransactionType
+
+# Map merchant categories to transaction categories
+CATEGORY_MAPPING = {
+    MerchantCategory.GROCERIES: TransactionCategory.GROCERIES,
+    MerchantCategory.RESTAURANTS: TransactionCategory.FOOD_DINING,
+    MerchantCategory.GAS_STATIONS: TransactionCategory.FUEL,
+    MerchantCategory.RETAIL: TransactionCategory.SHOPPING,
+    MerchantCategory.ENTERTAINMENT: TransactionCategory.ENTERTAINMENT,
+    MerchantCategory.TRAVEL: TransactionCategory.TRAVEL,
+    MerchantCategory.HEALTHCARE: TransactionCategory.HEALTHCARE,
+    MerchantCategory.UTILITIES: TransactionCategory.BILLS_UTILITIES,
+    MerchantCategory.EDUCATION: TransactionCategory.EDUCATION,
+    MerchantCategory.AUTOMOTIVE: TransactionCategory.TRANSPORTATION,
+    MerchantCategory.ONLINE_SERVICES: TransactionCategory.OTHER,
+    MerchantCategory.SUBSCRIPTION: TransactionCategory.OTHER,
+    MerchantCategory.TRANSFER: TransactionCategory.TRANSFERS,
+    MerchantCategory.INVESTMENT_TRADE: TransactionCategory.INVESTMENTS,
+}
+
+INCOME_TYPES = [TransactionType.SALARY, TransactionType.DEPOSIT,
+                TransactionType.INTEREST, TransactionType.DIVIDEND,
+                TransactionType.REFUND]
+
+
+def convert(transaction: Transaction) -> SimpleNamespace:
+    """One transaction in analytics form."""
+    # ORM columns hold the database enums; compare on their values
+    merchant_category = getattr(transaction.merchant_category, "value", transaction.merchant_category)
+    transaction_type = getattr(transaction.transaction_type, "value", transaction.transaction_type)
+    direction = getattr(transaction.direction, "value", transaction.direction)
+
+    category = CATEGORY_MAPPING.get(
+        MerchantCategory(merchant_category) if merchant_category else MerchantCategory.OTHER,
+        TransactionCategory.OTHER
+    )
+
+    # Stored amounts are always positive; the direction carries the sign
+    signed_amount = transaction.amount if direction == TransactionDirection.INBOUND.value else -transaction.amount
+    is_income = (transaction_type in INCOME_TYPES or
+                 direction == TransactionDirection.INBOUND.value or
+                 signed_amount > 0)
+
+    trans_date = transaction.transaction_date
+    if isinstance(trans_date, datetime):
+        trans_date = trans_date.date()
+
+    return SimpleNamespace(
+        amount=abs(transaction.amount),
+        category=category,
+        merchant=transaction.merchant_name,
+        transaction_date=trans_date,
+        is_income=is_income,
+    )
+
+
+async def analytics_rows(session, user_id, start_date=None, end_date=None, include_income=True):
+    """A user's transactions converted one by one; date bounds cover whole days."""
+    rows = []
+    for transaction in (await session.scalars(select(Transaction).where(Transaction.user_id == user_id))).all():
+        row = convert(transaction)
+        if start_date and row.transaction_date < start_date:
+            continue
+        if end_date and row.transaction_date > end_date:
+            continue
+        if include_income or not row.is_income:
+            rows.append(row)
+    return rows
@@ -0,0 +1,89 @@
+"""
+Unit tests for the cached financial health score and insights.
+"""
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+
+from fintech_backend.app.database.models import (
+    Transaction, TransactionTypeEnum, TransactionStatusEnum,
+    TransactionDirectionEnum, PaymentMethodEnum, MerchantCategoryEnum
+)
+from fintech_backend.app.models.analytics import FinancialGoalRequest, TransactionCategory
+from fintech_backend.app.services import analytics_service
+from fintech_backend.app.services.analytics_service import AnalyticsService
+
+
+def _purchase(account, reference, amount):
+    return Transaction(
+        user_id=account.user_id, account_id=account.id, transaction_type=TransactionTypeEnum.PURCHASE,
+        status=TransactionStatusEnum.COMPLETED, direction=TransactionDirectionEnum.OUTBOUND,
+        payment_method=PaymentMethodEnum.CARD, amount=Decimal(amount), currency="USD",
+        description="Groceries", merchant_category=MerchantCategoryEnum.GROCERIES,
+        reference_number=reference, transaction_date=datetime.utcnow()
+    )
+
+
+@pytest_asyncio.fixture
+async def account(async_db, user_account):
+    analytics_service._user_analytics_cache.clear()
+    user, account = user_account
+    async_db.add_all([user, account])
+    await async_db.commit()
+    async_db.add(_purchase(account, "SCO000001", "40.00"))
+    await async_db.commit()
+    yield account
+    analytics_service._user_analytics_cache.clear()
+
+
+class TestCachedHealthScore:
+    """Test cases for caching the health score and insights per user."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_compute_once(self, async_db, account, monkeypatch):
+        service = AnalyticsService(async_db)
+        compute = service._compute_financial_health_score
+        calls = []
+
+        async def counted(user_id):
+            calls.append(user_id)
+            await asyncio.sleep(0.01)
+            return await compute(user_id)
+
+        monkeypatch.setattr(service, "_compute_financial_health_score", counted)
+
+        scores = await asyncio.gather(*(service.get_financial_health_score(account.user_id) for _ in range(5)))
+
+        assert calls == [account.user_id]
+        assert len({score.last_calculated for score in scores}) == 1
+        assert await service.get_financial_health_score(account.user_id) == scores[0]
+
+    @pytest.mark.asyncio
+    async def test_committed_transactions_invalidate(self, async_db, account):
+        service = AnalyticsService(async_db)
+        insights = await service.get_financial_insights(account.user_id)
+        assert insights[0].amount == Decimal("40.00")
+        score = await service.get_financial_health_score(account.user_id)
+
+        async_db.add(_purchase(account, "SCO000002", "2.50"))
+        await async_db.flush()
+        assert await service.get_financial_insights(account.user_id) == insights
+
+        await async_db.commit()
+        assert (await service.get_financial_insights(account.user_id))[0].amount == Decimal("42.50")
+        assert (await service.get_financial_health_score(account.user_id)).last_calculated > score.last_calculated
+
+    @pytest.mark.asyncio
+    async def test_new_goal_invalidates(self, async_db, account):
+        service = AnalyticsService(async_db)
+        score = await service.get_financial_health_score(account.user_id)
+
+        await service.create_financial_goal(account.user_id, FinancialGoalRequest(
+            name="Emergency fund", target_amount=Decimal("1000"), target_date=datetime(2030, 1, 1).date(),
+            category=TransactionCategory.SAVINGS
+        ))
+
+        assert (await service.get_financial_health_score(account.user_id)).last_calculated > score.last_calculated
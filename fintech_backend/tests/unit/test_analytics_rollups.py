@@ -0,0 +1,255 @@
+"""
+Unit tests for the per-user daily analytics rollups.
+"""
+import random
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+
+from fintech_backend.app.database.models import (
+    Transaction, TransactionDailyRollup, TransactionMonthlyRollup, TransactionTypeEnum, TransactionStatusEnum,
+    TransactionDirectionEnum, PaymentMethodEnum, MerchantCategoryEnum
+)
+from fintech_backend.app.database.rollups import rebuild_rollups
+from fintech_backend.app.models.analytics import (
+    AnalyticsRequest, AnalyticsPeriod, BudgetDB, TransactionCategory
+)
+from fintech_backend.app.repositories.database_repository import TransactionRepository
+from fintech_backend.app.services.analytics_service import AnalyticsService
+from fintech_backend.tests.unit.analytics_reference import analytics_rows
+
+TYPES = [TransactionTypeEnum.PURCHASE, TransactionTypeEnum.PAYMENT, TransactionTypeEnum.DEPOSIT,
+         TransactionTypeEnum.INTEREST]
+
+
+def _rows(user_id, account_id, count, seed, prefix):
+    rng = random.Random(seed)
+    for i in range(count):
+        transaction_type = rng.choice(TYPES)
+        inbound = transaction_type == TransactionTypeEnum.DEPOSIT or rng.random() < 0.05
+        yield {
+            "user_id": user_id,
+            "account_id": account_id,
+            "transaction_type": transaction_type,
+            "status": TransactionStatusEnum.COMPLETED,
+            "direction": TransactionDirectionEnum.INBOUND if inbound else TransactionDirectionEnum.OUTBOUND,
+            "payment_method": PaymentMethodEnum.CARD,
+            "amount": Decimal(f"{rng.uniform(1, 400):.2f}"),
+            "currency": "USD",
+            "description": f"Row {i}",
+            "merchant_name": rng.choice(["Acme", "Payroll", None]),
+            "merchant_category": rng.choice(list(MerchantCategoryEnum) + [None]),
+            "reference_number": f"{prefix}{i:06d}",
+            "transaction_date": datetime(2024, 1, 1) + timedelta(hours=rng.randint(0, 24 * 120)),
+        }
+
+
+def _setup(session, user_account):
+    user, account = user_account
+    session.add_all([user, account])
+    session.flush()
+    return user.id, account.id
+
+
+def _snapshot(session, model=TransactionDailyRollup, period="day"):
+    """Stored rollups without rows that netted out to zero."""
+    return {
+        (row.user_id, getattr(row, period), row.category): (row.income_cents, row.income_count,
+                                                            row.expense_cents, row.expense_count)
+        for row in session.scalars(select(model))
+        if row.income_count or row.expense_count
+    }
+
+
+def _by_month(daily):
+    months = defaultdict(lambda: [0, 0, 0, 0])
+    for (user_id, day, category), totals in daily.items():
+        month = months[(user_id, day.replace(day=1), category)]
+        for index, value in enumerate(totals):
+            month[index] += value
+    return {key: tuple(totals) for key, totals in months.items() if totals[1] or totals[3]}
+
+
+@pytest_asyncio.fixture
+async def user_id(async_db, user_account):
+    await async_db.run_sync(lambda sync_session: TransactionRepository(sync_session).insert_transactions(
+        list(_rows(*_setup(sync_session, user_account), 300, seed=21, prefix="ASY"))
+    ))
+    await async_db.commit()
+    return user_account[0].id
+
+
+class TestRollupMaintenance:
+    """Test cases for keeping rollups in step with transaction writes."""
+
+    def test_every_write_path_matches_a_rebuild(self, db, user_account):
+        user_id, account_id = _setup(db, user_account)
+        repo = TransactionRepository(db)
+        repo.insert_transactions(list(_rows(user_id, account_id, 120, seed=1, prefix="INS")))
+        # Half of these reuse existing reference numbers and are skipped
+        repo.bulk_create_transactions(list(_rows(user_id, account_id, 80, seed=2, prefix="INS"))[60:]
+                                      + list(_rows(user_id, account_id, 40, seed=3, prefix="BLK")))
+        db.add_all(Transaction(**row) for row in _rows(user_id, account_id, 30, seed=4, prefix="ORM"))
+        db.commit()
+
+        transactions = db.scalars(select(Transaction).order_by(Transaction.reference_number)).all()
+        transactions[0].amount += Decimal("10.05")
+        transactions[1].merchant_category = MerchantCategoryEnum.TRAVEL
+        transactions[2].transaction_date -= timedelta(days=40)
+        transactions[3].direction = TransactionDirectionEnum.INBOUND
+        db.delete(transactions[4])
+        db.delete(transactions[5])
+        transactions[5].amount = Decimal("1.00")  # changed, then deleted
+        db.commit()
+
+        maintained = _snapshot(db)
+        monthly = _snapshot(db, TransactionMonthlyRollup, "month")
+        assert sum(counts[1] + counts[3] for counts in maintained.values()) == 120 + 40 + 30 - 2
+        assert monthly == _by_month(maintained)
+
+        assert rebuild_rollups(db) == 188
+        db.commit()
+        assert _snapshot(db) == maintained
+        assert _snapshot(db, TransactionMonthlyRollup, "month") == monthly
+
+        # Small batches add onto each other while the cursor streams
+        assert rebuild_rollups(db, batch_size=7) == 188
+        db.commit()
+        assert _snapshot(db) == maintained
+        assert _snapshot(db, TransactionMonthlyRollup, "month") == monthly
+
+    def test_rollback_discards_rollup_changes(self, db, user_account):
+        user_id, account_id = _setup(db, user_account)
+        TransactionRepository(db).insert_transactions(list(_rows(user_id, account_id, 10, seed=5, prefix="RBK")))
+        db.commit()
+        before = _snapshot(db)
+
+        TransactionRepository(db).insert_transactions(list(_rows(user_id, account_id, 10, seed=6, prefix="TMP")))
+        db.rollback()
+
+        assert _snapshot(db) == before
+
+
+class TestRollupAnalytics:
+    """Test cases for analytics read from rollups against the per-row conversion."""
+
+    @pytest.mark.asyncio
+    async def test_cash_flow_matches_per_row_conversion(self, async_db, user_id):
+        service = AnalyticsService(async_db)
+        start, end = date(2024, 2, 1), date(2024, 3, 15)
+        transactions = await analytics_rows(async_db, user_id, start, end)
+        income_sources = defaultdict(Decimal)
+        expense_categories = defaultdict(Decimal)
+        for transaction in transactions:
+            if transaction.is_income:
+                income_sources[transaction.merchant or "Other Income"] += transaction.amount
+            else:
+                expense_categories[transaction.category.value] += transaction.amount
+
+        result = await service.get_cash_flow_analysis(user_id, AnalyticsRequest(start_date=start, end_date=end))
+
+        assert result.total_income == sum(income_sources.values())
+        assert result.total_expenses == sum(expense_categories.values())
+        assert result.income_sources == income_sources
+        assert result.expense_categories == expense_categories
+
+    @pytest.mark.asyncio
+    async def test_budget_spending_is_batched(self, async_db, user_id, monkeypatch):
+        service = AnalyticsService(async_db)
+        budgets = [
+            _budget(user_id, "groceries", TransactionCategory.GROCERIES, date(2024, 2, 10), date(2024, 3, 9)),
+            _budget(user_id, "groceries_q1", TransactionCategory.GROCERIES, date(2024, 1, 1), date(2024, 3, 31)),
+            _budget(user_id, "travel", TransactionCategory.TRAVEL, date(2024, 3, 1), None, amount=Decimal("50")),
+            _budget(user_id, "savings", TransactionCategory.SAVINGS, date(2024, 1, 1), date(2024, 1, 31)),
+            _budget(user_id, "other", TransactionCategory.OTHER, date(2024, 2, 1), date(2024, 2, 29), active=False),
+        ]
+        expected = {}
+        for budget in budgets:
+            transactions = await analytics_rows(
+                async_db, user_id, budget.start_date, budget.end_date, include_income=False
+            )
+            expected[budget.id] = sum((t.amount for t in transactions if t.category == budget.category), Decimal("0"))
+        monkeypatch.setattr(service, "_load_user_budgets", lambda user_id: _resolved(budgets))
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(async_db.bind.sync_engine, "before_cursor_execute", listener)
+        try:
+            profiles = await service.get_user_budgets(user_id)
+        finally:
+            event.remove(async_db.bind.sync_engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 1
+        assert {profile.id: profile.spent_amount for profile in profiles} == expected
+        assert expected["groceries"] < expected["groceries_q1"]
+
+        alerts = await service.get_user_financial_alerts(user_id)
+        assert [alert.id for alert in alerts] == [
+            f"budget_exceeded_{profile.id}" for profile in profiles
+            if profile.is_active and profile.percentage_used > 100
+        ]
+        assert alerts and all(alert.amount > alert.threshold for alert in alerts)
+
+    @pytest.mark.asyncio
+    async def test_period_comparison_matches_per_row_conversion(self, async_db, user_id):
+        service = AnalyticsService(async_db)
+        months = defaultdict(lambda: [Decimal("0"), Decimal("0"), 0, defaultdict(Decimal)])
+        for transaction in await analytics_rows(async_db, user_id):
+            month = months[transaction.transaction_date.replace(day=1)]
+            month[0 if transaction.is_income else 1] += transaction.amount
+            month[2] += 1
+            if not transaction.is_income:
+                month[3][transaction.category.value] += transaction.amount
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(async_db.bind.sync_engine, "before_cursor_execute", listener)
+        try:
+            result = await service.get_period_comparison(user_id, months=4, end_date=date(2024, 4, 20))
+        finally:
+            event.remove(async_db.bind.sync_engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 1
+        assert [p.period for p in result.month_over_month] == ["2024-01", "2024-02", "2024-03", "2024-04"]
+        assert [p.period for p in result.quarter_over_quarter] == ["2024-Q1", "2024-Q2"]
+        assert [p.period for p in result.year_over_year] == ["2024"]
+        for summary in result.month_over_month:
+            income, spending, count, categories = months[summary.start_date]
+            assert (summary.total_income, summary.total_spending, summary.transaction_count) == \
+                (income, spending, count)
+            assert summary.category_spending == categories
+            assert sum(summary.category_mix.values()) == pytest.approx(100, abs=0.1)
+        january, february = result.month_over_month[:2]
+        assert january.spending_change_percent is None
+        assert february.spending_change_percent == round(
+            float((february.total_spending - january.total_spending) / january.total_spending * 100), 2
+        )
+        first_quarter, second_quarter = result.quarter_over_quarter
+        assert first_quarter.end_date == date(2024, 3, 31) and not first_quarter.is_partial
+        assert first_quarter.total_spending == sum(p.total_spending for p in result.month_over_month[:3])
+        # Q2 has only reached April, so it is compared with January alone
+        assert second_quarter.end_date == date(2024, 4, 30) and second_quarter.is_partial
+        assert second_quarter.total_spending == result.month_over_month[3].total_spending
+        assert second_quarter.spending_change_percent == round(
+            float((second_quarter.total_spending - january.total_spending) / january.total_spending * 100), 2
+        )
+        year = result.year_over_year[0]
+        assert (year.end_date, year.is_partial, year.transaction_count) == (date(2024, 4, 30), True, 300)
+        assert not any(p.is_partial for p in result.month_over_month)
+
+
+def _budget(user_id, budget_id, category, start_date, end_date, amount=Decimal("500"), active=True):
+    now = datetime(2024, 1, 1)
+    return BudgetDB(
+        id=budget_id, user_id=user_id, name=budget_id.title(), category=category, amount=amount,
+        period=AnalyticsPeriod.MONTHLY, start_date=start_date, end_date=end_date,
+        currency="USD", is_active=active, created_at=now, updated_at=now
+    )
+
+
+async def _resolved(value):
+    return value
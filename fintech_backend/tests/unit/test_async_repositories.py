@@ -0,0 +1,122 @@
+"""
+Unit tests for the async database repositories.
+"""
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from fintech_backend.app.api.v1.analytics import router as analytics_router
+from fintech_backend.app.auth.dependencies import get_current_user, get_current_user_async, get_current_user_id
+from fintech_backend.app.database.config import get_async_database_url, get_async_db, get_db
+from fintech_backend.app.database.models import User, AccountTypeEnum
+from fintech_backend.app.repositories.database_repository import (
+    AsyncUserRepository,
+    AsyncAccountRepository,
+)
+
+
+@pytest_asyncio.fixture
+async def user(async_db):
+    """A persisted user row."""
+    user = User(
+        email="async@example.com",
+        first_name="Async",
+        last_name="User",
+        password_hash="hashed",
+    )
+    async_db.add(user)
+    await async_db.commit()
+    return user
+
+
+class TestAsyncDatabaseUrl:
+    """Test cases for async driver URL mapping."""
+
+    def test_postgres_urls_use_asyncpg(self):
+        assert get_async_database_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+        assert get_async_database_url("postgres://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+
+    def test_sqlite_urls_use_aiosqlite(self):
+        assert get_async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+
+class TestAsyncRepositories:
+    """Test cases for AsyncUserRepository and AsyncAccountRepository."""
+
+    @pytest.mark.asyncio
+    async def test_user_lookup(self, async_db, user):
+        repo = AsyncUserRepository(async_db)
+
+        assert (await repo.get_user_by_id(user.id)).email == "async@example.com"
+        assert (await repo.get_user_by_email("async@example.com")).id == user.id
+        assert await repo.get_user_by_email("missing@example.com") is None
+
+    @pytest.mark.asyncio
+    async def test_update_user(self, async_db, user):
+        repo = AsyncUserRepository(async_db)
+
+        updated = await repo.update_user(user.id, first_name="Renamed")
+
+        assert updated.first_name == "Renamed"
+
+    @pytest.mark.asyncio
+    async def test_account_balance_and_primary(self, async_db, user):
+        repo = AsyncAccountRepository(async_db)
+        account = await repo.create_account(
+            user.id, "Checking", AccountTypeEnum.CHECKING, "ACC0000000001"
+        )
+
+        await repo.update_balance(account.id, 250.0, 200.0)
+        assert await repo.set_primary_account(user.id, account.id)
+
+        accounts = await repo.get_accounts_by_user_id(user.id)
+        assert len(accounts) == 1
+        assert float(accounts[0].current_balance) == 250.0
+        assert accounts[0].is_primary is True
+
+
+class TestCurrentUserSession:
+    """Test cases for authentication sharing the route's database session."""
+
+    def test_sync_routes_open_one_session(self, db):
+        user = User(email="sync@example.com", first_name="Sync", last_name="User", password_hash="hashed")
+        db.add(user)
+        db.commit()
+        opened = []
+
+        def override_get_db():
+            opened.append(db)
+            yield db
+
+        app = FastAPI()
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_current_user_id] = lambda: user.id
+
+        @app.get("/me")
+        async def me(current_user=Depends(get_current_user), session: Session = Depends(get_db)):
+            return {"same": session is db, "email": current_user.email}
+
+        response = TestClient(app).get("/me")
+
+        assert response.json() == {"same": True, "email": "sync@example.com"}
+        assert len(opened) == 1
+
+    @pytest.mark.asyncio
+    async def test_async_lookup_confirms_the_token_user(self, async_db, user):
+        claims = {"user_id": user.id, "email": user.email}
+        assert await get_current_user_async(claims, async_db) == claims
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user_async({"user_id": "deleted-user"}, async_db)
+        assert exc_info.value.status_code == 401
+
+    def test_analytics_routes_authenticate_on_their_async_session(self):
+        for route in analytics_router.routes:
+            if route.path.endswith("/health"):
+                continue  # unauthenticated
+            calls = [dependency.call for dependency in route.dependant.dependencies]
+            assert get_current_user_async in calls
+            auth = route.dependant.dependencies[calls.index(get_current_user_async)]
+            assert get_async_db in [dependency.call for dependency in auth.dependencies]
@@ -0,0 +1,145 @@
+"""
+Unit tests for the async TTL cache.
+"""
+import asyncio
+
+import pytest
+
+from fintech_backend.app.utils.cache import AsyncTTLCache
+
+
+class TestAsyncTTLCache:
+    """Test cases for AsyncTTLCache."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_computation(self):
+        cache = AsyncTTLCache(ttl_seconds=60)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"value": 42}
+
+        entries = await asyncio.gather(*[cache.get_or_compute("k", compute) for _ in range(50)])
+
+        assert calls == 1
+        assert all(entry.value == {"value": 42} for entry in entries)
+        assert len({id(entry) for entry in entries}) == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_recomputed(self):
+        cache = AsyncTTLCache(ttl_seconds=0)
+        values = iter([1, 2])
+
+        async def compute():
+            return next(values)
+
+        assert (await cache.get_or_compute("k", compute)).value == 1
+        assert (await cache.get_or_compute("k", compute)).value == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_is_not_cached(self):
+        cache = AsyncTTLCache(ttl_seconds=60)
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        async def succeeding():
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("k", failing)
+        assert (await cache.get_or_compute("k", succeeding)).value == "ok"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_during_computation_discards_result(self):
+        cache = AsyncTTLCache(ttl_seconds=60)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await release.wait()
+            return "stale"
+
+        task = asyncio.create_task(cache.get_or_compute("k", slow))
+        await started.wait()
+        cache.invalidate("k")
+        release.set()
+        await task
+
+        assert cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_over_to_waiter(self):
+        cache = AsyncTTLCache(ttl_seconds=60)
+        started = asyncio.Event()
+
+        async def stalled():
+            started.set()
+            await asyncio.Event().wait()
+
+        async def compute():
+            return "fresh"
+
+        leader = asyncio.create_task(cache.get_or_compute("k", stalled))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert (await waiter).value == "fresh"
+        assert leader.cancelled()
+        assert cache.get("k").value == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_leader_running(self):
+        cache = AsyncTTLCache(ttl_seconds=60)
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "value"
+
+        leader = asyncio.create_task(cache.get_or_compute("k", slow))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_compute("k", slow))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert (await leader).value == "value"
+        assert waiter.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self):
+        cache = AsyncTTLCache(ttl_seconds=60, max_entries=2)
+
+        for key in ("a", "b", "c"):
+            await cache.get_or_compute(key, lambda key=key: asyncio.sleep(0, result=key))
+
+        assert cache.get("a") is None
+        assert cache.get("c").value == "c"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_from_other_threads(self):
+        cache = AsyncTTLCache(ttl_seconds=60, max_entries=8)
+        keys = [f"k{i}" for i in range(16)]
+
+        def invalidate_all():
+            for _ in range(200):
+                for key in keys:
+                    cache.invalidate(key)
+
+        async def read_all():
+            for _ in range(200):
+                for key in keys:
+                    await cache.get_or_compute(key, lambda key=key: asyncio.sleep(0, result=key))
+
+        await asyncio.gather(read_all(), asyncio.to_thread(invalidate_all), asyncio.to_thread(invalidate_all))
+
+        assert len(cache._entries) <= 8 and not cache._in_flight
+        assert (await cache.get_or_compute("k0", lambda: asyncio.sleep(0, result="k0"))).value == "k0"
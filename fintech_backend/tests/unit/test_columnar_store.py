@@ -0,0 +1,283 @@
+"""
+Unit tests for the columnar transaction store.
+"""
+import random
+import tracemalloc
+from datetime import datetime, timedelta, UTC
+from decimal import Decimal
+
+import pytest
+
+from fintech_backend.app.repositories.columnar import ColumnarTransactionStore
+from fintech_backend.app.repositories.mock_repository import TransactionMockRepository, compile_criteria
+from fintech_backend.app.repositories.persistence import AppendLogBackend, StateJournal
+from fintech_backend.app.utils.transaction_columns import TransactionColumns
+
+BATCH_COLUMNS = (
+    "size", "scale", "amounts", "instants", "days", "date_kinds", "debit", "category_codes", "categories"
+)
+
+
+def _transactions(count, seed=3):
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    for i in range(count):
+        yield {
+            "id": f"txn_{i:04d}",
+            "user_id": f"user_{i % 3}",
+            "amount": Decimal(f"{rng.uniform(1, 300):.2f}"),
+            "transaction_type": rng.choice(["debit", "credit"]),
+            "category": rng.choice(["food", "rent", "travel"]),
+            "transaction_date": base + timedelta(hours=rng.randint(0, 24 * 120)),
+            "status": "completed",
+        }
+
+
+def _matches(predicate, record):
+    """Reference predicate; a naive date compared with an aware bound does not match."""
+    try:
+        return predicate(record)
+    except TypeError:
+        return False
+
+
+class TestColumnarTransactionStore:
+    """Test cases for lossless column storage."""
+
+    def test_round_trip_keeps_unencodable_values(self):
+        store = ColumnarTransactionStore()
+        record = {
+            "id": "t1",
+            "user_id": "u",
+            "amount": Decimal("12.345"),  # not whole cents
+            "transaction_date": datetime(2024, 5, 1, 12, 30),  # naive
+            "is_recurring": 1,
+            "tags": ["a", "b"],  # outside the schema
+            "merchant": None,
+        }
+        store["t1"] = record
+        store["t2"] = {"id": "t2", "amount": Decimal("12.30"), "is_recurring": True,
+                       "created_at": datetime(2024, 5, 1, 12, 30, 0, 17, tzinfo=UTC)}
+
+        assert store["t1"] == record
+        assert store["t1"]["is_recurring"] == 1
+        assert type(store["t1"]["is_recurring"]) is int
+        assert store["t2"]["is_recurring"] is True
+        assert str(store["t2"]["amount"]) == "12.30"
+        assert store["t2"]["created_at"].microsecond == 17
+
+    def test_deletes_keep_insertion_order(self):
+        store = ColumnarTransactionStore()
+        for record in _transactions(5):
+            store[record["id"]] = record
+        del store["txn_0002"]
+        store["new"] = {"id": "new", "category": "rent"}
+        store["txn_0000"] = dict(store["txn_0000"], category="travel")
+
+        assert len(store) == 5
+        assert "txn_0002" not in store
+        assert store["new"] == {"id": "new", "category": "rent"}
+        assert list(store) == ["txn_0000", "txn_0001", "txn_0003", "txn_0004", "new"]
+        with pytest.raises(ValueError):
+            store["x"] = {"id": "y"}
+
+    def test_holes_are_compacted(self):
+        store = ColumnarTransactionStore()
+        records = list(_transactions(3000))
+        for record in records:
+            store[record["id"]] = record
+        for record in records[:2000]:
+            del store[record["id"]]
+        store["odd\0id"] = {"id": "odd\0id", "category": "rent"}
+
+        assert len(store._ids) < 3000
+        assert list(store) == [record["id"] for record in records[2000:]] + ["odd\0id"]
+        assert [store[record["id"]] for record in records[2000:]] == records[2000:]
+        assert store["odd\0id"]["category"] == "rent"
+
+    def test_packed_strings_round_trip(self):
+        store = ColumnarTransactionStore()
+        values = ["TXN100", "TXN200", "TXN2001", "", "TXN", "réf-é", "x" * 80, "nul\0byte"]
+        for number, value in enumerate(values):
+            store[f"t{number}"] = {"id": f"t{number}", "reference_number": value}
+        store["t9"] = {"id": "t9"}
+
+        assert [store[f"t{number}"]["reference_number"] for number in range(len(values))] == values
+        assert "reference_number" not in store["t9"]
+        # Too long or NUL-bearing strings go to the overflow
+        assert set(store._overflow) == {6, 7}
+
+    def test_code_columns_widen_with_the_vocabulary(self):
+        store = ColumnarTransactionStore()
+        for number in range(300):
+            store[f"t{number}"] = {"id": f"t{number}", "user_id": f"user_{number}"}
+
+        assert store._columns["user_id"][1].typecode == "h"
+        assert store._columns["currency"][1].typecode == "b"
+        assert [store[f"t{number}"]["user_id"] for number in (0, 127, 128, 299)] == \
+            ["user_0", "user_127", "user_128", "user_299"]
+        assert sum(1 for _ in filter(store.column_checks({"user_id": "user_200"})[0][0], range(300))) == 1
+
+    def test_memory_per_record(self):
+        records = list(_transactions(20000))
+        for record in records:
+            record.update(reference_number=f"TXN{random.randint(10 ** 8, 10 ** 9 - 1)}",
+                          created_at=record["transaction_date"], updated_at=record["transaction_date"])
+        contents = [(record["id"], record) for record in records]
+        tracemalloc.start()
+        try:
+            store = ColumnarTransactionStore(contents=contents)
+            used = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        assert len(store) == 20000
+        assert used / len(store) < 100
+
+    def test_column_checks_agree_with_compiled_criteria(self):
+        store = ColumnarTransactionStore()
+        records = list(_transactions(300))
+        records.append({"id": "odd", "amount": Decimal("50.5"), "category": "food",
+                        "transaction_date": datetime(2024, 2, 1)})
+        for record in records:
+            store[record["id"]] = record
+        rows = dict(zip(store, store.views()))
+
+        for criteria in (
+            {"category": "food", "transaction_type": "debit"},
+            {"category": {"$in": ["rent", "travel"]}},
+            {"amount": {"$gte": Decimal("50.50"), "$lt": 100}},
+            {"transaction_date": {"$gt": datetime(2024, 2, 1, tzinfo=UTC)}},
+        ):
+            checks, rest = store.column_checks(criteria)
+            assert checks and not rest
+            expected = {r["id"] for r in records if _matches(compile_criteria(criteria), r)}
+            found = {
+                record_id for record_id, view in rows.items()
+                if _matches(lambda row: all(check(row) for check in checks), view.row)
+            }
+            assert found == expected
+
+    def test_vocabulary_lookups_and_release(self):
+        store = ColumnarTransactionStore()
+        for record in _transactions(30):
+            store[record["id"]] = dict(record, description=f"Note {record['id']}", is_recurring=True)
+        store["txn_0000"] = dict(store["txn_0000"], is_recurring=1)
+
+        users = store._vocabularies["user_id"]
+        assert users.matching(["user_1"]) == {users.codes[str]["user_1"]}
+        # 1 == True, so both codes match either way round
+        assert len(store._vocabularies["is_recurring"].matching([True])) == 2
+        descriptions = store._vocabularies["description"]
+        assert len(descriptions.codes[str]) == 30
+
+        for record_id in [record_id for record_id in store if store[record_id]["user_id"] == "user_1"]:
+            del store[record_id]
+        store["txn_0000"] = dict(store["txn_0000"], user_id="user_9")
+        assert users.matching(["user_1"]) == set()
+        assert "user_1" not in users.codes[str] and "user_0" in users.codes[str]
+        # Descriptions of the deleted rows are released with them
+        assert len(descriptions.codes[str]) == 20
+        assert store["txn_0003"]["user_id"] == "user_0"
+        # Freed codes are reused
+        store["txn_new"] = dict(store["txn_0003"], id="txn_new", user_id="user_7")
+        assert len(users.values) == 4
+        assert store["txn_new"]["user_id"] == "user_7"
+
+    def test_sum_amounts_is_exact(self):
+        store = ColumnarTransactionStore()
+        records = list(_transactions(500))
+        for record in records:
+            store[record["id"]] = record
+
+        totals = store.sum_amounts(store, group_by="category", where={"transaction_type": "debit"})
+
+        for category, (amount, count) in totals.items():
+            debits = [r for r in records if r["category"] == category and r["transaction_type"] == "debit"]
+            assert amount == sum(r["amount"] for r in debits)
+            assert count == len(debits)
+
+        months = store.sum_amounts(store, group_by="transaction_date:month")
+        assert sum(count for _, count in months.values()) == 500
+        assert set(months) == {r["transaction_date"].strftime("%Y-%m") for r in records}
+
+    def test_transaction_columns_match_the_records(self):
+        store = ColumnarTransactionStore()
+        records = list(_transactions(200))
+        records[3] = dict(records[3], amount=Decimal("1.005"))
+        records[4] = {key: value for key, value in records[4].items() if key != "transaction_date"}
+        for record in records:
+            store[record["id"]] = record
+
+        # Every record from the columns; then the sub-cent amount forces the record path
+        for ids in ([r["id"] for r in records if r is not records[3]], [r["id"] for r in records]):
+            batch = store.transaction_columns(ids)
+            expected = TransactionColumns(store[record_id] for record_id in ids)
+            assert [getattr(batch, name) for name in BATCH_COLUMNS] == \
+                [getattr(expected, name) for name in BATCH_COLUMNS]
+
+    def test_journaled_store_is_restored(self, tmp_path):
+        journal = StateJournal(AppendLogBackend(tmp_path))
+        store = journal.attach("transactions", ColumnarTransactionStore)
+        records = {record["id"]: record for record in _transactions(20)}
+        store.update(records)
+        del store["txn_0005"]
+        journal.backend.close()
+
+        restored = StateJournal(AppendLogBackend(tmp_path)).attach("transactions", ColumnarTransactionStore)
+        del records["txn_0005"]
+        assert isinstance(restored, ColumnarTransactionStore)
+        assert dict(restored) == records
+
+
+class TestColumnarRepository:
+    """Test cases for the transaction repository on top of the column store."""
+
+    @pytest.mark.asyncio
+    async def test_queries_return_plain_records(self):
+        repo = TransactionMockRepository()
+        for record in _transactions(200):
+            await repo.create(dict(record))
+
+        matches = await repo.find_by_criteria({"user_id": "user_1", "amount": {"$gt": Decimal("150")}})
+        assert matches and all(type(record) is dict for record in matches)
+        assert all(record["amount"] > 150 and record["user_id"] == "user_1" for record in matches)
+        assert await repo.count({"category": "rent"}) == \
+            len(await repo.find_by_criteria({"category": "rent"}, limit=1000))
+
+        await repo.update(matches[0]["id"], {"category": "moved"})
+        assert (await repo.get_by_id(matches[0]["id"]))["category"] == "moved"
+        assert await repo.delete_by_user("user_1") == 67
+
+    @pytest.mark.asyncio
+    async def test_amount_totals_over_a_date_range(self):
+        repo = TransactionMockRepository()
+        records = list(_transactions(300))
+        for record in records:
+            await repo.create(dict(record))
+        start, end = datetime(2024, 2, 1, tzinfo=UTC), datetime(2024, 3, 1, tzinfo=UTC)
+
+        totals = await repo.get_amount_totals("user_0", start, end, group_by="category")
+
+        in_range = [r for r in records if r["user_id"] == "user_0" and start <= r["transaction_date"] <= end]
+        assert sum(count for _, count in totals.values()) == len(in_range)
+        assert sum(amount for amount, _ in totals.values()) == sum(r["amount"] for r in in_range)
+
+    @pytest.mark.asyncio
+    async def test_transaction_columns_over_a_date_range(self):
+        repo = TransactionMockRepository()
+        records = list(_transactions(300))
+        for record in records:
+            await repo.create(dict(record))
+        start, end = datetime(2024, 2, 1, tzinfo=UTC), datetime(2024, 3, 1, tzinfo=UTC)
+
+        columns = await repo.get_transaction_columns("user_0", start, end, where={"category": {"$in": ["food"]}})
+
+        in_range = sorted(
+            (r for r in records if r["user_id"] == "user_0" and start <= r["transaction_date"] <= end
+             and r["category"] == "food"),
+            key=lambda r: r["transaction_date"]
+        )
+        assert columns.size == len(in_range)
+        assert list(columns.amounts) == [int(r["amount"] * 100) for r in in_range]
+        assert bytes(columns.debit) == bytes(r["transaction_type"] == "debit" for r in in_range)
@@ -0,0 +1,192 @@
+"""
+Unit tests for database connection liveness handling.
+"""
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from fintech_backend.app.core.exception_handlers import fintech_exception_handler
+from fintech_backend.app.core.exceptions import DatabaseUnavailableException, FintechException
+from fintech_backend.app.database import config
+from fintech_backend.app.database.liveness import (
+    CircuitBreaker,
+    install_liveness_listeners,
+    liveness_stats,
+)
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker state transitions."""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+        assert breaker.retry_after() > 0
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_admits_single_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_success_closes(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.allow_request()
+        breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request()
+
+    def test_half_open_rejections_ask_for_a_retry(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        assert breaker.retry_after() == 1
+
+
+class TestTrialRelease:
+    """Test cases for half-open trials that end without reaching the database."""
+
+    @pytest.fixture
+    def breaker(self, monkeypatch):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        monkeypatch.setattr(config, "db_circuit_breaker", breaker)
+        return breaker
+
+    @pytest.mark.asyncio
+    async def test_cancelled_async_trial_is_released(self, breaker, monkeypatch):
+        class StalledSession:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+            async def connection(self):
+                raise asyncio.CancelledError()
+
+        monkeypatch.setattr(config, "get_async_engine", lambda: config.engine)
+        monkeypatch.setattr(config, "get_async_session_factory", lambda: StalledSession)
+        monkeypatch.setattr(config.engine, "sync_engine", config.engine, raising=False)
+
+        with pytest.raises(asyncio.CancelledError):
+            await config.get_async_db().__anext__()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+
+    @pytest.mark.asyncio
+    async def test_async_setup_error_is_released(self, breaker, monkeypatch):
+        def broken():
+            raise RuntimeError("no driver")
+
+        monkeypatch.setattr(config, "get_async_engine", broken)
+
+        with pytest.raises(RuntimeError):
+            await config.get_async_db().__anext__()
+
+        assert breaker.allow_request()
+
+    def test_sync_setup_error_is_released(self, breaker, monkeypatch):
+        def broken():
+            raise RuntimeError("bad session")
+
+        monkeypatch.setattr(config, "SessionLocal", broken)
+
+        with pytest.raises(RuntimeError):
+            next(config.get_db())
+
+        assert breaker.allow_request()
+
+
+class TestLazyPing:
+    """Test cases for idle-threshold pings on checkout."""
+
+    @pytest.fixture(autouse=True)
+    def reset_stats(self):
+        liveness_stats.reset()
+        yield
+        liveness_stats.reset()
+
+    def _engine(self, tmp_path, idle_threshold):
+        engine = create_engine(f"sqlite:///{tmp_path}/liveness.db", poolclass=QueuePool, pool_size=1)
+        install_liveness_listeners(engine, idle_threshold=idle_threshold)
+        return engine
+
+    def test_recently_used_connection_is_not_pinged(self, tmp_path):
+        engine = self._engine(tmp_path, idle_threshold=60)
+
+        for _ in range(3):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        stats = liveness_stats.snapshot()
+        assert stats["checkouts"] == 3
+        assert stats["pings"] == 0
+        assert stats["connects"] == 1
+        engine.dispose()
+
+    def test_idle_connection_is_pinged(self, tmp_path):
+        engine = self._engine(tmp_path, idle_threshold=0)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        stats = liveness_stats.snapshot()
+        assert stats["pings"] == 2
+        assert stats["ping_failures"] == 0
+        engine.dispose()
+
+
+class TestUnavailableResponse:
+    """Test cases for the 503 returned while the database is unavailable."""
+
+    def test_retry_after_header(self):
+        app = FastAPI()
+        app.add_exception_handler(FintechException, fintech_exception_handler)
+
+        @app.get("/accounts")
+        def list_accounts():
+            raise DatabaseUnavailableException(retry_after=7)
+
+        response = TestClient(app).get("/accounts")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "7"
+        assert response.json()["details"]["retry_after_seconds"] == 7
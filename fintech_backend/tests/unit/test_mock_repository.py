@@ -0,0 +1,159 @@
+"""
+Unit tests for mock repository secondary indexes.
+"""
+from datetime import datetime, timedelta, UTC
+
+import pytest
+
+from fintech_backend.app.repositories.mock_repository import (
+    MockRepository, UserMockRepository, TransactionMockRepository, compile_criteria
+)
+
+
+class CountingRepository(UserMockRepository):
+    """User repository that counts how many records the criteria check visits."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checked = 0
+
+    def _compile_criteria(self, criteria):
+        predicate = super()._compile_criteria(criteria)
+
+        def counting(record):
+            self.checked += 1
+            return predicate(record)
+
+        return counting
+
+
+@pytest.fixture
+def base_date():
+    return datetime(2024, 1, 1, tzinfo=UTC)
+
+
+class TestHashIndexes:
+    """Test cases for equality lookups through hash indexes."""
+
+    @pytest.mark.asyncio
+    async def test_user_lookup_only_visits_that_users_records(self):
+        repo = CountingRepository(hash_indexes=("status",))
+        for i in range(1000):
+            await repo.create({"user_id": f"user_{i % 100}", "status": "pending" if i % 2 else "completed"})
+
+        records = await repo.get_by_user_id("user_7")
+
+        assert len(records) == 10
+        assert repo.checked == 10
+        assert await repo.count_by_user("user_7", {"status": "pending"}) == 10
+
+    @pytest.mark.asyncio
+    async def test_results_match_full_scan_order_after_updates(self):
+        indexed = UserMockRepository(hash_indexes=("status",))
+        plain = MockRepository()
+        for repo in (indexed, plain):
+            for i in range(20):
+                await repo.create({"id": f"r{i}", "user_id": "u", "status": "new"})
+            for i in (15, 3, 9):
+                await repo.update(f"r{i}", {"status": "done"})
+            await repo.delete("r4")
+
+        criteria = {"user_id": "u", "status": {"$in": ["done", "new"]}}
+        assert [r["id"] for r in await indexed.find_by_criteria(criteria)] == \
+            [r["id"] for r in await plain.find_by_criteria(criteria)]
+        assert [r["id"] for r in await indexed.find_by_criteria({"status": "done"})] == ["r3", "r9", "r15"]
+        assert await indexed.count({"user_id": "u"}) == 19
+
+    @pytest.mark.asyncio
+    async def test_unhashable_values_fall_back_to_scan(self):
+        repo = UserMockRepository(hash_indexes=("tags",))
+        await repo.create({"user_id": "u", "tags": ["a", "b"]})
+
+        assert "tags" not in repo._hash_indexes
+        assert len(await repo.find_by_criteria({"tags": ["a", "b"]})) == 1
+
+
+class TestCompiledCriteria:
+    """Test cases for criteria compiled into predicates."""
+
+    def test_operators(self):
+        record = {"status": "completed", "amount": 50, "description": "Coffee at Blue Bottle"}
+
+        assert compile_criteria({"status": "completed", "amount": {"$gte": 50, "$lt": 60}})(record)
+        assert compile_criteria({"status": {"$in": ["pending", "completed"]}})(record)
+        assert compile_criteria({"description": {"$regex": "blue\\s+bottle"}})(record)
+        assert not compile_criteria({"amount": {"$gt": 50}})(record)
+        assert not compile_criteria({"description": {"$regex": "^bottle"}})(record)
+        assert not compile_criteria({"merchant": {"$ne": "x"}})(record)
+        assert compile_criteria({})(record)
+
+    @pytest.mark.asyncio
+    async def test_find_stops_once_the_page_is_full(self):
+        repo = CountingRepository()
+        for i in range(100):
+            await repo.create({"n": i})
+
+        page = await repo.find_by_criteria({"n": {"$gte": 10}}, limit=5, offset=5)
+
+        assert [r["n"] for r in page] == [15, 16, 17, 18, 19]
+        assert repo.checked == 20
+
+
+class TestSortedIndexes:
+    """Test cases for range lookups through sorted indexes."""
+
+    @pytest.mark.asyncio
+    async def test_date_range_bounds(self, base_date):
+        repo = TransactionMockRepository()
+        for day in range(30):
+            await repo.create({"user_id": "u", "transaction_date": base_date + timedelta(days=day)})
+
+        records = await repo.get_by_date_range("u", base_date + timedelta(days=5), base_date + timedelta(days=9))
+        assert len(records) == 5
+        assert await repo.count({"transaction_date": {"$gt": base_date + timedelta(days=27)}}) == 2
+        assert await repo.count({"transaction_date": {"$lt": base_date}}) == 0
+
+    @pytest.mark.asyncio
+    async def test_planner_prefers_the_narrower_index(self, base_date):
+        repo = TransactionMockRepository()
+        for i in range(200):
+            await repo.create({"user_id": "u", "transaction_date": base_date + timedelta(hours=i)})
+
+        estimate, _ = repo._plan({
+            "user_id": "u",
+            "transaction_date": {"$gte": base_date, "$lt": base_date + timedelta(hours=3)}
+        })
+        assert estimate == 3
+
+
+class TestDateRangeQueries:
+    """Test cases for per-user, date-ordered transaction ranges."""
+
+    @pytest.mark.asyncio
+    async def test_newest_first_with_pagination(self, base_date):
+        repo = TransactionMockRepository()
+        days = [3, 0, 7, 5, 1, 9, 2]
+        for day in days:
+            await repo.create({"id": f"t{day}", "user_id": "u", "transaction_date": base_date + timedelta(days=day)})
+            await repo.create({"user_id": "other", "transaction_date": base_date + timedelta(days=day)})
+
+        start, end = base_date + timedelta(days=1), base_date + timedelta(days=7)
+        ids = [r["id"] for r in await repo.get_by_date_range("u", start, end)]
+        assert ids == ["t7", "t5", "t3", "t2", "t1"]
+
+        page = await repo.get_by_date_range("u", start, end, limit=2, offset=2)
+        assert [r["id"] for r in page] == ["t3", "t2"]
+        assert await repo.get_by_date_range("u", start, end, offset=5) == []
+
+    @pytest.mark.asyncio
+    async def test_updates_move_records_between_users_and_dates(self, base_date):
+        repo = TransactionMockRepository()
+        await repo.create({"id": "t", "user_id": "u", "transaction_date": base_date})
+        await repo.update("t", {"user_id": "v", "transaction_date": base_date + timedelta(days=1)})
+
+        window = (base_date, base_date + timedelta(days=2))
+        assert await repo.get_by_date_range("u", *window) == []
+        assert [r["id"] for r in await repo.get_by_date_range("v", *window)] == ["t"]
+
+        await repo.delete("t")
+        assert await repo.get_by_date_range("v", *window) == []
@@ -0,0 +1,129 @@
+"""
+Unit tests for lazy, deterministic mock data seeding.
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from fintech_backend.app.repositories.mock_repository import RepositoryManager
+from fintech_backend.app.repositories.seeding import LazyMockData
+from fintech_backend.app.services.audit_service import AuditService
+
+
+def _snapshot(records):
+    """Records without timestamps, which are relative to now."""
+    return [
+        {key: value for key, value in record.items() if not isinstance(value, datetime)}
+        for record in records
+    ]
+
+
+class TestRepositoryManagerSeeding:
+    """Test cases for per-user seeding and LRU eviction."""
+
+    @pytest.mark.asyncio
+    async def test_users_are_seeded_on_first_access_only(self):
+        manager = RepositoryManager(seed=7)
+        assert len(manager.transactions.data) == 0
+
+        assert await manager.ensure_user_seeded("demo_1") is True
+        assert await manager.ensure_user_seeded("demo_1") is False
+        assert await manager.transactions.count_by_user("demo_1") == 50
+        assert len(await manager.accounts.get_by_user_id("demo_1")) == 2
+        assert manager.seeded_user_ids == ["demo_1"]
+
+    @pytest.mark.asyncio
+    async def test_seeding_is_deterministic(self):
+        first, second = RepositoryManager(seed=7), RepositoryManager(seed=7)
+        await first.ensure_user_seeded("demo_1")
+        await second.ensure_user_seeded("demo_1")
+
+        assert _snapshot(await first.transactions.get_by_user_id("demo_1")) == \
+            _snapshot(await second.transactions.get_by_user_id("demo_1"))
+
+        other_seed = RepositoryManager(seed=8)
+        await other_seed.ensure_user_seeded("demo_1")
+        assert _snapshot(await other_seed.accounts.get_by_user_id("demo_1")) != \
+            _snapshot(await first.accounts.get_by_user_id("demo_1"))
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_user_is_evicted(self):
+        manager = RepositoryManager(seed=7, max_seeded_users=2)
+        await manager.ensure_user_seeded("a")
+        await manager.ensure_user_seeded("b")
+        await manager.ensure_user_seeded("a")  # touch a
+        await manager.ensure_user_seeded("c")
+
+        assert manager.seeded_user_ids == ["a", "c"]
+        assert await manager.transactions.count_by_user("b") == 0
+        assert await manager.settings.count_by_user("b") == 0
+        assert len(manager.transactions.data) == 100
+
+        # Re-seeding an evicted user recreates the same records
+        await manager.ensure_user_seeded("b")
+        assert sorted(r["id"] for r in await manager.cards.get_by_user_id("b")) == ["card_b_1", "card_b_2"]
+
+    @pytest.mark.asyncio
+    async def test_failed_seeding_is_rolled_back(self, monkeypatch):
+        manager = RepositoryManager(seed=7)
+
+        async def fail(user_id, rng):
+            raise RuntimeError("seed source unavailable")
+
+        monkeypatch.setattr(manager, "_create_user_investments", fail)
+        with pytest.raises(RuntimeError):
+            await manager.ensure_user_seeded("demo_1")
+        assert manager.seeded_user_ids == []
+        assert await manager.transactions.count_by_user("demo_1") == 0
+        assert await manager.accounts.count_by_user("demo_1") == 0
+
+        monkeypatch.undo()
+        assert await manager.ensure_user_seeded("demo_1") is True
+        assert await manager.transactions.count_by_user("demo_1") == 50
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_accesses_seed_once(self):
+        manager = RepositoryManager(seed=7)
+        results = await asyncio.gather(*(manager.ensure_user_seeded("demo_1") for _ in range(3)))
+
+        assert sorted(results) == [False, False, True]
+        assert await manager.transactions.count_by_user("demo_1") == 50
+
+
+class TestLazyServiceSeeding:
+    """Test cases for services that seed on first use."""
+
+    def test_constructor_does_not_seed(self):
+        service = AuditService()
+        assert not service.mock_data_ready
+
+        assert len(service.audit_logs) == 5
+        assert service.mock_data_ready
+
+    def test_service_seed_data_is_reproducible(self):
+        first, second = AuditService(), AuditService()
+        assert [log.session_id for log in first.audit_logs.values()] == \
+            [log.session_id for log in second.audit_logs.values()]
+
+    def test_failed_seeding_is_retried(self):
+        class FlakyService(LazyMockData):
+            _lazy_attributes = ("records",)
+
+            def __init__(self):
+                self.records = {}
+                self.attempts = 0
+
+            def _initialize_mock_data(self):
+                self.attempts += 1
+                if self.attempts == 1:
+                    raise RuntimeError("seed source unavailable")
+                self.records["a"] = self.rng.random()
+
+        service = FlakyService()
+        with pytest.raises(RuntimeError):
+            service.records
+        assert not service.mock_data_ready
+
+        assert list(service.records) == ["a"]
+        assert service.mock_data_ready
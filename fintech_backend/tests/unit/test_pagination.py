@@ -0,0 +1,116 @@
+"""
+Unit tests for keyset (cursor) pagination.
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from fintech_backend.app.core.exceptions import ValidationException
+from fintech_backend.app.database.models import (
+    TransactionTypeEnum, TransactionStatusEnum, TransactionDirectionEnum, PaymentMethodEnum
+)
+from fintech_backend.app.repositories.database_repository import TransactionRepository
+from fintech_backend.app.services.transaction_service import TransactionService
+from fintech_backend.app.utils.pagination import encode_cursor, decode_cursor
+
+
+class TestCursorEncoding:
+    """Test cases for cursor encoding."""
+
+    def test_datetime_round_trip(self):
+        value = datetime(2024, 3, 1, 12, 30, 15)
+        assert decode_cursor(encode_cursor(value, "abc")) == (value, "abc")
+
+    def test_date_round_trip(self):
+        assert decode_cursor(encode_cursor(date(2024, 3, 1), "x")) == (date(2024, 3, 1), "x")
+
+    def test_invalid_cursor_raises_validation_error(self):
+        with pytest.raises(ValidationException):
+            decode_cursor("not-a-cursor")
+
+
+@pytest.fixture
+def account(db, user_account):
+    user, account = user_account
+    db.add_all([user, account])
+    db.commit()
+    return account
+
+
+def _add_transactions(db, account, dates):
+    repo = TransactionRepository(db)
+    ids = repo.insert_transactions([
+        {
+            "user_id": account.user_id,
+            "account_id": account.id,
+            "transaction_type": TransactionTypeEnum.PURCHASE,
+            "status": TransactionStatusEnum.COMPLETED,
+            "direction": TransactionDirectionEnum.OUTBOUND,
+            "payment_method": PaymentMethodEnum.CARD,
+            "amount": Decimal("1.00"),
+            "currency": "USD",
+            "description": "Coffee",
+            "transaction_date": when,
+        }
+        for when in dates
+    ])
+    db.commit()
+    return ids
+
+
+class TestKeysetPagination:
+    """Test cases for TransactionRepository keyset pages."""
+
+    def test_pages_cover_every_row_once_in_order(self, db, account):
+        base = datetime(2024, 1, 1)
+        # Duplicate timestamps exercise the id tie-break
+        _add_transactions(db, account, [base + timedelta(hours=i // 2) for i in range(23)])
+        repo = TransactionRepository(db)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = repo.get_transaction_page_by_user(account.user_id, limit=5, cursor=cursor)
+            seen.extend(page)
+            if cursor is None:
+                break
+
+        assert len(seen) == 23
+        assert len({t.id for t in seen}) == 23
+        keys = [(t.transaction_date, t.id) for t in seen]
+        assert keys == sorted(keys, reverse=True)
+
+    def test_new_rows_do_not_shift_pages(self, db, account):
+        base = datetime(2024, 1, 1)
+        _add_transactions(db, account, [base + timedelta(days=i) for i in range(10)])
+        repo = TransactionRepository(db)
+
+        first, cursor = repo.get_transaction_page_by_account(account.id, limit=4)
+        _add_transactions(db, account, [base + timedelta(days=30)])
+        second, _ = repo.get_transaction_page_by_account(account.id, limit=4, cursor=cursor)
+
+        assert [t.transaction_date.day for t in first] == [10, 9, 8, 7]
+        assert [t.transaction_date.day for t in second] == [6, 5, 4, 3]
+
+
+class TestServiceKeysetSlice:
+    """Test cases for cursor pages over the service's sorted Plaid transactions."""
+
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_pages_cover_every_row_once_in_order(self, descending):
+        service = TransactionService.__new__(TransactionService)
+        # Two transactions a day exercise the id tie-break
+        rows = sorted(
+            (SimpleNamespace(date=(date(2024, 1, 1) + timedelta(days=i // 2)).isoformat(), transaction_id=f"p{i:02d}")
+             for i in range(23)),
+            key=lambda t: (t.date, t.transaction_id), reverse=descending
+        )
+
+        seen = rows[:5]
+        cursor = encode_cursor(date.fromisoformat(seen[-1].date), seen[-1].transaction_id)
+        while cursor:
+            page, cursor = service._keyset_slice(rows, cursor, 5, descending=descending)
+            seen.extend(page)
+
+        assert seen == rows
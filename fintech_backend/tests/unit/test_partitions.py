@@ -0,0 +1,110 @@
+"""
+Unit tests for monthly transaction partition helpers.
+"""
+import asyncio
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from fintech_backend.app.database import partitions
+from fintech_backend.app.database.partitions import (
+    add_months, create_partition_sql, ensure_transaction_partitions, iter_months,
+    maintain_transaction_partitions, partition_bounds, partition_name
+)
+from fintech_backend.app.repositories.database_repository import transaction_date_criteria
+
+
+class TestPartitionHelpers:
+    """Test cases for partition naming and month arithmetic."""
+
+    def test_add_months_crosses_year_boundaries(self):
+        assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+        assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+
+    def test_bounds_are_half_open_months(self):
+        assert partition_bounds(date(2024, 12, 17)) == (date(2024, 12, 1), date(2025, 1, 1))
+        assert partition_name(date(2024, 3, 9)) == "transactions_y2024m03"
+
+    def test_iter_months_is_inclusive(self):
+        months = list(iter_months(date(2024, 11, 30), date(2025, 1, 2)))
+        assert months == [date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1)]
+
+    def test_create_partition_sql(self):
+        assert create_partition_sql(date(2024, 2, 10)) == (
+            "CREATE TABLE IF NOT EXISTS transactions_y2024m02 PARTITION OF transactions "
+            "FOR VALUES FROM ('2024-02-01') TO ('2024-03-01')"
+        )
+
+    def test_ensure_partitions_is_noop_on_sqlite(self, memory_engine):
+        assert ensure_transaction_partitions(memory_engine) == []
+
+
+class _FakePostgres:
+    """Connection stand-in recording DDL, with rows stranded in the default partition for some months."""
+
+    def __init__(self, existing, stranded):
+        self.dialect = SimpleNamespace(name="postgresql")
+        self.existing = set(existing) | {"transactions_default"}
+        self.stranded = stranded
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if "pg_partitioned_table" in sql:
+            result = True
+        elif "to_regclass" in sql:
+            result = params["name"] in self.existing
+        elif sql.startswith("SELECT EXISTS"):
+            result = params["start"] in self.stranded
+        else:
+            self.statements.append(sql)
+            result = None
+        return SimpleNamespace(scalar=lambda: result)
+
+
+class TestPartitionMaintenance:
+    """Test cases for creating partitions over rows already in the default partition."""
+
+    def test_stranded_rows_are_moved_into_the_new_partition(self):
+        connection = _FakePostgres(existing={"transactions_y2024m05"}, stranded={date(2024, 6, 1)})
+
+        names = ensure_transaction_partitions(connection, months_ahead=2, today=date(2024, 5, 20))
+
+        assert names == ["transactions_y2024m05", "transactions_y2024m06", "transactions_y2024m07"]
+        detach, create, move, attach = connection.statements[:4]
+        assert detach == "ALTER TABLE transactions DETACH PARTITION transactions_default"
+        assert create == create_partition_sql(date(2024, 6, 1))
+        assert "DELETE FROM transactions_default" in move and "INSERT INTO transactions_y2024m06" in move
+        assert attach == "ALTER TABLE transactions ATTACH PARTITION transactions_default DEFAULT"
+        assert connection.statements[4:] == [create_partition_sql(date(2024, 7, 1))]
+
+    @pytest.mark.asyncio
+    async def test_maintenance_repeats_until_cancelled(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(partitions, "ensure_transaction_partitions", lambda bind, months: calls.append(months))
+
+        task = asyncio.create_task(maintain_transaction_partitions("engine", 3, interval_seconds=0))
+        while len(calls) < 2:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert calls[:2] == [3, 3]
+
+
+class TestDateCriteria:
+    """Test cases for partition-prunable date bounds."""
+
+    def test_plain_dates_become_whole_day_datetime_bounds(self):
+        lower, upper = transaction_date_criteria(date(2024, 1, 1), date(2024, 1, 31))
+        assert lower.right.value == datetime(2024, 1, 1)
+        assert upper.right.value == datetime(2024, 2, 1)
+        assert upper.operator.__name__ == "lt"
+
+    def test_missing_bounds_add_no_criteria(self):
+        assert transaction_date_criteria() == []
+        (upper,) = transaction_date_criteria(end_date=datetime(2024, 1, 1, 12))
+        assert upper.right.value == datetime(2024, 1, 1, 12)
+        assert upper.operator.__name__ == "le"
@@ -0,0 +1,177 @@
+"""
+Unit tests for per-request SQL instrumentation.
+"""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select, text
+from sqlalchemy.orm import sessionmaker
+
+from fintech_backend.app.config.settings import settings
+from fintech_backend.app.core.middleware import RequestLoggingMiddleware
+from fintech_backend.app.database.instrumentation import (
+    install_query_instrumentation, start_request_stats, finish_request_stats, get_request_stats,
+    format_stats_header, _START_TIMES_KEY, _explain
+)
+from fintech_backend.app.database.models import User, Account, AccountTypeEnum
+
+
+@pytest.fixture
+def engine(memory_engine):
+    install_query_instrumentation(memory_engine, explain_slow=True)
+    return memory_engine
+
+
+@pytest.fixture
+def users(engine):
+    db = sessionmaker(bind=engine)()
+    for i in range(6):
+        user = User(email=f"n{i}@example.com", first_name="N", last_name=str(i), password_hash="x")
+        db.add(user)
+        db.flush()
+        db.add(Account(user_id=user.id, account_number=f"NPO000000000{i}", account_name="Main",
+                       account_type=AccountTypeEnum.CHECKING))
+    db.commit()
+    db.close()
+
+
+class TestRequestQueryStats:
+    """Test cases for statement recording per request context."""
+
+    def test_lazy_loads_are_flagged_as_n_plus_one(self, engine, users, monkeypatch):
+        monkeypatch.setattr(settings, "db_n_plus_one_threshold", 5)
+        stats = start_request_stats("req-n-plus-one")
+        db = sessionmaker(bind=engine)()
+        try:
+            for user in db.scalars(select(User)).all():
+                _ = user.accounts  # one lazy load per user
+        finally:
+            db.close()
+            summary = finish_request_stats(stats)
+
+        assert summary["query_count"] == 7
+        assert summary["db_time_ms"] > 0
+        (statement, count), = summary["n_plus_one"].items()
+        assert "FROM accounts" in statement
+        assert count == 6
+
+    def test_slow_selects_capture_explain(self, engine, users, monkeypatch):
+        monkeypatch.setattr(settings, "db_slow_query_threshold_ms", 0.0)
+        stats = start_request_stats("req-slow")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT * FROM users WHERE email = :email"), {"email": "n1@example.com"})
+        summary = finish_request_stats(stats)
+
+        (slow,) = summary["slow_queries"]
+        assert slow["statement"].startswith("SELECT * FROM users")
+        assert slow["explain"]
+
+    def test_untracked_statements_are_ignored(self, engine):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert get_request_stats() is None
+        assert finish_request_stats(None) is None
+
+    def test_start_times_do_not_leak_when_tracking_ends_mid_statement(self, engine):
+        stats = start_request_stats("req-ended")
+        # Registered after the instrumentation, so it runs between its two events
+        end_tracking = lambda *args: finish_request_stats(stats)
+        event.listen(engine, "before_cursor_execute", end_tracking)
+        try:
+            with engine.connect() as conn:
+                for _ in range(3):
+                    conn.execute(text("SELECT 1"))
+                assert conn.info[_START_TIMES_KEY] == []
+        finally:
+            event.remove(engine, "before_cursor_execute", end_tracking)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_sharing_a_correlation_id_stay_apart(self, engine):
+        async def handle(statements):
+            stats = start_request_stats("client-reused-id")
+            await asyncio.sleep(0)
+            with engine.connect() as conn:
+                for _ in range(statements):
+                    conn.execute(text("SELECT 1"))
+                    await asyncio.sleep(0)
+            return finish_request_stats(stats)
+
+        first, second = await asyncio.gather(handle(2), handle(3))
+
+        assert first["query_count"] == 2
+        assert second["query_count"] == 3
+
+
+class _RecordingCursor:
+    """DBAPI cursor stub that logs statements and fails the EXPLAIN if asked to."""
+
+    def __init__(self, executed, fail_explain):
+        self.executed = executed
+        self.fail_explain = fail_explain
+        self.connection = self
+
+    def cursor(self):
+        return self
+
+    def execute(self, statement, parameters=()):
+        self.executed.append(statement.split(" SELECT")[0])
+        if self.fail_explain and statement.startswith("EXPLAIN"):
+            raise RuntimeError("permission denied")
+
+    def fetchall(self):
+        return [("Seq Scan on users",)]
+
+    def close(self):
+        pass
+
+
+class TestExplain:
+    """Test cases for EXPLAIN of slow statements inside the request's transaction."""
+
+    @pytest.mark.parametrize("fail_explain, expected", [
+        (False, ["SAVEPOINT query_instrumentation_explain", "EXPLAIN",
+                 "RELEASE SAVEPOINT query_instrumentation_explain"]),
+        (True, ["SAVEPOINT query_instrumentation_explain", "EXPLAIN",
+                "ROLLBACK TO SAVEPOINT query_instrumentation_explain",
+                "RELEASE SAVEPOINT query_instrumentation_explain"]),
+    ])
+    def test_postgres_explain_runs_in_a_savepoint(self, fail_explain, expected):
+        executed = []
+        plan = _explain(_RecordingCursor(executed, fail_explain), "SELECT * FROM users", {}, "postgresql")
+
+        assert executed == expected
+        assert plan == (None if fail_explain else ["Seq Scan on users"])
+
+
+class TestStatsHeader:
+    """Test cases for the opt-in X-DB-Stats response header."""
+
+    def _client(self, engine, header_enabled, monkeypatch):
+        monkeypatch.setattr(settings, "db_stats_header", header_enabled)
+        app = FastAPI()
+        app.add_middleware(RequestLoggingMiddleware, settings=settings)
+
+        @app.get("/users")
+        def list_users():
+            with engine.connect() as conn:
+                return {"count": len(conn.execute(text("SELECT id FROM users")).all())}
+
+        return TestClient(app)
+
+    def test_header_reports_request_totals(self, engine, users, monkeypatch):
+        response = self._client(engine, True, monkeypatch).get(
+            "/users", headers={"X-Correlation-ID": "req-header"}
+        )
+
+        assert response.json() == {"count": 6}
+        assert response.headers["X-DB-Stats"].startswith("queries=1;time_ms=")
+
+    def test_header_is_opt_in(self, engine, users, monkeypatch):
+        response = self._client(engine, False, monkeypatch).get("/users")
+        assert "X-DB-Stats" not in response.headers
+
+    def test_format(self):
+        summary = {"query_count": 3, "db_time_ms": 1.5, "n_plus_one": {}, "slow_queries": [{}]}
+        assert format_stats_header(summary) == "queries=3;time_ms=1.5;n_plus_one=0;slow=1"
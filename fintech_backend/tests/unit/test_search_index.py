@@ -0,0 +1,119 @@
+"""
+Unit tests for the transaction text search index.
+"""
+from collections import OrderedDict
+from datetime import datetime, timedelta, UTC
+from types import SimpleNamespace
+
+import pytest
+
+from fintech_backend.app.repositories.mock_repository import TransactionMockRepository
+from fintech_backend.app.services.transaction_service import TransactionService
+from fintech_backend.app.utils.search import TextSearchIndex
+
+
+@pytest.fixture
+def index():
+    index = TextSearchIndex()
+    index.add("a", ["Coffee at Starbucks", "Starbucks"], sort_key=1)
+    index.add("b", ["Starbucksian merch", None], sort_key=2)
+    index.add("c", ["Gas", "Shell Starbucks Plaza"], sort_key=3)
+    index.add("d", ["Groceries", "Whole Foods"], sort_key=4)
+    return index
+
+
+class TestTextSearchIndex:
+    """Test cases for trigram search and ranking."""
+
+    def test_infix_and_prefix_matches(self, index):
+        assert set(index.search("tarbuck")) == {"a", "b", "c"}
+        assert index.search("whole f") == ["d"]
+        assert index.search("xyz") == []
+
+    def test_whole_words_rank_first_then_newest(self, index):
+        assert index.search("starbucks") == ["c", "a", "b"]
+        assert index.search("starbucks", limit=1) == ["c"]
+
+    def test_short_queries_and_removal(self, index):
+        assert index.search("as") == ["c"]
+        index.remove("c")
+        assert index.search("starbucks") == ["a", "b"]
+        assert "c" not in index and len(index) == 3
+
+    def test_suggestions_prefer_prefixes_then_usage(self, index):
+        assert index.suggest("star") == ["starbucks", "starbucksian"]
+        assert index.suggest("ocer") == ["groceries"]
+        index.remove("d")
+        assert index.suggest("groc") == []
+
+    def test_suggestions_respect_allowed_documents(self, index):
+        assert index.suggest("star", allowed={"a"}) == ["starbucks"]
+        assert index.suggest("star", allowed={"b"}) == ["starbucksian"]
+        assert index.suggest("star", allowed=set()) == []
+
+
+class TestTransactionSearch:
+    """Test cases for repository and service search through the index."""
+
+    @pytest.mark.asyncio
+    async def test_repository_search_is_per_user_and_paginated(self):
+        repo = TransactionMockRepository()
+        now = datetime.now(UTC)
+        for i in range(6):
+            await repo.create({
+                "id": f"t{i}", "user_id": "u", "description": f"Payment {i}",
+                "merchant": "Netflix" if i % 2 else "Netflixer", "transaction_date": now - timedelta(days=i)
+            })
+        await repo.create({"id": "x", "user_id": "other", "description": "Netflix", "transaction_date": now})
+
+        ids = [r["id"] for r in await repo.search_transactions("u", "NETFLIX")]
+        assert ids == ["t1", "t3", "t5", "t0", "t2", "t4"]
+        assert [r["id"] for r in await repo.search_transactions("u", "netflix", limit=2, offset=2)] == ["t5", "t0"]
+
+        await repo.update("t1", {"merchant": "Hulu"})
+        assert "t1" not in [r["id"] for r in await repo.search_transactions("u", "netflix")]
+
+    def test_service_search_and_suggestions(self, monkeypatch):
+        monkeypatch.setattr(
+            "fintech_backend.app.services.transaction_service._search_indexes", OrderedDict()
+        )
+        service = TransactionService.__new__(TransactionService)
+        transactions = [
+            _plaid("p1", "UBER TRIP", "Uber", "2024-01-02"),
+            _plaid("p2", "Uber Eats order", None, "2024-01-03"),
+            _plaid("p3", "Rent", "Landlord", "2024-01-04"),
+        ]
+
+        assert [t.transaction_id for t in service._apply_search(transactions, "uber", "u")] == ["p2", "p1"]
+        assert service._apply_search(transactions[2:], "uber", "u") == []
+        assert service._generate_search_suggestions("land", transactions, "u") == ["landlord"]
+        # Filtered out of this request: the rest of the user's index is not suggested
+        assert service._generate_search_suggestions("land", transactions[:2], "u") == []
+
+    def test_service_index_follows_changes(self, monkeypatch):
+        indexes = OrderedDict()
+        monkeypatch.setattr("fintech_backend.app.services.transaction_service._search_indexes", indexes)
+        monkeypatch.setattr("fintech_backend.app.services.transaction_service.MAX_SEARCH_INDEXES", 2)
+        service = TransactionService.__new__(TransactionService)
+        transactions = [_plaid("p1", "UBER TRIP", "Uber", "2024-01-02"), _plaid("p2", "Rent", None, "2024-01-03")]
+        assert service._apply_search(transactions, "uber", "u", complete=True) == transactions[:1]
+
+        # Renamed after the last sync: re-indexed under its new text
+        renamed = _plaid("p1", "Lyft ride", "Lyft", "2024-01-02", updated=2)
+        assert service._apply_search([renamed, transactions[1]], "uber", "u", complete=True) == []
+        assert service._apply_search([renamed, transactions[1]], "lyft", "u", complete=True) == [renamed]
+
+        # Gone from a complete sync: dropped from the index
+        assert service._apply_search(transactions[1:], "lyft", "u", complete=True) == []
+        assert "p1" not in indexes["u"].index
+
+        for user_id in ("v", "w"):
+            service._apply_search(transactions, "uber", user_id)
+        assert list(indexes) == ["v", "w"]
+
+
+def _plaid(transaction_id, name, merchant_name, day, updated=1):
+    return SimpleNamespace(
+        transaction_id=transaction_id, name=name, merchant_name=merchant_name, date=day,
+        updated_at=datetime(2024, 1, 5, tzinfo=UTC) + timedelta(minutes=updated)
+    )
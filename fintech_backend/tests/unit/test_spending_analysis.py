@@ -0,0 +1,91 @@
+"""
+Unit tests for the grouped spending analysis query.
+"""
+import random
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+
+from fintech_backend.app.database.models import (
+    Transaction, TransactionTypeEnum, TransactionStatusEnum,
+    TransactionDirectionEnum, PaymentMethodEnum, MerchantCategoryEnum
+)
+from fintech_backend.app.models.analytics import SpendingAnalysisRequest, TrendDirection
+from fintech_backend.app.services.analytics_service import AnalyticsService
+from fintech_backend.tests.unit.analytics_reference import analytics_rows
+
+
+@pytest_asyncio.fixture
+async def user_id(async_db, user_account):
+    user, account = user_account
+    async_db.add_all([user, account])
+
+    rng = random.Random(19)
+    types = [TransactionTypeEnum.PURCHASE, TransactionTypeEnum.PAYMENT, TransactionTypeEnum.DEPOSIT]
+    for i in range(400):
+        transaction_type = rng.choice(types)
+        inbound = transaction_type == TransactionTypeEnum.DEPOSIT or rng.random() < 0.05
+        async_db.add(Transaction(
+            user_id=user.id, account_id=account.id, transaction_type=transaction_type,
+            status=TransactionStatusEnum.COMPLETED,
+            direction=TransactionDirectionEnum.INBOUND if inbound else TransactionDirectionEnum.OUTBOUND,
+            payment_method=PaymentMethodEnum.CARD,
+            amount=Decimal(f"{rng.uniform(1, 400):.2f}"), currency="USD", description=f"Row {i}",
+            merchant_category=rng.choice(list(MerchantCategoryEnum) + [None]),
+            reference_number=f"SPD{i:06d}",
+            transaction_date=datetime(2024, 1, 1) + timedelta(hours=rng.randint(0, 24 * 180)),
+        ))
+    await async_db.commit()
+    return user.id
+
+
+async def _reference(db, user_id, start_date, end_date):
+    """Per-category spending computed row by row."""
+    totals = defaultdict(lambda: [Decimal("0"), 0])
+    for transaction in await analytics_rows(db, user_id, start_date, end_date, include_income=False):
+        totals[transaction.category][0] += transaction.amount
+        totals[transaction.category][1] += 1
+    return {category: tuple(value) for category, value in totals.items()}
+
+
+class TestSpendingAnalysis:
+    """Test cases for AnalyticsService.get_spending_analysis."""
+
+    @pytest.mark.asyncio
+    async def test_single_query_matches_per_row_conversion(self, async_db, user_id):
+        service = AnalyticsService(async_db)
+        start, end = date(2024, 3, 1), date(2024, 3, 31)
+        current = await _reference(async_db, user_id, start, end)
+        previous = await _reference(async_db, user_id, start - timedelta(days=30), start - timedelta(days=1))
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(async_db.bind.sync_engine, "before_cursor_execute", listener)
+        try:
+            result = await service.get_spending_analysis(
+                user_id, SpendingAnalysisRequest(start_date=start, end_date=end)
+            )
+        finally:
+            event.remove(async_db.bind.sync_engine, "before_cursor_execute", listener)
+
+        assert previous and len(statements) == 1
+        assert {item.category: (item.amount, item.transaction_count) for item in result} == current
+        for item in result:
+            assert item.trend == AnalyticsService._calculate_category_trend(
+                item.amount, previous.get(item.category, (Decimal("0"), 0))[0]
+            )
+        assert sum(item.percentage for item in result) == pytest.approx(100, abs=0.1)
+
+    @pytest.mark.asyncio
+    async def test_open_ended_period_is_stable(self, async_db, user_id):
+        service = AnalyticsService(async_db)
+
+        result = await service.get_spending_analysis(user_id, SpendingAnalysisRequest())
+
+        assert {item.category: (item.amount, item.transaction_count) for item in result} == \
+            await _reference(async_db, user_id, None, None)
+        assert {item.trend for item in result} == {TrendDirection.STABLE}
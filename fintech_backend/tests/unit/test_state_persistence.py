@@ -0,0 +1,118 @@
+"""
+Unit tests for snapshot and append-log persistence of in-memory state.
+"""
+from datetime import datetime, timedelta, UTC
+
+import pytest
+
+from fintech_backend.app.repositories import persistence
+from fintech_backend.app.repositories.mock_repository import RepositoryManager
+from fintech_backend.app.repositories.persistence import AppendLogBackend, StateJournal
+from fintech_backend.app.services.support_service import SupportService
+
+
+def _restart(directory, snapshot_every=10000):
+    """Journal of a fresh process over ``directory``."""
+    return StateJournal(AppendLogBackend(directory), snapshot_every=snapshot_every)
+
+
+class TestStateJournal:
+    """Test cases for journaled stores restored from snapshots and logs."""
+
+    def test_writes_are_replayed_from_the_log(self, tmp_path):
+        journal = _restart(tmp_path)
+        store = journal.attach("accounts")
+        store["a"] = {"balance": 10}
+        store["b"] = {"balance": 20}
+        store.pop("a")
+        store.setdefault("c", {"balance": 30})
+        journal.backend.close()  # no snapshot, as after a crash
+
+        restored = _restart(tmp_path)
+        assert restored.restored("accounts")
+        assert restored.attach("accounts") == {"b": {"balance": 20}, "c": {"balance": 30}}
+
+    def test_snapshot_then_tail(self, tmp_path):
+        journal = _restart(tmp_path, snapshot_every=3)
+        store = journal.attach("counters")
+        for i in range(5):
+            store[i] = i * i
+        journal.backend.close()
+
+        backend = AppendLogBackend(tmp_path)
+        restored = StateJournal(backend)
+        assert backend.generation == 1
+        assert [p.name for p in tmp_path.glob("*.log")] == ["state.1.log"]
+        assert restored.attach("counters") == {0: 0, 1: 1, 2: 4, 3: 9, 4: 16}
+
+    def test_unattached_stores_survive_snapshots(self, tmp_path):
+        journal = _restart(tmp_path)
+        journal.attach("kept")["x"] = 1
+        journal.close()
+
+        journal = _restart(tmp_path)
+        journal.attach("other")["y"] = 2
+        journal.close()
+
+        restored = _restart(tmp_path)
+        assert restored.attach("kept") == {"x": 1}
+        assert restored.attach("other") == {"y": 2}
+
+    def test_torn_tail_is_truncated(self, tmp_path):
+        journal = _restart(tmp_path)
+        journal.attach("s")["k"] = "v"
+        journal.backend.close()
+        log = tmp_path / "state.0.log"
+        intact = log.stat().st_size
+        with open(log, "ab") as f:
+            f.write(b"\x40\x00\x00\x00partial")
+
+        restored = _restart(tmp_path)
+        assert restored.attach("s") == {"k": "v"}
+        assert log.stat().st_size == intact
+
+    def test_disabled_journal_records_nothing(self):
+        journal = StateJournal()
+        store = journal.attach("s")
+        store["k"] = "v"
+        store.touch("k")
+
+        assert not journal.enabled
+        assert journal.attach("s") == {}
+        assert not journal.is_seeded("Anything")
+
+
+class TestPersistentRepositories:
+    """Test cases for repositories and services restored after a restart."""
+
+    @pytest.mark.asyncio
+    async def test_seeded_users_are_restored_not_reseeded(self, tmp_path):
+        manager = RepositoryManager(seed=7, journal=_restart(tmp_path))
+        await manager.ensure_user_seeded("demo_1")
+        txn = (await manager.transactions.get_by_user_id("demo_1", limit=1))[0]
+        await manager.transactions.update(txn["id"], {"description": "Edited"})
+        manager.journal.close()
+
+        restarted = RepositoryManager(seed=7, journal=_restart(tmp_path))
+        assert restarted.seeded_user_ids == ["demo_1"]
+        assert await restarted.ensure_user_seeded("demo_1") is False
+        assert (await restarted.transactions.get_by_id(txn["id"]))["description"] == "Edited"
+
+        now = datetime.now(UTC)
+        assert await restarted.transactions.get_by_date_range("demo_1", now - timedelta(days=400), now) == \
+            await manager.transactions.get_by_date_range("demo_1", now - timedelta(days=400), now)
+
+    @pytest.mark.asyncio
+    async def test_service_changes_in_place_are_persisted(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(persistence, "_journal", _restart(tmp_path))
+        service = SupportService()
+        ticket_id, ticket = next(iter(service.tickets.items()))
+        ticket.subject = "Changed in place"
+        service.tickets.touch(ticket_id)
+        persistence.get_journal().backend.close()
+
+        monkeypatch.setattr(persistence, "_journal", _restart(tmp_path))
+        restarted = SupportService()
+        assert restarted.mock_data_ready
+        assert restarted.tickets[ticket_id].subject == "Changed in place"
+        assert restarted._ticket_counter == service._ticket_counter
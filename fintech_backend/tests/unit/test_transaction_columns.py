@@ -0,0 +1,182 @@
+"""
+Unit tests for the columnar analytics kernels.
+
+The reference functions below are the row-by-row calculators the kernels
+replaced, with ``now`` made explicit. Randomised batches must give identical
+results.
+"""
+import math
+import random
+from datetime import datetime, timedelta, timezone, UTC
+from decimal import Decimal, ROUND_HALF_UP
+
+import pytest
+
+from fintech_backend.app.utils.calculations import AnalyticsCalculator, LimitCalculator, RiskCalculator
+from fintech_backend.app.utils.transaction_columns import TransactionColumns
+
+NOW = datetime(2024, 6, 15, 12, 0, 0)
+CENT = Decimal("0.01")
+
+
+def _parse(tx_date):
+    if isinstance(tx_date, str):
+        tx_date = datetime.fromisoformat(tx_date.replace('Z', '+00:00'))
+    return tx_date
+
+
+def reference_spending_by_category(transactions, days, now):
+    cutoff_date = now - timedelta(days=days)
+    category_totals = {}
+    for transaction in transactions:
+        tx_date = _parse(transaction.get("transaction_date"))
+        if tx_date and tx_date >= cutoff_date and transaction.get("transaction_type") == "debit":
+            category = transaction.get("category", "Other")
+            amount = Decimal(str(transaction.get("amount", 0)))
+            category_totals[category] = category_totals.get(category, Decimal("0.00")) + amount
+    total_spending = sum(category_totals.values())
+    results = []
+    for category, amount in category_totals.items():
+        percentage = Decimal("0.00")
+        if total_spending > 0:
+            percentage = (amount / total_spending * 100).quantize(Decimal("0.1"), rounding=ROUND_HALF_UP)
+        results.append({
+            "category": category,
+            "amount": amount.quantize(CENT, rounding=ROUND_HALF_UP),
+            "percentage": percentage,
+            "transaction_count": len([t for t in transactions
+                                      if t.get("category") == category and t.get("transaction_type") == "debit"])
+        })
+    return sorted(results, key=lambda x: x["amount"], reverse=True)
+
+
+def reference_monthly_trends(transactions, months):
+    monthly_data = {}
+    for transaction in transactions:
+        tx_date = _parse(transaction.get("transaction_date"))
+        if tx_date and transaction.get("transaction_type") == "debit":
+            month = monthly_data.setdefault(tx_date.strftime("%Y-%m"), [Decimal("0.00"), 0])
+            month[0] += Decimal(str(transaction.get("amount", 0)))
+            month[1] += 1
+    trends = [{
+        "month": month,
+        "total_spending": total.quantize(CENT, rounding=ROUND_HALF_UP),
+        "transaction_count": count,
+        "avg_transaction_amount": (total / count).quantize(CENT, rounding=ROUND_HALF_UP),
+    } for month, (total, count) in sorted(monthly_data.items())]
+    return trends[-months:] if months else trends
+
+
+def reference_spending_velocity(transactions, days, now):
+    cutoff_date = now - timedelta(days=days)
+    recent_spending = Decimal("0.00")
+    transaction_count = 0
+    daily_amounts = {}
+    for transaction in transactions:
+        tx_date = _parse(transaction.get("transaction_date"))
+        if tx_date and tx_date >= cutoff_date and transaction.get("transaction_type") == "debit":
+            amount = Decimal(str(transaction.get("amount", 0)))
+            recent_spending += amount
+            transaction_count += 1
+            daily_amounts[tx_date.date()] = daily_amounts.get(tx_date.date(), Decimal("0.00")) + amount
+    avg_daily_spending = recent_spending / days if days > 0 else Decimal("0.00")
+    avg_transaction_amount = recent_spending / transaction_count if transaction_count > 0 else Decimal("0.00")
+    daily_values = list(daily_amounts.values())
+    if len(daily_values) > 1:
+        mean = sum(daily_values) / len(daily_values)
+        variance = sum((x - mean) ** 2 for x in daily_values) / len(daily_values)
+        std_deviation = Decimal(str(math.sqrt(float(variance))))
+    else:
+        std_deviation = Decimal("0.00")
+    return {
+        "total_spending": recent_spending.quantize(CENT, rounding=ROUND_HALF_UP),
+        "avg_daily_spending": avg_daily_spending.quantize(CENT, rounding=ROUND_HALF_UP),
+        "avg_transaction_amount": avg_transaction_amount.quantize(CENT, rounding=ROUND_HALF_UP),
+        "transaction_count": transaction_count,
+        "spending_volatility": std_deviation.quantize(CENT, rounding=ROUND_HALF_UP),
+        "days_analyzed": days
+    }
+
+
+def _batch(rng, size, aware):
+    """Random transactions mixing amount types, ISO strings, datetimes and missing fields."""
+    offset = timezone(timedelta(hours=rng.choice([-5, 0, 3]))) if aware else None
+    now = NOW.replace(tzinfo=offset)
+    transactions = []
+    for _ in range(size):
+        transaction = {"transaction_type": rng.choice(["debit", "debit", "credit"])}
+        kind = rng.random()
+        if kind < 0.6:
+            transaction["amount"] = Decimal(rng.randint(1, 90000)) / 100
+        elif kind < 0.8:
+            transaction["amount"] = round(rng.uniform(0, 500), rng.choice([0, 1, 2, 3]))
+        elif kind < 0.95:
+            transaction["amount"] = rng.randint(0, 300)
+        if rng.random() < 0.9:
+            tx_date = now - timedelta(minutes=rng.randint(0, 60 * 24 * 200))
+            transaction["transaction_date"] = tx_date.isoformat() if rng.random() < 0.5 else tx_date
+        if rng.random() < 0.9:
+            transaction["category"] = rng.choice(["food", "rent", "travel", "Other", None])
+        transactions.append(transaction)
+    return transactions, now
+
+
+class TestTransactionKernels:
+    """Test cases for calculators running on columnar batches."""
+
+    @pytest.mark.parametrize("seed", range(25))
+    def test_identical_to_row_by_row(self, seed):
+        rng = random.Random(seed)
+        transactions, now = _batch(rng, rng.randint(0, 300), aware=seed % 2 == 1)
+        days = rng.choice([1, 7, 30, 90])
+        columns = TransactionColumns(transactions)
+
+        for batch in (transactions, columns):
+            assert AnalyticsCalculator.calculate_spending_by_category(batch, days, now=now) == \
+                reference_spending_by_category(transactions, days, now)
+            assert AnalyticsCalculator.calculate_monthly_trends(batch, months=4) == \
+                reference_monthly_trends(transactions, 4)
+            assert RiskCalculator.calculate_spending_velocity(batch, days, now=now) == \
+                reference_spending_velocity(transactions, days, now)
+
+    def test_sums_stay_exact_below_a_cent(self):
+        transactions = [
+            {"amount": Decimal("0.005"), "transaction_type": "debit", "transaction_date": NOW, "category": "fees"},
+            {"amount": 0.1 + 0.2, "transaction_type": "debit", "transaction_date": NOW, "category": "fees"},
+        ]
+
+        columns = TransactionColumns(transactions)
+        rows = columns.debit_rows()
+
+        assert columns.to_decimal(sum(columns.amounts[i] for i in rows)) == Decimal("0.30500000000000004")
+        assert RiskCalculator.calculate_spending_velocity(transactions, 1, now=NOW)["total_spending"] == Decimal("0.31")
+
+    def test_naive_and_aware_dates_can_be_mixed(self):
+        now = datetime.now(UTC)
+        transactions = [
+            {"amount": Decimal("10.00"), "transaction_type": "debit", "transaction_date": datetime.now()},
+            {"amount": Decimal("5.00"), "transaction_type": "debit", "transaction_date": now.isoformat()},
+            {"amount": Decimal("7.00"), "transaction_type": "debit", "transaction_date": now - timedelta(days=9)},
+        ]
+
+        velocity = RiskCalculator.calculate_spending_velocity(transactions, days=7)
+        limits = LimitCalculator.suggest_optimal_limits(transactions, days_to_analyze=30)
+
+        assert velocity["total_spending"] == Decimal("15.00")
+        assert velocity["transaction_count"] == 2
+        assert limits["data_points_monthly"] >= 1
+        assert AnalyticsCalculator.calculate_spending_by_category(transactions)[0]["amount"] == Decimal("22.00")
+
+    def test_weekdays_follow_the_wall_clock(self):
+        saturday_night = datetime(2024, 6, 15, 23, 30)
+        transactions = [
+            {"transaction_type": "debit", "transaction_date": saturday_night},
+            {"transaction_type": "debit", "transaction_date": saturday_night.replace(tzinfo=timezone.utc)},
+            # Already Sunday in UTC, still Saturday on its own clock
+            {"transaction_type": "debit", "transaction_date": saturday_night.replace(tzinfo=timezone(-timedelta(hours=5)))},
+            {"transaction_type": "debit", "transaction_date": datetime(1969, 12, 29)},
+        ]
+
+        columns = TransactionColumns(transactions)
+
+        assert [columns.weekday(i) for i in range(columns.size)] == [5, 5, 5, 0]
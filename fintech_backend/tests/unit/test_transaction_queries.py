@@ -0,0 +1,203 @@
+"""
+Unit tests for SQL-side transaction filtering.
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from fintech_backend.app.core.exceptions import ValidationException
+from fintech_backend.app.database.models import (
+    Account, TransactionTypeEnum, TransactionStatusEnum,
+    TransactionDirectionEnum, PaymentMethodEnum
+)
+from fintech_backend.app.models.transaction import TransactionFilters
+from fintech_backend.app.repositories.database_repository import TransactionRepository, _copy_text
+from fintech_backend.app.services.database_transaction_service import DatabaseTransactionService
+
+
+@pytest.fixture
+def user_id(db, user_account):
+    user, account = user_account
+    db.add_all([user, account])
+    db.flush()
+
+    base = datetime(2024, 1, 1)
+    rows = []
+    for i in range(60):
+        # Only every tenth row is a completed deposit
+        is_deposit = i % 10 == 0
+        rows.append({
+            "user_id": user.id,
+            "account_id": account.id,
+            "transaction_type": TransactionTypeEnum.DEPOSIT if is_deposit else TransactionTypeEnum.PURCHASE,
+            "status": TransactionStatusEnum.COMPLETED if is_deposit else TransactionStatusEnum.PENDING,
+            "direction": TransactionDirectionEnum.INBOUND if is_deposit else TransactionDirectionEnum.OUTBOUND,
+            "payment_method": PaymentMethodEnum.CARD,
+            "amount": Decimal(i + 1),
+            "currency": "USD",
+            "description": f"Row {i}",
+            "transaction_date": base + timedelta(days=i),
+        })
+    TransactionRepository(db).insert_transactions(rows)
+    db.commit()
+    return user.id
+
+
+class TestGetUserTransactions:
+    """Test cases for DatabaseTransactionService.get_user_transactions."""
+
+    def test_sparse_filter_fills_the_page(self, db, user_id):
+        service = DatabaseTransactionService(db)
+
+        result = service.get_user_transactions(user_id, TransactionFilters(
+            transaction_type="deposit", status="completed", limit=5
+        ))
+
+        assert result["total_count"] == 6
+        assert len(result["transactions"]) == 5
+        assert result["has_more"] is True
+        assert all(t["transaction_type"] == "deposit" for t in result["transactions"])
+
+    def test_date_and_amount_filters(self, db, user_id):
+        service = DatabaseTransactionService(db)
+
+        result = service.get_user_transactions(user_id, TransactionFilters(
+            start_date=date(2024, 1, 11), end_date=date(2024, 1, 20), min_amount=15, limit=50
+        ))
+
+        amounts = [t["amount"] for t in result["transactions"]]
+        assert amounts == [20.0, 19.0, 18.0, 17.0, 16.0, 15.0]
+        assert result["total_count"] == 6
+        assert result["has_more"] is False
+
+    def test_offset_past_end_still_reports_total(self, db, user_id):
+        service = DatabaseTransactionService(db)
+
+        result = service.get_user_transactions(user_id, TransactionFilters(offset=100))
+
+        assert result["transactions"] == []
+        assert result["total_count"] == 60
+
+    def test_invalid_status_is_rejected(self, db, user_id):
+        service = DatabaseTransactionService(db)
+
+        with pytest.raises(ValidationException):
+            service.get_user_transactions(user_id, TransactionFilters(status="bogus"))
+
+
+class TestTransactionSummary:
+    """Test cases for the GROUP BY transaction summaries."""
+
+    def test_user_summary(self, db, user_id):
+        summary = DatabaseTransactionService(db).get_transaction_summary(user_id)
+
+        assert summary["total_transactions"] == 60
+        assert summary["total_credits"] == 156.0
+        assert summary["total_debits"] == 1674.0
+        assert summary["net_amount"] == 156.0 - 1674.0
+        assert summary["status_breakdown"] == {"completed": 6, "pending": 54}
+        assert summary["type_breakdown"] == {"deposit": 6, "purchase": 54}
+
+    def test_summary_date_window(self, db, user_id):
+        summary = DatabaseTransactionService(db).get_transaction_summary(
+            user_id, start_date=date(2024, 1, 1), end_date=date(2024, 1, 10)
+        )
+
+        assert summary["total_transactions"] == 10
+        assert summary["total_credits"] == 1.0
+        assert summary["total_debits"] == 54.0
+
+    @pytest.mark.asyncio
+    async def test_admin_summary(self, db, user_id):
+        summary = await DatabaseTransactionService(db).get_transaction_summary_admin(
+            start_date=datetime(2024, 2, 1)
+        )
+
+        assert summary["total_transactions"] == 29
+        assert summary["type_breakdown"] == {"deposit": 2, "purchase": 27}
+
+
+def _bulk_row(user_id, account_id, i, **overrides):
+    row = {
+        "user_id": user_id,
+        "account_id": account_id,
+        "transaction_type": TransactionTypeEnum.PURCHASE,
+        "status": TransactionStatusEnum.COMPLETED,
+        "direction": TransactionDirectionEnum.OUTBOUND,
+        "payment_method": PaymentMethodEnum.CARD,
+        "amount": Decimal("2.50"),
+        "currency": "USD",
+        "description": f"Bulk {i}",
+        "reference_number": f"BULK-{i:08d}",
+        "transaction_date": datetime(2024, 6, 1) + timedelta(minutes=i),
+    }
+    row.update(overrides)
+    return row
+
+
+class TestBulkCreateTransactions:
+    """Test cases for TransactionRepository.bulk_create_transactions."""
+
+    def test_streams_chunks_and_returns_ids_in_order(self, db, user_id):
+        repo = TransactionRepository(db)
+        account_id = db.query(Account.id).filter(Account.user_id == user_id).scalar()
+
+        rows = (_bulk_row(user_id, account_id, i) for i in range(250))
+        ids = repo.bulk_create_transactions(rows, chunk_size=64)
+        db.commit()
+
+        assert len(ids) == 250
+        assert len(set(ids)) == 250
+        first = repo.get_transaction_by_id(ids[0])
+        assert first.reference_number == "BULK-00000000"
+        assert first.is_disputed is False
+        assert first.created_at is not None
+
+    def test_reference_number_conflicts_are_skipped(self, db, user_id):
+        repo = TransactionRepository(db)
+        account_id = db.query(Account.id).filter(Account.user_id == user_id).scalar()
+        repo.bulk_create_transactions([_bulk_row(user_id, account_id, i) for i in range(5)])
+
+        ids = repo.bulk_create_transactions([
+            _bulk_row(user_id, account_id, i, id=f"new-{i}") for i in range(3, 8)
+        ])
+        db.commit()
+
+        assert ids == ["new-5", "new-6", "new-7"]
+
+    def test_duplicate_references_are_reported(self, db, user_id):
+        repo = TransactionRepository(db)
+        account_id = db.query(Account.id).filter(Account.user_id == user_id).scalar()
+        repo.bulk_create_transactions([_bulk_row(user_id, account_id, 0)])
+
+        skipped = []
+        # Same reference as a stored row but a different timestamp, and repeated within one chunk
+        ids = repo.bulk_create_transactions([
+            _bulk_row(user_id, account_id, 0, id="again", transaction_date=datetime(2025, 1, 1)),
+            _bulk_row(user_id, account_id, 1, id="first"),
+            _bulk_row(user_id, account_id, 1, id="repeat"),
+        ], skipped=skipped)
+
+        assert ids == ["first"]
+        assert skipped == ["BULK-00000000", "BULK-00000001"]
+
+    def test_id_collisions_are_not_hidden(self, db, user_id):
+        repo = TransactionRepository(db)
+        account_id = db.query(Account.id).filter(Account.user_id == user_id).scalar()
+        repo.bulk_create_transactions([_bulk_row(user_id, account_id, 0, id="taken")])
+
+        with pytest.raises(IntegrityError):
+            repo.bulk_create_transactions([_bulk_row(user_id, account_id, 1, id="taken")])
+
+    def test_unknown_field_is_rejected(self, db, user_id):
+        with pytest.raises(ValidationException):
+            TransactionRepository(db).bulk_create_transactions([{"colour": "blue"}])
+
+    def test_copy_text_escaping(self):
+        assert _copy_text(None) == "\\N"
+        assert _copy_text(TransactionTypeEnum.DEPOSIT) == "DEPOSIT"
+        assert _copy_text(True) == "t"
+        assert _copy_text("a\tb\\c\n") == "a\\tb\\\\c\\n"
+        assert _copy_text(["x"]) == '["x"]'
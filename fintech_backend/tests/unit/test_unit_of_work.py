@@ -0,0 +1,120 @@
+"""
+Unit tests for the unit-of-work transaction scope.
+"""
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+
+from fintech_backend.app.database.config import get_db
+from fintech_backend.app.database.models import User, Account, Transaction, AccountTypeEnum
+from fintech_backend.app.database.unit_of_work import (
+    UnitOfWork, unit_of_work, async_unit_of_work, get_unit_of_work
+)
+from fintech_backend.app.models.flat_account import AccountType
+from fintech_backend.app.repositories.database_repository import (
+    UserRepository, AccountRepository, AsyncUserRepository
+)
+from fintech_backend.app.services.database_account_service import DatabaseAccountService
+
+
+@pytest.fixture
+def commits(db):
+    """Sessions committed on ``db``, one entry per commit."""
+    committed = []
+    event.listen(db, "after_commit", committed.append)
+    return committed
+
+
+@pytest.fixture
+def user(db, user_account, commits):
+    # Only the user; these tests count and create the accounts themselves
+    user, _ = user_account
+    db.add(user)
+    db.commit()
+    commits.clear()
+    return user
+
+
+class TestUnitOfWork:
+    """Test cases for the sync unit of work."""
+
+    def test_commits_once_at_the_end(self, db, user, commits):
+        with unit_of_work(db):
+            AccountRepository(db).create_account(user.id, "A", AccountTypeEnum.CHECKING, "UOW0000000001")
+            UserRepository(db).update_user(user.id, first_name="Changed")
+            assert len(commits) == 0
+
+        assert len(commits) == 1
+        assert db.scalar(select(func.count(Account.id))) == 1
+
+    def test_rolls_back_on_error(self, db, user, commits):
+        with pytest.raises(RuntimeError):
+            with unit_of_work(db):
+                AccountRepository(db).create_account(user.id, "A", AccountTypeEnum.CHECKING, "UOW0000000002")
+                raise RuntimeError("boom")
+
+        assert len(commits) == 0
+        assert db.scalar(select(func.count(Account.id))) == 0
+
+    def test_nested_scopes_join_the_outer_one(self, db, user, commits):
+        with unit_of_work(db):
+            with unit_of_work(db):
+                AccountRepository(db).create_account(user.id, "A", AccountTypeEnum.CHECKING, "UOW0000000003")
+            assert len(commits) == 0
+
+        assert len(commits) == 1
+
+    def test_create_account_with_deposit_and_bonus_is_one_commit(self, db, user, commits, monkeypatch):
+        service = DatabaseAccountService(db)
+        monkeypatch.setattr(service, "_generate_account_number", lambda: "UOW0000000004")
+        request = SimpleNamespace(
+            account_name="Savings", account_type=AccountType.SAVINGS,
+            currency="USD", initial_deposit=Decimal("1000.00")
+        )
+
+        result = service.create_account(user.id, request)
+
+        assert len(commits) == 1
+        assert result["welcome_bonus"] == Decimal("50.00")
+        account = db.get(Account, result["account"].id)
+        assert account.current_balance == Decimal("1050.00")
+        assert account.is_primary is True
+        amounts = sorted(db.scalars(select(Transaction.amount)).all())
+        assert amounts == [Decimal("50.00"), Decimal("1000.00")]
+
+    def test_dependency_uses_overridden_session(self, db, user, commits):
+        app = FastAPI()
+        app.dependency_overrides[get_db] = lambda: db
+
+        @app.post("/accounts")
+        def create(uow: UnitOfWork = Depends(get_unit_of_work)):
+            AccountRepository(uow.session).create_account(user.id, "A", AccountTypeEnum.CHECKING, "UOW0000000005")
+            return {}
+
+        assert TestClient(app).post("/accounts").status_code == 200
+        assert len(commits) == 1
+        assert db.scalar(select(func.count(Account.id))) == 1
+
+
+class TestAsyncUnitOfWork:
+    """Test cases for the async unit of work."""
+
+    @pytest.mark.asyncio
+    async def test_commit_and_rollback(self, async_db):
+        repo = AsyncUserRepository(async_db)
+
+        async with async_unit_of_work(async_db):
+            user = User(email="kept@example.com", first_name="Kept", last_name="User", password_hash="x")
+            async_db.add(user)
+
+        with pytest.raises(RuntimeError):
+            async with async_unit_of_work(async_db):
+                await repo.update_user(user.id, first_name="Lost")
+                raise RuntimeError("boom")
+
+        await async_db.refresh(user)
+        assert user.first_name == "Kept"
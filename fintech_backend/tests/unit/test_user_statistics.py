@@ -0,0 +1,142 @@
+"""
+Unit tests for the single-scan user statistics query.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from fintech_backend.app.api import public
+from fintech_backend.app.core.exception_handlers import fintech_exception_handler
+from fintech_backend.app.core.exceptions import FintechException
+from fintech_backend.app.database import config
+from fintech_backend.app.database.liveness import CircuitBreaker
+from fintech_backend.app.database.models import User
+from fintech_backend.app.services.user_service_admin import UserServiceAdmin
+
+
+@pytest.fixture
+def users(db):
+    """Twelve users spread over roles, countries and signup dates."""
+    old = datetime.utcnow() - timedelta(days=90)
+    for i in range(12):
+        db.add(User(
+            email=f"user{i}@example.com",
+            first_name="U",
+            last_name=str(i),
+            password_hash="x",
+            role="admin" if i < 2 else "user",
+            is_active=i % 3 != 0,
+            email_verified=i % 2 == 0,
+            country="GH" if i < 7 else ("NG" if i < 10 else None),
+            created_at=old if i < 5 else datetime.utcnow()
+        ))
+    db.commit()
+
+
+EXPECTED = {
+    "total_users": 12,
+    "active_users": 8,
+    "inactive_users": 4,
+    "verified_users": 6,
+    "unverified_users": 6,
+    "role_distribution": {"admin": 2, "user": 10},
+    "top_countries": {"GH": 7, "NG": 3},
+    "recent_registrations": 7,
+}
+
+
+class TestUserStatistics:
+    """Test cases for UserServiceAdmin.get_user_statistics_admin."""
+
+    @pytest.mark.asyncio
+    async def test_statistics(self, db, users):
+        stats = await UserServiceAdmin().get_user_statistics_admin(db)
+
+        assert {key: stats[key] for key in EXPECTED} == EXPECTED
+
+    @pytest.mark.asyncio
+    async def test_statistics_without_filter_clause(self, db, users, monkeypatch):
+        dialect = db.get_bind().dialect
+        monkeypatch.setattr(dialect, "server_version_info", (3, 29, 0))
+
+        stats = await UserServiceAdmin().get_user_statistics_admin(db)
+
+        assert {key: stats[key] for key in EXPECTED} == EXPECTED
+
+
+@pytest.fixture
+def public_client(db, users, monkeypatch):
+    """Client for the public router, with get_db sessions on the test database."""
+    monkeypatch.setattr(config, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    public._public_stats_cache.clear()
+    app = FastAPI()
+    app.add_exception_handler(FintechException, fintech_exception_handler)
+    app.include_router(public.router)
+    yield TestClient(app)
+    public._public_stats_cache.clear()
+
+
+class TestPublicStatisticsETag:
+    """Test cases for the public statistics ETag."""
+
+    @pytest.mark.asyncio
+    async def test_etag_ignores_generation_time(self, db, users, monkeypatch):
+        monkeypatch.setattr(config, "SessionLocal", sessionmaker(bind=db.get_bind()))
+
+        first = await public._compute_public_user_statistics()
+        second = await public._compute_public_user_statistics()
+
+        assert first["body"] != second["body"]  # generated_at differs
+        assert first["etag"] == second["etag"]
+
+        db.add(User(email="late@example.com", first_name="L", last_name="A", password_hash="x"))
+        db.commit()
+        assert (await public._compute_public_user_statistics())["etag"] != first["etag"]
+
+
+class TestPublicStatisticsEndpoint:
+    """Test cases for the public statistics endpoint."""
+
+    def test_serves_statistics(self, public_client):
+        response = public_client.get("/user-stats")
+
+        assert response.status_code == 200
+        assert response.json()["statistics"]["total_users"] == 12
+
+    @pytest.mark.parametrize("if_none_match", [
+        "{etag}",
+        "{bare}",
+        '"other", {etag}',
+        '"other",{bare}',
+        "*",
+    ])
+    def test_matching_etag_is_not_modified(self, public_client, if_none_match):
+        etag = public_client.get("/user-stats").headers["ETag"]
+        header = if_none_match.format(etag=etag, bare=etag.removeprefix("W/"))
+
+        response = public_client.get("/user-stats", headers={"If-None-Match": header})
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+    def test_other_etag_is_served(self, public_client):
+        response = public_client.get("/user-stats", headers={"If-None-Match": 'W/"other", "again"'})
+
+        assert response.status_code == 200
+
+    def test_open_circuit_fails_fast(self, public_client, monkeypatch):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        monkeypatch.setattr(config, "db_circuit_breaker", breaker)
+
+        def unreachable():
+            raise AssertionError("session opened while the circuit is open")
+
+        monkeypatch.setattr(config, "SessionLocal", unreachable)
+        response = public_client.get("/user-stats")
+
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) > 0